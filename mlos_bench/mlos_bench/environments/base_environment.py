@@ -418,3 +418,19 @@ class Environment(metaclass=abc.ABCMeta):
             return (Status.READY, timestamp, [])
         _LOG.warning("Environment not ready: %s", self)
         return (Status.PENDING, timestamp, [])
+
+    def cancel(self) -> bool:
+        """
+        Request to stop the benchmark that is currently running in `.run()`,
+        e.g., when the scheduler decides to prune the trial early.
+        Can be called from a different thread while `.run()` is in progress;
+        `.run()` should return shortly after that.
+        Base class' implementation does nothing.
+
+        Returns
+        -------
+        is_canceled : bool
+            True if the request to stop the benchmark went through, False otherwise.
+        """
+        _LOG.debug("Cancel is not supported: %s", self)
+        return False
@@ -43,7 +43,9 @@ class CompositeEnv(Environment):
             Human-readable name of the environment.
         config : dict
             Free-format dictionary that contains the environment
-            configuration. Must have a "children" section.
+            configuration. Must have a "children" section. Optional
+            `incremental_setup` flag tells the environment to skip the setup of
+            the children whose tunables have not changed since the last trial.
         global_config : dict
             Free-format dictionary of global parameters (e.g., security credentials)
             to be mixed in into the "const_args" section of the local config.
@@ -65,6 +67,13 @@ class CompositeEnv(Environment):
         _LOG.debug("Build composite environment '%s' START: %s", self, tunables)
         self._children: List[Environment] = []
         self._child_contexts: List[Environment] = []
+        self._is_canceled = False
+
+        # In incremental setup mode, skip the (potentially expensive) setup of the
+        # children that are still ready and whose covariant groups did not change.
+        self._incremental_setup = bool(config.get("incremental_setup", False))
+        # Index of the child environment -> tunable values of its last successful setup.
+        self._child_setup_values: Dict[int, Dict[str, TunableValue]] = {}
 
         # To support trees of composite environments (e.g. for multiple VM experiments),
         # each CompositeEnv gets a copy of the original global config and adjusts it with
@@ -165,9 +174,34 @@ class CompositeEnv(Environment):
         """
         assert self._in_context
         self._is_ready = super().setup(tunables, global_config) and all(
-            env_context.setup(tunables, global_config) for env_context in self._child_contexts)
+            self._setup_child(idx, env_context, tunables, global_config)
+            for (idx, env_context) in enumerate(self._child_contexts))
+        self._is_canceled = False
         return self._is_ready
 
+    def _setup_child(self, idx: int, env_context: Environment,
+                     tunables: TunableGroups, global_config: Optional[dict]) -> bool:
+        """
+        Set up the child environment. In incremental setup mode, skip the setup
+        if the child is still ready and the values of its tunables are the same
+        as in its last successful setup; just update its parameters in that case.
+        Nested composite environments are always set up, as they make the same
+        decision for their own children.
+        """
+        values = tunables.get_param_values(env_context.tunable_params.get_covariant_group_names())
+        # pylint: disable=protected-access
+        if (self._incremental_setup and env_context._is_ready
+                and not isinstance(env_context, CompositeEnv)
+                and self._child_setup_values.get(idx) == values):
+            _LOG.info("Skip setup of unchanged environment: %s", env_context)
+            # Base class' setup only assigns the tunables and merges the parameters.
+            return Environment.setup(env_context, tunables, global_config)
+        self._child_setup_values.pop(idx, None)
+        is_success = env_context.setup(tunables, global_config)
+        if is_success:
+            self._child_setup_values[idx] = values
+        return is_success
+
     def teardown(self) -> None:
         """
         Tear down the children environments. This method is idempotent,
@@ -177,6 +211,7 @@ class CompositeEnv(Environment):
         assert self._in_context
         for env_context in reversed(self._child_contexts):
             env_context.teardown()
+        self._child_setup_values = {}
         super().teardown()
 
     def run(self) -> Tuple[Status, datetime, Optional[Dict[str, TunableValue]]]:
@@ -199,12 +234,17 @@ class CompositeEnv(Environment):
             return (status, timestamp, metrics)
 
         joint_metrics = {}
-        for env_context in self._child_contexts:
+        for (idx, env_context) in enumerate(self._child_contexts):
+            if self._is_canceled:
+                _LOG.info("Run canceled: %s :: before %s", self, env_context)
+                return (Status.CANCELED, timestamp, None)
             _LOG.debug("Child env. run: %s", env_context)
             (status, timestamp, metrics) = env_context.run()
             _LOG.debug("Child env. run results: %s :: %s %s", env_context, status, metrics)
             if not status.is_good():
                 _LOG.info("Run failed: %s :: %s", self, status)
+                # Do not trust the state of the failed environment in the next trial.
+                self._child_setup_values.pop(idx, None)
                 return (status, timestamp, None)
             joint_metrics.update(metrics or {})
 
@@ -212,6 +252,22 @@ class CompositeEnv(Environment):
         # Return the status and the timestamp of the last child environment.
         return (status, timestamp, joint_metrics)
 
+    def cancel(self) -> bool:
+        """
+        Stop the currently running child environment (if it supports that)
+        and skip running the rest of them.
+
+        Returns
+        -------
+        is_canceled : bool
+            Always True, as the remaining children will not run.
+        """
+        _LOG.info("Cancel: %s", self)
+        self._is_canceled = True
+        for env_context in self._child_contexts:
+            env_context.cancel()
+        return True
+
     def status(self) -> Tuple[Status, datetime, List[Tuple[datetime, str, Any]]]:
         """
         Check the status of the benchmark environment.
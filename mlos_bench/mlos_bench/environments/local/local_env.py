@@ -203,6 +203,19 @@ class LocalEnv(ScriptEnv):
         _LOG.info("Local run complete: %s ::\n%s", self, stdout_data)
         return (Status.SUCCEEDED, timestamp, stdout_data)
 
+    def cancel(self) -> bool:
+        """
+        Terminate the script that is currently running in the local environment (if any).
+
+        Returns
+        -------
+        is_canceled : bool
+            True if the running script has been terminated, False otherwise.
+        """
+        if self._temp_dir is None:
+            return False
+        return self._local_exec_service.local_exec_cancel(self._temp_dir)
+
     @staticmethod
     def _normalize_columns(data: pandas.DataFrame) -> pandas.DataFrame:
         """
@@ -22,6 +22,7 @@ class Status(enum.Enum):
     CANCELED = 5
     FAILED = 6
     TIMED_OUT = 7
+    PRUNED = 8
 
     def is_good(self) -> bool:
         """
@@ -37,13 +38,14 @@ class Status(enum.Enum):
     def is_completed(self) -> bool:
         """
         Check if the status of the benchmark/environment is
-        one of {SUCCEEDED, CANCELED, FAILED, TIMED_OUT}.
+        one of {SUCCEEDED, CANCELED, FAILED, TIMED_OUT, PRUNED}.
         """
         return self in {
             Status.SUCCEEDED,
             Status.CANCELED,
             Status.FAILED,
             Status.TIMED_OUT,
+            Status.PRUNED,
         }
 
     def is_pending(self) -> bool:
@@ -81,3 +83,10 @@ class Status(enum.Enum):
         Check if the status of the benchmark/environment is TIMED_OUT.
         """
         return self == Status.FAILED
+
+    def is_pruned(self) -> bool:
+        """
+        Check if the status of the benchmark/environment is PRUNED,
+        i.e., the trial was stopped early because it was not promising.
+        """
+        return self == Status.PRUNED
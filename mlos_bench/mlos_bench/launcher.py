@@ -146,6 +146,7 @@ class Launcher:
         _LOG.info("Init storage: %s", self.storage)
 
         self.teardown: bool = bool(args.teardown) if args.teardown is not None else bool(config.get("teardown", True))
+        self.worker: bool = bool(args.worker) if args.worker is not None else bool(config.get("worker", False))
         self.scheduler = self._load_scheduler(args.scheduler or config.get("scheduler"))
         _LOG.info("Init scheduler: %s", self.scheduler)
 
@@ -243,6 +244,13 @@ class Launcher:
             dest='teardown', action='store_false',
             help='Disable teardown of the environment after the benchmark.')
 
+        parser.add_argument(
+            '--worker', required=False, default=None,
+            dest='worker', action='store_true',
+            help='Run in worker mode: claim and run the pending trials of the experiment' +
+                 ' from the shared storage, but do not suggest new ones.' +
+                 ' Many workers (possibly on different hosts) can share one experiment.')
+
         parser.add_argument(
             '--experiment_id', '--experiment-id', required=False, default=None,
             help="""
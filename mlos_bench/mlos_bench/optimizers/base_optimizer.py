@@ -11,7 +11,7 @@ import logging
 from abc import ABCMeta, abstractmethod
 from distutils.util import strtobool  # pylint: disable=deprecated-module
 from types import TracebackType
-from typing import Dict, Optional, Sequence, Tuple, Type, Union
+from typing import Dict, List, Optional, Sequence, Tuple, Type, Union
 
 from ConfigSpace import ConfigurationSpace
 from typing_extensions import Literal
@@ -287,6 +287,31 @@ class Optimizer(metaclass=ABCMeta):  # pylint: disable=too-many-instance-attribu
         _LOG.debug("Iteration %d :: Suggest", self._iter)
         return self._tunables.copy()
 
+    def suggest_batch(self, n: int) -> List[TunableGroups]:
+        """
+        Generate a batch of up to `n` next suggestions at once.
+        Base class' implementation calls `.suggest()` and `.register_pending()`
+        for each configuration until the batch is full or the optimizer converges.
+
+        Parameters
+        ----------
+        n : int
+            Maximum number of configurations to suggest. Must be positive.
+
+        Returns
+        -------
+        batch : List[TunableGroups]
+            Between 1 and `n` configurations to benchmark.
+        """
+        if n <= 0:
+            raise ValueError(f"Invalid batch size: {n}")
+        batch: List[TunableGroups] = []
+        while len(batch) < n and (not batch or self.not_converged()):
+            tunables = self.suggest()
+            self.register_pending(tunables)
+            batch.append(tunables)
+        return batch
+
     @abstractmethod
     def register(
         self,
@@ -325,6 +350,33 @@ class Optimizer(metaclass=ABCMeta):  # pylint: disable=too-many-instance-attribu
             raise ValueError("Status and score must be consistent.")
         return self._get_scores(status, score)
 
+    def register_pending(self, tunables: TunableGroups) -> None:
+        """
+        Mark the configuration as pending, i.e., suggested but not benchmarked yet.
+        This lets the optimizer account for the configurations in flight when
+        making more suggestions before their results become available.
+        Base class' implementation does nothing.
+
+        Parameters
+        ----------
+        tunables : TunableGroups
+            The configuration that the `.suggest()` method returned.
+        """
+        _LOG.debug("Iteration %d :: Register pending: %s", self._iter, tunables)
+
+    def unregister_pending(self, tunables: TunableGroups) -> None:
+        """
+        Forget the pending configuration that will never be benchmarked,
+        e.g., a stale suggestion that the scheduler has dropped.
+        Base class' implementation does nothing.
+
+        Parameters
+        ----------
+        tunables : TunableGroups
+            The configuration previously marked as pending.
+        """
+        _LOG.debug("Iteration %d :: Unregister pending: %s", self._iter, tunables)
+
     def _get_scores(
         self,
         status: Status,
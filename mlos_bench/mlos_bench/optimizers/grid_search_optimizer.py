@@ -7,8 +7,8 @@ Grid search optimizer for mlos_bench.
 """
 
 import logging
-
-from typing import Dict, Iterable, Set, Optional, Sequence, Tuple
+from itertools import islice
+from typing import Dict, Iterable, List, Set, Optional, Sequence, Tuple
 
 import numpy as np
 import ConfigSpace
@@ -153,6 +153,28 @@ class GridSearchOptimizer(TrackBestOptimizer):
         _LOG.info("Iteration %d :: Suggest: %s", self._iter, tunables)
         return tunables
 
+    def suggest_batch(self, n: int) -> List[TunableGroups]:
+        """
+        Generate the next slice of the grid search suggestions.
+        """
+        if n <= 0:
+            raise ValueError(f"Invalid batch size: {n}")
+        batch: List[TunableGroups] = []
+        if self._start_with_defaults or not self._pending_configs:
+            # Let the single suggestion logic handle the defaults and the grid restarts.
+            batch.append(self.suggest())
+        # Do not go past the max. number of iterations, but always suggest something.
+        num_configs = min(n - len(batch), max(self._max_iter - self._iter, 0 if batch else 1))
+        next_configs = list(islice(self._pending_configs.keys(), num_configs))
+        for next_config_values in next_configs:
+            # Move it to the suggested set.
+            self._suggested_configs.add(next_config_values)
+            del self._pending_configs[next_config_values]
+            batch.append(self._tunables.copy().assign(dict(zip(self._config_keys, next_config_values))))
+        self._iter += len(next_configs)
+        _LOG.info("Iteration %d :: Suggest batch: %s", self._iter, batch)
+        return batch
+
     def register(self, tunables: TunableGroups, status: Status,
                  score: Optional[Dict[str, TunableValue]] = None) -> Optional[Dict[str, float]]:
         registered_score = super().register(tunables, status, score)
@@ -163,6 +185,15 @@ class GridSearchOptimizer(TrackBestOptimizer):
             _LOG.warning("Attempted to remove missing config (previously registered?) from suggested set: %s", tunables)
         return registered_score
 
+    def unregister_pending(self, tunables: TunableGroups) -> None:
+        super().unregister_pending(tunables)
+        config = dict(ConfigSpace.Configuration(self.config_space, values=tunables.get_param_values()))
+        config_values = tuple(config.values())
+        if config_values in self._suggested_configs:
+            # Return the config to the grid so that it still gets benchmarked.
+            self._suggested_configs.remove(config_values)
+            self._pending_configs[config_values] = None
+
     def not_converged(self) -> bool:
         if self._iter > self._max_iter:
             if bool(self._pending_configs):
@@ -8,7 +8,7 @@ A wrapper for mlos_core optimizers for mlos_bench.
 import logging
 import os
 from types import TracebackType
-from typing import Dict, Optional, Sequence, Tuple, Type, Union
+from typing import Dict, List, Optional, Sequence, Tuple, Type, Union
 
 import pandas as pd
 from typing_extensions import Literal
@@ -47,22 +47,8 @@ class MlosCoreOptimizer(Optimizer):
     ):
         super().__init__(tunables, config, global_config, service)
 
-<<<<<<< HEAD
-        # TODO: Remove after implementing multi-target optimization in mlos_core
-        if len(self._opt_targets) != 1:
-            raise NotImplementedError(
-                f"Multi-target optimization is not supported: {self}"
-            )
-        (self._opt_target, self._opt_sign) = list(self._opt_targets.items())[0]
-
-        opt_type = getattr(
-            OptimizerType,
-            self._config.pop("optimizer_type", DEFAULT_OPTIMIZER_TYPE.name),
-        )
-=======
         opt_type = getattr(OptimizerType, self._config.pop(
             'optimizer_type', DEFAULT_OPTIMIZER_TYPE.name))
->>>>>>> c7a4823b22855ccc9b9083495b48e95a48b779ec
 
         if opt_type == OptimizerType.SMAC:
             output_directory = self._config.get("output_directory")
@@ -112,36 +98,20 @@ class MlosCoreOptimizer(Optimizer):
     def name(self) -> str:
         return f"{self.__class__.__name__}:{self._opt.__class__.__name__}"
 
-<<<<<<< HEAD
-    def bulk_register(
-        self,
-        configs: Sequence[dict],
-        scores: Sequence[Optional[Dict[str, TunableValue]]],
-        status: Optional[Sequence[Status]] = None,
-    ) -> bool:
-=======
     def bulk_register(self,
                       configs: Sequence[dict],
                       scores: Sequence[Optional[Dict[str, TunableValue]]],
                       status: Optional[Sequence[Status]] = None) -> bool:
 
->>>>>>> c7a4823b22855ccc9b9083495b48e95a48b779ec
         if not super().bulk_register(configs, scores, status):
             return False
 
         df_configs = self._to_df(configs)  # Impute missing values, if necessary
-<<<<<<< HEAD
-        df_scores = (
-            pd.Series([self._extract_target(score) for score in scores], dtype=float)
-            * self._opt_sign
-        )
-=======
 
         df_scores = self._adjust_signs_df(
             pd.DataFrame([{} if score is None else score for score in scores]))
 
         opt_targets = list(self._opt_targets)
->>>>>>> c7a4823b22855ccc9b9083495b48e95a48b779ec
         if status is not None:
             # Select only the completed trials, set scores for failed trials to +inf.
             df_status = pd.Series(status)
@@ -162,12 +132,6 @@ class MlosCoreOptimizer(Optimizer):
 
         return True
 
-<<<<<<< HEAD
-    def _extract_target(
-        self, scores: Optional[Dict[str, TunableValue]]
-    ) -> Optional[TunableValue]:
-        return None if scores is None else scores[self._opt_target]
-=======
     def _adjust_signs_df(self, df_scores: pd.DataFrame) -> pd.DataFrame:
         """
         In-place adjust the signs of the scores for MINIMIZATION problem.
@@ -175,7 +139,6 @@ class MlosCoreOptimizer(Optimizer):
         for (opt_target, opt_dir) in self._opt_targets.items():
             df_scores[opt_target] *= opt_dir
         return df_scores
->>>>>>> c7a4823b22855ccc9b9083495b48e95a48b779ec
 
     def _to_df(self, configs: Sequence[Dict[str, TunableValue]]) -> pd.DataFrame:
         """
@@ -233,51 +196,46 @@ class MlosCoreOptimizer(Optimizer):
             configspace_data_to_tunable_values(df_config.loc[0].to_dict())
         )
 
-<<<<<<< HEAD
-    def register(
-        self,
-        tunables: TunableGroups,
-        status: Status,
-        score: Optional[Dict[str, TunableValue]] = None,
-    ) -> Optional[Dict[str, float]]:
-        registered_score = super().register(
-            tunables, status, score
-        )  # With _opt_sign applied
-=======
+    def suggest_batch(self, n: int) -> List[TunableGroups]:
+        if n <= 0:
+            raise ValueError(f"Invalid batch size: {n}")
+        # Do not go past the max. number of iterations, but always suggest something.
+        n = max(1, min(n, self._max_iter - self._iter))
+        if self._start_with_defaults:
+            _LOG.info("Use default values for the first trial")
+        # mlos_core optimizer keeps track of the pending configurations in the batch.
+        df_configs, _ = self._opt.suggest_batch(n, defaults=self._start_with_defaults)
+        self._start_with_defaults = False
+        self._iter += len(df_configs)
+        _LOG.info("Iteration %d :: Suggest batch:\n%s", self._iter, df_configs)
+        return [
+            self._tunables.copy().assign(configspace_data_to_tunable_values(config))
+            for config in df_configs.to_dict(orient="records")
+        ]
+
     def register(self, tunables: TunableGroups, status: Status,
                  score: Optional[Dict[str, TunableValue]] = None) -> Optional[Dict[str, float]]:
         registered_score = super().register(tunables, status, score)  # Sign-adjusted for MINIMIZATION
->>>>>>> c7a4823b22855ccc9b9083495b48e95a48b779ec
         if status.is_completed():
             assert registered_score is not None
             df_config = self._to_df([tunables.get_param_values()])
             _LOG.debug("Score: %s Dataframe:\n%s", registered_score, df_config)
-<<<<<<< HEAD
-            self._opt.register(
-                df_config, pd.Series([registered_score[self._opt_target]], dtype=float)
-            )
-        return registered_score
-
-    def get_best_observation(
-        self,
-    ) -> Union[Tuple[Dict[str, float], TunableGroups], Tuple[None, None]]:
-        df_config = self._opt.get_best_observation()
-        if len(df_config) == 0:
-            return (None, None)
-        params = configspace_data_to_tunable_values(df_config.iloc[0].to_dict())
-        _LOG.debug("Best observation: %s", params)
-        score = params.pop("score")
-        assert score is not None
-        score = (
-            float(score) * self._opt_sign
-        )  # mlos_core always uses the `score` column
-        return ({self._opt_target: score}, self._tunables.copy().assign(params))
-=======
             # TODO: Specify (in the config) which metrics to pass to the optimizer.
             # Issue: https://github.com/microsoft/MLOS/issues/745
             self._opt.register(df_config, pd.DataFrame([registered_score], dtype=float))
         return registered_score
 
+    def register_pending(self, tunables: TunableGroups) -> None:
+        super().register_pending(tunables)
+        try:
+            self._opt.register_pending(self._to_df([tunables.get_param_values()]))
+        except NotImplementedError:
+            _LOG.debug("Pending configurations are not supported by: %s", self._opt)
+
+    def unregister_pending(self, tunables: TunableGroups) -> None:
+        super().unregister_pending(tunables)
+        self._opt.unregister_pending(self._to_df([tunables.get_param_values()]))
+
     def get_best_observation(self) -> Union[Tuple[Dict[str, float], TunableGroups], Tuple[None, None]]:
         (df_config, df_score, _df_context) = self._opt.get_best_observations()
         if len(df_config) == 0:
@@ -286,4 +244,3 @@ class MlosCoreOptimizer(Optimizer):
         scores = self._adjust_signs_df(df_score).iloc[0].to_dict()
         _LOG.debug("Best observation: %s score: %s", params, scores)
         return (scores, self._tunables.copy().assign(params))
->>>>>>> c7a4823b22855ccc9b9083495b48e95a48b779ec
@@ -0,0 +1,19 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Rules to stop the unpromising trials early based on their telemetry.
+"""
+
+from mlos_bench.pruners.base_pruner import TrialPruner
+from mlos_bench.pruners.median_stopping_pruner import MedianStoppingPruner
+from mlos_bench.pruners.percentile_pruner import PercentilePruner
+from mlos_bench.pruners.curve_extrapolation_pruner import CurveExtrapolationPruner
+
+__all__ = [
+    'TrialPruner',
+    'MedianStoppingPruner',
+    'PercentilePruner',
+    'CurveExtrapolationPruner',
+]
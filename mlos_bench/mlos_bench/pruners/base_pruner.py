@@ -0,0 +1,185 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Base class for the rules that stop unpromising trials early.
+"""
+
+import logging
+import math
+import threading
+from abc import ABCMeta, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from mlos_bench.storage.base_storage import Storage
+from mlos_bench.util import try_parse_val
+
+_LOG = logging.getLogger(__name__)
+
+Curve = List[Tuple[float, float]]
+"""
+A learning curve of the trial: a list of (seconds since the first sample, value) pairs.
+The values are always sign-adjusted for MINIMIZATION.
+"""
+
+
+class TrialPruner(metaclass=ABCMeta):
+    """
+    An abstract base class for the rules that decide whether a running trial
+    should be stopped early, based on the telemetry it produced so far and
+    the telemetry of the trials that completed successfully before it.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Create a new trial pruner.
+
+        Parameters
+        ----------
+        config : dict
+            Free-format key/value pairs of configuration parameters.
+            Must have the `metric` to watch in the telemetry. Optional
+            `direction` ("min" or "max", default "min") tells whether lower
+            values of the metric are better. `grace_period` (in seconds) and
+            `min_trials` set the minimum duration of the trial and the minimum
+            number of completed trials to compare with before pruning.
+        """
+        self._config = config.copy()
+        self._metric = str(self._config["metric"])
+        direction = self._config.get("direction", "min")
+        if direction not in {"min", "max"}:
+            raise ValueError(f"Invalid direction: {direction}")
+        self._sign = 1 if direction == "min" else -1
+        self._grace_period = float(self._config.get("grace_period", 0))
+        if self._grace_period < 0:
+            raise ValueError(f"Invalid grace_period: {self._grace_period}")
+        self._min_trials = int(self._config.get("min_trials", 3))
+        if self._min_trials <= 0:
+            raise ValueError(f"Invalid min_trials: {self._min_trials}")
+        # Trial ID -> learning curve of the completed trial.
+        self._history: Dict[int, Curve] = {}
+        # Trials can be monitored in several threads while the history is updated.
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(metric={self._metric})"
+
+    @property
+    def metric(self) -> str:
+        """
+        The name of the telemetry metric to watch.
+        """
+        return self._metric
+
+    @property
+    def num_trials(self) -> int:
+        """
+        The number of completed trials to compare the running trials with.
+        """
+        return len(self._history)
+
+    def add_trial(self, trial_id: int, telemetry: List[Tuple[datetime, str, Any]]) -> None:
+        """
+        Add the telemetry of a successfully completed trial to the history.
+
+        Parameters
+        ----------
+        trial_id : int
+            ID of the completed trial.
+        telemetry : List[Tuple[datetime, str, Any]]
+            Telemetry of the trial as a list of (timestamp, metric, value) triplets.
+        """
+        curve = self._to_curve(telemetry)
+        if not curve:
+            _LOG.debug("No telemetry for metric %s in trial: %d", self._metric, trial_id)
+            return
+        with self._lock:
+            self._history[trial_id] = curve
+
+    def update_history(self, experiment: Storage.Experiment, trial_ids: Iterable[int]) -> None:
+        """
+        Load the telemetry of the successfully completed trials from the storage.
+
+        Parameters
+        ----------
+        experiment : Storage.Experiment
+            The experiment the trials belong to.
+        trial_ids : Iterable[int]
+            IDs of the completed trials. Trials already in the history are skipped.
+        """
+        for trial_id in trial_ids:
+            if trial_id not in self._history:
+                self.add_trial(trial_id, experiment.load_telemetry(trial_id))
+
+    def should_prune(self, telemetry: List[Tuple[datetime, str, Any]]) -> bool:
+        """
+        Check if the running trial should be stopped early.
+
+        Parameters
+        ----------
+        telemetry : List[Tuple[datetime, str, Any]]
+            Telemetry of the running trial so far, as returned by `Environment.status()`.
+
+        Returns
+        -------
+        is_pruned : bool
+            True if the trial is not promising and should be stopped, False otherwise.
+        """
+        curve = self._to_curve(telemetry)
+        if not curve or curve[-1][0] < self._grace_period:
+            return False
+        with self._lock:
+            history = list(self._history.values())
+        if len(history) < self._min_trials:
+            return False
+        is_pruned = self._should_prune(curve, history)
+        if is_pruned:
+            _LOG.info("Prune trial: %s :: at %.1f sec. value %s", self, curve[-1][0], curve[-1][1])
+        return is_pruned
+
+    @abstractmethod
+    def _should_prune(self, curve: Curve, history: List[Curve]) -> bool:
+        """
+        Compare the learning curve of the running trial with the completed ones.
+
+        Parameters
+        ----------
+        curve : Curve
+            Learning curve of the running trial. Never empty.
+        history : List[Curve]
+            Learning curves of the completed trials. Has at least `min_trials` elements.
+
+        Returns
+        -------
+        is_pruned : bool
+            True if the trial should be stopped, False otherwise.
+        """
+
+    def _to_curve(self, telemetry: List[Tuple[datetime, str, Any]]) -> Curve:
+        """
+        Extract the learning curve of the metric from the telemetry data.
+        Skip the non-numeric (and NaN) values.
+        """
+        samples: List[Tuple[datetime, float]] = []
+        for (timestamp, metric, value) in telemetry:
+            if metric != self._metric:
+                continue
+            value = try_parse_val(value) if isinstance(value, str) else value
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and not math.isnan(value):
+                samples.append((timestamp, float(value) * self._sign))
+        if not samples:
+            return []
+        samples.sort(key=lambda sample: sample[0])
+        start = samples[0][0]
+        return [((timestamp - start).total_seconds(), value) for (timestamp, value) in samples]
+
+    @staticmethod
+    def _values_until(curve: Curve, elapsed: float) -> Optional[List[float]]:
+        """
+        Get the values of the curve up to (and including) the `elapsed` time.
+        Return None if there are none.
+        """
+        values = [value for (sample_elapsed, value) in curve if sample_elapsed <= elapsed]
+        return values or None
@@ -0,0 +1,56 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Learning curve extrapolation stopping rule for the trials.
+"""
+
+from typing import Any, Dict, List
+
+import numpy as np
+
+from mlos_bench.pruners.base_pruner import Curve, TrialPruner
+
+
+class CurveExtrapolationPruner(TrialPruner):
+    """
+    Extrapolate the learning curve of the trial to the typical duration of
+    the completed trials and stop the trial if the predicted final value
+    is worse than the best final value of the completed trials.
+
+    The curve is fitted as `value = a + b * log(1 + t)`, which captures
+    the typical warm-up behavior of the benchmarks.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Create a new learning curve extrapolation pruner.
+
+        Parameters
+        ----------
+        config : dict
+            In addition to the base pruner parameters, it can have
+            `min_samples` (default 3) telemetry samples to fit the curve, and
+            `tolerance` (default 0.1), i.e., how much (relative to the best final
+            value) the prediction can be worse than the best one.
+        """
+        super().__init__(config)
+        self._min_samples = int(self._config.get("min_samples", 3))
+        if self._min_samples < 2:
+            raise ValueError(f"Invalid min_samples: {self._min_samples}")
+        self._tolerance = float(self._config.get("tolerance", 0.1))
+        if self._tolerance < 0:
+            raise ValueError(f"Invalid tolerance: {self._tolerance}")
+
+    def _should_prune(self, curve: Curve, history: List[Curve]) -> bool:
+        if len(curve) < self._min_samples:
+            return False
+        (elapsed, values) = np.array(curve).T
+        if np.ptp(elapsed) == 0:
+            return False
+        (slope, intercept) = np.polyfit(np.log1p(elapsed), values, 1)
+        horizon = np.median([trial_curve[-1][0] for trial_curve in history])
+        predicted = intercept + slope * np.log1p(max(horizon, elapsed[-1]))
+        best_final = min(trial_curve[-1][1] for trial_curve in history)
+        return bool(predicted - best_final > self._tolerance * abs(best_final))
@@ -0,0 +1,33 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Median stopping rule for the trials.
+"""
+
+from typing import List
+
+import numpy as np
+
+from mlos_bench.pruners.base_pruner import Curve, TrialPruner
+
+
+class MedianStoppingPruner(TrialPruner):
+    """
+    Median stopping rule (Golovin et al., "Google Vizier", KDD 2017):
+    stop the trial if its best value so far is worse than the median
+    of the running averages of the completed trials at the same point in time.
+    """
+
+    def _should_prune(self, curve: Curve, history: List[Curve]) -> bool:
+        (elapsed, _) = curve[-1]
+        best_value = min(value for (_, value) in curve)
+        running_averages = [
+            np.mean(values) for values in (
+                self._values_until(trial_curve, elapsed) for trial_curve in history
+            ) if values
+        ]
+        if len(running_averages) < self._min_trials:
+            return False
+        return bool(best_value > np.median(running_averages))
@@ -0,0 +1,47 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Percentile stopping rule for the trials.
+"""
+
+from typing import Any, Dict, List
+
+import numpy as np
+
+from mlos_bench.pruners.base_pruner import Curve, TrialPruner
+
+
+class PercentilePruner(TrialPruner):
+    """
+    Stop the trial if its best value so far is not in the top `percentile`
+    of the best values of the completed trials at the same point in time.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Create a new percentile pruner.
+
+        Parameters
+        ----------
+        config : dict
+            In addition to the base pruner parameters, it can have
+            `percentile` (0 to 100, default 25) of the best trials to keep running.
+        """
+        super().__init__(config)
+        self._percentile = float(self._config.get("percentile", 25))
+        if not 0 <= self._percentile <= 100:
+            raise ValueError(f"Invalid percentile: {self._percentile}")
+
+    def _should_prune(self, curve: Curve, history: List[Curve]) -> bool:
+        (elapsed, _) = curve[-1]
+        best_value = min(value for (_, value) in curve)
+        best_values = [
+            min(values) for values in (
+                self._values_until(trial_curve, elapsed) for trial_curve in history
+            ) if values
+        ]
+        if len(best_values) < self._min_trials:
+            return False
+        return bool(best_value > np.percentile(best_values, self._percentile))
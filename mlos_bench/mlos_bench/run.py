@@ -26,7 +26,10 @@ def _main(argv: Optional[List[str]] = None
     launcher = Launcher("mlos_bench", "Systems autotuning and benchmarking tool", argv=argv)
 
     with launcher.scheduler as scheduler_context:
-        scheduler_context.start()
+        if launcher.worker:
+            scheduler_context.run_worker()
+        else:
+            scheduler_context.start()
         scheduler_context.teardown()
 
     (score, _config) = result = launcher.scheduler.get_best_observation()
@@ -6,25 +6,44 @@
 Base class for the optimization loop scheduling policies.
 """
 
+import asyncio
 import json
 import logging
-from datetime import datetime
+import os
+import socket
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import datetime, timedelta
+from threading import Lock
 
 from abc import ABCMeta, abstractmethod
 from types import TracebackType
-from typing import Any, Dict, Optional, Tuple, Type
+from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Type
 from typing_extensions import Literal
 
+import numpy as np
+import scipy.stats
 from pytz import UTC
 
 from mlos_bench.environments.base_environment import Environment
+from mlos_bench.environments.status import Status
+from mlos_bench.event_loop_context import EventLoopContext, FutureReturnType
 from mlos_bench.optimizers.base_optimizer import Optimizer
+from mlos_bench.pruners.base_pruner import TrialPruner
 from mlos_bench.storage.base_storage import Storage
+from mlos_bench.storage.experiment_progress import ExperimentProgress
+from mlos_bench.tunables.tunable import TunableValue
 from mlos_bench.tunables.tunable_groups import TunableGroups
-from mlos_bench.util import merge_parameters
+from mlos_bench.util import instantiate_from_config, merge_parameters
 
 _LOG = logging.getLogger(__name__)
 
+TrialResult = Tuple[Status, datetime, Optional[Dict[str, TunableValue]], List[Tuple[datetime, str, Any]]]
+"""
+A tuple of (status, timestamp, results, telemetry) of a trial run.
+"""
+
 
 class Scheduler(metaclass=ABCMeta):
     # pylint: disable=too-many-instance-attributes
@@ -70,18 +89,86 @@ class Scheduler(metaclass=ABCMeta):
         self._max_trials = int(config.get("max_trials", -1))
         self._trial_count = 0
 
+        # Wall-clock (in seconds) and cost budgets of the experiment; -1 or 0 for unlimited.
+        # The cost is the total duration of the trials times the hourly `cost_per_hour` rate.
+        self._max_time = float(config.get("max_time", -1))
+        self._max_cost = float(config.get("max_cost", -1))
+        self._cost_per_hour = float(config.get("cost_per_hour", 1))
+        if self._cost_per_hour <= 0:
+            raise ValueError(f"Invalid cost_per_hour: {self._cost_per_hour}")
+        # Result of the last `._check_budget()` call.
+        self._is_within_budget = True
+
         self._trial_config_repeat_count = int(config.get("trial_config_repeat_count", 1))
         if self._trial_config_repeat_count <= 0:
             raise ValueError(f"Invalid trial_config_repeat_count: {self._trial_config_repeat_count}")
 
+        # In racing mode, run each config once and repeat it (up to `trial_config_repeat_count`
+        # times) only while the confidence interval of its mean overlaps the incumbent's.
+        self._racing = bool(config.get("racing", False))
+        self._racing_confidence = float(config.get("racing_confidence", 0.95))
+        if not 0 < self._racing_confidence < 1:
+            raise ValueError(f"Invalid racing_confidence: {self._racing_confidence}")
+
         self._do_teardown = bool(config.get("teardown", True))
 
+        # IDs of the other experiments to merge the compatible trials from (to warm up the optimizer).
+        self._merge_experiment_ids: List[str] = list(config.get("merge", []))
+
+        # Order to run the pending trials in: "fifo" (by trial ID) or "min_reconfig_cost"
+        # (run the trials that share the values of the costly tunable groups back to back).
+        self._trial_queue_order = str(config.get("trial_queue_order", "fifo"))
+        if self._trial_queue_order not in {"fifo", "min_reconfig_cost"}:
+            raise ValueError(f"Invalid trial_queue_order: {self._trial_queue_order}")
+
+        # Parameters for coordinating multiple schedulers (workers) through the shared storage.
+        self._worker_id = str(config.get("worker_id") or f"{socket.gethostname()}:{os.getpid()}")
+        self._trial_lease_timeout = timedelta(seconds=float(config.get("trial_lease_timeout", 600)))
+        if self._trial_lease_timeout <= timedelta(0):
+            raise ValueError(f"Invalid trial_lease_timeout: {self._trial_lease_timeout}")
+        self._worker_idle_timeout = float(config.get("worker_idle_timeout", 60))
+
+        # Number of optimizer suggestions to compute in the background while the trials run.
+        self._suggestion_lookahead = int(config.get("suggestion_lookahead", 0))
+        if self._suggestion_lookahead < 0:
+            raise ValueError(f"Invalid suggestion_lookahead: {self._suggestion_lookahead}")
+        # Number of optimizer suggestions to add to the queue at once.
+        self._suggestion_batch_size = int(config.get("suggestion_batch_size", 1))
+        if self._suggestion_batch_size <= 0:
+            raise ValueError(f"Invalid suggestion_batch_size: {self._suggestion_batch_size}")
+
+        # Optional rule to stop the unpromising trials early, and how often to check it.
+        self._pruner: Optional[TrialPruner] = None
+        if config.get("pruner"):
+            self._pruner = instantiate_from_config(
+                TrialPruner, config["pruner"]["class"], config["pruner"].get("config", {}))
+        self._pruning_interval = float(config.get("pruning_interval", 10))
+        if self._pruning_interval <= 0:
+            raise ValueError(f"Invalid pruning_interval: {self._pruning_interval}")
+
         self.experiment: Optional[Storage.Experiment] = None
         self.environment = environment
         self.optimizer = optimizer
         self.storage = storage
         self._root_env_config = root_env_config
         self._last_trial_id = -1
+        # IDs of trials above the `_last_trial_id` watermark that have already
+        # been registered with the optimizer (trials can complete out of order).
+        self._registered_trial_ids: Set[int] = set()
+
+        self._event_loop_context = EventLoopContext()
+        # Trial ID -> background heartbeat task for the trials claimed by this scheduler.
+        self._heartbeats: Dict[int, FutureReturnType] = {}
+
+        # Suggestions precomputed in the background, each with the number
+        # of results registered with the optimizer at the time it was made.
+        self._suggestions: Deque[Tuple[int, TunableGroups]] = deque()
+        self._suggestions_future: Optional[FutureReturnType] = None
+        self._num_registered = 0
+        # The root environment shares its tunables with the optimizer (see `Launcher`).
+        # Hold this lock while assigning to them (e.g., in `.setup()`) so that the
+        # suggestions computed in the background do not see a half-updated config.
+        self._tunables_lock = Lock()
 
         _LOG.debug("Scheduler instantiated: %s :: %s", self, config)
 
@@ -102,6 +189,7 @@ class Scheduler(metaclass=ABCMeta):
         """
         _LOG.debug("Scheduler START :: %s", self)
         assert self.experiment is None
+        self._event_loop_context.enter()
         self.environment.__enter__()
         self.optimizer.__enter__()
         # Start new or resume the existing experiment. Verify that the
@@ -116,6 +204,8 @@ class Scheduler(metaclass=ABCMeta):
             tunables=self.environment.tunable_params,
             opt_targets=self.optimizer.targets,
         ).__enter__()
+        if self._merge_experiment_ids:
+            self.experiment.merge(self._merge_experiment_ids)
         return self
 
     def __exit__(self,
@@ -131,9 +221,19 @@ class Scheduler(metaclass=ABCMeta):
             assert ex_type and ex_val
             _LOG.warning("Scheduler END :: %s", self, exc_info=(ex_type, ex_val, ex_tb))
         assert self.experiment is not None
+        try:
+            self._wait_for_suggestions()
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            _LOG.error("Exception while computing suggestions in background: %s", ex)
         self.experiment.__exit__(ex_type, ex_val, ex_tb)
         self.optimizer.__exit__(ex_type, ex_val, ex_tb)
         self.environment.__exit__(ex_type, ex_val, ex_tb)
+        for heartbeat in self._heartbeats.values():
+            heartbeat.cancel()
+        self._heartbeats = {}
+        # Let the event loop process the cancellations before stopping it.
+        self._event_loop_context.run_coroutine(asyncio.sleep(0)).result()
+        self._event_loop_context.exit()
         self.experiment = None
         return False  # Do not suppress exceptions
 
@@ -187,69 +287,477 @@ class Scheduler(metaclass=ABCMeta):
         into the optimizer, suggest new configurations, and add them to the queue.
         Return True if optimization is not over, False otherwise.
         """
+        new_trial_ids = self._register_new_results()
+        not_done = self.not_done()
+        # Racing repeats can run after the optimizer converges, but not past the limits.
+        num_repeats = self._race(new_trial_ids) if self._racing and self._is_within_budget else 0
+        if not_done:
+            self.schedule_trials(self._next_suggestions())
+            self._prefetch_suggestions()
+        # Run the new repeats even if there will be no new suggestions.
+        return not_done or num_repeats > 0
+
+    def _register_new_results(self) -> List[int]:
+        """
+        Load the results of the trials completed since the last call from the storage
+        and pass them to `._register_results()`. Return the IDs of the new trials.
+        """
         assert self.experiment is not None
+        self._wait_for_suggestions()
         (trial_ids, configs, scores, status) = self.experiment.load(self._last_trial_id)
-        _LOG.info("QUEUE: Update the optimizer with trial results: %s", trial_ids)
-        self.optimizer.bulk_register(configs, scores, status)
+        new_idx = [i for (i, trial_id) in enumerate(trial_ids) if trial_id not in self._registered_trial_ids]
+        _LOG.info("QUEUE: Update the optimizer with trial results: %s", [trial_ids[i] for i in new_idx])
+        self._register_results([trial_ids[i] for i in new_idx],
+                               [configs[i] for i in new_idx],
+                               [scores[i] for i in new_idx],
+                               [status[i] for i in new_idx])
+        self._registered_trial_ids.update(trial_ids)
+        self._num_registered += len(new_idx)
+        if self._pruner is not None:
+            self._pruner.update_history(
+                self.experiment, [trial_ids[i] for i in new_idx if status[i].is_succeeded()])
+        self._drop_stale_suggestions()
+
+        # Trials can complete out of order (e.g., when running in parallel or
+        # on several workers), so do not move the watermark past the oldest
+        # trial that has not completed yet.
         self._last_trial_id = max(trial_ids, default=self._last_trial_id)
+        pending_trial_ids = [
+            trial.trial_id for trial in self.experiment.pending_trials(
+                datetime.max.replace(tzinfo=UTC), running=True, limit=1)
+        ]
+        if pending_trial_ids:
+            self._last_trial_id = min(self._last_trial_id, pending_trial_ids[0] - 1)
+        self._registered_trial_ids = {
+            trial_id for trial_id in self._registered_trial_ids if trial_id > self._last_trial_id
+        }
+        return [trial_ids[i] for i in new_idx]
 
-        not_done = self.not_done()
-        if not_done:
-            tunables = self.optimizer.suggest()
-            self.schedule_trial(tunables)
+    def _register_results(self, trial_ids: Sequence[int],
+                          configs: Sequence[Dict[str, Any]],
+                          scores: Sequence[Optional[Dict[str, Any]]],
+                          status: Sequence[Status]) -> None:
+        """
+        Register the results of the newly completed trials with the optimizer.
+        """
+        _LOG.debug("Register the results of trials: %s", trial_ids)
+        self.optimizer.bulk_register(configs, scores, status)
 
-        return not_done
+    def _next_suggestions(self) -> List[TunableGroups]:
+        """
+        Get the next batch of (up to `suggestion_batch_size`) configurations to schedule.
+        Use the precomputed suggestions first, if any.
+        """
+        batch_size = self._suggestion_batch_size
+        if self._max_trials > 0:
+            # Do not queue up more trials than we are going to run.
+            repeat_count = 1 if self._racing else self._trial_config_repeat_count
+            batch_size = min(batch_size, max(1, (self._max_trials - self._trial_count) // repeat_count))
+        batch: List[TunableGroups] = []
+        while self._suggestions and len(batch) < batch_size:
+            batch.append(self._suggestions.popleft()[1])
+        if not batch or (len(batch) < batch_size and self.optimizer.not_converged()):
+            batch.extend(self.optimizer.suggest_batch(batch_size - len(batch)))
+        return batch
+
+    def _prefetch_suggestions(self) -> None:
+        """
+        Start computing the next `suggestion_lookahead` suggestions in the background
+        so that the optimizer does not hold up the next trial.
+        """
+        if self._suggestion_lookahead <= 0 or len(self._suggestions) >= self._suggestion_lookahead:
+            return
+        assert self._suggestions_future is None
+        self._suggestions_future = self._event_loop_context.run_coroutine(self._suggest_ahead())
+
+    async def _suggest_ahead(self) -> None:
+        """
+        Fill up the queue of the lookahead suggestions in a worker thread.
+        """
+        await asyncio.get_running_loop().run_in_executor(None, self._suggest_ahead_sync)
+
+    def _suggest_ahead_sync(self) -> None:
+        """
+        Fill up the queue of the lookahead suggestions.
+        The optimizer keeps them as pending so that it does not suggest them again.
+        """
+        num_missing = self._suggestion_lookahead - len(self._suggestions)
+        if num_missing <= 0 or not self.optimizer.not_converged():
+            return
+        with self._tunables_lock:
+            suggestions = self.optimizer.suggest_batch(num_missing)
+        for tunables in suggestions:
+            self._suggestions.append((self._num_registered, tunables))
+            _LOG.info("QUEUE: Lookahead suggestion %d/%d :: %s",
+                      len(self._suggestions), self._suggestion_lookahead, tunables)
+
+    def _wait_for_suggestions(self) -> None:
+        """
+        Wait for the background computation of the suggestions to finish.
+        The optimizer must not be used in the main thread before that.
+        """
+        if self._suggestions_future is not None:
+            (future, self._suggestions_future) = (self._suggestions_future, None)
+            future.result()
+
+    def _drop_stale_suggestions(self) -> None:
+        """
+        Drop the precomputed suggestions that do not account for too many
+        of the results registered with the optimizer since they were made.
+        """
+        # Up to a whole batch of trials completes while the suggestions are waiting in the queue.
+        max_new_results = ((self._suggestion_lookahead + self._suggestion_batch_size - 1)
+                           * self._trial_config_repeat_count)
+        while self._suggestions and self._num_registered - self._suggestions[0][0] > max_new_results:
+            (_num_registered, tunables) = self._suggestions.popleft()
+            _LOG.info("QUEUE: Drop stale lookahead suggestion :: %s", tunables)
+            # The optimizer must not keep the dropped suggestion as pending forever.
+            self.optimizer.unregister_pending(tunables)
 
     def schedule_trial(self, tunables: TunableGroups) -> None:
         """
         Add a configuration to the queue of trials.
         """
-        for repeat_i in range(1, self._trial_config_repeat_count + 1):
-            self._add_trial_to_queue(tunables, config={
-                # Add some additional metadata to track for the trial such as the
-                # optimizer config used.
-                # Note: these values are unfortunately mutable at the moment.
-                # Consider them as hints of what the config was the trial *started*.
-                # It is possible that the experiment configs were changed
-                # between resuming the experiment (since that is not currently
-                # prevented).
-                "optimizer": self.optimizer.name,
-                "repeat_i": repeat_i,
-                "is_defaults": tunables.is_defaults,
-                **{
-                    f"opt_{key}_{i}": val
-                    for (i, opt_target) in enumerate(self.optimizer.targets.items())
-                    for (key, val) in zip(["target", "direction"], opt_target)
-                }
-            })
-
-    def _add_trial_to_queue(self, tunables: TunableGroups,
-                            ts_start: Optional[datetime] = None,
-                            config: Optional[Dict[str, Any]] = None) -> None:
+        self.schedule_trials([tunables])
+
+    def schedule_trials(self, batch: Sequence[TunableGroups], *,
+                        trial_config: Optional[Dict[str, Any]] = None,
+                        repeat_count: Optional[int] = None) -> List[Storage.Trial]:
         """
-        Add a configuration to the queue of trials.
-        A wrapper for the `Experiment.new_trial` method.
+        Add a batch of configurations to the queue of trials.
+        All trials of the batch (including the repeats) are added in one go.
+
+        Parameters
+        ----------
+        batch : Sequence[TunableGroups]
+            Configurations to benchmark.
+        trial_config : Optional[Dict[str, Any]]
+            Additional parameters to store in the config of each new trial.
+        repeat_count : Optional[int]
+            Number of trials for each configuration. Default is `trial_config_repeat_count`
+            from the scheduler config, or 1 in racing mode.
+
+        Returns
+        -------
+        trials : List[Storage.Trial]
+            The new trials in the same order as the configurations.
         """
         assert self.experiment is not None
-        trial = self.experiment.new_trial(tunables, ts_start, config)
-        _LOG.info("QUEUE: Add new trial: %s", trial)
+        if repeat_count is None:
+            repeat_count = 1 if self._racing else self._trial_config_repeat_count
+        tunables_list: List[TunableGroups] = []
+        configs: List[Dict[str, Any]] = []
+        for tunables in batch:
+            for repeat_i in range(1, repeat_count + 1):
+                tunables_list.append(tunables)
+                configs.append({
+                    # Add some additional metadata to track for the trial such as the
+                    # optimizer config used.
+                    # Note: these values are unfortunately mutable at the moment.
+                    # Consider them as hints of what the config was the trial *started*.
+                    # It is possible that the experiment configs were changed
+                    # between resuming the experiment (since that is not currently
+                    # prevented).
+                    "optimizer": self.optimizer.name,
+                    "repeat_i": repeat_i,
+                    "is_defaults": tunables.is_defaults,
+                    **{
+                        f"opt_{key}_{i}": val
+                        for (i, opt_target) in enumerate(self.optimizer.targets.items())
+                        for (key, val) in zip(["target", "direction"], opt_target)
+                    },
+                    **(trial_config or {}),
+                })
+        trials = self.experiment.new_trials(tunables_list, configs=configs)
+        for trial in trials:
+            _LOG.info("QUEUE: Add new trial: %s", trial)
+        return trials
 
-    def _run_schedule(self, running: bool = False) -> None:
+    def _race(self, trial_ids: Sequence[int]) -> int:
         """
-        Scheduler part of the loop. Check for pending trials in the queue and run them.
+        Racing mode: decide which configurations of the just completed trials
+        need another repeat, and add these trials to the queue.
+
+        A configuration gets another repeat while the confidence interval of the mean
+        of its (first) optimization target overlaps that of the incumbent, i.e., of the
+        configuration with the best mean so far, and until it has been benchmarked
+        `trial_config_repeat_count` times. Configurations with just one result use the
+        pooled standard deviation of all configurations for their confidence interval.
+        No new trials are added once `max_trials` is reached. The caller must check
+        the time and cost budgets. Return the number of new trials.
         """
         assert self.experiment is not None
-        for trial in self.experiment.pending_trials(datetime.now(UTC), running=running):
-            self.run_trial(trial)
+        if not trial_ids or not (self._trial_count < self._max_trials or self._max_trials <= 0):
+            return 0
+        (opt_target, opt_dir) = next(iter(self.optimizer.targets.items()))
+        sign = 1 if opt_dir == "min" else -1
+        config_trials = self.experiment.load_config_trials(opt_target)
+        # Config ID -> values of the target in the succeeded trials (sign-adjusted for MINIMIZATION).
+        config_values = {
+            config_id: [
+                sign * float(value) for (status, value) in trials.values()
+                if status.is_succeeded() and value is not None
+            ]
+            for (config_id, trials) in config_trials.items()
+        }
+        config_values = {config_id: values for (config_id, values) in config_values.items() if values}
+        if not config_values:
+            return 0
+
+        pooled_std = self._pooled_std(list(config_values.values()))
+        incumbent_id = min(config_values, key=lambda config_id: float(np.mean(config_values[config_id])))
+        (incumbent_mean, incumbent_half_width) = self._confidence_interval(
+            config_values[incumbent_id], pooled_std)
+
+        new_trial_ids = set(trial_ids)
+        # Repeat number -> IDs of the configurations to run that repeat for.
+        repeats: Dict[int, List[int]] = {}
+        for (config_id, trials) in config_trials.items():
+            if new_trial_ids.isdisjoint(trials) or config_id not in config_values:
+                continue    # Not in the race anymore or all trials have failed.
+            if len(trials) >= self._trial_config_repeat_count or not all(
+                    status.is_completed() for (status, _value) in trials.values()):
+                continue    # Reached the max. number of repeats or waiting for them to complete.
+            (mean, half_width) = self._confidence_interval(config_values[config_id], pooled_std)
+            if config_id == incumbent_id or abs(mean - incumbent_mean) <= half_width + incumbent_half_width:
+                repeats.setdefault(len(trials) + 1, []).append(config_id)
+            else:
+                _LOG.info("QUEUE: Config %d is dominated by config %d :: %s mean: %s vs. %s",
+                          config_id, incumbent_id, opt_target, sign * mean, sign * incumbent_mean)
+
+        for (repeat_i, config_ids) in repeats.items():
+            _LOG.info("QUEUE: Repeat %d/%d for configs: %s", repeat_i, self._trial_config_repeat_count, config_ids)
+            self.schedule_trials(
+                [
+                    self.environment.tunable_params.copy().assign(
+                        self.experiment.load_tunable_config(config_id))
+                    for config_id in config_ids
+                ],
+                trial_config={"repeat_i": repeat_i},
+                repeat_count=1,
+            )
+        return sum(len(config_ids) for config_ids in repeats.values())
+
+    def _confidence_interval(self, values: List[float],
+                             pooled_std: Optional[Tuple[float, int]]) -> Tuple[float, float]:
+        """
+        Get the mean and the half-width of its confidence interval for the given sample.
+        Use the pooled standard deviation (with its degrees of freedom) for the
+        single-value samples. Half-width is +inf if the variance is unknown.
+        """
+        mean = float(np.mean(values))
+        if len(values) > 1:
+            (std, dof) = (float(np.std(values, ddof=1)), len(values) - 1)
+        elif pooled_std is not None:
+            (std, dof) = pooled_std
+        else:
+            return (mean, float("inf"))
+        t_value = float(scipy.stats.t.ppf((1 + self._racing_confidence) / 2, dof))
+        return (mean, t_value * std / np.sqrt(len(values)))
+
+    @staticmethod
+    def _pooled_std(samples: List[List[float]]) -> Optional[Tuple[float, int]]:
+        """
+        Estimate the standard deviation of the benchmark noise from all samples
+        with more than one value. Return it along with its degrees of freedom,
+        or None if there is not enough data.
+        """
+        dof = sum(len(values) - 1 for values in samples)
+        if dof <= 0:
+            return None
+        sum_sq = sum(float(np.var(values)) * len(values) for values in samples)
+        return (float(np.sqrt(sum_sq / dof)), dof)
+
+    def _trial_global_config(self, trial: Storage.Trial) -> Dict[str, Any]:
+        """
+        Get the global config to set up the environment for the given trial.
+        """
+        return trial.config(self.global_config)
+
+    def _run_schedule(self, running: bool = False) -> int:
+        """
+        Scheduler part of the loop. Check for pending trials in the queue,
+        claim, and run them. Return the number of trials claimed.
+        """
+        num_trials = 0
+        for trial in self._pending_trials(running):
+            if self._claim_trial(trial):
+                self.run_trial(trial)
+                num_trials += 1
+        return num_trials
+
+    def _pending_trials(self, running: bool, limit: Optional[int] = None) -> Iterable[Storage.Trial]:
+        """
+        Get (at most `limit` of) the pending trials from the storage in the order they should run.
+        """
+        assert self.experiment is not None
+        trials = self.experiment.pending_trials(datetime.now(UTC), running=running, limit=limit)
+        if self._trial_queue_order == "min_reconfig_cost":
+            return self._order_by_reconfiguration_cost(list(trials), self.environment.tunable_params)
+        return trials
+
+    @staticmethod
+    def _order_by_reconfiguration_cost(trials: List[Storage.Trial],
+                                       tunables: TunableGroups) -> List[Storage.Trial]:
+        """
+        Reorder the trials to minimize the total cost of reconfiguring the environment
+        between them, starting from its current `tunables` values. Use a greedy
+        nearest neighbor heuristic: always run next the trial that is the cheapest to
+        switch to. Ties (e.g., repeats of the same config) keep the original order.
+        """
+        ordered: List[Storage.Trial] = []
+        total_cost = 0
+        current = tunables
+        while trials:
+            costs = [current.get_reconfiguration_cost(trial.tunables) for trial in trials]
+            next_idx = int(np.argmin(costs))
+            total_cost += costs[next_idx]
+            ordered.append(trials.pop(next_idx))
+            current = ordered[-1].tunables
+        _LOG.info("QUEUE: Run order: %s :: reconfiguration cost: %d",
+                  [trial.trial_id for trial in ordered], total_cost)
+        return ordered
+
+    def _claim_trial(self, trial: Storage.Trial) -> bool:
+        """
+        Claim the trial for this scheduler so that no other worker runs it,
+        and keep extending the lease in the background while the trial runs.
+        """
+        assert self.experiment is not None
+        if not self.experiment.claim_trial(trial, worker_id=self._worker_id,
+                                           timestamp=datetime.now(UTC),
+                                           lease_timeout=self._trial_lease_timeout):
+            return False
+        self._heartbeats = {
+            trial_id: heartbeat for (trial_id, heartbeat) in self._heartbeats.items()
+            if not heartbeat.done()
+        }
+        self._heartbeats[trial.trial_id] = self._event_loop_context.run_coroutine(
+            self._heartbeat(trial))
+        return True
+
+    async def _heartbeat(self, trial: Storage.Trial) -> None:
+        """
+        Periodically extend the lease on the trial until it completes.
+        """
+        interval = self._trial_lease_timeout.total_seconds() / 3
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if not await loop.run_in_executor(None, trial.heartbeat, datetime.now(UTC)):
+                    return
+            except Exception as ex:  # pylint: disable=broad-exception-caught
+                _LOG.warning("Trial %s :: heartbeat failed: %s", trial, ex)
+                return
+
+    def run_worker(self) -> None:
+        """
+        Worker mode: claim the pending trials of the experiment from the shared
+        storage and run them, without consulting the optimizer. Stop after no
+        new trials have been available for `worker_idle_timeout` seconds.
+        """
+        assert self.experiment is not None
+        _LOG.info("START WORKER: %s Experiment: %s Env: %s",
+                  self._worker_id, self.experiment, self.environment)
+        idle_since = time.monotonic()
+        while self._trial_count < self._max_trials or self._max_trials <= 0:
+            # Include the running trials to pick up the ones with expired leases.
+            if self._run_schedule(running=True) > 0:
+                idle_since = time.monotonic()
+                continue
+            idle_time = time.monotonic() - idle_since
+            if idle_time >= self._worker_idle_timeout:
+                _LOG.info("Worker %s :: no pending trials for %.1f sec", self._worker_id, idle_time)
+                break
+            time.sleep(min(1.0, self._worker_idle_timeout - idle_time))
 
     def not_done(self) -> bool:
         """
         Check the stopping conditions.
-        By default, stop when the optimizer converges or max limit of trials reached.
+        By default, stop when the optimizer converges (and there are no precomputed
+        suggestions left), max limit of trials reached, or the time or cost budget
+        of the experiment is exhausted.
         """
-        return self.optimizer.not_converged() and (
+        is_within_budget = self._check_budget()
+        return (self.optimizer.not_converged() or bool(self._suggestions)) and (
             self._trial_count < self._max_trials or self._max_trials <= 0
-        )
+        ) and is_within_budget
+
+    def _check_budget(self) -> bool:
+        """
+        Log the progress of the experiment and the ETA, and check whether the
+        time and cost budgets allow running more trials.
+        """
+        assert self.experiment is not None
+        progress = self.experiment.progress()
+        cost = progress.benchmark_time.total_seconds() / 3600 * self._cost_per_hour
+        _LOG.info("PROGRESS: %s :: cost: %.2f ETA: %s", progress, cost, self._estimate_time_left(progress, cost))
+        self._is_within_budget = True
+        if 0 < self._max_time <= progress.wall_time.total_seconds():
+            _LOG.info("Time budget exhausted: %s >= %s sec.", progress.wall_time, self._max_time)
+            self._is_within_budget = False
+        elif 0 < self._max_cost <= cost:
+            _LOG.info("Cost budget exhausted: %.2f >= %.2f", cost, self._max_cost)
+            self._is_within_budget = False
+        return self._is_within_budget
+
+    def _estimate_time_left(self, progress: ExperimentProgress, cost: float) -> Optional[timedelta]:
+        """
+        Estimate the wall time until the first of the `max_trials`, time,
+        or cost limits is reached. Return None if there are no limits
+        or not enough data to estimate the throughput yet.
+        """
+        etas: List[Optional[timedelta]] = []
+        if self._max_trials > 0:
+            etas.append(progress.time_to_complete(self._max_trials - self._trial_count))
+        if self._max_time > 0:
+            etas.append(max(timedelta(0), timedelta(seconds=self._max_time) - progress.wall_time))
+        if self._max_cost > 0 and cost > 0:
+            # Cost grows with the benchmark time, which can be faster than the wall time.
+            wall_hours = progress.wall_time.total_seconds() / 3600
+            etas.append(timedelta(hours=max(0.0, self._max_cost - cost) * wall_hours / cost))
+        known_etas = [eta for eta in etas if eta is not None]
+        return min(known_etas) if known_etas else None
+
+    def _run_environment(self, env: Environment) -> TrialResult:
+        """
+        Run the benchmark in the (already set up) environment and get its telemetry.
+
+        If the pruner is configured, run the benchmark in a separate thread and
+        poll the environment for the telemetry every `pruning_interval` seconds.
+        Cancel the benchmark as soon as the pruner finds it unpromising and
+        return PRUNED status with the latest telemetry values as partial results.
+        Does not touch the storage, so can be called from any thread.
+        """
+        if self._pruner is None:
+            (status, timestamp, results) = env.run()  # Block and wait for the final result.
+            (_status, _timestamp, telemetry) = env.status()
+            return (status, timestamp, results, telemetry)
+
+        is_pruned = False
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="trial_run") as executor:
+            run_future = executor.submit(env.run)
+            while True:
+                try:
+                    (status, timestamp, results) = run_future.result(timeout=self._pruning_interval)
+                    break
+                except FutureTimeoutError:
+                    pass
+                if is_pruned:
+                    continue  # Wait for the canceled benchmark to stop.
+                (_status, _timestamp, telemetry) = env.status()
+                if self._pruner.should_prune(telemetry):
+                    # Retry at the next check if the environment cannot stop right now.
+                    is_pruned = env.cancel()
+
+        (_status, _timestamp, telemetry) = env.status()
+        if is_pruned and not status.is_succeeded():
+            # Use the latest value of each metric as the partial results.
+            results = {metric: value for (_ts, metric, value) in sorted(telemetry, key=lambda t: t[0])}
+            _LOG.info("Trial pruned: %s :: %s", env, results)
+            return (Status.PRUNED, timestamp, results, telemetry)
+        return (status, timestamp, results, telemetry)
 
     @abstractmethod
     def run_trial(self, trial: Storage.Trial) -> None:
@@ -0,0 +1,281 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+A multi-fidelity optimization loop that runs many configurations at a low
+budget and promotes only the most promising ones to the higher budgets
+(successive halving with Hyperband brackets).
+"""
+
+import logging
+import math
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from mlos_bench.environments.base_environment import Environment
+from mlos_bench.environments.status import Status
+from mlos_bench.optimizers.base_optimizer import Optimizer
+from mlos_bench.schedulers.sync_scheduler import SyncScheduler
+from mlos_bench.storage.base_storage import Storage
+from mlos_bench.tunables.tunable_groups import TunableGroups
+from mlos_bench.util import try_parse_val
+
+_LOG = logging.getLogger(__name__)
+
+
+class HyperbandScheduler(SyncScheduler):
+    # pylint: disable=too-many-instance-attributes
+    """
+    A synchronous multi-fidelity optimization loop (Hyperband).
+
+    Each bracket of Hyperband starts with a batch of optimizer suggestions
+    benchmarked at a low budget, then repeatedly keeps only the top `1/eta`
+    fraction of the configurations and benchmarks them again at an `eta` times
+    larger budget, until the `max_budget` is reached. The brackets differ in
+    the starting budget and cycle until the optimization is over.
+
+    The budget is passed to the environments through the `budget_param`
+    parameter of the trial config, so it can be used in the `const_args` of
+    the environment, e.g., as the duration of the benchmark. Lower budgets also
+    run fewer repeats of each configuration. Only the results obtained at the
+    `max_budget` are registered with the optimizer, so the best observation is
+    always the best *full-budget* result. The optimizer forgets the pending
+    configurations eliminated at the lower budgets.
+    """
+
+    def __init__(self, *,
+                 config: Dict[str, Any],
+                 global_config: Dict[str, Any],
+                 environment: Environment,
+                 optimizer: Optimizer,
+                 storage: Storage,
+                 root_env_config: str):
+        """
+        Create a new instance of the Hyperband scheduler.
+
+        Parameters
+        ----------
+        config : dict
+            The configuration for the scheduler.
+            In addition to the base scheduler parameters, it must have the
+            `min_budget` and `max_budget` values, and can have `eta` (the
+            reduction factor between the rungs, default 3) and `budget_param`
+            (the name of the parameter to pass the budget to the environment,
+            default "budget"). The `racing`, `suggestion_lookahead`, and
+            `suggestion_batch_size` options of the base scheduler are not supported.
+        global_config : dict
+            The global configuration for the experiment.
+        environment : Environment
+            The environment to benchmark/optimize.
+        optimizer : Optimizer
+            The optimizer to use.
+        storage : Storage
+            The storage to use.
+        root_env_config : str
+            Path to the root environment configuration.
+        """
+        super().__init__(config=config, global_config=global_config,
+                         environment=environment, optimizer=optimizer,
+                         storage=storage, root_env_config=root_env_config)
+        # Hyperband picks the configurations to (re)run at each budget by itself.
+        if self._racing or self._suggestion_lookahead > 0 or self._suggestion_batch_size != 1:
+            raise ValueError(f"{self.__class__.__name__} does not support racing, suggestion_lookahead, " +
+                             "or suggestion_batch_size")
+        if "min_budget" not in config or "max_budget" not in config:
+            raise ValueError("Both min_budget and max_budget must be specified")
+        self._min_budget = float(config["min_budget"])
+        self._max_budget = float(config["max_budget"])
+        if not 0 < self._min_budget <= self._max_budget:
+            raise ValueError(f"Invalid budget range: [{self._min_budget}, {self._max_budget}]")
+        # Keep the budgets integer (e.g., duration in seconds) if the limits are.
+        self._is_int_budget = isinstance(config["min_budget"], int) and isinstance(config["max_budget"], int)
+        self._eta = float(config.get("eta", 3))
+        if self._eta <= 1:
+            raise ValueError(f"Invalid eta: {self._eta}")
+        self._budget_param = str(config.get("budget_param", "budget"))
+
+        # Number of the successive halving brackets, i.e., number of rungs in the longest one.
+        self._num_brackets = int(math.log(self._max_budget / self._min_budget) / math.log(self._eta) + 1e-9) + 1
+        self._brackets = self._iter_brackets()
+
+        # The remaining rungs of the current bracket as (num. configs, budget) pairs.
+        self._next_rungs: List[Tuple[int, float]] = []
+        # Current rung: its budget, the configurations, and their results
+        # (sign-adjusted for MINIMIZATION).
+        self._rung_budget: Union[int, float] = self._max_budget
+        self._rung_configs: List[TunableGroups] = []
+        self._rung_scores: List[List[float]] = []
+        # Trial ID -> index of the configuration in the current rung.
+        self._rung_trials: Dict[int, int] = {}
+
+    def __repr__(self) -> str:
+        return (f"{self.__class__.__name__}(budget=[{self._min_budget}, {self._max_budget}], " +
+                f"eta={self._eta})")
+
+    @property
+    def budget_param(self) -> str:
+        """
+        The name of the parameter to pass the budget to the environment.
+        """
+        return self._budget_param
+
+    def _iter_brackets(self) -> Iterator[List[Tuple[int, float]]]:
+        """
+        Cycle through the Hyperband brackets, from the most aggressive one
+        (lowest starting budget) to plain full-budget runs.
+        Yield the (num. configs, budget) pairs for each rung of the bracket.
+        """
+        while True:
+            for bracket in reversed(range(self._num_brackets)):
+                num_configs = math.ceil(self._num_brackets / (bracket + 1) * self._eta ** bracket)
+                yield [
+                    (max(1, int(num_configs * self._eta ** (-i) + 1e-9)),
+                     self._max_budget * self._eta ** (i - bracket))
+                    for i in range(bracket + 1)
+                ]
+
+    def _budget_value(self, budget: float) -> Union[int, float]:
+        """
+        Clip the budget to the [min_budget, max_budget] range and round it, if necessary.
+        """
+        budget = min(max(budget, self._min_budget), self._max_budget)
+        return int(round(budget)) if self._is_int_budget else budget
+
+    def _repeat_count(self, budget: float) -> int:
+        """
+        Number of repeats of each configuration at the given budget.
+        """
+        return max(1, math.ceil(self._trial_config_repeat_count * budget / self._max_budget - 1e-9))
+
+    def _trial_global_config(self, trial: Storage.Trial) -> Dict[str, Any]:
+        # The budget of the trial takes precedence over the global value.
+        # Trial configs loaded from the storage have all values as strings.
+        config = super()._trial_global_config(trial)
+        budget = trial.config().get(self._budget_param)
+        if budget is not None:
+            config[self._budget_param] = try_parse_val(budget) if isinstance(budget, str) else budget
+        return config
+
+    def not_done(self) -> bool:
+        """
+        Check the stopping conditions. Do not stop in the middle of a bracket
+        unless the max. limit of trials is reached or the budget is exhausted.
+        """
+        is_within_budget = self._check_budget()
+        return (self.optimizer.not_converged() or bool(self._next_rungs)) and (
+            self._trial_count < self._max_trials or self._max_trials <= 0
+        ) and is_within_budget
+
+    def _register_results(self, trial_ids: Sequence[int],
+                          configs: Sequence[Dict[str, Any]],
+                          scores: Sequence[Optional[Dict[str, Any]]],
+                          status: Sequence[Status]) -> None:
+        """
+        Record the results of the trials of the current rung, and register
+        the full-budget results (including the ones from outside of the
+        brackets, e.g., from the previous runs) with the optimizer.
+        """
+        full_budget_idx = []
+        for (i, trial_id) in enumerate(trial_ids):
+            config_idx = self._rung_trials.pop(trial_id, None)
+            if config_idx is not None:
+                self._rung_scores[config_idx].append(self._rank_score(status[i], scores[i]))
+                if self._rung_budget < self._max_budget:
+                    continue
+            full_budget_idx.append(i)
+        super()._register_results([trial_ids[i] for i in full_budget_idx],
+                                  [configs[i] for i in full_budget_idx],
+                                  [scores[i] for i in full_budget_idx],
+                                  [status[i] for i in full_budget_idx])
+
+    def _rank_score(self, status: Status, score: Optional[Dict[str, Any]]) -> float:
+        """
+        Get the value to rank the configurations in the rung by, i.e., the first
+        optimization target adjusted for MINIMIZATION. +inf for the failed trials.
+        """
+        (opt_target, opt_dir) = next(iter(self.optimizer.targets.items()))
+        if not status.is_succeeded() or score is None or score.get(opt_target) is None:
+            return float("inf")
+        return float(score[opt_target]) * (1 if opt_dir == "min" else -1)
+
+    def _schedule_new_optimizer_suggestions(self) -> bool:
+        """
+        Optimizer part of the loop. Once all trials of the current rung complete,
+        promote the best configurations to the next rung with a larger budget,
+        or start a new bracket with the new optimizer suggestions.
+        Return True if optimization is not over, False otherwise.
+        """
+        self._register_new_results()
+        if self._rung_trials:
+            _LOG.info("QUEUE: Waiting for %d trials of the rung", len(self._rung_trials))
+            return True
+        not_done = self.not_done()
+        if not not_done:
+            return False
+        if self._next_rungs:
+            self._promote()
+        else:
+            self._start_bracket()
+        return bool(self._rung_configs)
+
+    def _start_bracket(self) -> None:
+        """
+        Start the next Hyperband bracket with a new batch of optimizer suggestions.
+        """
+        self._next_rungs = next(self._brackets)
+        (num_configs, budget) = self._next_rungs.pop(0)
+        configs: List[TunableGroups] = []
+        while len(configs) < num_configs and self.optimizer.not_converged():
+            configs.extend(self.optimizer.suggest_batch(num_configs - len(configs)))
+        _LOG.info("QUEUE: Start a new bracket with %d configs :: next rungs: %s",
+                  len(configs), self._next_rungs)
+        self._schedule_rung(configs, budget)
+
+    def _promote(self) -> None:
+        """
+        Promote the best configurations of the current rung to the next one.
+        """
+        (num_configs, budget) = self._next_rungs.pop(0)
+        mean_scores = [np.mean(rung_scores) if rung_scores else float("inf")
+                       for rung_scores in self._rung_scores]
+        best_idx = [i for i in np.argsort(mean_scores, kind="stable")[:num_configs]
+                    if np.isfinite(mean_scores[i])]
+        self._release_configs([config for (i, config) in enumerate(self._rung_configs) if i not in best_idx])
+        if not best_idx:
+            _LOG.warning("QUEUE: No successful trials in the rung; end the bracket")
+            self._next_rungs = []
+            self._start_bracket()
+            return
+        _LOG.info("QUEUE: Promote %d of %d configs :: scores: %s",
+                  len(best_idx), len(mean_scores), [mean_scores[i] for i in best_idx])
+        self._schedule_rung([self._rung_configs[i] for i in best_idx], budget)
+
+    def _release_configs(self, configs: List[TunableGroups]) -> None:
+        """
+        Let the optimizer forget the configurations eliminated before the `max_budget`.
+        Their results are never registered, so they must not stay pending forever.
+        """
+        for tunables in configs:
+            _LOG.debug("QUEUE: Eliminate config :: %s", tunables)
+            self.optimizer.unregister_pending(tunables)
+
+    def _schedule_rung(self, configs: List[TunableGroups], budget: float) -> None:
+        """
+        Add the trials for all configurations of the new rung to the queue.
+        """
+        self._rung_budget = self._budget_value(budget)
+        self._rung_configs = configs
+        self._rung_scores = [[] for _ in configs]
+        self._rung_trials = {}
+        if not configs:
+            self._next_rungs = []
+            return
+        repeat_count = self._repeat_count(self._rung_budget)
+        trials = self.schedule_trials(configs, trial_config={self._budget_param: self._rung_budget},
+                                      repeat_count=repeat_count)
+        for (i, trial) in enumerate(trials):
+            self._rung_trials[trial.trial_id] = i // repeat_count
+        _LOG.info("QUEUE: New rung :: %d configs x %d repeats at budget %s = %s",
+                  len(configs), repeat_count, self._budget_param, self._rung_budget)
@@ -0,0 +1,278 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+A multi-threaded optimization loop implementation that keeps several
+trial runners busy at the same time.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from types import TracebackType
+from typing import Any, Dict, List, Optional, Tuple, Type
+from typing_extensions import Literal
+
+from pytz import UTC
+
+from mlos_bench.environments.base_environment import Environment
+from mlos_bench.environments.status import Status
+from mlos_bench.event_loop_context import FutureReturnType
+from mlos_bench.optimizers.base_optimizer import Optimizer
+from mlos_bench.schedulers.base_scheduler import Scheduler, TrialResult
+from mlos_bench.storage.base_storage import Storage
+from mlos_bench.tunables.tunable_groups import TunableGroups
+
+_LOG = logging.getLogger(__name__)
+
+
+class ParallelScheduler(Scheduler):
+    # pylint: disable=too-many-instance-attributes
+    """
+    A multi-threaded optimization loop implementation.
+
+    Each trial runner has its own copy of the Environment tree and executes
+    the (blocking) `.setup()`, `.run()`, and `.status()` calls in a separate
+    worker thread. The worker threads are orchestrated from the background
+    asyncio event loop of the `EventLoopContext`, while all updates to the
+    storage and the optimizer happen in the main thread.
+    """
+
+    def __init__(self, *,
+                 config: Dict[str, Any],
+                 global_config: Dict[str, Any],
+                 environment: Environment,
+                 optimizer: Optimizer,
+                 storage: Storage,
+                 root_env_config: str):
+        """
+        Create a new instance of the parallel scheduler.
+
+        Parameters
+        ----------
+        config : dict
+            The configuration for the scheduler.
+            In addition to the base scheduler parameters, it can have
+            `num_trial_runners` to specify the number of trials to run concurrently.
+        global_config : dict
+            The global configuration for the experiment.
+        environment : Environment
+            The environment to benchmark/optimize.
+        optimizer : Optimizer
+            The optimizer to use.
+        storage : Storage
+            The storage to use.
+        root_env_config : str
+            Path to the root environment configuration.
+        """
+        super().__init__(config=config, global_config=global_config,
+                         environment=environment, optimizer=optimizer,
+                         storage=storage, root_env_config=root_env_config)
+        self._num_trial_runners = int(config.get("num_trial_runners", 1))
+        if self._num_trial_runners <= 0:
+            raise ValueError(f"Invalid num_trial_runners: {self._num_trial_runners}")
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Environment trees for each trial runner. The root `self.environment` (and its tunables,
+        # shared with the optimizer) is only used in the main thread and never runs the trials.
+        self._trial_runners: List[Environment] = []
+        self._idle_runners: List[Environment] = []
+        # Trial ID -> (trial, runner, future) for the trials currently in flight.
+        self._running_trials: Dict[int, Tuple[Storage.Trial, Environment, FutureReturnType]] = {}
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(num_trial_runners={self._num_trial_runners})"
+
+    @property
+    def num_trial_runners(self) -> int:
+        """
+        The number of trials to run concurrently.
+        """
+        return self._num_trial_runners
+
+    def __enter__(self) -> 'ParallelScheduler':
+        """
+        Enter the scheduler's context and start the trial runners.
+        """
+        super().__enter__()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._num_trial_runners, thread_name_prefix="trial_runner")
+        self._trial_runners = [
+            self._clone_environment().__enter__() for _ in range(self._num_trial_runners)
+        ]
+        self._idle_runners = list(reversed(self._trial_runners))
+        return self
+
+    def __exit__(self,
+                 ex_type: Optional[Type[BaseException]],
+                 ex_val: Optional[BaseException],
+                 ex_tb: Optional[TracebackType]) -> Literal[False]:
+        """
+        Wait for the trial runners to finish and exit the context of the scheduler.
+        """
+        assert self._executor is not None
+        self._executor.shutdown(wait=True)
+        self._executor = None
+        for env in self._trial_runners:
+            env.__exit__(ex_type, ex_val, ex_tb)
+        self._trial_runners = []
+        self._idle_runners = []
+        self._running_trials = {}
+        return super().__exit__(ex_type, ex_val, ex_tb)
+
+    def _clone_environment(self) -> Environment:
+        """
+        Create a new instance of the root environment for a trial runner.
+        The new environment tree has its own copy of the tunables.
+        """
+        # pylint: disable=protected-access
+        if self.environment._service is not None:
+            return self.environment._config_loader_service.load_environment(
+                self._root_env_config, TunableGroups(), self.global_config,
+                service=self.environment._service)
+        # No config loader available: rebuild the (standalone) root environment from its config.
+        return Environment.new(
+            env_name=self.environment.name,
+            class_name=self.environment.__class__.__module__ + "." + self.environment.__class__.__name__,
+            config=self.environment.config,
+            global_config=self.global_config,
+            tunables=self.environment.tunable_params.copy(),
+        )
+
+    def start(self) -> None:
+        """
+        Start the optimization loop.
+        """
+        super().start()
+
+        is_warm_up = self.optimizer.supports_preload
+        if not is_warm_up:
+            _LOG.warning("Skip pending trials and warm-up: %s", self.optimizer)
+
+        not_done = True
+        while not_done:
+            _LOG.info("Optimization loop: Last trial ID: %d", self._last_trial_id)
+            self._run_schedule(is_warm_up)
+            not_done = self._schedule_new_optimizer_suggestions()
+            is_warm_up = False
+
+        # Wait for the trials still in flight and register their results.
+        self._collect_trial_results(wait_all=True)
+        self._schedule_new_optimizer_suggestions()
+
+    def teardown(self) -> None:
+        """
+        Tear down the environments of all trial runners.
+        """
+        assert self.experiment is not None
+        if self._do_teardown:
+            for env in self._trial_runners:
+                env.teardown()
+
+    def run_worker(self) -> None:
+        """
+        Worker mode: claim and run the pending trials and wait for them to complete.
+        """
+        super().run_worker()
+        self._collect_trial_results(wait_all=True)
+
+    def _run_schedule(self, running: bool = False) -> int:
+        """
+        Scheduler part of the loop. Claim the pending trials and dispatch them
+        to the trial runners. Return the number of trials claimed.
+        """
+        self._collect_trial_results()
+        num_trials = 0
+        for trial in self._pending_trials(running):
+            if trial.trial_id not in self._running_trials and self._claim_trial(trial):
+                self.run_trial(trial)
+                num_trials += 1
+        return num_trials
+
+    def _schedule_new_optimizer_suggestions(self) -> bool:
+        """
+        Optimizer part of the loop. Save the results of the completed trials,
+        then register them with the optimizer and suggest new configurations.
+        Return True if optimization is not over, False otherwise.
+        """
+        self._collect_trial_results()
+        return super()._schedule_new_optimizer_suggestions()
+
+    def run_trial(self, trial: Storage.Trial) -> None:
+        """
+        Dispatch a single (claimed) trial to the next available trial runner.
+        Block until one of the runners becomes available, if necessary.
+        The results are saved in the storage once the trial completes.
+        """
+        super().run_trial(trial)
+        while not self._idle_runners:
+            self._collect_trial_results(wait_any=True)
+
+        env = self._idle_runners.pop()
+        future = self._event_loop_context.run_coroutine(
+            self._run_trial_async(env, trial.tunables, self._trial_global_config(trial)))
+        self._running_trials[trial.trial_id] = (trial, env, future)
+        _LOG.info("QUEUE: Dispatched trial: %s to runner %s", trial, env)
+
+    async def _run_trial_async(self, env: Environment, tunables: TunableGroups,
+                               global_config: Dict[str, Any]) -> TrialResult:
+        """
+        Run the trial in one of the worker threads without blocking the event loop.
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, self._run_trial_sync, env, tunables, global_config)
+
+    def _run_trial_sync(self, env: Environment, tunables: TunableGroups,
+                        global_config: Dict[str, Any]) -> TrialResult:
+        """
+        Set up and run a single trial in the given environment.
+        Executes in the trial runner thread; does not touch the storage.
+        """
+        if not env.setup(tunables, global_config):
+            _LOG.warning("Setup failed: %s :: %s", env, tunables)
+            # FIXME: Use the actual timestamp from the environment.
+            return (Status.FAILED, datetime.now(UTC), None, [])
+
+        # Block and wait for the final result (or until the pruner stops the trial).
+        (status, timestamp, results, telemetry) = self._run_environment(env)
+        _LOG.info("Results: %s :: %s\n%s", tunables, status, results)
+        return (status, timestamp, results, telemetry)
+
+    def _collect_trial_results(self, *, wait_any: bool = False, wait_all: bool = False) -> None:
+        """
+        Save the results of the completed trials in the storage
+        and return their trial runners to the pool.
+
+        Parameters
+        ----------
+        wait_any : bool
+            If True, block until at least one of the running trials completes.
+        wait_all : bool
+            If True, block until all running trials complete.
+        """
+        if not self._running_trials:
+            return
+        futures = [future for (_trial, _env, future) in self._running_trials.values()]
+        if wait_all:
+            wait(futures)
+        elif wait_any:
+            wait(futures, return_when=FIRST_COMPLETED)
+
+        for (trial_id, (trial, env, future)) in list(self._running_trials.items()):
+            if not future.done():
+                continue
+            del self._running_trials[trial_id]
+            self._idle_runners.append(env)
+            try:
+                (status, timestamp, results, telemetry) = future.result()
+            except Exception as ex:  # pylint: disable=broad-exception-caught
+                # Do not let one broken trial runner lose the results of the other trials.
+                _LOG.error("QUEUE: Trial %s failed on runner %s", trial, env, exc_info=ex)
+                trial.update(Status.FAILED, datetime.now(UTC))
+                continue
+            # Use the status and timestamp from `.run()` as it is the final status of the experiment.
+            trial.update_telemetry(status, timestamp, telemetry)
+            trial.update(status, timestamp, results)
+            _LOG.info("QUEUE: Update trial results: %s :: %s %s", trial, status, results)
@@ -46,19 +46,20 @@ class SyncScheduler(Scheduler):
         """
         super().run_trial(trial)
 
-        if not self.environment.setup(trial.tunables, trial.config(self.global_config)):
+        with self._tunables_lock:
+            is_ready = self.environment.setup(trial.tunables, self._trial_global_config(trial))
+        if not is_ready:
             _LOG.warning("Setup failed: %s :: %s", self.environment, trial.tunables)
             # FIXME: Use the actual timestamp from the environment.
             _LOG.info("QUEUE: Update trial results: %s :: %s", trial, Status.FAILED)
             trial.update(Status.FAILED, datetime.now(UTC))
             return
 
-        (status, timestamp, results) = self.environment.run()  # Block and wait for the final result.
+        # Block and wait for the final result (or until the pruner stops the trial).
+        (status, timestamp, results, telemetry) = self._run_environment(self.environment)
         _LOG.info("Results: %s :: %s\n%s", trial.tunables, status, results)
 
-        # In async mode (TODO), poll the environment for status and telemetry
-        # and update the storage with the intermediate results.
-        (_status, _timestamp, telemetry) = self.environment.status()
+        # In async mode (TODO), update the storage with the intermediate results.
 
         # Use the status and timestamp from `.run()` as it is the final status of the experiment.
         # TODO: Use the `.status()` output in async mode.
@@ -10,8 +10,10 @@ import errno
 import logging
 import os
 import shlex
+import signal
 import subprocess
 import sys
+import threading
 
 from string import Template
 from typing import (
@@ -93,9 +95,12 @@ class LocalExecService(TempDirContextService, SupportsLocalExec):
         """
         super().__init__(
             config, global_config, parent,
-            self.merge_methods(methods, [self.local_exec])
+            self.merge_methods(methods, [self.local_exec, self.local_exec_cancel])
         )
         self.abort_on_error = self.config.get("abort_on_error", True)
+        # Work directory -> the process currently running there (for cancellation).
+        self._running_procs: Dict[str, subprocess.Popen] = {}
+        self._running_procs_lock = threading.Lock()
 
     def local_exec(self, script_lines: Iterable[str],
                    env: Optional[Mapping[str, "TunableValue"]] = None,
@@ -139,6 +144,36 @@ class LocalExecService(TempDirContextService, SupportsLocalExec):
 
         return (return_code, stdout, stderr)
 
+    def local_exec_cancel(self, cwd: str) -> bool:
+        """
+        Terminate the local process that runs the script in the given work directory.
+        With `abort_on_error` set, the rest of the script will not run either.
+
+        Parameters
+        ----------
+        cwd : str
+            Work directory of the script, as passed to `.local_exec()`.
+
+        Returns
+        -------
+        is_canceled : bool
+            True if the running process has been terminated, False if there was none.
+        """
+        with self._running_procs_lock:
+            proc = self._running_procs.get(cwd)
+        if proc is None:
+            return False
+        _LOG.info("Terminate process %d at: %s", proc.pid, cwd)
+        try:
+            if sys.platform == 'win32':
+                proc.terminate()
+            else:
+                os.killpg(proc.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            _LOG.debug("Process %d has already exited", proc.pid)
+            return False
+        return True
+
     def _resolve_cmdline_script_path(self, subcmd_tokens: List[str]) -> List[str]:
         """
         Resolves local script path (first token) in the (sub)command line
@@ -214,11 +249,21 @@ class LocalExecService(TempDirContextService, SupportsLocalExec):
                 _LOG.debug("Expands to: %s", Template(" ".join(cmd)).safe_substitute(env))
                 _LOG.debug("Current working dir: %s", cwd)
 
-            proc = subprocess.run(cmd, env=env or None, cwd=cwd, shell=True,
-                                  text=True, check=False, capture_output=True)
+            # Run the shell in its own process group, so `.local_exec_cancel()` can stop
+            # the whole pipeline and not just the shell itself.
+            with subprocess.Popen(cmd, env=env or None, cwd=cwd, shell=True, text=True,
+                                  start_new_session=(sys.platform != 'win32'),
+                                  stdout=subprocess.PIPE, stderr=subprocess.PIPE) as proc:
+                with self._running_procs_lock:
+                    self._running_procs[cwd] = proc
+                try:
+                    (stdout, stderr) = proc.communicate()
+                finally:
+                    with self._running_procs_lock:
+                        del self._running_procs[cwd]
 
             _LOG.debug("Run: return code = %d", proc.returncode)
-            return (proc.returncode, proc.stdout, proc.stderr)
+            return (proc.returncode, stdout, stderr)
 
         except FileNotFoundError as ex:
             _LOG.warning("File not found: %s", cmd, exc_info=ex)
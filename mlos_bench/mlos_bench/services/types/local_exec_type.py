@@ -48,6 +48,21 @@ class SupportsLocalExec(Protocol):
             A 3-tuple of return code, stdout, and stderr of the script process.
         """
 
+    def local_exec_cancel(self, cwd: str) -> bool:
+        """
+        Terminate the local process that runs the script in the given work directory.
+
+        Parameters
+        ----------
+        cwd : str
+            Work directory of the script, as passed to `.local_exec()`.
+
+        Returns
+        -------
+        is_canceled : bool
+            True if the running process has been terminated, False if there was none.
+        """
+
     def temp_dir_context(self, path: Optional[str] = None) -> Union[tempfile.TemporaryDirectory, contextlib.nullcontext]:
         """
         Create a temp directory or use the provided path.
@@ -8,11 +8,13 @@ Base interface for accessing the stored benchmark experiment data.
 
 from abc import ABCMeta, abstractmethod
 from distutils.util import strtobool    # pylint: disable=deprecated-module
-from typing import Dict, Literal, Optional, Tuple, TYPE_CHECKING
+from typing import Dict, Literal, Mapping, Optional, Tuple, TYPE_CHECKING
 
 import pandas
 
+from mlos_bench.environments.status import Status
 from mlos_bench.storage.base_tunable_config_data import TunableConfigData
+from mlos_bench.storage.experiment_progress import ExperimentProgress
 
 if TYPE_CHECKING:
     from mlos_bench.storage.base_trial_data import TrialData
@@ -30,6 +32,9 @@ class ExperimentData(metaclass=ABCMeta):
     RESULT_COLUMN_PREFIX = "result."
     CONFIG_COLUMN_PREFIX = "config."
 
+    # Percentiles to compute in `.config_trial_group_stats()`.
+    PERCENTILES = (50, 75, 90, 95, 99)
+
     def __init__(self, *,
                  experiment_id: str,
                  description: str,
@@ -86,38 +91,38 @@ class ExperimentData(metaclass=ABCMeta):
 
     @property
     @abstractmethod
-    def trials(self) -> Dict[int, "TrialData"]:
+    def trials(self) -> Mapping[int, "TrialData"]:
         """
         Retrieve the experiment's trials' data from the storage.
 
         Returns
         -------
-        trials : Dict[int, TrialData]
-            A dictionary of the trials' data, keyed by trial id.
+        trials : Mapping[int, TrialData]
+            A (possibly lazy) mapping of the trials' data, keyed by trial id.
         """
 
     @property
     @abstractmethod
-    def tunable_configs(self) -> Dict[int, TunableConfigData]:
+    def tunable_configs(self) -> Mapping[int, TunableConfigData]:
         """
         Retrieve the experiment's (tunable) configs' data from the storage.
 
         Returns
         -------
-        trials : Dict[int, TunableConfigData]
-            A dictionary of the configs' data, keyed by (tunable) config id.
+        trials : Mapping[int, TunableConfigData]
+            A (possibly lazy) mapping of the configs' data, keyed by (tunable) config id.
         """
 
     @property
     @abstractmethod
-    def tunable_config_trial_groups(self) -> Dict[int, "TunableConfigTrialGroupData"]:
+    def tunable_config_trial_groups(self) -> Mapping[int, "TunableConfigTrialGroupData"]:
         """
         Retrieve the Experiment's (Tunable) Config Trial Group data from the storage.
 
         Returns
         -------
-        trials : Dict[int, TunableConfigTrialGroupData]
-            A dictionary of the trials' data, keyed by (tunable) by config id.
+        trials : Mapping[int, TunableConfigTrialGroupData]
+            A (possibly lazy) mapping of the trials' data, keyed by (tunable) by config id.
         """
 
     @property
@@ -147,6 +152,20 @@ class ExperimentData(metaclass=ABCMeta):
         # Fallback (min trial_id)
         return trials_items[0][1].tunable_config_id
 
+    @property
+    @abstractmethod
+    def progress(self) -> ExperimentProgress:
+        """
+        Retrieve the time spent on the experiment so far, its throughput, and
+        the overhead (i.e., the time when no trial was running).
+
+        Returns
+        -------
+        progress : ExperimentProgress
+            Progress of the experiment as of now. Use `.time_to_complete()`
+            to estimate the time to run more trials.
+        """
+
     @property
     @abstractmethod
     def results_df(self) -> pandas.DataFrame:
@@ -162,3 +181,118 @@ class ExperimentData(metaclass=ABCMeta):
             trial results (prefixed with "result."). The latter can be NULLs if the
             trial was not successful.
         """
+
+    def config_trial_group_stats(self, metric: str) -> pandas.DataFrame:
+        """
+        Compute the statistics of the metric for each (tunable) config trial group,
+        i.e., over all trials that use the same config.
+
+        Note: this implementation loads the whole `.results_df`; subclasses should
+        push the aggregation into the storage backend, if possible.
+
+        Parameters
+        ----------
+        metric : str
+            Name of the metric (with or without the "result." prefix).
+
+        Returns
+        -------
+        stats : pandas.DataFrame
+            A DataFrame with one row per config trial group and the columns
+            [tunable_config_id, tunable_config_trial_group_id, count, mean, stddev,
+            var, var_zscore, p50, p75, p90, p95, p99]. The "var_zscore" column is
+            the zscore of the group variance relative to the variances of all other
+            groups (useful to filter out the noisy configs).
+            Only the successful trials with a numeric value of the metric are counted.
+        """
+        metric_col = self.RESULT_COLUMN_PREFIX + self._metric_name(metric)
+        results_df = self.results_df
+        results_df = results_df[results_df["status"] == Status.SUCCEEDED.name]
+        if metric_col not in results_df.columns:
+            return self._config_trial_group_stats_df(pandas.DataFrame())
+        results_df = results_df.assign(value=pandas.to_numeric(results_df[metric_col], errors="coerce"))
+        results_groups = results_df.dropna(subset=["value"]).groupby(
+            ["tunable_config_id", "tunable_config_trial_group_id"])["value"]
+        stats_df = pandas.DataFrame({
+            "count": results_groups.count(),
+            "mean": results_groups.mean(),
+            "var": results_groups.var(),
+        })
+        for percentile in self.PERCENTILES:
+            stats_df[f"p{percentile}"] = results_groups.quantile(percentile / 100)
+        return self._config_trial_group_stats_df(stats_df.reset_index())
+
+    def top_n_configs(self, top_n: int = 10, *,
+                      objective: Optional[str] = None,
+                      method: Literal["mean", "p50", "p75", "p90", "p95", "p99"] = "mean",
+                      ) -> pandas.DataFrame:
+        """
+        Get the statistics of the best performing configs, along with the default
+        config as a baseline.
+
+        Parameters
+        ----------
+        top_n : int
+            How many best configs to return (in addition to the default one).
+        objective : Optional[str]
+            Which objective to rank the configs by. By default, use the first
+            objective of the experiment. The direction (min or max) is taken from
+            the experiment objectives.
+        method : Literal["mean", "p50", "p75", "p90", "p95", "p99"]
+            Which statistic of the config trial group to rank the configs by.
+
+        Returns
+        -------
+        stats : pandas.DataFrame
+            The rows of `.config_trial_group_stats()` for the default config
+            (first, if it has any results) and the top-N other configs, best first.
+            The "is_default" column marks the default config.
+        """
+        if top_n < 0:
+            raise ValueError(f"Invalid top_n: {top_n}")
+        if method not in ["mean"] + [f"p{percentile}" for percentile in self.PERCENTILES]:
+            raise ValueError(f"Invalid method: {method}")
+        objectives = self.objectives
+        if objective is None:
+            if not objectives:
+                raise ValueError(f"No objectives defined for the experiment: {self}")
+            objective = next(iter(objectives))
+        objective = self._metric_name(objective)
+        if objective not in objectives:
+            raise ValueError(f"Unknown objective: {objective} :: {objectives}")
+        stats_df = self.config_trial_group_stats(objective)
+        stats_df["is_default"] = stats_df["tunable_config_id"] == self.default_tunable_config_id
+        top_n_df = stats_df.loc[~stats_df["is_default"]].sort_values(
+            by=[method, "tunable_config_trial_group_id"],
+            ascending=[objectives[objective] == "min", True],
+        ).head(top_n)
+        return pandas.concat([stats_df.loc[stats_df["is_default"]], top_n_df]).reset_index(drop=True)
+
+    @classmethod
+    def _metric_name(cls, metric: str) -> str:
+        """
+        Strip the "result." prefix from the metric name, if present.
+        """
+        if metric.startswith(cls.RESULT_COLUMN_PREFIX):
+            return metric[len(cls.RESULT_COLUMN_PREFIX):]
+        return metric
+
+    @classmethod
+    def _config_trial_group_stats_df(cls, stats_df: pandas.DataFrame) -> pandas.DataFrame:
+        """
+        Add the derived columns to the per-group statistics with
+        [tunable_config_id, tunable_config_trial_group_id, count, mean, var, p50, ...]
+        columns, and put the columns in the standard order.
+        """
+        percentile_cols = [f"p{percentile}" for percentile in cls.PERCENTILES]
+        columns = ["tunable_config_id", "tunable_config_trial_group_id", "count", "mean", "var"]
+        stats_df = stats_df.reindex(columns=columns + percentile_cols)
+        stats_df["stddev"] = stats_df["var"].astype(float) ** 0.5
+        stats_df["var_zscore"] = (stats_df["var"] - stats_df["var"].mean()) / stats_df["var"].std()
+        return stats_df.astype({
+            "tunable_config_id": int,
+            "tunable_config_trial_group_id": int,
+            "count": int,
+        }).sort_values("tunable_config_trial_group_id")[
+            columns[:-1] + ["stddev", "var", "var_zscore"] + percentile_cols
+        ].reset_index(drop=True)
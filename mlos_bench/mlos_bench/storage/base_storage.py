@@ -8,15 +8,16 @@ Base interface for saving and restoring the benchmark data.
 
 import logging
 from abc import ABCMeta, abstractmethod
-from datetime import datetime
+from datetime import datetime, timedelta
 from types import TracebackType
-from typing import Optional, List, Tuple, Dict, Iterator, Type, Any
+from typing import Optional, List, Sequence, Tuple, Dict, Iterator, Mapping, Type, Any
 from typing_extensions import Literal
 
 from mlos_bench.config.schemas import ConfigSchema
 from mlos_bench.environments.status import Status
 from mlos_bench.services.base_service import Service
 from mlos_bench.storage.base_experiment_data import ExperimentData
+from mlos_bench.storage.experiment_progress import ExperimentProgress
 from mlos_bench.tunables.tunable_groups import TunableGroups
 from mlos_bench.util import get_git_info
 
@@ -62,14 +63,14 @@ class Storage(metaclass=ABCMeta):
 
     @property
     @abstractmethod
-    def experiments(self) -> Dict[str, ExperimentData]:
+    def experiments(self) -> Mapping[str, ExperimentData]:
         """
         Retrieve the experiments' data from the storage.
 
         Returns
         -------
-        experiments : Dict[str, ExperimentData]
-            A dictionary of the experiments' data, keyed by experiment id.
+        experiments : Mapping[str, ExperimentData]
+            A (possibly lazy) mapping of the experiments' data, keyed by experiment id.
         """
 
     @abstractmethod
@@ -246,6 +247,37 @@ class Storage(metaclass=ABCMeta):
                 Telemetry data.
             """
 
+        @abstractmethod
+        def load_config_trials(self, metric: str) -> Dict[int, Dict[int, Tuple[Status, Optional[Any]]]]:
+            """
+            Load the status and the value of the given metric for all trials
+            of the experiment, grouped by the tunable configuration.
+
+            Parameters
+            ----------
+            metric : str
+                Name of the benchmark result to load (e.g., the optimization target).
+
+            Returns
+            -------
+            config_trials : Dict[int, Dict[int, Tuple[Status, Optional[Any]]]]
+                A dict of config_id -> {trial_id -> (status, metric value)}.
+                The metric value is None if the trial has not produced it (yet).
+            """
+
+        @abstractmethod
+        def progress(self) -> ExperimentProgress:
+            """
+            Summarize the time spent on the experiment so far and its throughput,
+            based on the start and end timestamps of all its trials.
+            The trials merged from other experiments are not counted.
+
+            Returns
+            -------
+            progress : ExperimentProgress
+                Progress of the experiment as of now.
+            """
+
         @abstractmethod
         def load(self, last_trial_id: int = -1,
                  ) -> Tuple[List[int], List[dict], List[Optional[Dict[str, Any]]], List[Status]]:
@@ -268,10 +300,13 @@ class Storage(metaclass=ABCMeta):
             """
 
         @abstractmethod
-        def pending_trials(self, timestamp: datetime, *, running: bool) -> Iterator['Storage.Trial']:
+        def pending_trials(self, timestamp: datetime, *, running: bool,
+                           limit: Optional[int] = None) -> Iterator['Storage.Trial']:
             """
             Return an iterator over the pending trials that are scheduled to run
-            on or before the specified timestamp.
+            on or before the specified timestamp, in the order of their trial IDs.
+            The trials are loaded from the storage upfront, so the caller can run
+            them while iterating without holding any storage resources.
 
             Parameters
             ----------
@@ -280,6 +315,9 @@ class Storage(metaclass=ABCMeta):
             running : bool
                 If True, include the trials that are already running.
                 Otherwise, return only the scheduled trials.
+            limit : Optional[int]
+                Max. number of trials to return (e.g., to claim a small batch).
+                Return all pending trials if None.
 
             Returns
             -------
@@ -309,6 +347,60 @@ class Storage(metaclass=ABCMeta):
                 the results of the experiment trial run.
             """
 
+        @abstractmethod
+        def new_trials(self, tunables: Sequence[TunableGroups], ts_start: Optional[datetime] = None,
+                       configs: Optional[Sequence[Optional[Dict[str, Any]]]] = None) -> List['Storage.Trial']:
+            """
+            Create a batch of new experiment runs in the storage, all at once.
+            Either all trials get added, or none of them.
+
+            Parameters
+            ----------
+            tunables : Sequence[TunableGroups]
+                Tunable parameters to use for each trial.
+            ts_start : Optional[datetime]
+                Timestamp of the trials start (can be in the future).
+            configs : Optional[Sequence[Optional[dict]]]
+                Key/value pairs of additional non-tunable parameters of each trial.
+                Must be of the same length as `tunables`, if provided.
+
+            Returns
+            -------
+            trials : List[Storage.Trial]
+                Objects that allow to update the storage with
+                the results of the experiment trial runs, in the same order as `tunables`.
+            """
+
+        @abstractmethod
+        def claim_trial(self, trial: 'Storage.Trial', *, worker_id: str,
+                        timestamp: datetime, lease_timeout: timedelta) -> bool:
+            """
+            Atomically claim a pending trial for execution by the given worker.
+
+            The claim succeeds if the trial is still pending, or if it is running
+            but its lease has expired (i.e., the worker that ran it stopped sending
+            heartbeats for longer than `lease_timeout`, or the trial has been running
+            without any heartbeats for that long). Upon success, the trial
+            is marked as RUNNING and belongs to `worker_id` until it completes.
+
+            Parameters
+            ----------
+            trial : Storage.Trial
+                The trial to claim, e.g., as returned by `.pending_trials()`.
+            worker_id : str
+                Unique ID of the worker (i.e., the scheduler process) claiming the trial.
+            timestamp : datetime
+                Timestamp of the claim.
+            lease_timeout : timedelta
+                How long the claim of other workers remains valid without a heartbeat.
+
+            Returns
+            -------
+            is_claimed : bool
+                True if the trial now belongs to `worker_id`, False if it was
+                claimed (or completed) by some other worker first.
+            """
+
     class Trial(metaclass=ABCMeta):
         # pylint: disable=too-many-instance-attributes
         """
@@ -326,6 +418,7 @@ class Storage(metaclass=ABCMeta):
             self._tunable_config_id = tunable_config_id
             self._opt_targets = opt_targets
             self._config = config or {}
+            self._worker_id: Optional[str] = None
 
         def __repr__(self) -> str:
             return f"{self._experiment_id}:{self._trial_id}:{self._tunable_config_id}"
@@ -351,6 +444,13 @@ class Storage(metaclass=ABCMeta):
             """
             return self._opt_targets
 
+        @property
+        def worker_id(self) -> Optional[str]:
+            """
+            ID of the worker that claimed the trial, if any.
+            """
+            return self._worker_id
+
         @property
         def tunables(self) -> TunableGroups:
             """
@@ -397,6 +497,8 @@ class Storage(metaclass=ABCMeta):
             -------
             metrics : Optional[Dict[str, Any]]
                 Same as `metrics`, but always in the dict format.
+                None if the results were dropped because the worker
+                that claimed the trial has lost its lease.
             """
             _LOG.info("Store trial: %s :: %s %s", self, status, metrics)
             if status.is_succeeded():
@@ -408,6 +510,23 @@ class Storage(metaclass=ABCMeta):
                     # raise ValueError()
             return metrics
 
+        @abstractmethod
+        def heartbeat(self, timestamp: datetime) -> bool:
+            """
+            Extend the lease of the worker that claimed the trial.
+
+            Parameters
+            ----------
+            timestamp : datetime
+                Timestamp of the heartbeat.
+
+            Returns
+            -------
+            is_alive : bool
+                True if the trial is still running and owned by the current worker,
+                False otherwise (i.e., the trial has completed or the lease was lost).
+            """
+
         @abstractmethod
         def update_telemetry(self, status: Status, timestamp: datetime,
                              metrics: List[Tuple[datetime, str, Any]]) -> None:
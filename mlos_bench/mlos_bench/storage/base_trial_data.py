@@ -9,13 +9,14 @@ from abc import ABCMeta, abstractmethod
 from datetime import datetime
 from typing import Any, Dict, Optional, TYPE_CHECKING
 
+import numpy
 import pandas
 from pytz import UTC
 
 from mlos_bench.environments.status import Status
 from mlos_bench.tunables.tunable import TunableValue
 from mlos_bench.storage.base_tunable_config_data import TunableConfigData
-from mlos_bench.storage.util import kv_df_to_dict
+from mlos_bench.storage.util import kv_df_to_dict, telemetry_rollup_df
 
 if TYPE_CHECKING:
     from mlos_bench.storage.base_tunable_config_trial_group_data import TunableConfigTrialGroupData
@@ -156,6 +157,45 @@ class TrialData(metaclass=ABCMeta):
             the dataframe is empty.
         """
 
+    def telemetry_rollup_df(self, resolution: int) -> pandas.DataFrame:
+        """
+        Retrieve the trials' numeric telemetry downsampled to the buckets
+        of `resolution` seconds.
+
+        The base implementation aggregates the raw telemetry in pandas;
+        the storage backends serve it from the rollups maintained at ingest
+        time instead, where possible.
+
+        Parameters
+        ----------
+        resolution : int
+            Size of the buckets in seconds.
+
+        Returns
+        -------
+        telemetry : pandas.DataFrame
+            A dataframe with one row per bucket and metric, and the columns
+            "ts" (start of the bucket), "metric", "count", "min", "max", "mean",
+            and "last" (the latest value in the bucket).
+            The non-numeric telemetry values are skipped.
+        """
+        if resolution <= 0:
+            raise ValueError(f"Invalid telemetry resolution: {resolution}")
+        telemetry_df = self.telemetry_df
+        values = pandas.to_numeric(telemetry_df["value"], errors="coerce")
+        telemetry_df = telemetry_df[numpy.isfinite(values.astype(float))]
+        values = values[telemetry_df.index].astype(float)
+        return telemetry_rollup_df(pandas.DataFrame({
+            "ts": telemetry_df["ts"],
+            "metric": telemetry_df["metric"],
+            "count": 1,
+            "min": values,
+            "max": values,
+            "sum": values,
+            "last": values,
+            "ts_last": telemetry_df["ts"],
+        }), resolution)
+
     @property
     @abstractmethod
     def metadata_df(self) -> pandas.DataFrame:
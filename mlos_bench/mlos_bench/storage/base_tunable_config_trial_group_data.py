@@ -7,7 +7,7 @@ Base interface for accessing the stored benchmark config trial group data.
 """
 
 from abc import ABCMeta, abstractmethod
-from typing import Any, Dict, Optional, TYPE_CHECKING
+from typing import Any, Mapping, Optional, TYPE_CHECKING
 
 import pandas
 
@@ -92,14 +92,14 @@ class TunableConfigTrialGroupData(metaclass=ABCMeta):
 
     @property
     @abstractmethod
-    def trials(self) -> Dict[int, "TrialData"]:
+    def trials(self) -> Mapping[int, "TrialData"]:
         """
         Retrieve the trials' data for this (tunable) config trial group from the storage.
 
         Returns
         -------
-        trials : Dict[int, TrialData]
-            A dictionary of the trials' data, keyed by trial id.
+        trials : Mapping[int, TrialData]
+            A (possibly lazy) mapping of the trials' data, keyed by trial id.
         """
 
     @property
@@ -0,0 +1,168 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Summary of the experiment's progress computed from the timestamps of its trials.
+"""
+
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Tuple
+
+from pytz import UTC
+
+from mlos_bench.environments.status import Status
+
+
+class ExperimentProgress:
+    """
+    Time spent on the experiment so far, its throughput, and the time to
+    complete more trials, based on the `ts_start` and `ts_end` timestamps
+    of the trials in the storage.
+
+    Wall time is measured from the start of the first trial to the end of the
+    last one (or to now, if some trials are still running). Benchmark time is
+    the sum of the durations of all trials, so it can exceed the wall time when
+    trials run in parallel. Overhead is the part of the wall time when no trial
+    was running, e.g., while the optimizer was suggesting new configurations.
+    """
+
+    def __init__(self, trials: Iterable[Tuple[datetime, Optional[datetime], Status]],
+                 timestamp: Optional[datetime] = None):
+        """
+        Compute the progress of the experiment.
+
+        Parameters
+        ----------
+        trials : Iterable[Tuple[datetime, Optional[datetime], Status]]
+            (ts_start, ts_end, status) triplets for all trials of the experiment.
+        timestamp : Optional[datetime]
+            Current time to measure the running trials up to. Default is now.
+        """
+        self._timestamp = timestamp or datetime.now(UTC)
+        self._num_completed = 0
+        self._num_running = 0
+        self._num_pending = 0
+        self._completed_time = timedelta(0)
+        intervals: List[Tuple[datetime, datetime]] = []
+        for (ts_start, ts_end, status) in trials:
+            if ts_end is not None:
+                self._num_completed += 1
+                self._completed_time += ts_end - ts_start
+                intervals.append((ts_start, ts_end))
+            elif status in {Status.READY, Status.RUNNING}:
+                self._num_running += 1
+                intervals.append((ts_start, max(ts_start, self._timestamp)))
+            else:
+                self._num_pending += 1
+
+        self._benchmark_time = sum((ts_end - ts_start for (ts_start, ts_end) in intervals), timedelta(0))
+        self._wall_time = timedelta(0)
+        busy_time = timedelta(0)
+        if intervals:
+            intervals.sort()
+            self._wall_time = max(ts_end for (_ts_start, ts_end) in intervals) - intervals[0][0]
+            # Length of the union of the trial intervals.
+            (busy_start, busy_end) = intervals[0]
+            for (ts_start, ts_end) in intervals[1:]:
+                if ts_start > busy_end:
+                    busy_time += busy_end - busy_start
+                    busy_start = ts_start
+                busy_end = max(busy_end, ts_end)
+            busy_time += busy_end - busy_start
+        self._overhead_time = self._wall_time - busy_time
+
+    def __repr__(self) -> str:
+        return (f"{self.__class__.__name__}(completed={self._num_completed}, " +
+                f"running={self._num_running}, pending={self._num_pending}, " +
+                f"wall={self._wall_time}, benchmark={self._benchmark_time}, " +
+                f"overhead={self._overhead_time}, trials/hour={self.trials_per_hour:.2f})")
+
+    @property
+    def timestamp(self) -> datetime:
+        """
+        Time the progress is measured at.
+        """
+        return self._timestamp
+
+    @property
+    def num_completed(self) -> int:
+        """
+        Number of the trials that have ended (successfully or not).
+        """
+        return self._num_completed
+
+    @property
+    def num_running(self) -> int:
+        """
+        Number of the trials that are currently running.
+        """
+        return self._num_running
+
+    @property
+    def num_pending(self) -> int:
+        """
+        Number of the trials that are waiting in the queue.
+        """
+        return self._num_pending
+
+    @property
+    def wall_time(self) -> timedelta:
+        """
+        Time from the start of the first trial to the end of the last one.
+        """
+        return self._wall_time
+
+    @property
+    def benchmark_time(self) -> timedelta:
+        """
+        Total duration of all completed and running trials.
+        """
+        return self._benchmark_time
+
+    @property
+    def overhead_time(self) -> timedelta:
+        """
+        Part of the wall time when no trial was running.
+        """
+        return self._overhead_time
+
+    @property
+    def mean_trial_time(self) -> Optional[timedelta]:
+        """
+        Average duration of the completed trials, or None if there are none.
+        """
+        if self._num_completed == 0:
+            return None
+        return self._completed_time / self._num_completed
+
+    @property
+    def trials_per_hour(self) -> float:
+        """
+        Number of the completed trials per hour of the wall time.
+        """
+        if self._wall_time <= timedelta(0):
+            return 0.0
+        return self._num_completed * 3600 / self._wall_time.total_seconds()
+
+    def time_to_complete(self, num_trials: int) -> Optional[timedelta]:
+        """
+        Estimate the wall time to complete the given number of trials
+        at the current throughput.
+
+        Parameters
+        ----------
+        num_trials : int
+            Number of the trials to complete.
+
+        Returns
+        -------
+        eta : Optional[timedelta]
+            Estimated wall time, or None if there is not enough data yet.
+        """
+        if num_trials <= 0:
+            return timedelta(0)
+        throughput = self.trials_per_hour
+        if throughput <= 0:
+            return None
+        return timedelta(hours=num_trials / throughput)
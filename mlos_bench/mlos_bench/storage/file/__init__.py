@@ -0,0 +1,12 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Interfaces to the append-only file-based storage backend for OS Autotune.
+"""
+from mlos_bench.storage.file.storage import FileStorage
+
+__all__ = [
+    'FileStorage',
+]
@@ -0,0 +1,96 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Common methods for accessing the benchmark data stored in the experiment log.
+"""
+from typing import Dict, Mapping, Optional
+
+import pandas
+
+from mlos_bench.storage.base_experiment_data import ExperimentData
+from mlos_bench.storage.base_trial_data import TrialData
+from mlos_bench.storage.experiment_progress import ExperimentProgress
+from mlos_bench.storage.file.index import ExperimentIndex
+
+
+def get_trials(index: ExperimentIndex, experiment_id: str,
+               tunable_config_id: Optional[int] = None) -> Mapping[int, TrialData]:
+    """
+    Gets a mapping of TrialData for the given experiment, optionally
+    restricted by tunable_config_id.
+    Used by both TunableConfigTrialGroupFileData and ExperimentFileData.
+    """
+    from mlos_bench.storage.file.trial_data import TrialFileData  # pylint: disable=import-outside-toplevel,cyclic-import
+    return {
+        trial.trial_id: TrialFileData(
+            index=index,
+            experiment_id=experiment_id,
+            trial_id=trial.trial_id,
+            config_id=trial.config_id,
+            ts_start=trial.ts_start,
+            ts_end=trial.ts_end,
+            status=trial.status,
+        )
+        for trial in index.trials_by_config(tunable_config_id)
+        if trial.ts_start is not None
+    }
+
+
+def get_progress(index: ExperimentIndex) -> ExperimentProgress:
+    """
+    Compute the progress of the experiment from the timestamps of its trials.
+    Used by both ExperimentFileData and the Experiment object of FileStorage.
+
+    The trials merged from other experiments (see `Experiment.merge()`) keep
+    their original timestamps, so they do not count towards the progress.
+    """
+    return ExperimentProgress(
+        (trial.ts_start, trial.ts_end, trial.status)
+        for trial in index.trials_by_config()
+        if trial.ts_start is not None and "merged_from" not in trial.params
+    )
+
+
+def get_results_df(index: ExperimentIndex, tunable_config_id: Optional[int] = None) -> pandas.DataFrame:
+    """
+    Gets the results DataFrame of the experiment, in the same format as
+    `ExperimentData.results_df`, optionally restricted by tunable_config_id.
+    """
+    trials = index.trials_by_config()
+    # The group ID of the config is the first trial that uses it.
+    group_ids: Dict[int, int] = {}
+    for trial in trials:
+        group_ids.setdefault(trial.config_id, trial.trial_id)
+    with index.lock:
+        configs = dict(index.configs)
+    rows = [
+        {
+            "trial_id": trial.trial_id,
+            "ts_start": trial.ts_start,
+            "ts_end": trial.ts_end,
+            "tunable_config_id": trial.config_id,
+            "tunable_config_trial_group_id": group_ids[trial.config_id],
+            "status": trial.status.name,
+            **{ExperimentData.CONFIG_COLUMN_PREFIX + key: val
+               for (key, val) in configs.get(trial.config_id, {}).items()},
+            **{ExperimentData.RESULT_COLUMN_PREFIX + key: val
+               for (key, val) in trial.results.items()},
+        }
+        for trial in trials
+        if tunable_config_id is None or trial.config_id == tunable_config_id
+    ]
+    columns = [
+        "trial_id",
+        "ts_start",
+        "ts_end",
+        "tunable_config_id",
+        "tunable_config_trial_group_id",
+        "status",
+    ]
+    # Same column order as in the SQL storage: the configs and the results, sorted by name.
+    extra_columns = {col for row in rows for col in row}.difference(columns)
+    columns += sorted(col for col in extra_columns if col.startswith(ExperimentData.CONFIG_COLUMN_PREFIX))
+    columns += sorted(col for col in extra_columns if col.startswith(ExperimentData.RESULT_COLUMN_PREFIX))
+    return pandas.DataFrame(rows, columns=columns).infer_objects()
@@ -0,0 +1,353 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Saving and restoring the benchmark data in the append-only experiment log.
+"""
+
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Literal, Optional, Sequence, Tuple
+
+from pytz import UTC
+
+from mlos_bench.environments.status import Status
+from mlos_bench.storage.base_storage import Storage
+from mlos_bench.storage.experiment_progress import ExperimentProgress
+from mlos_bench.storage.file import common
+from mlos_bench.storage.file.index import ExperimentIndex, format_timestamp
+from mlos_bench.storage.file.trial import Trial
+from mlos_bench.tunables.tunable_groups import TunableGroups
+from mlos_bench.util import utcify_timestamp
+
+_LOG = logging.getLogger(__name__)
+
+
+class Experiment(Storage.Experiment):
+    """
+    Logic for retrieving and storing the results of a single experiment.
+    """
+
+    def __init__(self, *,
+                 open_index: Callable[..., Optional[ExperimentIndex]],
+                 tunables: TunableGroups,
+                 experiment_id: str,
+                 trial_id: int,
+                 root_env_config: str,
+                 description: str,
+                 opt_targets: Dict[str, Literal['min', 'max']]):
+        super().__init__(
+            tunables=tunables,
+            experiment_id=experiment_id,
+            trial_id=trial_id,
+            root_env_config=root_env_config,
+            description=description,
+            opt_targets=opt_targets,
+        )
+        # Get the index of the experiment from the storage (opened for writing
+        # for this experiment, and read-only for the others, e.g., for merging).
+        self._open_index = open_index
+        self._index: ExperimentIndex
+
+    def _setup(self) -> None:
+        super()._setup()
+        # Replay the log (and recover its active segment after a crash, if needed).
+        index = self._open_index(self._experiment_id, writable=True)
+        assert index is not None
+        self._index = index
+        with self._index.lock:
+            exp_info = self._index.experiment
+            if exp_info is None:
+                _LOG.info("Start new experiment: %s", self._experiment_id)
+                self._index.append({
+                    "type": "experiment",
+                    "exp_id": self._experiment_id,
+                    "description": self._description,
+                    "git_repo": self._git_repo,
+                    "git_commit": self._git_commit,
+                    "root_env_config": self._root_env_config,
+                    "objectives": self._opt_targets,
+                })
+                return
+            last_trial_id = self._index.last_trial_id
+        if last_trial_id is not None:
+            self._trial_id = last_trial_id + 1
+        _LOG.info("Continue experiment: %s last trial: %s resume from: %d",
+                  self._experiment_id, last_trial_id, self._trial_id)
+        if exp_info["git_commit"] != self._git_commit:
+            _LOG.warning("Experiment %s git expected: %s %s",
+                         self, exp_info["git_repo"], exp_info["git_commit"])
+
+    def _teardown(self, is_ok: bool) -> None:
+        self._index.log.close()
+        super()._teardown(is_ok)
+
+    def merge(self, experiment_ids: List[str]) -> None:
+        _LOG.info("Merge: %s <- %s", self._experiment_id, experiment_ids)
+        for experiment_id in dict.fromkeys(experiment_ids):
+            if experiment_id == self._experiment_id:
+                _LOG.warning("Cannot merge experiment into itself: %s", self)
+                continue
+            count = self._merge_experiment(experiment_id)
+            _LOG.info("Merged %d trials: %s <- %s", count, self._experiment_id, experiment_id)
+
+    def _merge_experiment(self, experiment_id: str) -> int:
+        """
+        Copy the completed trials of the other experiment (along with their
+        parameters and results) that are compatible with the tunables of this
+        experiment, in one atomic batch record.
+
+        The trials keep their relative order and get the new IDs after the last
+        trial of this experiment. Each merged trial gets a `merged_from` parameter
+        with the original experiment and trial IDs.
+
+        Returns
+        -------
+        count : int
+            Number of the merged trials.
+        """
+        src_index = self._open_index(experiment_id)
+        if src_index is None or src_index.experiment is None:
+            raise ValueError(f"Experiment not found: {experiment_id}")
+        missing_targets = set(self._opt_targets) - set(src_index.experiment["objectives"])
+        if missing_targets:
+            _LOG.warning("Skip experiment %s without the optimization targets: %s",
+                         experiment_id, missing_targets)
+            return 0
+        with src_index.lock:
+            src_configs = dict(src_index.configs)
+            src_config_hashes = {config_id: config_hash for (config_hash, config_id) in src_index.config_ids.items()}
+            src_trials = [
+                trial for trial in src_index.trials.values()
+                if trial.status in {Status.SUCCEEDED, Status.FAILED, Status.TIMED_OUT, Status.PRUNED}
+            ]
+        tunable_names = set(self._tunables.get_param_values())
+        src_trials = [
+            trial for trial in src_trials
+            if set(src_configs[trial.config_id]) == tunable_names and all(
+                self._is_valid_value(name, value) for (name, value) in src_configs[trial.config_id].items())
+        ]
+        with self._index.lock:
+            if any(str(trial.params.get("merged_from", "")).startswith(f"{experiment_id}:")
+                   for trial in self._index.trials.values()):
+                _LOG.warning("Experiment %s has already been merged into: %s", experiment_id, self)
+                return 0
+            if not src_trials:
+                return 0
+            # Remap the trial IDs to follow the last trial of this experiment.
+            next_trial_id = max(self._trial_id, (self._index.last_trial_id or 0) + 1)
+            offset = next_trial_id - src_trials[0].trial_id
+            records: List[Dict[str, Any]] = []
+            config_ids: Dict[int, int] = {}
+            next_config_id = max(self._index.configs, default=0) + 1
+            for trial in src_trials:
+                if trial.config_id not in config_ids:
+                    config_hash = src_config_hashes[trial.config_id]
+                    config_id = self._index.config_ids.get(config_hash)
+                    if config_id is None:
+                        config_id = next_config_id
+                        next_config_id += 1
+                        records.append({
+                            "type": "config",
+                            "config_id": config_id,
+                            "config_hash": config_hash,
+                            "params": src_configs[trial.config_id],
+                        })
+                    config_ids[trial.config_id] = config_id
+                params = {key: val for (key, val) in trial.params.items() if key != "merged_from"}
+                params["merged_from"] = f"{experiment_id}:{trial.trial_id}"
+                records.append({
+                    "type": "trial",
+                    "trial_id": trial.trial_id + offset,
+                    "config_id": config_ids[trial.config_id],
+                    "ts_start": format_timestamp(trial.ts_start),
+                    "ts_end": format_timestamp(trial.ts_end),
+                    "status": trial.status.name,
+                    "params": params,
+                    "results": trial.results,
+                })
+            self._index.append({"type": "batch", "records": records})
+        self._trial_id = max(self._trial_id, src_trials[-1].trial_id + offset + 1)
+        return len(src_trials)
+
+    def _is_valid_value(self, name: str, value: Any) -> bool:
+        """
+        Check if the value (as stored in the log) is valid for the tunable.
+        """
+        (tunable, _group) = self._tunables.get_tunable(name)
+        if value is None:
+            return tunable.is_categorical and tunable.is_valid(None)
+        try:
+            return tunable.is_valid(tunable.dtype(value))
+        except (TypeError, ValueError):
+            return False
+
+    def load_tunable_config(self, config_id: int) -> Dict[str, Any]:
+        with self._index.lock:
+            return dict(self._index.configs.get(config_id, {}))
+
+    def load_telemetry(self, trial_id: int) -> List[Tuple[datetime, str, Any]]:
+        return self._index.read_telemetry(trial_id)
+
+    def progress(self) -> ExperimentProgress:
+        return common.get_progress(self._index)
+
+    def load_config_trials(self, metric: str) -> Dict[int, Dict[int, Tuple[Status, Optional[Any]]]]:
+        config_trials: Dict[int, Dict[int, Tuple[Status, Optional[Any]]]] = {}
+        with self._index.lock:
+            for trial in self._index.trials.values():
+                config_trials.setdefault(trial.config_id, {})[trial.trial_id] = (
+                    trial.status, trial.results.get(metric))
+        return config_trials
+
+    def load(self, last_trial_id: int = -1,
+             ) -> Tuple[List[int], List[dict], List[Optional[Dict[str, Any]]], List[Status]]:
+        trial_ids: List[int] = []
+        configs: List[Dict[str, Any]] = []
+        scores: List[Optional[Dict[str, Any]]] = []
+        status: List[Status] = []
+        with self._index.lock:
+            for trial in self._index.trials.values():
+                if trial.trial_id <= last_trial_id or trial.status not in {
+                        Status.SUCCEEDED, Status.FAILED, Status.TIMED_OUT, Status.PRUNED}:
+                    continue
+                trial_ids.append(trial.trial_id)
+                configs.append(dict(self._index.configs[trial.config_id]))
+                scores.append(dict(trial.results) if trial.status.is_succeeded() else None)
+                status.append(trial.status)
+        return (trial_ids, configs, scores, status)
+
+    def pending_trials(self, timestamp: datetime, *, running: bool,
+                       limit: Optional[int] = None) -> Iterator[Storage.Trial]:
+        timestamp = utcify_timestamp(timestamp, origin="local")
+        _LOG.info("Retrieve pending trials for: %s @ %s", self._experiment_id, timestamp)
+        if running:
+            pending_status = {Status.PENDING, Status.READY, Status.RUNNING}
+        else:
+            pending_status = {Status.PENDING}
+        trials: List[Storage.Trial] = []
+        with self._index.lock:
+            for trial in self._index.trials.values():
+                if limit is not None and len(trials) >= limit:
+                    break
+                if trial.ts_end is not None or trial.status not in pending_status or (
+                        trial.ts_start is not None and trial.ts_start > timestamp):
+                    continue
+                trials.append(Trial(
+                    index=self._index,
+                    # Reset .is_updated flag after the assignment:
+                    tunables=self._tunables.copy().assign(self._index.configs[trial.config_id]).reset(),
+                    experiment_id=self._experiment_id,
+                    trial_id=trial.trial_id,
+                    config_id=trial.config_id,
+                    opt_targets=self._opt_targets,
+                    config=dict(trial.params),
+                ))
+        return iter(trials)
+
+    @staticmethod
+    def _config_hash(tunables: TunableGroups) -> str:
+        """
+        Compute the hash of the tunable values in a canonical form.
+        """
+        config = json.dumps(tunables.get_param_values(), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(config.encode('utf-8')).hexdigest()
+
+    def new_trial(self, tunables: TunableGroups, ts_start: Optional[datetime] = None,
+                  config: Optional[Dict[str, Any]] = None) -> Storage.Trial:
+        return self.new_trials([tunables], ts_start, [config])[0]
+
+    def new_trials(self, tunables: Sequence[TunableGroups], ts_start: Optional[datetime] = None,
+                   configs: Optional[Sequence[Optional[Dict[str, Any]]]] = None) -> List[Storage.Trial]:
+        if configs is None:
+            configs = [None] * len(tunables)
+        if len(configs) != len(tunables):
+            raise ValueError(f"Mismatched number of tunables and configs: {len(tunables)} != {len(configs)}")
+        ts_start = utcify_timestamp(ts_start or datetime.now(UTC), origin="local")
+        _LOG.debug("Create %d trials: %s:%d @ %s", len(tunables), self._experiment_id, self._trial_id, ts_start)
+        trials: List[Storage.Trial] = []
+        # New configs and trials are written in one record, so either all trials get added, or none.
+        records: List[Dict[str, Any]] = []
+        with self._index.lock:
+            config_ids: Dict[str, int] = {}
+            next_config_id = max(self._index.configs, default=0) + 1
+            for (trial_id, (trial_tunables, config)) in enumerate(zip(tunables, configs), self._trial_id):
+                config_hash = self._config_hash(trial_tunables)
+                config_id = self._index.config_ids.get(config_hash, config_ids.get(config_hash))
+                if config_id is None:
+                    config_id = config_ids[config_hash] = next_config_id
+                    next_config_id += 1
+                    records.append({
+                        "type": "config",
+                        "config_id": config_id,
+                        "config_hash": config_hash,
+                        "params": {tunable.name: tunable.value for (tunable, _group) in trial_tunables},
+                    })
+                records.append({
+                    "type": "trial",
+                    "trial_id": trial_id,
+                    "config_id": config_id,
+                    "ts_start": format_timestamp(ts_start),
+                    # Note: config here is the framework config, not the target
+                    # environment config (i.e., tunables).
+                    "params": config or {},
+                })
+                trials.append(Trial(
+                    index=self._index,
+                    tunables=trial_tunables,
+                    experiment_id=self._experiment_id,
+                    trial_id=trial_id,
+                    config_id=config_id,
+                    opt_targets=self._opt_targets,
+                    config=config,
+                ))
+            if records:
+                self._index.append({"type": "batch", "records": records})
+        self._trial_id += len(trials)
+        return trials
+
+    def claim_trial(self, trial: Storage.Trial, *, worker_id: str,
+                    timestamp: datetime, lease_timeout: timedelta) -> bool:
+        timestamp = utcify_timestamp(timestamp, origin="local")
+        _LOG.debug("Claim trial: %s by %s @ %s", trial, worker_id, timestamp)
+        with self._index.lock:
+            # Compare-and-set: only one worker can move the trial from PENDING
+            # (or RUNNING with an expired lease) to RUNNING. The running trials
+            # without a heartbeat (e.g., started by a scheduler that does not
+            # claim its trials) hold the lease since their start time.
+            trial_record = self._index.trials[trial.trial_id]
+            ts_lease = trial_record.ts_heartbeat or trial_record.ts_start
+            is_claimable = trial_record.ts_end is None and (
+                trial_record.status == Status.PENDING or (
+                    trial_record.status in {Status.READY, Status.RUNNING} and (
+                        ts_lease is None or ts_lease < timestamp - lease_timeout or
+                        trial_record.worker_id == worker_id
+                    )
+                )
+            )
+            if not is_claimable:
+                _LOG.info("Trial %s :: already claimed by another worker", trial)
+                return False
+            self._index.append({
+                "type": "batch",
+                "records": [
+                    {
+                        "type": "claim",
+                        "trial_id": trial.trial_id,
+                        "worker_id": worker_id,
+                        "ts": format_timestamp(timestamp),
+                    },
+                    {
+                        "type": "status",
+                        "trial_id": trial.trial_id,
+                        "ts": format_timestamp(timestamp),
+                        "status": Status.RUNNING.name,
+                    },
+                ],
+            })
+        trial._worker_id = worker_id  # pylint: disable=protected-access
+        _LOG.info("Trial %s :: claimed by %s", trial, worker_id)
+        return True
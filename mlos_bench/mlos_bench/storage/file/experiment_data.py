@@ -0,0 +1,79 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+An interface to access the experiment benchmark data stored in the experiment log.
+"""
+from typing import Dict, Literal, Mapping
+
+import pandas
+
+from mlos_bench.storage.base_experiment_data import ExperimentData
+from mlos_bench.storage.base_trial_data import TrialData
+from mlos_bench.storage.base_tunable_config_data import TunableConfigData
+from mlos_bench.storage.base_tunable_config_trial_group_data import TunableConfigTrialGroupData
+from mlos_bench.storage.experiment_progress import ExperimentProgress
+from mlos_bench.storage.file import common
+from mlos_bench.storage.file.index import ExperimentIndex
+from mlos_bench.storage.file.tunable_config_data import TunableConfigFileData
+from mlos_bench.storage.file.tunable_config_trial_group_data import TunableConfigTrialGroupFileData
+
+
+class ExperimentFileData(ExperimentData):
+    """
+    File storage interface for accessing the stored experiment benchmark data.
+
+    An experiment groups together a set of trials that are run with a given set of
+    scripts and mlos_bench configuration files.
+    """
+
+    def __init__(self, *, index: ExperimentIndex):
+        assert index.experiment is not None
+        super().__init__(
+            experiment_id=index.experiment["exp_id"],
+            description=index.experiment["description"],
+            root_env_config=index.experiment["root_env_config"],
+            git_repo=index.experiment["git_repo"],
+            git_commit=index.experiment["git_commit"],
+        )
+        self._index = index
+
+    @property
+    def objectives(self) -> Dict[str, Literal["min", "max"]]:
+        assert self._index.experiment is not None
+        return dict(self._index.experiment["objectives"])
+
+    @property
+    def trials(self) -> Mapping[int, TrialData]:
+        return common.get_trials(self._index, self._experiment_id)
+
+    @property
+    def tunable_config_trial_groups(self) -> Mapping[int, TunableConfigTrialGroupData]:
+        group_ids: Dict[int, int] = {}
+        for trial in self._index.trials_by_config():
+            group_ids.setdefault(trial.config_id, trial.trial_id)
+        return {
+            config_id: TunableConfigTrialGroupFileData(
+                index=self._index,
+                experiment_id=self._experiment_id,
+                tunable_config_id=config_id,
+                tunable_config_trial_group_id=group_id,
+            )
+            for (config_id, group_id) in group_ids.items()
+        }
+
+    @property
+    def tunable_configs(self) -> Mapping[int, TunableConfigData]:
+        return {
+            trial.config_id: TunableConfigFileData(index=self._index, tunable_config_id=trial.config_id)
+            for trial in self._index.trials_by_config()
+        }
+
+    @property
+    def progress(self) -> ExperimentProgress:
+        return common.get_progress(self._index)
+
+    @property
+    def results_df(self) -> pandas.DataFrame:
+        return common.get_results_df(self._index)
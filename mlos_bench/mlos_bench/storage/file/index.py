@@ -0,0 +1,214 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+In-memory index of the experiment data stored in the append-only log.
+
+The index is rebuilt by replaying the log from the beginning when the experiment
+is opened, and then updated with each new record appended through it. The state
+transitions of the trials follow the same rules as the `SqlStorage` UPDATE
+statements, so replaying the log always produces the same state.
+The telemetry records are not kept in memory; the index only stores their
+positions in the log.
+"""
+
+import logging
+from datetime import datetime
+from threading import RLock
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pytz import UTC
+
+from mlos_bench.environments.status import Status
+from mlos_bench.storage.file.segment_log import Position, SegmentLog
+
+_LOG = logging.getLogger(__name__)
+
+
+def format_timestamp(timestamp: Optional[datetime]) -> Optional[str]:
+    """
+    Convert the (UTC) timestamp to the ISO string to store in the log.
+    """
+    return None if timestamp is None else timestamp.astimezone(UTC).isoformat()
+
+
+def parse_timestamp(timestamp: Optional[str]) -> Optional[datetime]:
+    """
+    Convert the ISO string from the log back to the UTC timestamp.
+    """
+    return None if timestamp is None else datetime.fromisoformat(timestamp).astimezone(UTC)
+
+
+class TrialRecord:
+    """
+    Current state of the trial, as of the last record of the log.
+    """
+
+    # pylint: disable=too-many-instance-attributes,too-few-public-methods
+
+    def __init__(self, *,
+                 trial_id: int,
+                 config_id: int,
+                 ts_start: Optional[datetime],
+                 params: Dict[str, Any]):
+        self.trial_id = trial_id
+        self.config_id = config_id
+        self.ts_start = ts_start
+        self.ts_end: Optional[datetime] = None
+        self.status = Status.PENDING
+        self.params = params
+        self.results: Dict[str, Any] = {}
+        self.worker_id: Optional[str] = None
+        self.ts_heartbeat: Optional[datetime] = None
+        # Positions of the telemetry records of the trial in the log.
+        self.telemetry: List[Position] = []
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.trial_id}:{self.config_id} {self.status.name})"
+
+
+class ExperimentIndex:
+    """
+    In-memory index of the experiment log.
+    All reads and writes of the index must hold its `.lock`.
+    """
+
+    def __init__(self, log: SegmentLog):
+        """
+        Build the index by replaying the log.
+
+        Parameters
+        ----------
+        log : SegmentLog
+            Log of the experiment records (opened for writing or read-only).
+        """
+        self.log = log
+        self.lock = RLock()
+        # The "experiment" record: description, git info, objectives, etc.
+        self.experiment: Optional[Dict[str, Any]] = None
+        # Tunable values of the configs, and the config IDs by their hash.
+        self.configs: Dict[int, Dict[str, Any]] = {}
+        self.config_ids: Dict[str, int] = {}
+        # Trials in the order of their IDs.
+        self.trials: Dict[int, TrialRecord] = {}
+        with self.lock:
+            for (position, record) in log.replay():
+                self._apply(position, record)
+        _LOG.debug("Loaded %s :: %d configs, %d trials", log, len(self.configs), len(self.trials))
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.log.path})"
+
+    @property
+    def last_trial_id(self) -> Optional[int]:
+        """
+        ID of the last trial of the experiment, if any.
+        """
+        return max(self.trials) if self.trials else None
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """
+        Write the record to the log and apply it to the index.
+        Use the "batch" record to write several records atomically.
+        """
+        with self.lock:
+            position = self.log.append(record)
+            self._apply(position, record)
+
+    def _apply(self, position: Position, record: Dict[str, Any]) -> None:
+        """
+        Update the index with the record read from (or just written to) the log.
+        """
+        # pylint: disable=too-many-branches
+        record_type = record.get("type")
+        if record_type == "batch":
+            for sub_record in record["records"]:
+                self._apply(position, sub_record)
+        elif record_type == "experiment":
+            if self.experiment is None:
+                self.experiment = record
+        elif record_type == "config":
+            self.configs[record["config_id"]] = record["params"]
+            self.config_ids[record["config_hash"]] = record["config_id"]
+        elif record_type == "trial":
+            trial = TrialRecord(
+                trial_id=record["trial_id"],
+                config_id=record["config_id"],
+                ts_start=parse_timestamp(record["ts_start"]),
+                params=record.get("params", {}),
+            )
+            if "status" in record:
+                # Completed trial merged from another experiment.
+                trial.status = Status[record["status"]]
+                trial.ts_end = parse_timestamp(record.get("ts_end"))
+                trial.results = record.get("results", {})
+            self.trials[trial.trial_id] = trial
+        elif record_type == "status":
+            self._apply_status(
+                self.trials[record["trial_id"]], Status[record["status"]],
+                parse_timestamp(record["ts"]), record.get("metrics"))
+        elif record_type == "claim":
+            trial = self.trials[record["trial_id"]]
+            trial.status = Status.RUNNING
+            trial.ts_start = trial.ts_heartbeat = parse_timestamp(record["ts"])
+            trial.worker_id = record["worker_id"]
+        elif record_type == "heartbeat":
+            trial = self.trials[record["trial_id"]]
+            if self.is_owned(trial, record["worker_id"]):
+                trial.ts_heartbeat = parse_timestamp(record["ts"])
+        elif record_type == "telemetry":
+            self.trials[record["trial_id"]].telemetry.append(position)
+        else:
+            _LOG.warning("Skip unknown record in %s: %s", self, record)
+
+    @staticmethod
+    def can_complete(trial: TrialRecord) -> bool:
+        """
+        Check if the trial can be moved to one of the completed states.
+        """
+        return trial.ts_end is None and not trial.status.is_completed()
+
+    @staticmethod
+    def is_owned(trial: TrialRecord, worker_id: Optional[str]) -> bool:
+        """
+        Check if the trial is still running and belongs to the given worker.
+        """
+        return (trial.ts_end is None and trial.status in {Status.READY, Status.RUNNING}
+                and worker_id is not None and trial.worker_id == worker_id)
+
+    def _apply_status(self, trial: TrialRecord, status: Status, timestamp: Optional[datetime],
+                      metrics: Optional[Dict[str, Any]]) -> None:
+        """
+        Update the status of the trial. Same as in `SqlStorage`, the trial can only
+        be completed once, and cannot be started again while it is running.
+        """
+        if status.is_completed():
+            if self.can_complete(trial):
+                trial.status = status
+                trial.ts_end = timestamp
+                trial.results = metrics or {}
+        elif trial.ts_end is None and trial.status != Status.RUNNING and not trial.status.is_completed():
+            trial.status = status
+            trial.ts_start = timestamp
+
+    def read_telemetry(self, trial_id: int) -> List[Tuple[datetime, str, Any]]:
+        """
+        Read the telemetry of the trial from the log, ordered by the timestamp and
+        the metric name. Skip the duplicate records (same timestamp and metric).
+        """
+        with self.lock:
+            positions = list(self.trials[trial_id].telemetry)
+        telemetry: Dict[Tuple[datetime, str], Any] = {}
+        for record in self.log.read(positions):
+            for (timestamp, key, val) in record["metrics"]:
+                telemetry.setdefault((parse_timestamp(timestamp), key), val)
+        return [(timestamp, key, val) for ((timestamp, key), val) in sorted(telemetry.items())]
+
+    def trials_by_config(self, config_id: Optional[int] = None) -> Iterable[TrialRecord]:
+        """
+        Get the trials of the experiment (that use the given config, if specified).
+        """
+        with self.lock:
+            return [trial for trial in self.trials.values()
+                    if config_id is None or trial.config_id == config_id]
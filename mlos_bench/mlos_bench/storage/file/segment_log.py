@@ -0,0 +1,262 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Append-only log of JSON records split into segment files.
+
+Each record is one line of JSON. The records are appended to the active segment
+`segment-NNNNNN.jsonl.open`; when it grows over `segment_size` bytes, it is
+flushed to disk and atomically renamed to `segment-NNNNNN.jsonl`, and the next
+append starts a new active segment. The sealed segments are never modified.
+
+A crash can only leave a partially written record at the end of the active
+segment. Such a record is skipped when reading the log, and truncated when
+the log is opened for writing again.
+
+The writer holds an exclusive lock on the `LOCK` file in the log directory
+until the log is closed, so only one process can write to the log at a time.
+"""
+
+import json
+import logging
+import os
+import re
+import sys
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+_LOG = logging.getLogger(__name__)
+
+Position = Tuple[int, int]
+"""
+Location of the record in the log: (segment number, byte offset).
+"""
+
+
+class SegmentLog:
+    """
+    Append-only log of JSON records in the segment files of one directory.
+    Supports one writer and any number of readers.
+    """
+
+    _SEGMENT_RE = re.compile(r"^segment-(\d+)\.jsonl(\.open)?$")
+
+    _LOCK_FILE = "LOCK"
+
+    def __init__(self, path: str, *,
+                 segment_size: int = 64 * 1024 * 1024,
+                 fsync: bool = False,
+                 read_only: bool = False):
+        """
+        Open the log in the given directory.
+
+        Parameters
+        ----------
+        path : str
+            Directory with the segment files. Created on the first append, if missing.
+        segment_size : int
+            Size (in bytes) of the active segment to seal it at.
+        fsync : bool
+            If True, fsync the active segment after every append.
+            Otherwise, the data is only flushed to the OS (i.e., it survives
+            a crash of the process, but not of the machine).
+        read_only : bool
+            If True, open the log for reading only (e.g., for analysis
+            while another process writes to it).
+        """
+        if segment_size <= 0:
+            raise ValueError(f"Invalid segment size: {segment_size}")
+        self._path = path
+        self._segment_size = segment_size
+        self._fsync = fsync
+        self._read_only = read_only
+        self._file: Optional[Any] = None
+        self._lock_file: Optional[Any] = None
+        # Number and size of the active segment.
+        self._segment = 0
+        self._size = 0
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._path})"
+
+    @property
+    def path(self) -> str:
+        """
+        Directory with the segment files.
+        """
+        return self._path
+
+    def _segment_path(self, segment: int, is_open: bool) -> str:
+        """
+        Path to the sealed or the active segment file.
+        """
+        return os.path.join(self._path, f"segment-{segment:06d}.jsonl" + (".open" if is_open else ""))
+
+    def _segments(self) -> List[Tuple[int, bool]]:
+        """
+        List the (segment number, is active) pairs of the log in order.
+        """
+        if not os.path.isdir(self._path):
+            return []
+        segments = []
+        for file_name in os.listdir(self._path):
+            match = self._SEGMENT_RE.match(file_name)
+            if match:
+                segments.append((int(match.group(1)), match.group(2) is not None))
+        return sorted(segments)
+
+    def _open_segment(self, segment: int, is_open: bool) -> Any:
+        """
+        Open the segment file for reading. The active segment could have
+        been sealed by the writer since it was listed.
+        """
+        try:
+            return open(self._segment_path(segment, is_open), "rb")
+        except FileNotFoundError:
+            if not is_open:
+                raise
+            return open(self._segment_path(segment, False), "rb")
+
+    def _lock(self) -> None:
+        """
+        Take the exclusive lock of the writer, if not taken yet.
+        Raise RuntimeError if another writer holds it.
+        """
+        if self._lock_file is not None:
+            return
+        os.makedirs(self._path, exist_ok=True)
+        lock_file = open(os.path.join(self._path, self._LOCK_FILE), "a+b")  # pylint: disable=consider-using-with
+        try:
+            if sys.platform == "win32":
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError as ex:
+            lock_file.close()
+            raise RuntimeError(f"Log is locked by another writer: {self}") from ex
+        self._lock_file = lock_file
+
+    def _unlock(self) -> None:
+        """
+        Release the lock of the writer, if taken.
+        """
+        if self._lock_file is None:
+            return
+        if sys.platform == "win32":
+            self._lock_file.seek(0)
+            msvcrt.locking(self._lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        # Closing the file releases the flock() on POSIX.
+        self._lock_file.close()
+        self._lock_file = None
+
+    def replay(self) -> Iterator[Tuple[Position, Dict[str, Any]]]:
+        """
+        Read all records of the log in order, along with their positions.
+        In the writable log, take the writer lock, truncate the partially written
+        record at the end, and seal the active segments left over by the crashed
+        writers (all but the last one, which becomes current).
+        """
+        if not self._read_only:
+            self._lock()
+        for (segment, is_open) in self._segments():
+            with self._open_segment(segment, is_open) as fh_segment:
+                offset = 0
+                for line in fh_segment:
+                    if not line.endswith(b"\n"):
+                        _LOG.warning("Skip the partial record at %s:%d", self._segment_path(segment, is_open), offset)
+                        break
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        _LOG.warning("Skip the corrupt record at %s:%d", self._segment_path(segment, is_open), offset)
+                    else:
+                        yield ((segment, offset), record)
+                    offset += len(line)
+            if is_open and not self._read_only:
+                self._recover(segment, offset)
+            self._segment = segment
+
+    def _recover(self, segment: int, size: int) -> None:
+        """
+        Truncate the active segment to its last complete record and make it current.
+        Seal the previous active segment, if any.
+        """
+        if self._file is not None:
+            self._seal()
+        path = self._segment_path(segment, True)
+        if os.path.getsize(path) > size:
+            _LOG.warning("Truncate %s to %d bytes", path, size)
+            with open(path, "r+b") as fh_segment:
+                fh_segment.truncate(size)
+        self._file = open(path, "ab")  # pylint: disable=consider-using-with
+        self._size = size
+
+    def read(self, positions: List[Position]) -> Iterator[Dict[str, Any]]:
+        """
+        Read the records at the given positions.
+        """
+        segment_files: Dict[int, Any] = {}
+        try:
+            for (segment, offset) in positions:
+                if segment not in segment_files:
+                    segment_files[segment] = self._open_segment(segment, True)
+                fh_segment = segment_files[segment]
+                fh_segment.seek(offset)
+                yield json.loads(fh_segment.readline())
+        finally:
+            for fh_segment in segment_files.values():
+                fh_segment.close()
+
+    def append(self, record: Dict[str, Any]) -> Position:
+        """
+        Write the record to the end of the log and flush it.
+
+        Returns
+        -------
+        position : Position
+            Location of the new record in the log.
+        """
+        if self._read_only:
+            raise ValueError(f"Log is read-only: {self}")
+        line = json.dumps(record, separators=(",", ":"), default=str).encode("utf-8") + b"\n"
+        if self._file is None:
+            self._lock()
+            segments = self._segments()
+            self._segment = segments[-1][0] + 1 if segments else 1
+            self._file = open(self._segment_path(self._segment, True), "ab")  # pylint: disable=consider-using-with
+            self._size = 0
+        position = (self._segment, self._size)
+        self._file.write(line)
+        self._file.flush()
+        if self._fsync:
+            os.fsync(self._file.fileno())
+        self._size += len(line)
+        if self._size >= self._segment_size:
+            self._seal()
+        return position
+
+    def _seal(self) -> None:
+        """
+        Flush the active segment to disk and atomically rename it to the sealed one.
+        """
+        assert self._file is not None
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+        os.replace(self._segment_path(self._segment, True), self._segment_path(self._segment, False))
+        _LOG.debug("Sealed segment: %s", self._segment_path(self._segment, False))
+
+    def close(self) -> None:
+        """
+        Seal the active segment and release the lock of the writer.
+        The next append (if any) takes the lock again and starts a new segment.
+        """
+        if self._file is not None:
+            self._seal()
+        self._unlock()
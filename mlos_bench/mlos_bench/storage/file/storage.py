@@ -0,0 +1,135 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Saving and restoring the benchmark data in the append-only log files.
+
+Each experiment is stored in its own subdirectory of the storage `path` as a
+sequence of JSON-lines segment files (see `SegmentLog`). The experiment state is
+indexed in memory by replaying the log when the experiment is opened, so the
+storage needs no database server and can be copied or archived as plain files.
+
+Only one process (i.e., one scheduler) can write to an experiment at a time
+(the log is locked by the writer); any number of processes can read it
+(e.g., for analysis) while it runs.
+"""
+
+import logging
+import os
+from typing import Any, Dict, Iterator, Literal, Mapping, Optional
+from urllib.parse import quote, unquote
+
+from mlos_bench.services.base_service import Service
+from mlos_bench.storage.base_experiment_data import ExperimentData
+from mlos_bench.storage.base_storage import Storage
+from mlos_bench.storage.file.experiment import Experiment
+from mlos_bench.storage.file.experiment_data import ExperimentFileData
+from mlos_bench.storage.file.index import ExperimentIndex
+from mlos_bench.storage.file.segment_log import SegmentLog
+from mlos_bench.tunables.tunable_groups import TunableGroups
+
+_LOG = logging.getLogger(__name__)
+
+
+class FileStorage(Storage):
+    """
+    An implementation of the Storage interface using append-only log files.
+    """
+
+    def __init__(self,
+                 config: dict,
+                 global_config: Optional[dict] = None,
+                 service: Optional[Service] = None):
+        super().__init__(config, global_config, service)
+        self._path: str = self._config["path"]
+        self._segment_size = int(self._config.get("segment_size", 64 * 1024 * 1024))
+        self._fsync = bool(self._config.get("fsync", False))
+        # Indexes of the experiments opened for writing by this storage object.
+        self._indexes: Dict[str, ExperimentIndex] = {}
+
+    def __repr__(self) -> str:
+        return f"file:{self._path}"
+
+    def _experiment_path(self, experiment_id: str) -> str:
+        """
+        Directory of the experiment log.
+        """
+        return os.path.join(self._path, quote(experiment_id, safe=""))
+
+    def _open_index(self, experiment_id: str, *, writable: bool = False) -> Optional[ExperimentIndex]:
+        """
+        Get the index of the experiment: the one opened for writing by this
+        storage object, if any, or a new read-only snapshot of the log otherwise.
+        Return None if the experiment does not exist (and `writable` is False).
+        """
+        index = self._indexes.get(experiment_id)
+        if index is not None:
+            return index
+        path = self._experiment_path(experiment_id)
+        if not writable and not os.path.isdir(path):
+            return None
+        index = ExperimentIndex(SegmentLog(
+            path,
+            segment_size=self._segment_size,
+            fsync=self._fsync,
+            read_only=not writable,
+        ))
+        if writable:
+            self._indexes[experiment_id] = index
+        return index
+
+    def experiment(self, *,
+                   experiment_id: str,
+                   trial_id: int,
+                   root_env_config: str,
+                   description: str,
+                   tunables: TunableGroups,
+                   opt_targets: Dict[str, Literal['min', 'max']]) -> Storage.Experiment:
+        return Experiment(
+            open_index=self._open_index,
+            tunables=tunables,
+            experiment_id=experiment_id,
+            trial_id=trial_id,
+            root_env_config=root_env_config,
+            description=description,
+            opt_targets=opt_targets,
+        )
+
+    @property
+    def experiments(self) -> Mapping[str, ExperimentData]:
+        return _ExperimentsMapping(self)
+
+
+class _ExperimentsMapping(Mapping[str, ExperimentData]):
+    """
+    A lazy mapping of the experiments in the storage directory.
+    The experiment logs are replayed on access.
+    """
+
+    def __init__(self, storage: FileStorage):
+        self._storage = storage
+
+    def __getitem__(self, experiment_id: str) -> ExperimentData:
+        index = self._storage._open_index(experiment_id)  # pylint: disable=protected-access
+        if index is None or index.experiment is None:
+            raise KeyError(experiment_id)
+        return ExperimentFileData(index=index)
+
+    def __iter__(self) -> Iterator[str]:
+        path = self._storage._path  # pylint: disable=protected-access
+        if not os.path.isdir(path):
+            return iter([])
+        return iter(sorted(
+            unquote(name) for name in os.listdir(path) if os.path.isdir(os.path.join(path, name))
+        ))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, experiment_id: Any) -> bool:
+        try:
+            self[experiment_id]
+            return True
+        except KeyError:
+            return False
@@ -0,0 +1,112 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Saving and updating the benchmark data in the append-only experiment log.
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional, Tuple
+
+from mlos_bench.environments.status import Status
+from mlos_bench.storage.base_storage import Storage
+from mlos_bench.storage.file.index import ExperimentIndex, format_timestamp
+from mlos_bench.tunables.tunable_groups import TunableGroups
+from mlos_bench.util import utcify_timestamp
+
+_LOG = logging.getLogger(__name__)
+
+
+class Trial(Storage.Trial):
+    """
+    Store the results of a single run of the experiment in the experiment log.
+    """
+
+    def __init__(self, *,
+                 index: ExperimentIndex,
+                 tunables: TunableGroups,
+                 experiment_id: str,
+                 trial_id: int,
+                 config_id: int,
+                 opt_targets: Dict[str, Literal['min', 'max']],
+                 config: Optional[Dict[str, Any]] = None):
+        super().__init__(
+            tunables=tunables,
+            experiment_id=experiment_id,
+            trial_id=trial_id,
+            tunable_config_id=config_id,
+            opt_targets=opt_targets,
+            config=config,
+        )
+        self._index = index
+        # Timestamp of the latest telemetry record saved through this object.
+        # Telemetry is often reported cumulatively, so skip the older records.
+        self._telemetry_ts: Optional[datetime] = None
+
+    def update(self, status: Status, timestamp: datetime,
+               metrics: Optional[Dict[str, Any]] = None
+               ) -> Optional[Dict[str, Any]]:
+        timestamp = utcify_timestamp(timestamp, origin="local")
+        metrics = super().update(status, timestamp, metrics)
+        record: Dict[str, Any] = {
+            "type": "status",
+            "trial_id": self._trial_id,
+            "ts": format_timestamp(timestamp),
+            "status": status.name,
+        }
+        with self._index.lock:
+            if status.is_completed():
+                trial = self._index.trials[self._trial_id]
+                if self._worker_id is not None and not self._index.is_owned(trial, self._worker_id):
+                    # Another worker has taken over the trial after our lease expired.
+                    _LOG.warning("Trial %s :: lease of %s is over, drop the results: %s %s",
+                                 self, self._worker_id, status, metrics)
+                    return None
+                if not self._index.can_complete(trial):
+                    _LOG.warning("Trial %s :: update failed: %s", self, status)
+                    raise RuntimeError(f"Failed to update the status of the trial {self} to {status}.")
+                record["metrics"] = metrics or {}
+            else:
+                assert metrics is None, f"Unexpected metrics for status: {status}"
+                if self._index.trials[self._trial_id].status == Status.RUNNING:
+                    # Keep the old status and timestamp if already running, but log it.
+                    _LOG.warning("Trial %s :: cannot be updated to: %s", self, status)
+            self._index.append(record)
+        return metrics
+
+    def heartbeat(self, timestamp: datetime) -> bool:
+        timestamp = utcify_timestamp(timestamp, origin="local")
+        with self._index.lock:
+            is_alive = self._index.is_owned(self._index.trials[self._trial_id], self._worker_id)
+            if is_alive:
+                self._index.append({
+                    "type": "heartbeat",
+                    "trial_id": self._trial_id,
+                    "worker_id": self._worker_id,
+                    "ts": format_timestamp(timestamp),
+                })
+        if not is_alive:
+            _LOG.info("Trial %s :: lease of %s is over", self, self._worker_id)
+        return is_alive
+
+    def update_telemetry(self, status: Status, timestamp: datetime,
+                         metrics: List[Tuple[datetime, str, Any]]) -> None:
+        super().update_telemetry(status, timestamp, metrics)
+        metrics = [(utcify_timestamp(ts, origin="local"), key, val) for (ts, key, val) in metrics]
+        # The records at the high-water mark itself can still be new (e.g., other metrics).
+        if self._telemetry_ts is not None:
+            metrics = [(metric_ts, key, val) for (metric_ts, key, val) in metrics
+                       if metric_ts >= self._telemetry_ts]
+        if not metrics:
+            return
+        # The duplicates (if any) are skipped when reading the telemetry.
+        self._index.append({
+            "type": "telemetry",
+            "trial_id": self._trial_id,
+            "status": status.name,
+            "ts": format_timestamp(utcify_timestamp(timestamp, origin="local")),
+            "metrics": [(format_timestamp(metric_ts), key, val) for (metric_ts, key, val) in metrics],
+        })
+        self._telemetry_ts = max(metric_ts for (metric_ts, _key, _val) in metrics)
@@ -0,0 +1,91 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+An interface to access the benchmark trial data stored in the experiment log.
+"""
+from datetime import datetime
+from typing import Optional, TYPE_CHECKING
+
+import pandas
+
+from mlos_bench.environments.status import Status
+from mlos_bench.storage.base_trial_data import TrialData
+from mlos_bench.storage.base_tunable_config_data import TunableConfigData
+from mlos_bench.storage.file.index import ExperimentIndex
+from mlos_bench.storage.file.tunable_config_data import TunableConfigFileData
+
+if TYPE_CHECKING:
+    from mlos_bench.storage.base_tunable_config_trial_group_data import TunableConfigTrialGroupData
+
+
+class TrialFileData(TrialData):
+    """
+    An interface to access the trial data stored in the experiment log.
+    """
+
+    def __init__(self, *,
+                 index: ExperimentIndex,
+                 experiment_id: str,
+                 trial_id: int,
+                 config_id: int,
+                 ts_start: datetime,
+                 ts_end: Optional[datetime],
+                 status: Status):
+        super().__init__(
+            experiment_id=experiment_id,
+            trial_id=trial_id,
+            tunable_config_id=config_id,
+            ts_start=ts_start,
+            ts_end=ts_end,
+            status=status,
+        )
+        self._index = index
+
+    @property
+    def tunable_config(self) -> TunableConfigData:
+        """
+        Retrieve the trial's tunable configuration from the storage.
+
+        Note: this corresponds to the Trial object's "tunables" property.
+        """
+        return TunableConfigFileData(index=self._index, tunable_config_id=self._tunable_config_id)
+
+    @property
+    def tunable_config_trial_group(self) -> "TunableConfigTrialGroupData":
+        """
+        Retrieve the trial's tunable config group configuration data from the storage.
+        """
+        # pylint: disable=import-outside-toplevel
+        from mlos_bench.storage.file.tunable_config_trial_group_data import TunableConfigTrialGroupFileData
+        return TunableConfigTrialGroupFileData(index=self._index,
+                                               experiment_id=self._experiment_id,
+                                               tunable_config_id=self._tunable_config_id)
+
+    @property
+    def results_df(self) -> pandas.DataFrame:
+        """
+        Retrieve the trials' results from the storage.
+        """
+        with self._index.lock:
+            results = dict(self._index.trials[self._trial_id].results)
+        return pandas.DataFrame(sorted(results.items()), columns=['metric', 'value'])
+
+    @property
+    def telemetry_df(self) -> pandas.DataFrame:
+        """
+        Retrieve the trials' telemetry from the storage.
+        """
+        return pandas.DataFrame(self._index.read_telemetry(self._trial_id), columns=['ts', 'metric', 'value'])
+
+    @property
+    def metadata_df(self) -> pandas.DataFrame:
+        """
+        Retrieve the trials' metadata params.
+
+        Note: this corresponds to the Trial object's "config" property.
+        """
+        with self._index.lock:
+            params = dict(self._index.trials[self._trial_id].params)
+        return pandas.DataFrame(sorted(params.items()), columns=['parameter', 'value'])
@@ -0,0 +1,32 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+An interface to access the tunable config data stored in the experiment log.
+"""
+
+import pandas
+
+from mlos_bench.storage.base_tunable_config_data import TunableConfigData
+from mlos_bench.storage.file.index import ExperimentIndex
+
+
+class TunableConfigFileData(TunableConfigData):
+    """
+    File storage interface for accessing the stored experiment benchmark (tunable) config data.
+
+    A configuration in this context is the set of tunable parameter values.
+    """
+
+    def __init__(self, *,
+                 index: ExperimentIndex,
+                 tunable_config_id: int):
+        super().__init__(tunable_config_id=tunable_config_id)
+        self._index = index
+
+    @property
+    def config_df(self) -> pandas.DataFrame:
+        with self._index.lock:
+            params = dict(self._index.configs.get(self._tunable_config_id, {}))
+        return pandas.DataFrame(sorted(params.items()), columns=['parameter', 'value'])
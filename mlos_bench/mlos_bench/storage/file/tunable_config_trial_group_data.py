@@ -0,0 +1,69 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+An interface to access the tunable config trial group data stored in the experiment log.
+"""
+
+from typing import Mapping, Optional, TYPE_CHECKING
+
+import pandas
+
+from mlos_bench.storage.base_tunable_config_data import TunableConfigData
+from mlos_bench.storage.base_tunable_config_trial_group_data import TunableConfigTrialGroupData
+from mlos_bench.storage.file import common
+from mlos_bench.storage.file.index import ExperimentIndex
+from mlos_bench.storage.file.tunable_config_data import TunableConfigFileData
+
+if TYPE_CHECKING:
+    from mlos_bench.storage.base_trial_data import TrialData
+
+
+class TunableConfigTrialGroupFileData(TunableConfigTrialGroupData):
+    """
+    File storage interface for accessing the stored experiment benchmark tunable
+    config trial group data.
+
+    A (tunable) config is used to define an instance of values for a set of tunable
+    parameters for a given experiment and can be used by one or more trial instances
+    (e.g., for repeats), which we call a (tunable) config trial group.
+    """
+
+    def __init__(self, *,
+                 index: ExperimentIndex,
+                 experiment_id: str,
+                 tunable_config_id: int,
+                 tunable_config_trial_group_id: Optional[int] = None):
+        super().__init__(
+            experiment_id=experiment_id,
+            tunable_config_id=tunable_config_id,
+            tunable_config_trial_group_id=tunable_config_trial_group_id,
+        )
+        self._index = index
+
+    def _get_tunable_config_trial_group_id(self) -> int:
+        """
+        Retrieve the trial's tunable_config_trial_group_id from the storage.
+        """
+        return min(trial.trial_id for trial in self._index.trials_by_config(self._tunable_config_id))
+
+    @property
+    def tunable_config(self) -> TunableConfigData:
+        return TunableConfigFileData(index=self._index, tunable_config_id=self.tunable_config_id)
+
+    @property
+    def trials(self) -> Mapping[int, "TrialData"]:
+        """
+        Retrieve the trials' data for this (tunable) config trial group from the storage.
+
+        Returns
+        -------
+        trials : Mapping[int, TrialData]
+            A mapping of the trials' data, keyed by trial id.
+        """
+        return common.get_trials(self._index, self._experiment_id, self._tunable_config_id)
+
+    @property
+    def results_df(self) -> pandas.DataFrame:
+        return common.get_results_df(self._index, self._tunable_config_id)
@@ -5,67 +5,149 @@
 """
 Common SQL methods for accessing the stored benchmark data.
 """
-from typing import Dict, Optional
+from typing import Collection, Iterable, Mapping, Optional, Union
 
 import pandas
-from sqlalchemy import Engine, Integer, func, and_, select
+from sqlalchemy import ColumnElement, Engine, Insert, Integer, Table, case, func, and_, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
 
 from mlos_bench.environments.status import Status
 from mlos_bench.storage.base_experiment_data import ExperimentData
 from mlos_bench.storage.base_trial_data import TrialData
+from mlos_bench.storage.experiment_progress import ExperimentProgress
+from mlos_bench.storage.sql.lazy_mapping import LazySqlMapping
 from mlos_bench.storage.sql.schema import DbSchema
 from mlos_bench.util import utcify_timestamp, utcify_nullable_timestamp
 
 
+def insert_ignore(engine: Engine, table: Table) -> Optional[Insert]:
+    """
+    Build an INSERT statement for the table that silently skips the rows that
+    violate the unique constraints, using the dialect-specific syntax.
+    Return None if the database dialect does not support it.
+    """
+    dialect = engine.dialect.name
+    if dialect == "sqlite":
+        return sqlite.insert(table).on_conflict_do_nothing()
+    if dialect in {"postgresql", "duckdb"}:
+        return postgresql.insert(table).on_conflict_do_nothing()
+    if dialect in {"mysql", "mariadb"}:
+        return table.insert().prefix_with("IGNORE")
+    return None
+
+
+def typed_value(str_value: Optional[str],
+                num_value: Optional[float]) -> Optional[Union[int, float, str]]:
+    """
+    Combine the string and numeric columns of a stored metric or parameter
+    into a single value: a number, if available, and the string otherwise.
+    Only the values saved as ints (e.g., "10", but not "10.0") are returned
+    as ints, so the float columns of the results keep their dtype.
+    """
+    if num_value is None:
+        return str_value
+    if num_value.is_integer() and str_value is not None:
+        try:
+            return int(str_value)
+        except ValueError:
+            pass
+    return num_value
+
+
 def get_trials(
         engine: Engine,
         schema: DbSchema,
         experiment_id: str,
-        tunable_config_id: Optional[int] = None) -> Dict[int, TrialData]:
+        tunable_config_id: Optional[int] = None) -> Mapping[int, TrialData]:
     """
-    Gets TrialData for the given experiment_data and optionally additionally
-    restricted by tunable_config_id.
+    Gets a lazy mapping of TrialData for the given experiment_data and optionally
+    additionally restricted by tunable_config_id. The trials are fetched on access.
     Used by both TunableConfigTrialGroupSqlData and ExperimentSqlData.
     """
     from mlos_bench.storage.sql.trial_data import TrialSqlData  # pylint: disable=import-outside-toplevel,cyclic-import
-    with engine.connect() as conn:
-        # Build up sql a statement for fetching trials.
-        stmt = schema.trial.select().where(
-            schema.trial.c.exp_id == experiment_id,
-        ).order_by(
-            schema.trial.c.exp_id.asc(),
-            schema.trial.c.trial_id.asc(),
+    # Build up sql a statement for fetching trials.
+    stmt = schema.trial.select().where(
+        schema.trial.c.exp_id == experiment_id,
+    )
+    # Optionally restrict to those using a particular tunable config.
+    if tunable_config_id is not None:
+        stmt = stmt.where(
+            schema.trial.c.config_id == tunable_config_id,
         )
-        # Optionally restrict to those using a particular tunable config.
-        if tunable_config_id is not None:
-            stmt = stmt.where(
-                schema.trial.c.config_id == tunable_config_id,
-            )
-        trials = conn.execute(stmt)
-        return {
-            trial.trial_id: TrialSqlData(
-                engine=engine,
-                schema=schema,
-                experiment_id=experiment_id,
-                trial_id=trial.trial_id,
-                config_id=trial.config_id,
-                ts_start=utcify_timestamp(trial.ts_start, origin="utc"),
-                ts_end=utcify_nullable_timestamp(trial.ts_end, origin="utc"),
-                status=Status[trial.status],
+    return LazySqlMapping(
+        engine=engine,
+        stmt=stmt,
+        key=schema.trial.c.trial_id,
+        factory=lambda trial: TrialSqlData(
+            engine=engine,
+            schema=schema,
+            experiment_id=experiment_id,
+            trial_id=trial.trial_id,
+            config_id=trial.config_id,
+            ts_start=utcify_timestamp(trial.ts_start, origin="utc"),
+            ts_end=utcify_nullable_timestamp(trial.ts_end, origin="utc"),
+            status=Status[trial.status],
+        ),
+    )
+
+
+def get_progress(engine: Engine, schema: DbSchema, experiment_id: str) -> ExperimentProgress:
+    """
+    Compute the progress of the experiment from the timestamps of its trials.
+    Used by both ExperimentSqlData and the Experiment object of SqlStorage.
+
+    The trials merged from other experiments (see `Experiment.merge()`) keep
+    their original timestamps, so they do not count towards the progress.
+    """
+    merged_trial_ids = select(schema.trial_param.c.trial_id).where(
+        schema.trial_param.c.exp_id == experiment_id,
+        schema.trial_param.c.param_id == "merged_from",
+    )
+    with engine.connect() as conn:
+        cur_trials = conn.execute(
+            select(
+                schema.trial.c.ts_start,
+                schema.trial.c.ts_end,
+                schema.trial.c.status,
+            ).where(
+                schema.trial.c.exp_id == experiment_id,
+                schema.trial.c.trial_id.not_in(merged_trial_ids),
             )
-            for trial in trials.fetchall()
-        }
+        )
+        return ExperimentProgress(
+            (utcify_timestamp(row.ts_start, origin="utc"),
+             utcify_nullable_timestamp(row.ts_end, origin="utc"),
+             Status[row.status])
+            for row in cur_trials.fetchall()
+        )
+
+
+def _trial_id_filter(column: ColumnElement, min_trial_id: int,
+                     trial_ids: Collection[int]) -> ColumnElement:
+    """
+    Build a WHERE clause to select the trials with IDs greater than `min_trial_id`
+    or listed in `trial_ids`.
+    """
+    if not trial_ids:
+        return column > min_trial_id
+    return or_(column > min_trial_id, column.in_(sorted(trial_ids)))
 
 
 def get_results_df(
         engine: Engine,
         schema: DbSchema,
         experiment_id: str,
-        tunable_config_id: Optional[int] = None) -> pandas.DataFrame:
+        tunable_config_id: Optional[int] = None,
+        min_trial_id: Optional[int] = None,
+        trial_ids: Collection[int] = ()) -> pandas.DataFrame:
     """
     Gets TrialData for the given experiment_data and optionally additionally
     restricted by tunable_config_id.
     Used by both TunableConfigTrialGroupSqlData and ExperimentSqlData.
+
+    If `min_trial_id` is specified, only return the trials with the IDs greater
+    than `min_trial_id` or listed in `trial_ids` (used for the incremental
+    updates in `ResultsCache`).
     """
     # pylint: disable=too-many-locals
     with engine.connect() as conn:
@@ -106,6 +188,9 @@ def get_results_df(
             cur_trials_stmt = cur_trials_stmt.where(
                 schema.trial.c.config_id == tunable_config_id,
             )
+        if min_trial_id is not None:
+            cur_trials_stmt = cur_trials_stmt.where(
+                _trial_id_filter(schema.trial.c.trial_id, min_trial_id, trial_ids))
         cur_trials = conn.execute(cur_trials_stmt)
         trials_df = pandas.DataFrame(
             [(
@@ -132,6 +217,7 @@ def get_results_df(
             schema.trial.c.config_id,
             schema.config_param.c.param_id,
             schema.config_param.c.param_value,
+            schema.config_param.c.param_value_num,
         ).where(
             schema.trial.c.exp_id == experiment_id,
         ).join(
@@ -146,21 +232,27 @@ def get_results_df(
             configs_stmt = configs_stmt.where(
                 schema.trial.c.config_id == tunable_config_id,
             )
+        if min_trial_id is not None:
+            configs_stmt = configs_stmt.where(
+                _trial_id_filter(schema.trial.c.trial_id, min_trial_id, trial_ids))
         configs = conn.execute(configs_stmt)
         configs_df = pandas.DataFrame(
-            [(row.trial_id, row.config_id, ExperimentData.CONFIG_COLUMN_PREFIX + row.param_id, row.param_value)
+            [(row.trial_id, row.config_id, ExperimentData.CONFIG_COLUMN_PREFIX + row.param_id,
+              typed_value(row.param_value, row.param_value_num))
              for row in configs.fetchall()],
-            columns=['trial_id', 'tunable_config_id', 'param', 'value']
-        ).pivot(
+            columns=['trial_id', 'tunable_config_id', 'param', 'value'],
+            # Do not coerce the ints to floats before splitting the values into columns.
+            dtype=object,
+        ).astype({'trial_id': int, 'tunable_config_id': int}).pivot(
             index=["trial_id", "tunable_config_id"], columns="param", values="value",
-        )
-        configs_df = configs_df.apply(pandas.to_numeric, errors='coerce').fillna(configs_df)    # type: ignore[assignment]  # (fp)
+        ).infer_objects()
 
         # Get each trial's results in wide format.
         results_stmt = schema.trial_result.select().with_only_columns(
             schema.trial_result.c.trial_id,
             schema.trial_result.c.metric_id,
             schema.trial_result.c.metric_value,
+            schema.trial_result.c.metric_value_num,
         ).where(
             schema.trial_result.c.exp_id == experiment_id,
         ).order_by(
@@ -173,16 +265,110 @@ def get_results_df(
                 schema.trial.c.trial_id == schema.trial_result.c.trial_id,
                 schema.trial.c.config_id == tunable_config_id,
             ))
+        if min_trial_id is not None:
+            results_stmt = results_stmt.where(
+                _trial_id_filter(schema.trial_result.c.trial_id, min_trial_id, trial_ids))
         results = conn.execute(results_stmt)
         results_df = pandas.DataFrame(
-            [(row.trial_id, ExperimentData.RESULT_COLUMN_PREFIX + row.metric_id, row.metric_value)
+            [(row.trial_id, ExperimentData.RESULT_COLUMN_PREFIX + row.metric_id,
+              typed_value(row.metric_value, row.metric_value_num))
              for row in results.fetchall()],
-            columns=['trial_id', 'metric', 'value']
-        ).pivot(
+            columns=['trial_id', 'metric', 'value'],
+            dtype=object,
+        ).astype({'trial_id': int}).pivot(
             index="trial_id", columns="metric", values="value",
-        )
-        results_df = results_df.apply(pandas.to_numeric, errors='coerce').fillna(results_df)    # type: ignore[assignment]  # (fp)
+        ).infer_objects()
 
         # Concat the trials, configs, and results.
         return trials_df.merge(configs_df, on=["trial_id", "tunable_config_id"], how="left") \
                         .merge(results_df, on="trial_id", how="left")
+
+
+def get_config_trial_group_stats(
+        engine: Engine,
+        schema: DbSchema,
+        experiment_id: str,
+        metric: str,
+        percentiles: Iterable[int]) -> pandas.DataFrame:
+    """
+    Compute the statistics of the numeric metric for each tunable config trial
+    group of the experiment in the database, so only the aggregated rows are
+    fetched. See `ExperimentData.config_trial_group_stats()` for details.
+    Only the successful trials are counted.
+
+    Returns a DataFrame with [tunable_config_id, tunable_config_trial_group_id,
+    count, mean, var, p50, ...] columns.
+    """
+    # pylint: disable=not-callable
+    percentiles = list(percentiles)
+    trial = schema.trial
+    trial_result = schema.trial_result
+    group_ids = select(
+        trial.c.config_id,
+        func.min(trial.c.trial_id).label("tunable_config_trial_group_id"),
+    ).where(
+        trial.c.exp_id == experiment_id,
+    ).group_by(
+        trial.c.config_id,
+    ).subquery()
+
+    # Rank the values within each group for the percentiles, and get the group
+    # mean for the (numerically stable) two-pass variance.
+    value = trial_result.c.metric_value_num
+    ranked = select(
+        trial.c.config_id,
+        value.label("value"),
+        (func.row_number().over(partition_by=trial.c.config_id, order_by=value) - 1).label("rn"),
+        func.count().over(partition_by=trial.c.config_id).label("cnt"),
+        func.avg(value).over(partition_by=trial.c.config_id).label("group_mean"),
+    ).select_from(
+        trial_result.join(trial, and_(
+            trial.c.exp_id == trial_result.c.exp_id,
+            trial.c.trial_id == trial_result.c.trial_id,
+        ))
+    ).where(
+        trial_result.c.exp_id == experiment_id,
+        trial_result.c.metric_id == metric,
+        trial.c.status == Status.SUCCEEDED.name,
+        value.is_not(None),
+    ).subquery()
+
+    # The percentile p is interpolated between the values at the positions
+    # floor((cnt - 1) * p / 100) and ceil((cnt - 1) * p / 100). Select both
+    # using integer arithmetic only, so it works the same in all SQL dialects.
+    percentile_cols = []
+    for percentile in percentiles:
+        pos = (ranked.c.cnt - 1) * percentile
+        percentile_cols += [
+            func.max(case((and_(ranked.c.rn * 100 <= pos, (ranked.c.rn + 1) * 100 > pos), ranked.c.value))
+                     ).label(f"p{percentile}_lo"),
+            func.max(case((and_(ranked.c.rn * 100 >= pos, (ranked.c.rn - 1) * 100 < pos), ranked.c.value))
+                     ).label(f"p{percentile}_hi"),
+        ]
+    stats_stmt = select(
+        ranked.c.config_id.label("tunable_config_id"),
+        group_ids.c.tunable_config_trial_group_id,
+        func.count().label("count"),
+        func.avg(ranked.c.value).label("mean"),
+        func.sum((ranked.c.value - ranked.c.group_mean) * (ranked.c.value - ranked.c.group_mean)).label("sum_sq"),
+        *percentile_cols,
+    ).select_from(
+        ranked.join(group_ids, group_ids.c.config_id == ranked.c.config_id)
+    ).group_by(
+        ranked.c.config_id,
+        group_ids.c.tunable_config_trial_group_id,
+    ).order_by(
+        group_ids.c.tunable_config_trial_group_id,
+    )
+    with engine.connect() as conn:
+        stats = conn.execute(stats_stmt)
+        stats_df = pandas.DataFrame(stats.fetchall(), columns=list(stats.keys()))
+    if stats_df.empty:
+        return stats_df
+    stats_df["var"] = (stats_df["sum_sq"] / (stats_df["count"] - 1)).where(stats_df["count"] > 1)
+    for percentile in percentiles:
+        pos = (stats_df["count"] - 1) * percentile / 100
+        frac = pos - pos.astype(int)
+        (val_lo, val_hi) = (stats_df[f"p{percentile}_lo"], stats_df[f"p{percentile}_hi"])
+        stats_df[f"p{percentile}"] = val_lo + frac * (val_hi - val_lo)
+    return stats_df
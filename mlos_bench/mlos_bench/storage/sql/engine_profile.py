@@ -0,0 +1,176 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Dialect-aware settings of the SQLAlchemy engine for concurrent writers and readers.
+
+With the SQLAlchemy and driver defaults, SQLite uses the rollback journal, so a
+reader (e.g., a notebook loading `results_df`) and the scheduler writing the
+trial results block each other, and the connections of the network databases
+can go stale in long-running experiments. The profile of each dialect sets up
+the journal, the lock timeouts, and the connection pool for the concurrent use
+of the storage by one writer and several readers.
+
+The default profile can be overridden (or disabled altogether) with the
+`engine_profile` parameter of the storage config.
+"""
+
+import logging
+from typing import Any, Dict, Optional, Union
+
+from sqlalchemy import URL, Engine, create_engine, event
+
+_LOG = logging.getLogger(__name__)
+
+DEFAULT_PROFILES: Dict[str, Dict[str, Any]] = {
+    "sqlite": {
+        # Readers do not block the writer (and vice versa) in the WAL mode.
+        "journal_mode": "WAL",
+        # Safe with WAL: a power loss can only roll back the last transactions.
+        "synchronous": "NORMAL",
+        "busy_timeout": 30.0,
+        "mmap_size": 256 * 1024 * 1024,
+        "pool_size": 5,
+        "max_overflow": 10,
+    },
+    "duckdb": {
+        # All connections of the process share the same database instance.
+        "pool_size": 5,
+        "max_overflow": 10,
+    },
+    "postgresql": {
+        "busy_timeout": 30.0,
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_pre_ping": True,
+        "pool_recycle": 3600,
+    },
+    "mysql": {
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_pre_ping": True,
+        "pool_recycle": 3600,
+    },
+}
+"""
+Default engine profiles of the SQLAlchemy dialects.
+"""
+
+_POOL_SETTINGS = {"pool_size", "max_overflow", "pool_timeout", "pool_recycle", "pool_pre_ping"}
+
+_DIALECT_SETTINGS = {
+    "sqlite": {"journal_mode", "synchronous", "busy_timeout", "mmap_size"},
+    "duckdb": {"threads", "memory_limit", "checkpoint_threshold"},
+    "postgresql": {"busy_timeout"},
+    "mysql": set(),
+}
+
+# Allowed values of the SQLite PRAGMA settings (see also `storage-schema.json`).
+# The values are interpolated into the PRAGMA statements, so never pass them through as is.
+_PRAGMA_VALUES = {
+    "journal_mode": {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"},
+    "synchronous": {"OFF", "NORMAL", "FULL", "EXTRA"},
+}
+
+
+def is_in_memory(url: URL) -> bool:
+    """
+    Check if the URL points to an in-memory database.
+    """
+    return url.get_backend_name() in {"sqlite", "duckdb"} and url.database in {None, "", ":memory:"}
+
+
+def get_engine_profile(url: URL, settings: Union[bool, Dict[str, Any], None] = None) -> Dict[str, Any]:
+    """
+    Get the engine profile for the database: the default profile of its dialect
+    updated with the given settings.
+
+    Parameters
+    ----------
+    url : URL
+        SQLAlchemy URL of the database.
+    settings : Union[bool, Dict[str, Any], None]
+        Settings to override the default profile with.
+        False means no profile (i.e., use the SQLAlchemy defaults).
+
+    Returns
+    -------
+    profile : Dict[str, Any]
+        The engine profile settings.
+    """
+    if settings is False:
+        return {}
+    settings = settings if isinstance(settings, dict) else {}
+    dialect = url.get_backend_name()
+    supported = _POOL_SETTINGS | _DIALECT_SETTINGS.get(dialect, set())
+    unsupported = set(settings) - supported
+    if unsupported:
+        raise ValueError(f"Engine profile settings not supported for {dialect}: {sorted(unsupported)}")
+    for (key, values) in _PRAGMA_VALUES.items():
+        if key in settings and settings[key] not in values:
+            raise ValueError(f"Invalid {key}: {settings[key]!r} (must be one of {sorted(values)})")
+    if "mmap_size" in settings and (not isinstance(settings["mmap_size"], int) or isinstance(settings["mmap_size"], bool)):
+        raise ValueError(f"Invalid mmap_size: {settings['mmap_size']!r}")
+    return {**DEFAULT_PROFILES.get(dialect, {}), **settings}
+
+
+def create_profiled_engine(url: URL, profile: Dict[str, Any], **kwargs: Any) -> Engine:
+    """
+    Create the SQLAlchemy engine for the database with the given profile
+    (as returned by `get_engine_profile()`).
+
+    Parameters
+    ----------
+    url : URL
+        SQLAlchemy URL of the database.
+    profile : Dict[str, Any]
+        The engine profile settings.
+    kwargs : Any
+        Other parameters to pass to `sqlalchemy.create_engine()`.
+
+    Returns
+    -------
+    engine : Engine
+        The SQLAlchemy engine.
+    """
+    dialect = url.get_backend_name()
+    engine_kwargs: Dict[str, Any] = dict(kwargs)
+    if not is_in_memory(url):
+        # In-memory databases use a single connection per thread.
+        engine_kwargs.update({key: val for (key, val) in profile.items() if key in _POOL_SETTINGS})
+    connect_args: Dict[str, Any] = {}
+    pragmas: Dict[str, Any] = {}
+    busy_timeout: Optional[float] = profile.get("busy_timeout")
+    if dialect == "sqlite":
+        if busy_timeout is not None:
+            connect_args["timeout"] = busy_timeout
+        pragmas = {key: profile[key] for key in ("journal_mode", "synchronous", "mmap_size") if key in profile}
+    elif dialect == "duckdb":
+        config = {key: profile[key] for key in ("threads", "memory_limit", "checkpoint_threshold") if key in profile}
+        if config:
+            connect_args["config"] = config
+    elif dialect == "postgresql" and busy_timeout is not None:
+        connect_args["options"] = f"-c lock_timeout={int(busy_timeout * 1000)}"
+    if connect_args:
+        engine_kwargs["connect_args"] = {**connect_args, **engine_kwargs.get("connect_args", {})}
+    _LOG.debug("Create engine for %s with profile: %s", dialect, profile)
+    engine = create_engine(url, **engine_kwargs)
+    if pragmas:
+        _set_pragmas_on_connect(engine, pragmas)
+    return engine
+
+
+def _set_pragmas_on_connect(engine: Engine, pragmas: Dict[str, Any]) -> None:
+    """
+    Apply the SQLite PRAGMA settings to each new connection of the engine.
+    """
+    def _on_connect(dbapi_conn: Any, _conn_record: Any) -> None:
+        cursor = dbapi_conn.cursor()
+        try:
+            for (name, value) in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+
+    event.listen(engine, "connect", _on_connect)
@@ -6,20 +6,29 @@
 Saving and restoring the benchmark data using SQLAlchemy.
 """
 
+import json
 import logging
 import hashlib
-from datetime import datetime
-from typing import Optional, Tuple, List, Literal, Dict, Iterator, Any
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional, Sequence, Tuple, List, Literal, Dict, Iterator, Any
 
 from pytz import UTC
 
-from sqlalchemy import Engine, Connection, CursorResult, Table, column, func, select
+from sqlalchemy import (
+    Engine, Connection, CursorResult, Table, String, and_, cast, column, func, literal, select,
+)
+from sqlalchemy.exc import IntegrityError
 
 from mlos_bench.environments.status import Status
 from mlos_bench.tunables.tunable_groups import TunableGroups
 from mlos_bench.storage.base_storage import Storage
-from mlos_bench.storage.sql.schema import DbSchema
+from mlos_bench.storage.experiment_progress import ExperimentProgress
+from mlos_bench.storage.sql import common
+from mlos_bench.storage.sql.schema import DbSchema, numeric_value
+from mlos_bench.storage.sql.telemetry_rollup import TelemetryRollups
 from mlos_bench.storage.sql.trial import Trial
+from mlos_bench.storage.sql.writer import StorageWriter
 from mlos_bench.util import nullable, utcify_timestamp
 
 _LOG = logging.getLogger(__name__)
@@ -30,6 +39,11 @@ class Experiment(Storage.Experiment):
     Logic for retrieving and storing the results of a single experiment.
     """
 
+    _CONFIG_CACHE_SIZE = 4096
+    """
+    Maximum number of the config hash -> config_id records to keep in memory.
+    """
+
     def __init__(self, *,
                  engine: Engine,
                  schema: DbSchema,
@@ -38,7 +52,9 @@ class Experiment(Storage.Experiment):
                  trial_id: int,
                  root_env_config: str,
                  description: str,
-                 opt_targets: Dict[str, Literal['min', 'max']]):
+                 opt_targets: Dict[str, Literal['min', 'max']],
+                 writer: Optional[StorageWriter] = None,
+                 rollups: Optional[TelemetryRollups] = None):
         super().__init__(
             tunables=tunables,
             experiment_id=experiment_id,
@@ -49,6 +65,10 @@ class Experiment(Storage.Experiment):
         )
         self._engine = engine
         self._schema = schema
+        self._writer = writer
+        self._rollups = rollups
+        # LRU cache of the IDs of the configs (by hash) known to be in the database.
+        self._config_ids: OrderedDict[str, int] = OrderedDict()
 
     def _setup(self) -> None:
         super()._setup()
@@ -104,15 +124,188 @@ class Experiment(Storage.Experiment):
                     _LOG.warning("Experiment %s git expected: %s %s",
                                  self, exp_info.git_repo, exp_info.git_commit)
 
+    def _teardown(self, is_ok: bool) -> None:
+        # Make sure all queued writes reach the database before we leave.
+        if self._writer is not None:
+            self._writer.flush()
+        super()._teardown(is_ok)
+
     def merge(self, experiment_ids: List[str]) -> None:
         _LOG.info("Merge: %s <- %s", self._experiment_id, experiment_ids)
-        raise NotImplementedError("TODO")
+        with self._engine.begin() as conn:
+            for experiment_id in dict.fromkeys(experiment_ids):
+                if experiment_id == self._experiment_id:
+                    _LOG.warning("Cannot merge experiment into itself: %s", self)
+                    continue
+                count = self._merge_experiment(conn, experiment_id)
+                _LOG.info("Merged %d trials: %s <- %s", count, self._experiment_id, experiment_id)
+
+    def _merge_experiment(self, conn: Connection, experiment_id: str) -> int:
+        """
+        Copy the completed trials of the other experiment (along with their
+        parameters and results) that are compatible with the tunables of this
+        experiment, using set-based INSERT ... SELECT statements.
+
+        The trials keep their relative order and get the new IDs after the last
+        trial of this experiment. The configs are shared between the experiments,
+        so the merged trials reuse the config IDs of the original ones.
+        Each merged trial gets a `merged_from` parameter with the original
+        experiment and trial IDs.
+
+        Returns
+        -------
+        count : int
+            Number of the merged trials.
+        """
+        # pylint: disable=too-many-locals
+        schema = self._schema
+        src_objectives = conn.execute(
+            schema.objectives.select().where(schema.objectives.c.exp_id == experiment_id)
+        ).fetchall()
+        if not src_objectives and conn.execute(
+                schema.experiment.select().where(schema.experiment.c.exp_id == experiment_id)).first() is None:
+            raise ValueError(f"Experiment not found: {experiment_id}")
+        missing_targets = set(self._opt_targets) - set(row.optimization_target for row in src_objectives)
+        if missing_targets:
+            _LOG.warning("Skip experiment %s without the optimization targets: %s",
+                         experiment_id, missing_targets)
+            return 0
+        if conn.execute(
+            schema.trial_param.select().where(
+                schema.trial_param.c.exp_id == self._experiment_id,
+                schema.trial_param.c.param_id == "merged_from",
+                schema.trial_param.c.param_value.startswith(f"{experiment_id}:", autoescape=True),
+            ).limit(1)
+        ).first() is not None:
+            _LOG.warning("Experiment %s has already been merged into: %s", experiment_id, self)
+            return 0
+
+        src_trials = and_(
+            schema.trial.c.exp_id == experiment_id,
+            schema.trial.c.status.in_(['SUCCEEDED', 'FAILED', 'TIMED_OUT', 'PRUNED']),
+        )
+        config_ids = self._compatible_config_ids(conn, select(schema.trial.c.config_id).where(src_trials))
+        if not config_ids:
+            return 0
+        src_trials = and_(src_trials, schema.trial.c.config_id.in_(config_ids))
+
+        # Remap the trial IDs to follow the last trial of this experiment.
+        # pylint: disable=not-callable
+        (src_min_trial_id, src_max_trial_id) = conn.execute(
+            select(func.min(schema.trial.c.trial_id), func.max(schema.trial.c.trial_id)).where(src_trials)
+        ).one()
+        last_trial_id = conn.execute(
+            select(func.max(schema.trial.c.trial_id)).where(schema.trial.c.exp_id == self._experiment_id)
+        ).scalar()
+        next_trial_id = max(self._trial_id, (last_trial_id or 0) + 1)
+        offset = next_trial_id - src_min_trial_id
+        src_trial_ids = select(schema.trial.c.trial_id).where(src_trials)
+
+        count = conn.execute(
+            schema.trial.insert().from_select(
+                ["exp_id", "trial_id", "config_id", "ts_start", "ts_end", "status"],
+                select(
+                    literal(self._experiment_id, String),
+                    schema.trial.c.trial_id + offset,
+                    schema.trial.c.config_id,
+                    schema.trial.c.ts_start,
+                    schema.trial.c.ts_end,
+                    schema.trial.c.status,
+                ).where(src_trials)
+            )
+        ).rowcount
+        conn.execute(
+            schema.trial_param.insert().from_select(
+                ["exp_id", "trial_id", "param_id", "param_value", "param_value_num"],
+                select(
+                    literal(self._experiment_id, String),
+                    schema.trial_param.c.trial_id + offset,
+                    schema.trial_param.c.param_id,
+                    schema.trial_param.c.param_value,
+                    schema.trial_param.c.param_value_num,
+                ).where(
+                    schema.trial_param.c.exp_id == experiment_id,
+                    schema.trial_param.c.trial_id.in_(src_trial_ids),
+                    schema.trial_param.c.param_id != "merged_from",
+                )
+            )
+        )
+        conn.execute(
+            schema.trial_param.insert().from_select(
+                ["exp_id", "trial_id", "param_id", "param_value"],
+                select(
+                    literal(self._experiment_id, String),
+                    schema.trial.c.trial_id + offset,
+                    literal("merged_from", String),
+                    literal(f"{experiment_id}:", String) + cast(schema.trial.c.trial_id, String),
+                ).where(src_trials)
+            )
+        )
+        conn.execute(
+            schema.trial_result.insert().from_select(
+                ["exp_id", "trial_id", "metric_id", "metric_value", "metric_value_num"],
+                select(
+                    literal(self._experiment_id, String),
+                    schema.trial_result.c.trial_id + offset,
+                    schema.trial_result.c.metric_id,
+                    schema.trial_result.c.metric_value,
+                    schema.trial_result.c.metric_value_num,
+                ).where(
+                    schema.trial_result.c.exp_id == experiment_id,
+                    schema.trial_result.c.trial_id.in_(src_trial_ids),
+                )
+            )
+        )
+        self._trial_id = max(self._trial_id, src_max_trial_id + offset + 1)
+        return count
+
+    def _is_valid_value(self, name: str, value: Any) -> bool:
+        """
+        Check if the value (as stored in the database) is valid for the tunable.
+        """
+        (tunable, _group) = self._tunables.get_tunable(name)
+        if value is None:
+            return tunable.is_categorical and tunable.is_valid(None)
+        try:
+            return tunable.is_valid(tunable.dtype(value))
+        except (TypeError, ValueError):
+            return False
+
+    def _compatible_config_ids(self, conn: Connection, config_ids: Any) -> List[int]:
+        """
+        Get the IDs of the configs (out of the `config_ids` subquery) that have
+        the same tunable parameters as this experiment, with the values valid
+        for its tunables.
+        """
+        config_params: Dict[int, Dict[str, Any]] = {
+            row.config_id: {} for row in conn.execute(select(config_ids.subquery().c.config_id).distinct())
+        }
+        for row in conn.execute(
+            select(
+                self._schema.config_param.c.config_id,
+                self._schema.config_param.c.param_id,
+                self._schema.config_param.c.param_value,
+            ).where(
+                self._schema.config_param.c.config_id.in_(config_ids),
+            )
+        ):
+            config_params[row.config_id][row.param_id] = row.param_value
+        tunable_names = set(self._tunables.get_param_values())
+        compatible = [
+            config_id for (config_id, params) in config_params.items()
+            if set(params) == tunable_names and all(
+                self._is_valid_value(name, value) for (name, value) in params.items())
+        ]
+        _LOG.debug("Compatible configs: %d of %d", len(compatible), len(config_params))
+        return sorted(compatible)
 
     def load_tunable_config(self, config_id: int) -> Dict[str, Any]:
         with self._engine.connect() as conn:
             return self._get_key_val(conn, self._schema.config_param, "param", config_id=config_id)
 
     def load_telemetry(self, trial_id: int) -> List[Tuple[datetime, str, Any]]:
+        if self._writer is not None:
+            self._writer.flush()
         with self._engine.connect() as conn:
             cur_telemetry = conn.execute(
                 self._schema.trial_telemetry.select().where(
@@ -128,9 +321,46 @@ class Experiment(Storage.Experiment):
             return [(utcify_timestamp(row.ts, origin="utc"), row.metric_id, row.metric_value)
                     for row in cur_telemetry.fetchall()]
 
+    def progress(self) -> ExperimentProgress:
+        return common.get_progress(self._engine, self._schema, self._experiment_id)
+
+    def load_config_trials(self, metric: str) -> Dict[int, Dict[int, Tuple[Status, Optional[Any]]]]:
+        with self._engine.connect() as conn:
+            cur_trials = conn.execute(
+                select(
+                    self._schema.trial.c.config_id,
+                    self._schema.trial.c.trial_id,
+                    self._schema.trial.c.status,
+                    self._schema.trial_result.c.metric_value,
+                ).select_from(
+                    self._schema.trial.outerjoin(
+                        self._schema.trial_result,
+                        (self._schema.trial_result.c.exp_id == self._schema.trial.c.exp_id) &
+                        (self._schema.trial_result.c.trial_id == self._schema.trial.c.trial_id) &
+                        (self._schema.trial_result.c.metric_id == metric),
+                    )
+                ).where(
+                    self._schema.trial.c.exp_id == self._experiment_id,
+                ).order_by(
+                    self._schema.trial.c.trial_id.asc(),
+                )
+            )
+            config_trials: Dict[int, Dict[int, Tuple[Status, Optional[Any]]]] = {}
+            for row in cur_trials.fetchall():
+                config_trials.setdefault(row.config_id, {})[row.trial_id] = (
+                    Status[row.status], row.metric_value)
+            return config_trials
+
     def load(self, last_trial_id: int = -1,
              ) -> Tuple[List[int], List[dict], List[Optional[Dict[str, Any]]], List[Status]]:
 
+        # Load the trials, their configs, and their results in three queries
+        # (instead of two more queries per trial) and join them in memory.
+        trial_filter = (
+            (self._schema.trial.c.exp_id == self._experiment_id) &
+            (self._schema.trial.c.trial_id > last_trial_id) &
+            self._schema.trial.c.status.in_(['SUCCEEDED', 'FAILED', 'TIMED_OUT', 'PRUNED'])
+        )
         with self._engine.connect() as conn:
             cur_trials = conn.execute(
                 self._schema.trial.select().with_only_columns(
@@ -138,33 +368,63 @@ class Experiment(Storage.Experiment):
                     self._schema.trial.c.config_id,
                     self._schema.trial.c.status,
                 ).where(
-                    self._schema.trial.c.exp_id == self._experiment_id,
-                    self._schema.trial.c.trial_id > last_trial_id,
-                    self._schema.trial.c.status.in_(['SUCCEEDED', 'FAILED', 'TIMED_OUT']),
+                    trial_filter,
                 ).order_by(
                     self._schema.trial.c.trial_id.asc(),
                 )
             )
+            trials = cur_trials.fetchall()
+            if not trials:
+                return ([], [], [], [])
 
-            trial_ids: List[int] = []
-            configs: List[Dict[str, Any]] = []
-            scores: List[Optional[Dict[str, Any]]] = []
-            status: List[Status] = []
-
-            for trial in cur_trials.fetchall():
-                stat = Status[trial.status]
-                status.append(stat)
-                trial_ids.append(trial.trial_id)
-                configs.append(self._get_key_val(
-                    conn, self._schema.config_param, "param", config_id=trial.config_id))
-                if stat.is_succeeded():
-                    scores.append(self._get_key_val(
-                        conn, self._schema.trial_result, "metric",
-                        exp_id=self._experiment_id, trial_id=trial.trial_id))
-                else:
-                    scores.append(None)
-
-            return (trial_ids, configs, scores, status)
+            cur_params = conn.execute(
+                select(
+                    self._schema.config_param.c.config_id,
+                    self._schema.config_param.c.param_id,
+                    self._schema.config_param.c.param_value,
+                ).where(
+                    self._schema.config_param.c.config_id.in_(
+                        select(self._schema.trial.c.config_id).where(trial_filter)
+                    ),
+                )
+            )
+            config_params: Dict[int, Dict[str, Any]] = {}
+            for row in cur_params.fetchall():
+                config_params.setdefault(row.config_id, {})[row.param_id] = row.param_value
+
+            cur_results = conn.execute(
+                select(
+                    self._schema.trial_result.c.trial_id,
+                    self._schema.trial_result.c.metric_id,
+                    self._schema.trial_result.c.metric_value,
+                ).select_from(
+                    self._schema.trial_result.join(
+                        self._schema.trial,
+                        (self._schema.trial.c.exp_id == self._schema.trial_result.c.exp_id) &
+                        (self._schema.trial.c.trial_id == self._schema.trial_result.c.trial_id),
+                    )
+                ).where(
+                    trial_filter,
+                    self._schema.trial.c.status == 'SUCCEEDED',
+                )
+            )
+            trial_results: Dict[int, Dict[str, Any]] = {}
+            for row in cur_results.fetchall():
+                trial_results.setdefault(row.trial_id, {})[row.metric_id] = row.metric_value
+
+        trial_ids: List[int] = []
+        configs: List[Dict[str, Any]] = []
+        scores: List[Optional[Dict[str, Any]]] = []
+        status: List[Status] = []
+
+        for trial in trials:
+            stat = Status[trial.status]
+            status.append(stat)
+            trial_ids.append(trial.trial_id)
+            configs.append(dict(config_params.get(trial.config_id, {})))
+            scores.append(trial_results.get(trial.trial_id, {}) if stat.is_succeeded() else None)
+
+        return (trial_ids, configs, scores, status)
 
     @staticmethod
     def _get_key_val(conn: Connection, table: Table, field: str, **kwargs: Any) -> Dict[str, Any]:
@@ -192,53 +452,132 @@ class Experiment(Storage.Experiment):
             {
                 **kwargs,
                 "param_id": key,
-                "param_value": nullable(str, val)
+                "param_value": nullable(str, val),
+                "param_value_num": numeric_value(val),
             }
             for (key, val) in params.items()
         ])
 
-    def pending_trials(self, timestamp: datetime, *, running: bool) -> Iterator[Storage.Trial]:
+    def pending_trials(self, timestamp: datetime, *, running: bool,
+                       limit: Optional[int] = None) -> Iterator[Storage.Trial]:
         timestamp = utcify_timestamp(timestamp, origin="local")
         _LOG.info("Retrieve pending trials for: %s @ %s", self._experiment_id, timestamp)
         if running:
             pending_status = ['PENDING', 'READY', 'RUNNING']
         else:
             pending_status = ['PENDING']
+        # Load the trials along with their tunables and configs in three queries and
+        # release the connection before returning them: the caller runs the trials
+        # while iterating over them.
+        trial_filter = (
+            (self._schema.trial.c.exp_id == self._experiment_id) &
+            (self._schema.trial.c.ts_start.is_(None) | (self._schema.trial.c.ts_start <= timestamp)) &
+            self._schema.trial.c.ts_end.is_(None) &
+            self._schema.trial.c.status.in_(pending_status)
+        )
         with self._engine.connect() as conn:
-            cur_trials = conn.execute(self._schema.trial.select().where(
-                self._schema.trial.c.exp_id == self._experiment_id,
-                (self._schema.trial.c.ts_start.is_(None) |
-                 (self._schema.trial.c.ts_start <= timestamp)),
-                self._schema.trial.c.ts_end.is_(None),
-                self._schema.trial.c.status.in_(pending_status),
-            ))
-            for trial in cur_trials.fetchall():
-                tunables = self._get_key_val(
-                    conn, self._schema.config_param, "param",
-                    config_id=trial.config_id)
-                config = self._get_key_val(
-                    conn, self._schema.trial_param, "param",
-                    exp_id=self._experiment_id, trial_id=trial.trial_id)
-                yield Trial(
-                    engine=self._engine,
-                    schema=self._schema,
-                    # Reset .is_updated flag after the assignment:
-                    tunables=self._tunables.copy().assign(tunables).reset(),
-                    experiment_id=self._experiment_id,
-                    trial_id=trial.trial_id,
-                    config_id=trial.config_id,
-                    opt_targets=self._opt_targets,
-                    config=config,
+            stmt = self._schema.trial.select().where(
+                trial_filter,
+            ).order_by(
+                self._schema.trial.c.trial_id.asc(),
+            )
+            if limit is not None:
+                stmt = stmt.limit(limit)
+            trials = conn.execute(stmt).fetchall()
+            if not trials:
+                return iter([])
+
+            # Use short lists of IDs for small batches, and subqueries otherwise
+            # (to stay within the limits on the number of the query parameters).
+            trial_ids = [trial.trial_id for trial in trials]
+            config_ids = {trial.config_id for trial in trials}
+            if limit is None:
+                config_ids_select: Any = select(self._schema.trial.c.config_id).where(trial_filter)
+                trial_ids_select: Any = select(self._schema.trial.c.trial_id).where(trial_filter)
+            else:
+                (config_ids_select, trial_ids_select) = (config_ids, trial_ids)
+            cur_tunables = conn.execute(
+                select(
+                    self._schema.config_param.c.config_id,
+                    self._schema.config_param.c.param_id,
+                    self._schema.config_param.c.param_value,
+                ).where(
+                    self._schema.config_param.c.config_id.in_(config_ids_select),
+                )
+            )
+            tunables: Dict[int, Dict[str, Any]] = {config_id: {} for config_id in config_ids}
+            for row in cur_tunables.fetchall():
+                tunables.setdefault(row.config_id, {})[row.param_id] = row.param_value
+
+            cur_configs = conn.execute(
+                select(
+                    self._schema.trial_param.c.trial_id,
+                    self._schema.trial_param.c.param_id,
+                    self._schema.trial_param.c.param_value,
+                ).where(
+                    self._schema.trial_param.c.exp_id == self._experiment_id,
+                    self._schema.trial_param.c.trial_id.in_(trial_ids_select),
                 )
+            )
+            configs: Dict[int, Dict[str, Any]] = {trial_id: {} for trial_id in trial_ids}
+            for row in cur_configs.fetchall():
+                configs.setdefault(row.trial_id, {})[row.param_id] = row.param_value
+
+        return iter([
+            Trial(
+                engine=self._engine,
+                schema=self._schema,
+                # Reset .is_updated flag after the assignment:
+                tunables=self._tunables.copy().assign(tunables[trial.config_id]).reset(),
+                experiment_id=self._experiment_id,
+                trial_id=trial.trial_id,
+                config_id=trial.config_id,
+                opt_targets=self._opt_targets,
+                config=configs[trial.trial_id],
+                writer=self._writer,
+                rollups=self._rollups,
+            )
+            for trial in trials
+        ])
+
+    @staticmethod
+    def _config_hash(tunables: TunableGroups) -> str:
+        """
+        Compute the hash of the tunable values in a canonical form.
+        """
+        config = json.dumps(tunables.get_param_values(), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(config.encode('utf-8')).hexdigest()
+
+    def _get_cached_config_id(self, config_hash: str) -> Optional[int]:
+        """
+        Look up the config ID in the in-memory cache.
+        """
+        config_id = self._config_ids.get(config_hash)
+        if config_id is not None:
+            self._config_ids.move_to_end(config_hash)
+        return config_id
+
+    def _cache_config_id(self, config_hash: str, config_id: int) -> None:
+        """
+        Save the ID of the config (that is already committed to the database) in the cache.
+        """
+        self._config_ids[config_hash] = config_id
+        self._config_ids.move_to_end(config_hash)
+        while len(self._config_ids) > self._CONFIG_CACHE_SIZE:
+            self._config_ids.popitem(last=False)
 
-    def _get_config_id(self, conn: Connection, tunables: TunableGroups) -> int:
+    def _get_config_id(self, conn: Connection, tunables: TunableGroups,
+                       config_hash: Optional[str] = None) -> int:
         """
         Get the config ID for the given tunables. If the config does not exist,
         create a new record for it.
         """
-        config_hash = hashlib.sha256(str(tunables).encode('utf-8')).hexdigest()
+        if config_hash is None:
+            config_hash = self._config_hash(tunables)
+        # Configs saved by the earlier versions of mlos_bench were hashed by their repr().
+        legacy_config_hash = hashlib.sha256(str(tunables).encode('utf-8')).hexdigest()
         cur_config = conn.execute(self._schema.config.select().where(
-            self._schema.config.c.config_hash == config_hash
+            self._schema.config.c.config_hash.in_([config_hash, legacy_config_hash])
         )).fetchone()
         if cur_config is not None:
             return int(cur_config.config_id)  # mypy doesn't know it's always int
@@ -253,38 +592,128 @@ class Experiment(Storage.Experiment):
 
     def new_trial(self, tunables: TunableGroups, ts_start: Optional[datetime] = None,
                   config: Optional[Dict[str, Any]] = None) -> Storage.Trial:
+        return self.new_trials([tunables], ts_start, [config])[0]
+
+    def new_trials(self, tunables: Sequence[TunableGroups], ts_start: Optional[datetime] = None,
+                   configs: Optional[Sequence[Optional[Dict[str, Any]]]] = None) -> List[Storage.Trial]:
+        if configs is None:
+            configs = [None] * len(tunables)
+        if len(configs) != len(tunables):
+            raise ValueError(f"Mismatched number of tunables and configs: {len(tunables)} != {len(configs)}")
         ts_start = utcify_timestamp(ts_start or datetime.now(UTC), origin="local")
-        _LOG.debug("Create trial: %s:%d @ %s", self._experiment_id, self._trial_id, ts_start)
+        _LOG.debug("Create %d trials: %s:%d @ %s", len(tunables), self._experiment_id, self._trial_id, ts_start)
+        trials: List[Storage.Trial] = []
+        # Configs repeated in the batch or seen before (e.g., for repeated trials)
+        # are resolved without a database lookup.
+        config_ids: Dict[str, int] = {}
         with self._engine.begin() as conn:
             try:
-                config_id = self._get_config_id(conn, tunables)
-                conn.execute(self._schema.trial.insert().values(
-                    exp_id=self._experiment_id,
-                    trial_id=self._trial_id,
-                    config_id=config_id,
-                    ts_start=ts_start,
-                    status='PENDING',
-                ))
-
-                # Note: config here is the framework config, not the target
-                # environment config (i.e., tunables).
-                if config is not None:
-                    self._save_params(
-                        conn, self._schema.trial_param, config,
-                        exp_id=self._experiment_id, trial_id=self._trial_id)
-
-                trial = Trial(
-                    engine=self._engine,
-                    schema=self._schema,
-                    tunables=tunables,
-                    experiment_id=self._experiment_id,
-                    trial_id=self._trial_id,
-                    config_id=config_id,
-                    opt_targets=self._opt_targets,
-                    config=config,
-                )
-                self._trial_id += 1
-                return trial
+                trial_rows: List[Dict[str, Any]] = []
+                trial_param_rows: List[Dict[str, Any]] = []
+                for (trial_id, (trial_tunables, config)) in enumerate(zip(tunables, configs), self._trial_id):
+                    config_hash = self._config_hash(trial_tunables)
+                    if config_hash not in config_ids:
+                        config_id = self._get_cached_config_id(config_hash)
+                        if config_id is None:
+                            config_id = self._get_config_id(conn, trial_tunables, config_hash)
+                        config_ids[config_hash] = config_id
+                    config_id = config_ids[config_hash]
+                    trial_rows.append({
+                        "exp_id": self._experiment_id,
+                        "trial_id": trial_id,
+                        "config_id": config_id,
+                        "ts_start": ts_start,
+                        "status": 'PENDING',
+                    })
+                    # Note: config here is the framework config, not the target
+                    # environment config (i.e., tunables).
+                    trial_param_rows.extend(
+                        {
+                            "exp_id": self._experiment_id,
+                            "trial_id": trial_id,
+                            "param_id": key,
+                            "param_value": nullable(str, val),
+                            "param_value_num": numeric_value(val),
+                        }
+                        for (key, val) in (config or {}).items()
+                    )
+                    trials.append(Trial(
+                        engine=self._engine,
+                        schema=self._schema,
+                        tunables=trial_tunables,
+                        experiment_id=self._experiment_id,
+                        trial_id=trial_id,
+                        config_id=config_id,
+                        opt_targets=self._opt_targets,
+                        config=config,
+                        writer=self._writer,
+                        rollups=self._rollups,
+                    ))
+                if trial_rows:
+                    conn.execute(self._schema.trial.insert(), trial_rows)
+                # Always save the trial configs along with the trials (i.e., never
+                # write-behind): another worker can claim and run the trial right away.
+                if trial_param_rows:
+                    conn.execute(self._schema.trial_param.insert(), trial_param_rows)
             except Exception:
                 conn.rollback()
                 raise
+        # Cache the config IDs only after they are committed.
+        for (config_hash, config_id) in config_ids.items():
+            self._cache_config_id(config_hash, config_id)
+        self._trial_id += len(trials)
+        return trials
+
+    def claim_trial(self, trial: Storage.Trial, *, worker_id: str,
+                    timestamp: datetime, lease_timeout: timedelta) -> bool:
+        timestamp = utcify_timestamp(timestamp, origin="local")
+        _LOG.debug("Claim trial: %s by %s @ %s", trial, worker_id, timestamp)
+        with self._engine.begin() as conn:
+            # Compare-and-set: only one worker can move the trial from PENDING
+            # (or RUNNING with an expired lease) to RUNNING. The running trials
+            # without a heartbeat (e.g., started by a scheduler that does not
+            # claim its trials, or before the migration) hold the lease since
+            # their start time.
+            cur_claim = conn.execute(
+                self._schema.trial.update().where(
+                    self._schema.trial.c.exp_id == self._experiment_id,
+                    self._schema.trial.c.trial_id == trial.trial_id,
+                    self._schema.trial.c.ts_end.is_(None),
+                    (self._schema.trial.c.status == 'PENDING') | (
+                        self._schema.trial.c.status.in_(['READY', 'RUNNING']) & (
+                            (func.coalesce(self._schema.trial.c.ts_heartbeat,
+                                           self._schema.trial.c.ts_start) < timestamp - lease_timeout) |
+                            (self._schema.trial.c.worker_id == worker_id)
+                        )
+                    ),
+                ).values(
+                    status='RUNNING',
+                    ts_start=timestamp,
+                    worker_id=worker_id,
+                    ts_heartbeat=timestamp,
+                )
+            )
+            if cur_claim.rowcount != 1:
+                _LOG.info("Trial %s :: already claimed by another worker", trial)
+                return False
+            row = {
+                "exp_id": self._experiment_id,
+                "trial_id": trial.trial_id,
+                "ts": timestamp,
+                "status": Status.RUNNING.name,
+            }
+            # A failed statement aborts the whole transaction on some databases
+            # (e.g., PostgreSQL), so do not let a duplicate status record undo the claim.
+            stmt = common.insert_ignore(self._engine, self._schema.trial_status)
+            if stmt is not None:
+                conn.execute(stmt, [row])
+            else:
+                try:
+                    with conn.begin_nested():
+                        conn.execute(self._schema.trial_status.insert().values(**row))
+                except IntegrityError as ex:
+                    _LOG.warning("Status with that timestamp already exists: %s %s :: %s",
+                                 trial, timestamp, ex)
+        trial._worker_id = worker_id  # pylint: disable=protected-access
+        _LOG.info("Trial %s :: claimed by %s", trial, worker_id)
+        return True
@@ -5,18 +5,21 @@
 """
 An interface to access the experiment benchmark data stored in SQL DB.
 """
-from typing import Dict, Literal, Optional
+from typing import Dict, Literal, Mapping, Optional
 
 import logging
 
 import pandas
-from sqlalchemy import Engine, Integer, String, func
+from sqlalchemy import Engine, Integer, String, func, select
 
 from mlos_bench.storage.base_experiment_data import ExperimentData
 from mlos_bench.storage.base_trial_data import TrialData
+from mlos_bench.storage.experiment_progress import ExperimentProgress
 from mlos_bench.storage.base_tunable_config_data import TunableConfigData
 from mlos_bench.storage.base_tunable_config_trial_group_data import TunableConfigTrialGroupData
 from mlos_bench.storage.sql import common
+from mlos_bench.storage.sql.lazy_mapping import LazySqlMapping
+from mlos_bench.storage.sql.results_cache import ResultsCache
 from mlos_bench.storage.sql.schema import DbSchema
 from mlos_bench.storage.sql.tunable_config_data import TunableConfigSqlData
 from mlos_bench.storage.sql.tunable_config_trial_group_data import TunableConfigTrialGroupSqlData
@@ -39,7 +42,8 @@ class ExperimentSqlData(ExperimentData):
                  description: str,
                  root_env_config: str,
                  git_repo: str,
-                 git_commit: str):
+                 git_commit: str,
+                 results_cache: Optional[ResultsCache] = None):
         super().__init__(
             experiment_id=experiment_id,
             description=description,
@@ -49,6 +53,9 @@ class ExperimentSqlData(ExperimentData):
         )
         self._engine = engine
         self._schema = schema
+        # The cache can be shared by several instances of the same experiment data.
+        self._results_cache = results_cache or ResultsCache(
+            engine=engine, schema=schema, experiment_id=experiment_id)
 
     @property
     def objectives(self) -> Dict[str, Literal["min", "max"]]:
@@ -66,60 +73,49 @@ class ExperimentSqlData(ExperimentData):
                 for objective in objectives_db_data.fetchall()
             }
 
-    # TODO: provide a way to get individual data to avoid repeated bulk fetches where only small amounts of data is accessed.
-    # Or else make the TrialData object lazily populate.
-
     @property
-    def trials(self) -> Dict[int, TrialData]:
+    def trials(self) -> Mapping[int, TrialData]:
         return common.get_trials(self._engine, self._schema, self._experiment_id)
 
     @property
-    def tunable_config_trial_groups(self) -> Dict[int, TunableConfigTrialGroupData]:
-        with self._engine.connect() as conn:
-            tunable_config_trial_groups = conn.execute(
-                self._schema.trial.select().with_only_columns(
-                    self._schema.trial.c.config_id,
-                    func.min(self._schema.trial.c.trial_id).cast(Integer).label(    # pylint: disable=not-callable
-                        'tunable_config_trial_group_id'),
-                ).where(
-                    self._schema.trial.c.exp_id == self._experiment_id,
-                ).group_by(
-                    self._schema.trial.c.exp_id,
-                    self._schema.trial.c.config_id,
-                )
-            )
-            return {
-                tunable_config_trial_group.config_id: TunableConfigTrialGroupSqlData(
-                    engine=self._engine,
-                    schema=self._schema,
-                    experiment_id=self._experiment_id,
-                    tunable_config_id=tunable_config_trial_group.config_id,
-                    tunable_config_trial_group_id=tunable_config_trial_group.tunable_config_trial_group_id,
-                )
-                for tunable_config_trial_group in tunable_config_trial_groups.fetchall()
-            }
+    def tunable_config_trial_groups(self) -> Mapping[int, TunableConfigTrialGroupData]:
+        return LazySqlMapping(
+            engine=self._engine,
+            stmt=select(
+                self._schema.trial.c.config_id,
+                func.min(self._schema.trial.c.trial_id).cast(Integer).label(    # pylint: disable=not-callable
+                    'tunable_config_trial_group_id'),
+            ).where(
+                self._schema.trial.c.exp_id == self._experiment_id,
+            ).group_by(
+                self._schema.trial.c.config_id,
+            ),
+            key=self._schema.trial.c.config_id,
+            factory=lambda tunable_config_trial_group: TunableConfigTrialGroupSqlData(
+                engine=self._engine,
+                schema=self._schema,
+                experiment_id=self._experiment_id,
+                tunable_config_id=tunable_config_trial_group.config_id,
+                tunable_config_trial_group_id=tunable_config_trial_group.tunable_config_trial_group_id,
+            ),
+        )
 
     @property
-    def tunable_configs(self) -> Dict[int, TunableConfigData]:
-        with self._engine.connect() as conn:
-            tunable_configs = conn.execute(
-                self._schema.trial.select().with_only_columns(
-                    self._schema.trial.c.config_id.cast(Integer).label('config_id'),
-                ).where(
-                    self._schema.trial.c.exp_id == self._experiment_id,
-                ).group_by(
-                    self._schema.trial.c.exp_id,
-                    self._schema.trial.c.config_id,
-                )
-            )
-            return {
-                tunable_config.config_id: TunableConfigSqlData(
-                    engine=self._engine,
-                    schema=self._schema,
-                    tunable_config_id=tunable_config.config_id,
-                )
-                for tunable_config in tunable_configs.fetchall()
-            }
+    def tunable_configs(self) -> Mapping[int, TunableConfigData]:
+        return LazySqlMapping(
+            engine=self._engine,
+            stmt=select(
+                self._schema.trial.c.config_id,
+            ).where(
+                self._schema.trial.c.exp_id == self._experiment_id,
+            ).distinct(),
+            key=self._schema.trial.c.config_id,
+            factory=lambda tunable_config: TunableConfigSqlData(
+                engine=self._engine,
+                schema=self._schema,
+                tunable_config_id=tunable_config.config_id,
+            ),
+        )
 
     @property
     def default_tunable_config_id(self) -> Optional[int]:
@@ -177,6 +173,14 @@ class ExperimentSqlData(ExperimentData):
                 return min_trial_row._tuple()[0]
             return None
 
+    @property
+    def progress(self) -> ExperimentProgress:
+        return common.get_progress(self._engine, self._schema, self._experiment_id)
+
+    def config_trial_group_stats(self, metric: str) -> pandas.DataFrame:
+        return self._config_trial_group_stats_df(common.get_config_trial_group_stats(
+            self._engine, self._schema, self._experiment_id, self._metric_name(metric), self.PERCENTILES))
+
     @property
     def results_df(self) -> pandas.DataFrame:
-        return common.get_results_df(self._engine, self._schema, self._experiment_id)
+        return self._results_cache.get()
@@ -0,0 +1,160 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Read-only mapping views that fetch the storage data on demand.
+"""
+
+from typing import (
+    Any, Callable, ItemsView, Iterator, Mapping, Optional, Tuple, TypeVar, Union,
+    ValuesView, overload,
+)
+
+from sqlalchemy import ColumnElement, Engine, Row, Select, func, select
+
+KeyT = TypeVar("KeyT", int, str)
+ValueT = TypeVar("ValueT")
+
+
+class LazySqlMapping(Mapping[KeyT, ValueT]):
+    """
+    A read-only mapping over the rows of a SELECT statement, keyed by one of its
+    columns, that queries the database on every access instead of loading all
+    records upfront.
+
+    - `view[key]` fetches a single record.
+    - `view[start:stop]` returns another view restricted to `start <= key < stop`.
+    - Iteration (over keys, values, or items) fetches the records in pages of
+      `page_size`, ordered by the key. Each page continues from the last key seen
+      (i.e., keyset pagination), so no connection is held between the pages.
+    """
+
+    def __init__(self, *,
+                 engine: Engine,
+                 stmt: Select,
+                 key: ColumnElement,
+                 factory: Callable[[Row], ValueT],
+                 page_size: int = 1000):
+        """
+        Create a new mapping view.
+
+        Parameters
+        ----------
+        engine : Engine
+            SQLAlchemy engine to run the queries.
+        stmt : Select
+            SELECT statement for all records of the mapping.
+            Must include the `key` column.
+        key : ColumnElement
+            Column of the `stmt` to use as the mapping key. Must be unique.
+        factory : Callable[[Row], ValueT]
+            Function to convert a row of the `stmt` to the mapping value.
+        page_size : int
+            Number of records to fetch at once when iterating over the mapping.
+        """
+        if page_size <= 0:
+            raise ValueError(f"Invalid page_size: {page_size}")
+        self._engine = engine
+        self._stmt = stmt
+        self._key = key
+        self._factory = factory
+        self._page_size = page_size
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._key})"
+
+    @overload
+    def __getitem__(self, key: KeyT) -> ValueT: ...
+
+    @overload
+    def __getitem__(self, key: slice) -> "LazySqlMapping[KeyT, ValueT]": ...
+
+    def __getitem__(self, key: Union[KeyT, slice]) -> Union[ValueT, "LazySqlMapping[KeyT, ValueT]"]:
+        if isinstance(key, slice):
+            return self._slice(key)
+        with self._engine.connect() as conn:
+            row = conn.execute(self._stmt.where(self._key == key)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return self._factory(row)
+
+    def __contains__(self, key: Any) -> bool:
+        with self._engine.connect() as conn:
+            return conn.execute(self._stmt.where(self._key == key).limit(1)).first() is not None
+
+    def __len__(self) -> int:
+        with self._engine.connect() as conn:
+            return int(conn.execute(
+                select(func.count()).select_from(self._stmt.subquery())  # pylint: disable=not-callable
+            ).scalar_one())
+
+    def __iter__(self) -> Iterator[KeyT]:
+        return (key for (key, _row) in self._iter_rows())
+
+    def items(self) -> ItemsView[KeyT, ValueT]:
+        return _LazyItemsView(self)
+
+    def values(self) -> ValuesView[ValueT]:
+        return _LazyValuesView(self)
+
+    def iter_items(self) -> Iterator[Tuple[KeyT, ValueT]]:
+        """
+        Iterate over the (key, value) pairs of the mapping, one page at a time.
+        """
+        return ((key, self._factory(row)) for (key, row) in self._iter_rows())
+
+    def _iter_rows(self) -> Iterator[Tuple[KeyT, Row]]:
+        """
+        Fetch all records of the mapping page by page, ordered by the key.
+        """
+        last_key: Optional[KeyT] = None
+        while True:
+            stmt = self._stmt
+            if last_key is not None:
+                stmt = stmt.where(self._key > last_key)
+            stmt = stmt.order_by(None).order_by(self._key).limit(self._page_size)
+            with self._engine.connect() as conn:
+                rows = conn.execute(stmt).fetchall()
+            for row in rows:
+                last_key = row._mapping[self._key]  # pylint: disable=protected-access
+                assert last_key is not None
+                yield (last_key, row)
+            if len(rows) < self._page_size:
+                return
+
+    def _slice(self, key_range: slice) -> "LazySqlMapping[KeyT, ValueT]":
+        """
+        Get a view of the records with the keys in the `[start, stop)` range.
+        """
+        if key_range.step is not None:
+            raise ValueError(f"Slicing with a step is not supported: {key_range}")
+        stmt = self._stmt
+        if key_range.start is not None:
+            stmt = stmt.where(self._key >= key_range.start)
+        if key_range.stop is not None:
+            stmt = stmt.where(self._key < key_range.stop)
+        return LazySqlMapping(engine=self._engine, stmt=stmt, key=self._key,
+                              factory=self._factory, page_size=self._page_size)
+
+
+class _LazyItemsView(ItemsView[KeyT, ValueT]):
+    """
+    Items of the `LazySqlMapping` fetched one page at a time (instead of one by one).
+    """
+
+    _mapping: LazySqlMapping[KeyT, ValueT]
+
+    def __iter__(self) -> Iterator[Tuple[KeyT, ValueT]]:
+        return self._mapping.iter_items()
+
+
+class _LazyValuesView(ValuesView[ValueT]):
+    """
+    Values of the `LazySqlMapping` fetched one page at a time (instead of one by one).
+    """
+
+    _mapping: LazySqlMapping
+
+    def __iter__(self) -> Iterator[ValueT]:
+        return (value for (_key, value) in self._mapping.iter_items())
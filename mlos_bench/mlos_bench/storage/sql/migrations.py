@@ -0,0 +1,205 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Versioned migrations of the DB schema.
+
+Each migration upgrades a database created by an earlier version of mlos_bench
+by one step, and is recorded in the `schema_version` table when applied.
+`DbSchema.create()` stamps new databases with the latest version and runs the
+pending migrations on the existing ones. Databases created before the
+versioning was introduced have no records and start at version 1.
+
+To change the schema, update the `DbSchema` tables (for the new databases) and
+append a migration here that brings the old databases to the same state.
+Migrations should be idempotent, in case the schema was partially updated.
+"""
+
+import logging
+from datetime import datetime
+from typing import Callable, List, Tuple
+
+from pytz import UTC
+from sqlalchemy import Connection, Table, bindparam, func, inspect, select, text
+from sqlalchemy.schema import CreateColumn
+
+from mlos_bench.storage.sql.common import insert_ignore
+from mlos_bench.storage.sql.schema import DbSchema, numeric_value
+
+_LOG = logging.getLogger(__name__)
+
+
+def _initial_schema(_schema: DbSchema, _conn: Connection) -> None:
+    """
+    The schema of the databases created before the versioning was introduced.
+    """
+
+
+def _add_numeric_columns(schema: DbSchema, conn: Connection) -> None:
+    """
+    Add the typed `*_value_num` columns and populate them
+    from the string values already stored.
+    """
+    inspector = inspect(conn)
+    for (table, field) in [
+        (schema.config_param, "param"),
+        (schema.trial_param, "param"),
+        (schema.trial_result, "metric"),
+        (schema.trial_telemetry, "metric"),
+    ]:
+        col_names = {col["name"] for col in inspector.get_columns(table.name)}
+        if f"{field}_value_num" not in col_names:
+            _add_numeric_column(conn, table, field)
+
+
+def _add_numeric_column(conn: Connection, table: Table, field: str) -> None:
+    """
+    Add the `{field}_value_num` column to the table and backfill it.
+    """
+    str_col = table.c[f"{field}_value"]
+    num_col = table.c[f"{field}_value_num"]
+    _add_column(conn, table, num_col.name)
+    # Only update the rows with numeric values; the rest stay NULL.
+    values = [
+        {"str_value": val, "num_value": numeric_value(val)}
+        for (val,) in conn.execute(select(str_col).distinct()).fetchall()
+    ]
+    values = [row for row in values if row["num_value"] is not None]
+    if values:
+        conn.execute(
+            table.update().where(
+                str_col == bindparam("str_value"),
+            ).values({num_col: bindparam("num_value")}),
+            values
+        )
+
+
+def _add_column(conn: Connection, table: Table, col_name: str) -> None:
+    """
+    Add the column (as defined in `DbSchema`) to the existing table.
+    """
+    _LOG.info("Add column: %s.%s", table.name, col_name)
+    preparer = conn.dialect.identifier_preparer
+    col_ddl = CreateColumn(table.c[col_name]).compile(dialect=conn.dialect)
+    conn.execute(text(f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {col_ddl}"))
+
+
+def _add_indexes(schema: DbSchema, conn: Connection) -> None:
+    """
+    Create the secondary indexes of the `trial` table (if missing).
+    """
+    for index in schema.trial.indexes:
+        _LOG.info("Create index: %s", index.name)
+        index.create(conn, checkfirst=True)
+
+
+def _add_telemetry_rollup(schema: DbSchema, conn: Connection) -> None:
+    """
+    Create the `trial_telemetry_rollup` table (if missing).
+    """
+    _LOG.info("Create table: %s", schema.trial_telemetry_rollup.name)
+    schema.trial_telemetry_rollup.create(conn, checkfirst=True)
+
+
+def _add_trial_lease(schema: DbSchema, conn: Connection) -> None:
+    """
+    Add the `worker_id` and `ts_heartbeat` columns of the trial lease
+    (see `Experiment.claim_trial()`) to the `trial` table.
+    """
+    col_names = {col["name"] for col in inspect(conn).get_columns(schema.trial.name)}
+    for col_name in ["worker_id", "ts_heartbeat"]:
+        if col_name not in col_names:
+            _add_column(conn, schema.trial, col_name)
+
+
+MIGRATIONS: List[Tuple[int, str, Callable[[DbSchema, Connection], None]]] = [
+    (1, "Initial schema", _initial_schema),
+    (2, "Typed numeric columns for the metric and parameter values", _add_numeric_columns),
+    (3, "Indexes for the pending trials and the trial configs lookups", _add_indexes),
+    (4, "Time-bucketed rollups of the trial telemetry", _add_telemetry_rollup),
+    (5, "Worker leases on the running trials", _add_trial_lease),
+]
+"""
+All migrations of the DB schema as (version, description, upgrade function) triplets.
+"""
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+"""
+Version of the DB schema defined in `DbSchema`.
+"""
+
+
+_LOCK_ID = 0x6d6c6f73
+"""
+Application-defined ID of the PostgreSQL advisory lock on the DB schema.
+"""
+
+
+def lock(conn: Connection) -> None:
+    """
+    Lock the database for the schema changes until the end of the current transaction.
+    Must be the first statement of the transaction.
+    Does nothing if the database dialect does not support it; the duplicate
+    `schema_version` records are ignored in that case.
+    """
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        # Take the write lock right away instead of the first write, so that
+        # the concurrent writers wait for it (up to the busy timeout) instead of failing.
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+    elif dialect == "postgresql":
+        conn.execute(select(func.pg_advisory_xact_lock(_LOCK_ID)))
+
+
+def _record_version(schema: DbSchema, conn: Connection, version: int, description: str) -> None:
+    """
+    Record the applied version of the DB schema, unless it is already there.
+    """
+    stmt = insert_ignore(conn.engine, schema.schema_version)
+    conn.execute(stmt if stmt is not None else schema.schema_version.insert(), [{
+        "version": version,
+        "description": description,
+        "ts_applied": datetime.now(UTC),
+    }])
+
+
+def get_version(schema: DbSchema, conn: Connection) -> int:
+    """
+    Get the version of the DB schema from the database.
+    """
+    version = conn.execute(select(func.max(schema.schema_version.c.version))).scalar()
+    return 1 if version is None else int(version)
+
+
+def stamp(schema: DbSchema, conn: Connection) -> None:
+    """
+    Mark the newly created database as having the latest version of the schema.
+    """
+    (version, description, _upgrade) = MIGRATIONS[-1]
+    _LOG.info("New DB schema version: %d :: %s", version, description)
+    _record_version(schema, conn, version, description)
+
+
+def upgrade(schema: DbSchema, conn: Connection) -> int:
+    """
+    Apply all pending migrations to the existing database.
+
+    Returns
+    -------
+    version : int
+        The version of the DB schema after the upgrade.
+    """
+    version = get_version(schema, conn)
+    if version > SCHEMA_VERSION:
+        raise RuntimeError(
+            f"DB schema version {version} is newer than the supported {SCHEMA_VERSION}." +
+            " Please upgrade mlos_bench.")
+    for (migration_version, description, upgrade_func) in MIGRATIONS:
+        if migration_version <= version:
+            continue
+        _LOG.warning("Upgrade the DB schema to version %d :: %s", migration_version, description)
+        upgrade_func(schema, conn)
+        _record_version(schema, conn, migration_version, description)
+        version = migration_version
+    return version
@@ -0,0 +1,181 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Incrementally updated cache of the experiment results DataFrame.
+"""
+
+import logging
+import os
+import re
+from threading import Lock
+from typing import Optional, Set
+
+import pandas
+from sqlalchemy import Engine, func, select
+
+from mlos_bench.environments.status import Status
+from mlos_bench.storage.base_experiment_data import ExperimentData
+from mlos_bench.storage.sql import common
+from mlos_bench.storage.sql.schema import DbSchema
+
+_LOG = logging.getLogger(__name__)
+
+
+class ResultsCache:
+    """
+    Cache of the `ExperimentData.results_df` DataFrame for one experiment.
+
+    On the first access, it loads the results of all trials. On every subsequent
+    access, it fetches only the trials with the IDs above the watermark (i.e., the
+    largest trial ID seen so far) plus the trials that were not completed yet at
+    the time of the previous read, and merges them into the cached DataFrame.
+    This relies on the trial IDs growing monotonically within the experiment,
+    and on the completed trials (and their configs and results) never changing.
+
+    Optionally, the DataFrame is persisted as a Parquet file in `cache_dir`
+    to speed up the first access in the next session.
+    """
+
+    _COMPLETED_STATUSES = frozenset(status.name for status in Status if status.is_completed())
+
+    def __init__(self, *,
+                 engine: Engine,
+                 schema: DbSchema,
+                 experiment_id: str,
+                 cache_dir: Optional[str] = None):
+        """
+        Create a new (empty) cache for the experiment.
+
+        Parameters
+        ----------
+        engine : Engine
+            SQLAlchemy engine to run the queries.
+        schema : DbSchema
+            The database schema.
+        experiment_id : str
+            ID of the experiment.
+        cache_dir : Optional[str]
+            Directory to persist the cached DataFrame in.
+            If None (the default), keep the cache in memory only.
+        """
+        self._engine = engine
+        self._schema = schema
+        self._experiment_id = experiment_id
+        self._cache_path = None if cache_dir is None else os.path.join(
+            cache_dir, re.sub(r"[^\w.-]", "_", experiment_id) + ".parquet")
+        self._lock = Lock()
+        self._results_df: Optional[pandas.DataFrame] = None
+        self._watermark = 0
+        self._incomplete_trial_ids: Set[int] = set()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._experiment_id}:{self._watermark})"
+
+    @property
+    def watermark(self) -> int:
+        """
+        The largest trial ID in the cache.
+        """
+        return self._watermark
+
+    def get(self) -> pandas.DataFrame:
+        """
+        Get the results of the experiment, fetching the new and updated trials
+        from the database.
+
+        Returns
+        -------
+        results : pandas.DataFrame
+            A copy of the cached DataFrame. See `ExperimentData.results_df` for details.
+        """
+        with self._lock:
+            if self._results_df is None and not self._load():
+                self._update(common.get_results_df(self._engine, self._schema, self._experiment_id))
+                self._save()
+            else:
+                assert self._results_df is not None
+                delta_df = common.get_results_df(
+                    self._engine, self._schema, self._experiment_id,
+                    min_trial_id=self._watermark,
+                    trial_ids=self._incomplete_trial_ids,
+                )
+                if not delta_df.empty:
+                    _LOG.debug("Update %s with %d trials", self, len(delta_df))
+                    cached_df = self._results_df[~self._results_df["trial_id"].isin(delta_df["trial_id"])]
+                    self._update(self._merge(cached_df, delta_df))
+                    self._save()
+            return self._results_df.copy()
+
+    @staticmethod
+    def _merge(cached_df: pandas.DataFrame, delta_df: pandas.DataFrame) -> pandas.DataFrame:
+        """
+        Append the new and updated trials to the cached ones, keeping the columns
+        in the same order as `common.get_results_df()` does.
+        """
+        if cached_df.empty:
+            return delta_df
+        columns = list(cached_df.columns)
+        columns += [col for col in delta_df.columns if col not in cached_df.columns]
+        # Leave the metadata columns first, then the (sorted) config and result columns.
+        prefixes = (ExperimentData.CONFIG_COLUMN_PREFIX, ExperimentData.RESULT_COLUMN_PREFIX)
+        columns = [col for col in columns if not col.startswith(prefixes)] + [
+            col for prefix in prefixes for col in sorted(columns) if col.startswith(prefix)]
+        # Skip the all-NA columns (e.g., the results of the running trials)
+        # so they don't affect the dtypes of the merged DataFrame.
+        return pandas.concat([
+            cached_df.dropna(axis=1, how="all"),
+            delta_df.dropna(axis=1, how="all"),
+        ]).reindex(columns=columns)
+
+    def _update(self, results_df: pandas.DataFrame) -> None:
+        """
+        Replace the cached DataFrame and update the watermark and the set of
+        trials to re-check on the next read.
+        """
+        self._results_df = results_df.sort_values("trial_id").reset_index(drop=True).infer_objects()
+        self._watermark = int(self._results_df["trial_id"].max()) if not self._results_df.empty else 0
+        self._incomplete_trial_ids = set(
+            int(trial_id) for trial_id in self._results_df.loc[
+                ~self._results_df["status"].isin(self._COMPLETED_STATUSES), "trial_id"]
+        )
+
+    def _load(self) -> bool:
+        """
+        Load the DataFrame persisted in the previous session, if it matches the database.
+        Return True on success; the caller still has to fetch the trials added since.
+        """
+        if self._cache_path is None or not os.path.exists(self._cache_path):
+            return False
+        try:
+            results_df = pandas.read_parquet(self._cache_path)
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            _LOG.warning("Failed to load the results cache: %s :: %s", self._cache_path, ex)
+            return False
+        self._update(results_df)
+        # Make sure the cache belongs to the same database.
+        with self._engine.connect() as conn:
+            trial_count = conn.execute(
+                select(func.count()).select_from(self._schema.trial).where(  # pylint: disable=not-callable
+                    self._schema.trial.c.exp_id == self._experiment_id,
+                    self._schema.trial.c.trial_id <= self._watermark,
+                )
+            ).scalar_one()
+        if trial_count != len(results_df):
+            _LOG.warning("Discard the stale results cache: %s", self._cache_path)
+            return False
+        _LOG.info("Loaded the results cache: %s", self)
+        return True
+
+    def _save(self) -> None:
+        """
+        Persist the cached DataFrame, if the cache directory is specified.
+        """
+        if self._cache_path is None or self._results_df is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(self._cache_path), exist_ok=True)
+            self._results_df.to_parquet(self._cache_path, index=False)
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            _LOG.warning("Failed to save the results cache: %s :: %s", self._cache_path, ex)
@@ -7,17 +7,33 @@ DB schema definition.
 """
 
 import logging
-from typing import List, Any
+import math
+from typing import List, Any, Optional
 
 from sqlalchemy import (
-    Engine, MetaData, Dialect, create_mock_engine,
-    Table, Column, Sequence, Integer, Float, String, DateTime,
-    PrimaryKeyConstraint, ForeignKeyConstraint, UniqueConstraint,
+    Engine, MetaData, Dialect, create_mock_engine, inspect,
+    Table, Column, Sequence, Integer, Float, Double, String, DateTime,
+    Index, PrimaryKeyConstraint, ForeignKeyConstraint, UniqueConstraint,
 )
 
 _LOG = logging.getLogger(__name__)
 
 
+def numeric_value(val: Any) -> Optional[float]:
+    """
+    Convert the value of a metric or parameter to a float for the typed
+    `*_value_num` columns. Return None for the non-numeric (or non-finite)
+    values; these are stored in the string `*_value` columns only.
+    """
+    if val is None or isinstance(val, bool):
+        return None
+    try:
+        val_float = float(val)
+    except (ValueError, TypeError):
+        return None
+    return val_float if math.isfinite(val_float) else None
+
+
 class _DDL:
     """
     A helper class to capture the DDL statements from SQLAlchemy.
@@ -61,6 +77,18 @@ class DbSchema:
         # TODO: bind for automatic schema updates? (#649)
         self._meta = MetaData()
 
+        # Versions of the schema migrations applied to the database.
+        # See `mlos_bench.storage.sql.migrations` for details.
+        self.schema_version = Table(
+            "schema_version",
+            self._meta,
+            Column("version", Integer, nullable=False, autoincrement=False),
+            Column("description", String(1024), nullable=False),
+            Column("ts_applied", DateTime(timezone=True), nullable=False),
+
+            PrimaryKeyConstraint("version"),
+        )
+
         self.experiment = Table(
             "experiment",
             self._meta,
@@ -116,11 +144,23 @@ class DbSchema:
             Column("ts_end", DateTime),
             # Should match the text IDs of `mlos_bench.environments.Status` enum:
             Column("status", String(self._STATUS_LEN), nullable=False),
+            # ID of the worker that claimed the trial and the time of its last heartbeat
+            # (i.e., the lease on a RUNNING trial). See `Experiment.claim_trial()`.
+            Column("worker_id", String(self._ID_LEN)),
+            Column("ts_heartbeat", DateTime),
 
             PrimaryKeyConstraint("exp_id", "trial_id"),
             ForeignKeyConstraint(["exp_id"], [self.experiment.c.exp_id]),
             ForeignKeyConstraint(["config_id"], [self.config.c.config_id]),
+            # For joining the trials with their configs in `get_results_df()` and such.
+            Index("trial_config_idx", "exp_id", "config_id"),
         )
+        # For `Experiment.pending_trials()` and other lookups by status.
+        # DuckDB turns the updates of the indexed columns into delete + insert
+        # that violate the foreign keys of the other tables, so skip it there.
+        if engine.dialect.name != "duckdb":
+            Index("trial_status_idx", self.trial.c.exp_id, self.trial.c.status,
+                  self.trial.c.ts_start, self.trial.c.ts_end)
 
         # Values of the tunable parameters of the experiment,
         # fixed for a particular trial config.
@@ -130,6 +170,7 @@ class DbSchema:
             Column("config_id", Integer, nullable=False),
             Column("param_id", String(self._ID_LEN), nullable=False),
             Column("param_value", String(self._PARAM_VALUE_LEN)),
+            Column("param_value_num", Double),
 
             PrimaryKeyConstraint("config_id", "param_id"),
             ForeignKeyConstraint(["config_id"], [self.config.c.config_id]),
@@ -144,6 +185,7 @@ class DbSchema:
             Column("trial_id", Integer, nullable=False),
             Column("param_id", String(self._ID_LEN), nullable=False),
             Column("param_value", String(self._PARAM_VALUE_LEN)),
+            Column("param_value_num", Double),
 
             PrimaryKeyConstraint("exp_id", "trial_id", "param_id"),
             ForeignKeyConstraint(["exp_id", "trial_id"],
@@ -170,6 +212,7 @@ class DbSchema:
             Column("trial_id", Integer, nullable=False),
             Column("metric_id", String(self._ID_LEN), nullable=False),
             Column("metric_value", String(self._METRIC_VALUE_LEN)),
+            Column("metric_value_num", Double),
 
             PrimaryKeyConstraint("exp_id", "trial_id", "metric_id"),
             ForeignKeyConstraint(["exp_id", "trial_id"],
@@ -184,20 +227,56 @@ class DbSchema:
             Column("ts", DateTime(timezone=True), nullable=False, default="now"),
             Column("metric_id", String(self._ID_LEN), nullable=False),
             Column("metric_value", String(self._METRIC_VALUE_LEN)),
+            Column("metric_value_num", Double),
 
             UniqueConstraint("exp_id", "trial_id", "ts", "metric_id"),
             ForeignKeyConstraint(["exp_id", "trial_id"],
                                  [self.trial.c.exp_id, self.trial.c.trial_id]),
         )
 
+        # Aggregates of the numeric telemetry in the buckets of `resolution` seconds,
+        # maintained at ingest time. See `mlos_bench.storage.sql.telemetry_rollup`.
+        self.trial_telemetry_rollup = Table(
+            "trial_telemetry_rollup",
+            self._meta,
+            Column("exp_id", String(self._ID_LEN), nullable=False),
+            Column("trial_id", Integer, nullable=False),
+            Column("metric_id", String(self._ID_LEN), nullable=False),
+            Column("resolution", Integer, nullable=False, autoincrement=False),
+            # Start of the bucket.
+            Column("ts", DateTime(timezone=True), nullable=False),
+            Column("value_count", Integer, nullable=False),
+            Column("value_min", Double, nullable=False),
+            Column("value_max", Double, nullable=False),
+            Column("value_sum", Double, nullable=False),
+            Column("value_last", Double, nullable=False),
+            # Timestamp of the last value in the bucket.
+            Column("ts_last", DateTime(timezone=True), nullable=False),
+
+            PrimaryKeyConstraint("exp_id", "trial_id", "resolution", "metric_id", "ts"),
+            ForeignKeyConstraint(["exp_id", "trial_id"],
+                                 [self.trial.c.exp_id, self.trial.c.trial_id]),
+        )
+
         _LOG.debug("Schema: %s", self._meta)
 
     def create(self) -> 'DbSchema':
         """
-        Create the DB schema.
+        Create the DB schema, or upgrade the existing one to the current version.
         """
+        from mlos_bench.storage.sql import migrations  # pylint: disable=import-outside-toplevel,cyclic-import
         _LOG.info("Create the DB schema")
-        self._meta.create_all(self._engine)
+        with self._engine.begin() as conn:
+            # Several workers can open the same database at once: check the
+            # schema only after taking the lock, so that only one of them
+            # creates or upgrades it.
+            migrations.lock(conn)
+            is_new = not inspect(conn).has_table(self.experiment.name)
+            self._meta.create_all(conn)
+            if is_new:
+                migrations.stamp(self, conn)
+            else:
+                migrations.upgrade(self, conn)
         return self
 
     def __repr__(self) -> str:
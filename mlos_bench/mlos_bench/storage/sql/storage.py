@@ -7,17 +7,23 @@ Saving and restoring the benchmark data in SQL database.
 """
 
 import logging
-from typing import Dict, Literal, Optional
+from typing import Any, Dict, List, Literal, Mapping, Optional
 
-from sqlalchemy import URL, create_engine
+from sqlalchemy import URL
 
 from mlos_bench.tunables.tunable_groups import TunableGroups
 from mlos_bench.services.base_service import Service
 from mlos_bench.storage.base_storage import Storage
+from mlos_bench.storage.sql.engine_profile import create_profiled_engine, get_engine_profile, is_in_memory
 from mlos_bench.storage.sql.schema import DbSchema
 from mlos_bench.storage.sql.experiment import Experiment
 from mlos_bench.storage.base_experiment_data import ExperimentData
 from mlos_bench.storage.sql.experiment_data import ExperimentSqlData
+from mlos_bench.storage.sql.lazy_mapping import LazySqlMapping
+from mlos_bench.storage.sql.results_cache import ResultsCache
+from mlos_bench.storage.sql.telemetry_rollup import TelemetryRollups
+from mlos_bench.storage.sql.transfer import ExportFormat, export_experiment, import_experiment
+from mlos_bench.storage.sql.writer import StorageWriter
 
 _LOG = logging.getLogger(__name__)
 
@@ -34,10 +40,30 @@ class SqlStorage(Storage):
         super().__init__(config, global_config, service)
         lazy_schema_create = self._config.pop("lazy_schema_create", False)
         self._log_sql = self._config.pop("log_sql", False)
+        write_behind = self._config.pop("write_behind", False)
+        write_behind_queue_size = int(self._config.pop("write_behind_queue_size", 1000))
+        write_behind_interval = float(self._config.pop("write_behind_interval", 1.0))
+        self._results_cache_dir: Optional[str] = self._config.pop("results_cache_dir", None)
+        self._results_caches: Dict[str, ResultsCache] = {}
+        self._rollup_resolutions: List[int] = self._config.pop("telemetry_rollups", [])
+        self._rollup_retention: Optional[float] = self._config.pop("telemetry_retention", None)
+        engine_profile = self._config.pop("engine_profile", None)
         self._url = URL.create(**self._config)
         self._repr = f"{self._url.get_backend_name()}:{self._url.database}"
-        _LOG.info("Connect to the database: %s", self)
-        self._engine = create_engine(self._url, echo=self._log_sql)
+        self._engine_profile = get_engine_profile(self._url, engine_profile)
+        _LOG.info("Connect to the database: %s with profile: %s", self, self._engine_profile)
+        self._engine = create_profiled_engine(self._url, self._engine_profile, echo=self._log_sql)
+        self._writer: Optional[StorageWriter] = None
+        if write_behind:
+            if self._url.get_backend_name() == "sqlite" and is_in_memory(self._url):
+                # Each thread gets its own in-memory database.
+                raise ValueError(f"Write-behind is not supported for in-memory database: {self}")
+            self._writer = StorageWriter(
+                self._engine,
+                max_queue_size=write_behind_queue_size,
+                flush_interval=write_behind_interval,
+            )
+        self._rollups: Optional[TelemetryRollups] = None
         self._db_schema: DbSchema
         if not lazy_schema_create:
             assert self._schema
@@ -72,27 +98,74 @@ class SqlStorage(Storage):
             root_env_config=root_env_config,
             description=description,
             opt_targets=opt_targets,
+            writer=self._writer,
+            rollups=self._get_rollups(),
         )
 
+    def _get_rollups(self) -> Optional[TelemetryRollups]:
+        """
+        Get the maintainer of the telemetry rollups, if enabled.
+        Create it lazily, as it needs the DB schema.
+        """
+        if self._rollups is None and self._rollup_resolutions:
+            self._rollups = TelemetryRollups(
+                engine=self._engine,
+                schema=self._schema,
+                resolutions=self._rollup_resolutions,
+                retention=self._rollup_retention,
+                writer=self._writer,
+            )
+        return self._rollups
+
     @property
-    def experiments(self) -> Dict[str, ExperimentData]:
-        # FIXME: this is somewhat expensive if only fetching a single Experiment.
-        # May need to expand the API or data structures to lazily fetch data and/or cache it.
-        with self._engine.connect() as conn:
-            cur_exp = conn.execute(
-                self._schema.experiment.select().order_by(
-                    self._schema.experiment.c.exp_id.asc(),
-                )
+    def experiments(self) -> Mapping[str, ExperimentData]:
+        if self._writer is not None:
+            self._writer.flush()
+        return LazySqlMapping(
+            engine=self._engine,
+            stmt=self._schema.experiment.select(),
+            key=self._schema.experiment.c.exp_id,
+            factory=lambda exp: ExperimentSqlData(
+                engine=self._engine,
+                schema=self._schema,
+                experiment_id=exp.exp_id,
+                description=exp.description,
+                root_env_config=exp.root_env_config,
+                git_repo=exp.git_repo,
+                git_commit=exp.git_commit,
+                results_cache=self._get_results_cache(exp.exp_id),
+            ),
+        )
+
+    def _get_results_cache(self, experiment_id: str) -> ResultsCache:
+        """
+        Get the cache of the results DataFrame for the experiment,
+        so it survives between the `.experiments` lookups.
+        """
+        if experiment_id not in self._results_caches:
+            self._results_caches[experiment_id] = ResultsCache(
+                engine=self._engine,
+                schema=self._schema,
+                experiment_id=experiment_id,
+                cache_dir=self._results_cache_dir,
             )
-            return {
-                exp.exp_id: ExperimentSqlData(
-                    engine=self._engine,
-                    schema=self._schema,
-                    experiment_id=exp.exp_id,
-                    description=exp.description,
-                    root_env_config=exp.root_env_config,
-                    git_repo=exp.git_repo,
-                    git_commit=exp.git_commit,
-                )
-                for exp in cur_exp.fetchall()
-            }
+        return self._results_caches[experiment_id]
+
+    def export_experiment(self, experiment_id: str, path: str, *,
+                          fmt: ExportFormat = "parquet",
+                          chunk_size: int = 100_000) -> Dict[str, Any]:
+        """
+        Export all data of the experiment to the partitioned columnar files.
+        See `mlos_bench.storage.sql.transfer.export_experiment()` for details.
+        """
+        if self._writer is not None:
+            self._writer.flush()
+        return export_experiment(self._engine, self._schema, experiment_id, path,
+                                 fmt=fmt, chunk_size=chunk_size)
+
+    def import_experiment(self, path: str) -> str:
+        """
+        Load the experiment saved by `.export_experiment()` (possibly from another
+        database) into this storage. Return the ID of the imported experiment.
+        """
+        return import_experiment(self._engine, self._schema, path)
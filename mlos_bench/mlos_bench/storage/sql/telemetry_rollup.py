@@ -0,0 +1,250 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Time-bucketed rollups of the trial telemetry.
+
+The raw telemetry has one row per timestamp and metric, and grows quickly for
+long-running trials. The rollups keep the count, min, max, sum, and the last
+value of each numeric metric of the trial in fixed buckets of `resolution`
+seconds (aligned to the Unix epoch), updated at ingest time. Once the trial is
+completed, its raw telemetry can be pruned after the retention period, and the
+downsampled data is still served from the rollups.
+
+Only the latest (open) bucket of each metric and resolution is kept in memory.
+The values that arrive late (i.e., older than the last value already rolled up
+for the metric) are skipped; they are still kept in the raw telemetry.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from pytz import UTC
+from sqlalchemy import Engine, bindparam, exists, func, select
+
+from mlos_bench.environments.status import Status
+from mlos_bench.storage.sql.schema import DbSchema, numeric_value
+from mlos_bench.storage.sql.writer import StorageWriter
+from mlos_bench.util import utcify_timestamp
+
+_LOG = logging.getLogger(__name__)
+
+
+def bucket_start(timestamp: datetime, resolution: int) -> datetime:
+    """
+    Get the start of the `resolution`-seconds bucket of the (UTC) timestamp.
+    """
+    return datetime.fromtimestamp(timestamp.timestamp() // resolution * resolution, UTC)
+
+
+class TelemetryRollups:
+    """
+    Maintain the rollups of the trial telemetry at ingest time and prune
+    the raw telemetry of the completed trials after the retention period.
+    """
+
+    def __init__(self, *,
+                 engine: Engine,
+                 schema: DbSchema,
+                 resolutions: Iterable[int],
+                 retention: Optional[float] = None,
+                 writer: Optional[StorageWriter] = None):
+        """
+        Create the rollups maintainer for the storage.
+
+        Parameters
+        ----------
+        engine : Engine
+            SQLAlchemy engine of the storage.
+        schema : DbSchema
+            The database schema.
+        resolutions : Iterable[int]
+            Sizes of the buckets (in seconds) to maintain the rollups for.
+        retention : Optional[float]
+            Time (in seconds) to keep the raw telemetry of the completed trials for.
+            None (default) means keep it forever.
+        writer : Optional[StorageWriter]
+            Write-behind queue to save the rollups with (if enabled).
+        """
+        self._engine = engine
+        self._schema = schema
+        self._writer = writer
+        self.resolutions = tuple(sorted(set(int(res) for res in resolutions)))
+        if not self.resolutions or self.resolutions[0] <= 0:
+            raise ValueError(f"Invalid telemetry rollup resolutions: {list(resolutions)}")
+        if retention is not None and retention < 0:
+            raise ValueError(f"Invalid telemetry retention: {retention}")
+        self.retention = None if retention is None else timedelta(seconds=retention)
+        self._lock = Lock()
+        # Open buckets of the trials: (exp_id, trial_id) -> {(resolution, metric_id): row}
+        self._buckets: Dict[Tuple[str, int], Dict[Tuple[int, str], Dict[str, Any]]] = {}
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self.resolutions)})"
+
+    def update(self, experiment_id: str, trial_id: int,
+               metrics: List[Tuple[datetime, str, Any]]) -> None:
+        """
+        Roll up the new telemetry records (UTC timestamps) of the trial.
+        This call is idempotent.
+        """
+        values = sorted(
+            (timestamp, key, val_num) for (timestamp, key, val_num) in (
+                (timestamp, key, numeric_value(val)) for (timestamp, key, val) in metrics)
+            if val_num is not None
+        )
+        if not values:
+            return
+        trial_key = (experiment_id, trial_id)
+        with self._lock:
+            if trial_key not in self._buckets:
+                self._buckets[trial_key] = self._load(experiment_id, trial_id)
+            buckets = self._buckets[trial_key]
+            # Buckets to insert (opened in this batch) or update.
+            changed: Dict[Tuple[int, str, datetime], Dict[str, Any]] = {}
+            opened: Set[Tuple[int, str, datetime]] = set()
+            for (timestamp, key, val) in values:
+                for resolution in self.resolutions:
+                    bucket_ts = bucket_start(timestamp, resolution)
+                    row = buckets.get((resolution, key))
+                    if row is None or bucket_ts > row["ts"]:
+                        row = buckets[(resolution, key)] = {
+                            "exp_id": experiment_id,
+                            "trial_id": trial_id,
+                            "metric_id": key,
+                            "resolution": resolution,
+                            "ts": bucket_ts,
+                            "value_count": 0,
+                            "value_min": val,
+                            "value_max": val,
+                            "value_sum": 0.0,
+                            "value_last": val,
+                            "ts_last": timestamp,
+                        }
+                        opened.add((resolution, key, bucket_ts))
+                    elif timestamp <= row["ts_last"]:
+                        # Already rolled up (or arrived late).
+                        continue
+                    row["value_count"] += 1
+                    row["value_min"] = min(row["value_min"], val)
+                    row["value_max"] = max(row["value_max"], val)
+                    row["value_sum"] += val
+                    row["value_last"] = val
+                    row["ts_last"] = timestamp
+                    changed[(resolution, key, bucket_ts)] = row
+            new_rows = [dict(row) for (bucket, row) in changed.items() if bucket in opened]
+            updated_rows = [
+                {f"b_{col}": val for (col, val) in row.items()}
+                for (bucket, row) in changed.items() if bucket not in opened
+            ]
+        self._save(new_rows, updated_rows)
+
+    def _load(self, experiment_id: str, trial_id: int) -> Dict[Tuple[int, str], Dict[str, Any]]:
+        """
+        Load the latest bucket of each metric and resolution of the trial from the
+        database, if there are any (e.g., when the trial is resumed by another process).
+        """
+        table = self._schema.trial_telemetry_rollup
+        latest = select(
+            table.c.resolution,
+            table.c.metric_id,
+            func.max(table.c.ts).label("ts"),
+        ).where(
+            table.c.exp_id == experiment_id,
+            table.c.trial_id == trial_id,
+        ).group_by(
+            table.c.resolution,
+            table.c.metric_id,
+        ).subquery()
+        buckets: Dict[Tuple[int, str], Dict[str, Any]] = {}
+        with self._engine.connect() as conn:
+            cur_rollups = conn.execute(
+                table.select().join(
+                    latest,
+                    (table.c.resolution == latest.c.resolution) &
+                    (table.c.metric_id == latest.c.metric_id) &
+                    (table.c.ts == latest.c.ts)
+                ).where(
+                    table.c.exp_id == experiment_id,
+                    table.c.trial_id == trial_id,
+                )
+            )
+            for row in cur_rollups.mappings().fetchall():
+                rollup = {col.name: row[col] for col in table.c}
+                rollup["ts"] = utcify_timestamp(rollup["ts"], origin="utc")
+                rollup["ts_last"] = utcify_timestamp(rollup["ts_last"], origin="utc")
+                buckets[(rollup["resolution"], rollup["metric_id"])] = rollup
+        return buckets
+
+    def _save(self, new_rows: List[Dict[str, Any]], updated_rows: List[Dict[str, Any]]) -> None:
+        """
+        Insert the new buckets and update the existing ones.
+        """
+        table = self._schema.trial_telemetry_rollup
+        update_stmt = table.update().where(
+            table.c.exp_id == bindparam("b_exp_id"),
+            table.c.trial_id == bindparam("b_trial_id"),
+            table.c.resolution == bindparam("b_resolution"),
+            table.c.metric_id == bindparam("b_metric_id"),
+            table.c.ts == bindparam("b_ts"),
+        ).values({
+            col: bindparam(f"b_{col}")
+            for col in ("value_count", "value_min", "value_max", "value_sum", "value_last", "ts_last")
+        })
+        if self._writer is not None:
+            self._writer.write(table.insert(), new_rows)
+            self._writer.write(update_stmt, updated_rows)
+            return
+        with self._engine.begin() as conn:
+            if new_rows:
+                conn.execute(table.insert(), new_rows)
+            if updated_rows:
+                conn.execute(update_stmt, updated_rows)
+
+    def finish(self, experiment_id: str, trial_id: int, timestamp: datetime) -> None:
+        """
+        Forget the open buckets of the completed trial and apply the retention policy
+        to the raw telemetry of the experiment, as of the given (UTC) timestamp.
+        """
+        with self._lock:
+            self._buckets.pop((experiment_id, trial_id), None)
+        if self.retention is not None:
+            self.prune(experiment_id, timestamp - self.retention)
+
+    def prune(self, experiment_id: str, timestamp: datetime) -> None:
+        """
+        Delete the raw telemetry records older than the (UTC) timestamp
+        of the completed trials of the experiment that have been rolled up.
+        Only the numeric metrics that have the rollups are pruned;
+        the other (e.g., string) metrics are kept in the raw telemetry.
+        """
+        _LOG.info("Prune the raw telemetry of %s before %s", experiment_id, timestamp)
+        telemetry = self._schema.trial_telemetry
+        trial = self._schema.trial
+        rollup = self._schema.trial_telemetry_rollup
+        stmt = telemetry.delete().where(
+            telemetry.c.exp_id == bindparam("b_exp_id"),
+            telemetry.c.ts < bindparam("b_ts"),
+            telemetry.c.trial_id.in_(
+                select(trial.c.trial_id).where(
+                    trial.c.exp_id == bindparam("b_exp_id"),
+                    trial.c.status.in_([status.name for status in Status if status.is_completed()]),
+                )
+            ),
+            telemetry.c.metric_value_num.is_not(None),
+            exists().where(
+                rollup.c.exp_id == telemetry.c.exp_id,
+                rollup.c.trial_id == telemetry.c.trial_id,
+                rollup.c.metric_id == telemetry.c.metric_id,
+            ),
+        )
+        params = [{"b_exp_id": experiment_id, "b_ts": timestamp}]
+        if self._writer is not None:
+            # Queue it after the pending inserts of the raw telemetry.
+            self._writer.write(stmt, params)
+            return
+        with self._engine.begin() as conn:
+            conn.execute(stmt, params)
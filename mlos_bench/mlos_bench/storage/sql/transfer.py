@@ -0,0 +1,344 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Bulk export and import of the experiment data to and from columnar files.
+
+The experiment is saved into a directory with one subdirectory per table,
+each table partitioned into files of at most `chunk_size` rows, and a
+`manifest.json` file that lists all the partitions:
+
+    <path>/manifest.json
+    <path>/trial/part-00000.parquet
+    <path>/trial_telemetry/part-00000.parquet
+    <path>/trial_telemetry/part-00001.parquet
+    ...
+
+The files can be loaded back into any `SqlStorage` (regardless of the database
+dialect), or analyzed offline directly with pandas, DuckDB, Spark, etc.
+"""
+
+import json
+import logging
+import os
+from typing import Any, Callable, Dict, Iterator, List, Literal, Optional, Set
+
+import pandas
+from sqlalchemy import Connection, DateTime, Engine, Float, Integer, Select, Table, select
+
+from mlos_bench.storage.sql import migrations
+from mlos_bench.storage.sql.schema import DbSchema, numeric_value
+
+_LOG = logging.getLogger(__name__)
+
+ExportFormat = Literal["parquet", "arrow", "csv"]
+
+_MANIFEST_FILE = "manifest.json"
+
+_FILE_EXT: Dict[str, str] = {
+    "parquet": ".parquet",
+    "arrow": ".arrow",
+    "csv": ".csv",
+}
+
+# Formats that need the `pyarrow` package (installed with the `mlos-bench[pyarrow]` extra).
+_PYARROW_FORMATS = {"parquet", "arrow"}
+
+# Marker of the NULL values in the CSV files, to tell them apart from the empty strings.
+_CSV_NULL = r"\N"
+
+# Numeric columns to compute from the string ones if the exported data does not have them.
+_NUMERIC_COLUMNS = {
+    "param_value_num": "param_value",
+    "metric_value_num": "metric_value",
+}
+
+
+def _check_format(fmt: str) -> None:
+    """
+    Make sure the file format is supported and its dependencies are installed.
+    """
+    if fmt not in _FILE_EXT:
+        raise ValueError(f"Unsupported format: {fmt}")
+    if fmt in _PYARROW_FORMATS:
+        try:
+            import pyarrow  # pylint: disable=import-outside-toplevel,unused-import
+        except ImportError as ex:
+            raise ImportError(
+                f"The {fmt} format requires pyarrow: pip install 'mlos-bench[pyarrow]' " +
+                "or use the csv format instead.") from ex
+
+
+def _write_df(df: pandas.DataFrame, path: str, fmt: ExportFormat) -> None:
+    """
+    Save the DataFrame to a file in the given format.
+    """
+    if fmt == "parquet":
+        df.to_parquet(path, index=False)
+    elif fmt == "arrow":
+        df.to_feather(path)
+    elif fmt == "csv":
+        df.to_csv(path, index=False, na_rep=_CSV_NULL)
+    else:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+
+def _read_df(path: str, fmt: ExportFormat) -> pandas.DataFrame:
+    """
+    Load the DataFrame from a file in the given format.
+    """
+    if fmt == "parquet":
+        return pandas.read_parquet(path)
+    if fmt == "arrow":
+        return pandas.read_feather(path)
+    if fmt == "csv":
+        # Keep the strings (including the empty ones) as they are;
+        # the column types are restored from the schema.
+        return pandas.read_csv(path, dtype=str, keep_default_na=False, na_values=[_CSV_NULL])
+    raise ValueError(f"Unsupported format: {fmt}")
+
+
+def _export_stmts(schema: DbSchema, experiment_id: str) -> Dict[str, Select]:
+    """
+    Get the SELECT statements for all the data of the experiment, one per table.
+    """
+    config_ids = select(schema.trial.c.config_id).where(
+        schema.trial.c.exp_id == experiment_id).distinct()
+    return {
+        schema.experiment.name: schema.experiment.select().where(
+            schema.experiment.c.exp_id == experiment_id),
+        schema.objectives.name: schema.objectives.select().where(
+            schema.objectives.c.exp_id == experiment_id),
+        schema.config.name: schema.config.select().where(
+            schema.config.c.config_id.in_(config_ids)
+        ).order_by(schema.config.c.config_id),
+        schema.config_param.name: schema.config_param.select().where(
+            schema.config_param.c.config_id.in_(config_ids)
+        ).order_by(schema.config_param.c.config_id, schema.config_param.c.param_id),
+        schema.trial.name: schema.trial.select().where(
+            schema.trial.c.exp_id == experiment_id
+        ).order_by(schema.trial.c.trial_id),
+        schema.trial_param.name: schema.trial_param.select().where(
+            schema.trial_param.c.exp_id == experiment_id
+        ).order_by(schema.trial_param.c.trial_id, schema.trial_param.c.param_id),
+        schema.trial_status.name: schema.trial_status.select().where(
+            schema.trial_status.c.exp_id == experiment_id
+        ).order_by(schema.trial_status.c.trial_id, schema.trial_status.c.ts),
+        schema.trial_result.name: schema.trial_result.select().where(
+            schema.trial_result.c.exp_id == experiment_id
+        ).order_by(schema.trial_result.c.trial_id, schema.trial_result.c.metric_id),
+        schema.trial_telemetry.name: schema.trial_telemetry.select().where(
+            schema.trial_telemetry.c.exp_id == experiment_id
+        ).order_by(schema.trial_telemetry.c.trial_id, schema.trial_telemetry.c.ts,
+                   schema.trial_telemetry.c.metric_id),
+        schema.trial_telemetry_rollup.name: schema.trial_telemetry_rollup.select().where(
+            schema.trial_telemetry_rollup.c.exp_id == experiment_id
+        ).order_by(schema.trial_telemetry_rollup.c.trial_id, schema.trial_telemetry_rollup.c.resolution,
+                   schema.trial_telemetry_rollup.c.metric_id, schema.trial_telemetry_rollup.c.ts),
+    }
+
+
+def export_experiment(engine: Engine, schema: DbSchema, experiment_id: str, path: str, *,
+                      fmt: ExportFormat = "parquet",
+                      chunk_size: int = 100_000) -> Dict[str, Any]:
+    """
+    Export all data of the experiment to the partitioned files in the `path` directory.
+
+    Parameters
+    ----------
+    engine : Engine
+        SQLAlchemy engine of the source storage.
+    schema : DbSchema
+        The database schema.
+    experiment_id : str
+        ID of the experiment to export.
+    path : str
+        Output directory. Created if it does not exist.
+    fmt : ExportFormat
+        File format: "parquet" (default), "arrow" (Arrow IPC / Feather v2), or "csv".
+        "parquet" and "arrow" require the `pyarrow` package (`mlos-bench[pyarrow]` extra).
+    chunk_size : int
+        Maximum number of rows in one partition file.
+
+    Returns
+    -------
+    manifest : Dict[str, Any]
+        Description of the exported data, also saved into `manifest.json`.
+    """
+    _check_format(fmt)
+    if chunk_size <= 0:
+        raise ValueError(f"Invalid chunk_size: {chunk_size}")
+    manifest: Dict[str, Any] = {
+        "experiment_id": experiment_id,
+        "schema_version": migrations.SCHEMA_VERSION,
+        "format": fmt,
+        "tables": {},
+    }
+    stmts = _export_stmts(schema, experiment_id)
+    with engine.connect() as conn:
+        if conn.execute(stmts[schema.experiment.name]).first() is None:
+            raise ValueError(f"Experiment not found: {experiment_id}")
+        for (table_name, stmt) in stmts.items():
+            os.makedirs(os.path.join(path, table_name), exist_ok=True)
+            parts: List[Dict[str, Any]] = []
+            # Stream the rows in chunks instead of loading the whole table into memory.
+            result = conn.execution_options(yield_per=chunk_size).execute(stmt)
+            for rows in result.partitions():
+                file_name = f"{table_name}/part-{len(parts):05d}{_FILE_EXT[fmt]}"
+                _write_df(pandas.DataFrame(rows, columns=list(result.keys())),
+                          os.path.join(path, file_name), fmt)
+                parts.append({"file": file_name, "rows": len(rows)})
+            _LOG.info("Exported %s :: %s rows in %d files",
+                      table_name, sum(part["rows"] for part in parts), len(parts))
+            manifest["tables"][table_name] = parts
+    with open(os.path.join(path, _MANIFEST_FILE), "w", encoding="utf-8") as fh_manifest:
+        json.dump(manifest, fh_manifest, indent=2)
+    return manifest
+
+
+def _column_converter(table: Table, col_name: str) -> Callable[[Any], Any]:
+    """
+    Get a function to convert the value from the file to the type of the table column.
+    """
+    col_type = table.c[col_name].type
+    if isinstance(col_type, DateTime):
+        return (lambda val: pandas.Timestamp(val).tz_convert("UTC").to_pydatetime()) \
+            if col_type.timezone else \
+            (lambda val: pandas.Timestamp(val).tz_localize(None).to_pydatetime())
+    if isinstance(col_type, Integer):
+        return int
+    if isinstance(col_type, Float):
+        return float
+    return str
+
+
+def _to_records(table: Table, df: pandas.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Convert the DataFrame loaded from a file to the list of rows to insert into the table.
+    """
+    columns = [col for col in df.columns if col in table.c]
+    converters = {col: _column_converter(table, col) for col in columns}
+    # Timestamps in the files are either tz-aware or naive UTC.
+    for col in columns:
+        if isinstance(table.c[col].type, DateTime):
+            df[col] = pandas.to_datetime(df[col], utc=True)
+    records = [
+        {
+            col: None if pandas.isna(val) else converters[col](val)
+            for (col, val) in zip(columns, row)
+        }
+        for row in df[columns].itertuples(index=False, name=None)
+    ]
+    # Backfill the numeric columns for the data exported from the older schema versions.
+    for (num_col, str_col) in _NUMERIC_COLUMNS.items():
+        if num_col in table.c and num_col not in df.columns and str_col in df.columns:
+            for rec in records:
+                rec[num_col] = numeric_value(rec[str_col])
+    return records
+
+
+def _read_table(path: str, manifest: Dict[str, Any], table_name: str) -> Iterator[pandas.DataFrame]:
+    """
+    Read the partitions of the table listed in the manifest, one by one.
+    """
+    for part in manifest["tables"].get(table_name, []):
+        yield _read_df(os.path.join(path, part["file"]), manifest["format"])
+
+
+def _import_configs(conn: Connection, schema: DbSchema,
+                    path: str, manifest: Dict[str, Any]) -> Dict[int, int]:
+    """
+    Import the tunable configs that are not in the target database yet,
+    matching the existing ones by their hash.
+
+    Returns
+    -------
+    config_ids : Dict[int, int]
+        Mapping of the config IDs in the files to the config IDs in the database.
+    """
+    config_ids: Dict[int, int] = {}
+    new_config_ids: Set[int] = set()
+    for df in _read_table(path, manifest, schema.config.name):
+        hashes = {str(row.config_hash): int(row.config_id) for row in df.itertuples(index=False)}
+        existing = {
+            row.config_hash: row.config_id for row in conn.execute(
+                select(schema.config.c.config_id, schema.config.c.config_hash).where(
+                    schema.config.c.config_hash.in_(list(hashes)))
+            )
+        }
+        missing = [config_hash for config_hash in hashes if config_hash not in existing]
+        if missing:
+            conn.execute(schema.config.insert(), [{"config_hash": config_hash} for config_hash in missing])
+            for row in conn.execute(
+                    select(schema.config.c.config_id, schema.config.c.config_hash).where(
+                        schema.config.c.config_hash.in_(missing))):
+                existing[row.config_hash] = row.config_id
+                new_config_ids.add(hashes[row.config_hash])
+        config_ids.update({hashes[config_hash]: int(config_id)
+                           for (config_hash, config_id) in existing.items()})
+    # Only the new configs need their parameters; the existing ones have them already.
+    for df in _read_table(path, manifest, schema.config_param.name):
+        records = [
+            {**rec, "config_id": config_ids[rec["config_id"]]}
+            for rec in _to_records(schema.config_param, df)
+            if rec["config_id"] in new_config_ids
+        ]
+        if records:
+            conn.execute(schema.config_param.insert(), records)
+    return config_ids
+
+
+def import_experiment(engine: Engine, schema: DbSchema, path: str) -> str:
+    """
+    Load the experiment exported by `export_experiment()` into the database
+    using bulk inserts, all in one transaction.
+
+    The config IDs are remapped to the ones in the target database, reusing
+    the existing configs with the same hash.
+
+    Parameters
+    ----------
+    engine : Engine
+        SQLAlchemy engine of the target storage.
+    schema : DbSchema
+        The database schema.
+    path : str
+        Directory with the exported data.
+
+    Returns
+    -------
+    experiment_id : str
+        ID of the imported experiment.
+    """
+    with open(os.path.join(path, _MANIFEST_FILE), encoding="utf-8") as fh_manifest:
+        manifest: Dict[str, Any] = json.load(fh_manifest)
+    experiment_id: str = manifest["experiment_id"]
+    if manifest["schema_version"] > migrations.SCHEMA_VERSION:
+        raise ValueError(
+            f"Exported data schema version {manifest['schema_version']} is newer " +
+            f"than the supported version {migrations.SCHEMA_VERSION}: {path}")
+    _check_format(manifest["format"])
+    with engine.begin() as conn:
+        if conn.execute(schema.experiment.select().where(
+                schema.experiment.c.exp_id == experiment_id)).first() is not None:
+            raise ValueError(f"Experiment already exists: {experiment_id}")
+        config_ids: Optional[Dict[int, int]] = None
+        for table in (schema.experiment, schema.objectives, schema.config, schema.trial,
+                      schema.trial_param, schema.trial_status, schema.trial_result,
+                      schema.trial_telemetry, schema.trial_telemetry_rollup):
+            if table is schema.config:
+                config_ids = _import_configs(conn, schema, path, manifest)
+                continue
+            row_count = 0
+            for df in _read_table(path, manifest, table.name):
+                records = _to_records(table, df)
+                if table is schema.trial:
+                    assert config_ids is not None
+                    for rec in records:
+                        rec["config_id"] = config_ids[rec["config_id"]]
+                if records:
+                    conn.execute(table.insert(), records)
+                row_count += len(records)
+            _LOG.info("Imported %s :: %d rows", table.name, row_count)
+    return experiment_id
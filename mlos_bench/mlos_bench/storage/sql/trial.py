@@ -16,7 +16,10 @@ from sqlalchemy.exc import IntegrityError
 from mlos_bench.environments.status import Status
 from mlos_bench.tunables.tunable_groups import TunableGroups
 from mlos_bench.storage.base_storage import Storage
-from mlos_bench.storage.sql.schema import DbSchema
+from mlos_bench.storage.sql.common import insert_ignore
+from mlos_bench.storage.sql.schema import DbSchema, numeric_value
+from mlos_bench.storage.sql.telemetry_rollup import TelemetryRollups
+from mlos_bench.storage.sql.writer import StorageWriter
 from mlos_bench.util import nullable, utcify_timestamp
 
 _LOG = logging.getLogger(__name__)
@@ -35,7 +38,9 @@ class Trial(Storage.Trial):
                  trial_id: int,
                  config_id: int,
                  opt_targets: Dict[str, Literal['min', 'max']],
-                 config: Optional[Dict[str, Any]] = None):
+                 config: Optional[Dict[str, Any]] = None,
+                 writer: Optional[StorageWriter] = None,
+                 rollups: Optional[TelemetryRollups] = None):
         super().__init__(
             tunables=tunables,
             experiment_id=experiment_id,
@@ -46,6 +51,13 @@ class Trial(Storage.Trial):
         )
         self._engine = engine
         self._schema = schema
+        # Write-behind queue for the status history and telemetry (if enabled).
+        self._writer = writer
+        # Time-bucketed aggregates of the telemetry to maintain (if enabled).
+        self._rollups = rollups
+        # Timestamp of the latest telemetry record saved through this object.
+        # Telemetry is often reported cumulatively, so skip the older records.
+        self._telemetry_ts: Optional[datetime] = None
 
     def update(self, status: Status, timestamp: datetime,
                metrics: Optional[Dict[str, Any]] = None
@@ -54,27 +66,37 @@ class Trial(Storage.Trial):
         timestamp = utcify_timestamp(timestamp, origin="local")
         metrics = super().update(status, timestamp, metrics)
         with self._engine.begin() as conn:
-            self._update_status(conn, status, timestamp)
             try:
                 if status.is_completed():
                     # Final update of the status and ts_end:
+                    trial_filter = [
+                        self._schema.trial.c.exp_id == self._experiment_id,
+                        self._schema.trial.c.trial_id == self._trial_id,
+                        self._schema.trial.c.ts_end.is_(None),
+                        self._schema.trial.c.status.notin_(
+                            ['SUCCEEDED', 'CANCELED', 'FAILED', 'TIMED_OUT', 'PRUNED']),
+                    ]
+                    if self._worker_id is not None:
+                        # Only the worker that holds the lease can complete the trial.
+                        trial_filter.append(self._schema.trial.c.worker_id == self._worker_id)
                     cur_status = conn.execute(
-                        self._schema.trial.update().where(
-                            self._schema.trial.c.exp_id == self._experiment_id,
-                            self._schema.trial.c.trial_id == self._trial_id,
-                            self._schema.trial.c.ts_end.is_(None),
-                            self._schema.trial.c.status.notin_(
-                                ['SUCCEEDED', 'CANCELED', 'FAILED', 'TIMED_OUT']),
-                        ).values(
+                        self._schema.trial.update().where(*trial_filter).values(
                             status=status.name,
                             ts_end=timestamp,
                         )
                     )
                     if cur_status.rowcount not in {1, -1}:
+                        if self._worker_id is not None:
+                            # Another worker has taken over the trial after our lease expired.
+                            _LOG.warning("Trial %s :: lease of %s is over, drop the results: %s %s",
+                                         self, self._worker_id, status, metrics)
+                            conn.rollback()
+                            return None
                         _LOG.warning("Trial %s :: update failed: %s", self, status)
                         raise RuntimeError(
                             f"Failed to update the status of the trial {self} to {status}." +
                             f" ({cur_status.rowcount} rows)")
+                    self._update_status(conn, status, timestamp)
                     if metrics:
                         conn.execute(self._schema.trial_result.insert().values([
                             {
@@ -82,19 +104,21 @@ class Trial(Storage.Trial):
                                 "trial_id": self._trial_id,
                                 "metric_id": key,
                                 "metric_value": nullable(str, val),
+                                "metric_value_num": numeric_value(val),
                             }
                             for (key, val) in metrics.items()
                         ]))
                 else:
                     # Update of the status and ts_start when starting the trial:
                     assert metrics is None, f"Unexpected metrics for status: {status}"
+                    self._update_status(conn, status, timestamp)
                     cur_status = conn.execute(
                         self._schema.trial.update().where(
                             self._schema.trial.c.exp_id == self._experiment_id,
                             self._schema.trial.c.trial_id == self._trial_id,
                             self._schema.trial.c.ts_end.is_(None),
                             self._schema.trial.c.status.notin_(
-                                ['RUNNING', 'SUCCEEDED', 'CANCELED', 'FAILED', 'TIMED_OUT']),
+                                ['RUNNING', 'SUCCEEDED', 'CANCELED', 'FAILED', 'TIMED_OUT', 'PRUNED']),
                         ).values(
                             status=status.name,
                             ts_start=timestamp,
@@ -106,47 +130,97 @@ class Trial(Storage.Trial):
             except Exception:
                 conn.rollback()
                 raise
+        if self._rollups is not None and status.is_completed():
+            self._rollups.finish(self._experiment_id, self._trial_id, timestamp)
         return metrics
 
+    def heartbeat(self, timestamp: datetime) -> bool:
+        timestamp = utcify_timestamp(timestamp, origin="local")
+        if self._worker_id is None:
+            return False
+        with self._engine.begin() as conn:
+            cur_status = conn.execute(
+                self._schema.trial.update().where(
+                    self._schema.trial.c.exp_id == self._experiment_id,
+                    self._schema.trial.c.trial_id == self._trial_id,
+                    self._schema.trial.c.ts_end.is_(None),
+                    self._schema.trial.c.status.in_(['READY', 'RUNNING']),
+                    self._schema.trial.c.worker_id == self._worker_id,
+                ).values(
+                    ts_heartbeat=timestamp,
+                )
+            )
+            is_alive = cur_status.rowcount in {1, -1}
+        if not is_alive:
+            _LOG.info("Trial %s :: lease of %s is over", self, self._worker_id)
+        return is_alive
+
     def update_telemetry(self, status: Status, timestamp: datetime,
                          metrics: List[Tuple[datetime, str, Any]]) -> None:
         super().update_telemetry(status, timestamp, metrics)
         # Make sure to convert the timestamp to UTC before storing it in the database.
         timestamp = utcify_timestamp(timestamp, origin="local")
         metrics = [(utcify_timestamp(ts, origin="local"), key, val) for (ts, key, val) in metrics]
-        # NOTE: Not every SQLAlchemy dialect supports `Insert.on_conflict_do_nothing()`
-        # and we need to keep `.update_telemetry()` idempotent; hence a loop instead of
-        # a bulk upsert.
-        # See Also: comments in <https://github.com/microsoft/MLOS/pull/466>
         with self._engine.begin() as conn:
             self._update_status(conn, status, timestamp)
-        for (metric_ts, key, val) in metrics:
+        # The records at the high-water mark itself can still be new (e.g., other metrics).
+        if self._telemetry_ts is not None:
+            metrics = [(metric_ts, key, val) for (metric_ts, key, val) in metrics
+                       if metric_ts >= self._telemetry_ts]
+        if not metrics:
+            return
+        rows = [
+            {
+                "exp_id": self._experiment_id,
+                "trial_id": self._trial_id,
+                "ts": metric_ts,
+                "metric_id": key,
+                "metric_value": nullable(str, val),
+                "metric_value_num": numeric_value(val),
+            }
+            for (metric_ts, key, val) in metrics
+        ]
+        stmt = insert_ignore(self._engine, self._schema.trial_telemetry)
+        if stmt is not None and self._writer is not None:
+            self._writer.write(stmt, rows)
+        elif stmt is not None:
+            # Insert all records in one transaction and skip the duplicates.
             with self._engine.begin() as conn:
-                try:
-                    conn.execute(self._schema.trial_telemetry.insert().values(
-                        exp_id=self._experiment_id,
-                        trial_id=self._trial_id,
-                        ts=metric_ts,
-                        metric_id=key,
-                        metric_value=nullable(str, val),
-                    ))
-                except IntegrityError as ex:
-                    _LOG.warning("Record already exists: %s :: %s", (metric_ts, key, val), ex)
+                conn.execute(stmt, rows)
+        else:
+            # NOTE: Not every SQLAlchemy dialect supports the insert-or-ignore semantics
+            # and we need to keep `.update_telemetry()` idempotent; hence a loop instead of
+            # a bulk upsert.
+            # See Also: comments in <https://github.com/microsoft/MLOS/pull/466>
+            for row in rows:
+                with self._engine.begin() as conn:
+                    try:
+                        conn.execute(self._schema.trial_telemetry.insert().values(**row))
+                    except IntegrityError as ex:
+                        _LOG.warning("Record already exists: %s :: %s", row, ex)
+        if self._rollups is not None:
+            self._rollups.update(self._experiment_id, self._trial_id, metrics)
+        self._telemetry_ts = max(metric_ts for (metric_ts, _key, _val) in metrics)
 
     def _update_status(self, conn: Connection, status: Status, timestamp: datetime) -> None:
         """
         Insert a new status record into the database.
         This call is idempotent.
+        With the write-behind enabled, the record is queued instead.
         """
         # Make sure to convert the timestamp to UTC before storing it in the database.
         timestamp = utcify_timestamp(timestamp, origin="local")
+        row = {
+            "exp_id": self._experiment_id,
+            "trial_id": self._trial_id,
+            "ts": timestamp,
+            "status": status.name,
+        }
+        if self._writer is not None:
+            self._writer.insert(self._schema.trial_status, [row])
+            return
         try:
-            conn.execute(self._schema.trial_status.insert().values(
-                exp_id=self._experiment_id,
-                trial_id=self._trial_id,
-                ts=timestamp,
-                status=status.name,
-            ))
+            conn.execute(self._schema.trial_status.insert().values(**row))
         except IntegrityError as ex:
             _LOG.warning("Status with that timestamp already exists: %s %s :: %s",
                          self, timestamp, ex)
@@ -5,22 +5,27 @@
 """
 An interface to access the benchmark trial data stored in SQL DB.
 """
+import logging
 from datetime import datetime
 from typing import Optional, TYPE_CHECKING
 
 import pandas
-from sqlalchemy import Engine
+from sqlalchemy import Engine, select
 
 from mlos_bench.storage.base_trial_data import TrialData
 from mlos_bench.storage.base_tunable_config_data import TunableConfigData
 from mlos_bench.environments.status import Status
+from mlos_bench.storage.sql.common import typed_value
 from mlos_bench.storage.sql.schema import DbSchema
 from mlos_bench.storage.sql.tunable_config_data import TunableConfigSqlData
+from mlos_bench.storage.util import telemetry_rollup_df
 from mlos_bench.util import utcify_timestamp
 
 if TYPE_CHECKING:
     from mlos_bench.storage.base_tunable_config_trial_group_data import TunableConfigTrialGroupData
 
+_LOG = logging.getLogger(__name__)
+
 
 class TrialSqlData(TrialData):
     """
@@ -83,8 +88,11 @@ class TrialSqlData(TrialData):
                 )
             )
             return pandas.DataFrame(
-                [(row.metric_id, row.metric_value) for row in cur_results.fetchall()],
-                columns=['metric', 'value'])
+                [(row.metric_id, typed_value(row.metric_value, row.metric_value_num))
+                 for row in cur_results.fetchall()],
+                columns=['metric', 'value'],
+                # Keep the int and float metrics apart.
+                dtype=object)
 
     @property
     def telemetry_df(self) -> pandas.DataFrame:
@@ -104,9 +112,52 @@ class TrialSqlData(TrialData):
             # Not all storage backends store the original zone info.
             # We try to ensure data is entered in UTC and augment it on return again here.
             return pandas.DataFrame(
-                [(utcify_timestamp(row.ts, origin="utc"), row.metric_id, row.metric_value) for row in cur_telemetry.fetchall()],
+                [(utcify_timestamp(row.ts, origin="utc"), row.metric_id,
+                  typed_value(row.metric_value, row.metric_value_num))
+                 for row in cur_telemetry.fetchall()],
                 columns=['ts', 'metric', 'value'])
 
+    def telemetry_rollup_df(self, resolution: int) -> pandas.DataFrame:
+        """
+        Retrieve the trials' numeric telemetry downsampled to the buckets
+        of `resolution` seconds.
+
+        Serve it from the coarsest rollup that the resolution is a multiple of,
+        and fall back to the raw telemetry if there is no such rollup.
+        """
+        if resolution <= 0:
+            raise ValueError(f"Invalid telemetry resolution: {resolution}")
+        table = self._schema.trial_telemetry_rollup
+        with self._engine.connect() as conn:
+            resolutions = conn.execute(
+                select(table.c.resolution).where(
+                    table.c.exp_id == self._experiment_id,
+                    table.c.trial_id == self._trial_id,
+                ).distinct()
+            ).scalars().all()
+            rollup_resolution = max((res for res in resolutions if resolution % res == 0), default=None)
+            if rollup_resolution is None:
+                if resolutions:
+                    _LOG.warning("No telemetry rollup for %d sec in %s; using the raw telemetry",
+                                 resolution, resolutions)
+                return super().telemetry_rollup_df(resolution)
+            cur_rollups = conn.execute(
+                table.select().where(
+                    table.c.exp_id == self._experiment_id,
+                    table.c.trial_id == self._trial_id,
+                    table.c.resolution == rollup_resolution,
+                ).order_by(
+                    table.c.ts,
+                    table.c.metric_id,
+                )
+            )
+            return telemetry_rollup_df(pandas.DataFrame(
+                [(utcify_timestamp(row.ts, origin="utc"), row.metric_id,
+                  row.value_count, row.value_min, row.value_max, row.value_sum, row.value_last,
+                  utcify_timestamp(row.ts_last, origin="utc"))
+                 for row in cur_rollups.fetchall()],
+                columns=['ts', 'metric', 'count', 'min', 'max', 'sum', 'last', 'ts_last']), resolution)
+
     @property
     def metadata_df(self) -> pandas.DataFrame:
         """
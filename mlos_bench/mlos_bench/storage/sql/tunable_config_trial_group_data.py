@@ -6,7 +6,7 @@
 An interface to access the tunable config trial group data stored in SQL DB.
 """
 
-from typing import Dict, Optional, TYPE_CHECKING
+from typing import Mapping, Optional, TYPE_CHECKING
 
 import pandas
 from sqlalchemy import Engine, Integer, func
@@ -75,14 +75,14 @@ class TunableConfigTrialGroupSqlData(TunableConfigTrialGroupData):
         )
 
     @property
-    def trials(self) -> Dict[int, "TrialData"]:
+    def trials(self) -> Mapping[int, "TrialData"]:
         """
         Retrieve the trials' data for this (tunable) config trial group from the storage.
 
         Returns
         -------
-        trials : Dict[int, TrialData]
-            A dictionary of the trials' data, keyed by trial id.
+        trials : Mapping[int, TrialData]
+            A (possibly lazy) mapping of the trials' data, keyed by trial id.
         """
         return common.get_trials(self._engine, self._schema, self._experiment_id, self._tunable_config_id)
 
@@ -0,0 +1,148 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Background writer that batches the non-critical SQL storage updates.
+"""
+
+import logging
+import time
+from queue import Empty, Queue
+from threading import Lock, Thread
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Engine, Executable, Table
+
+from mlos_bench.storage.sql.common import insert_ignore
+
+_LOG = logging.getLogger(__name__)
+
+
+class StorageWriter:
+    """
+    Write-behind queue for the SQL storage.
+
+    The writes that nobody waits for (i.e., status history and telemetry)
+    are queued and executed by a background thread, batching all
+    statements collected within `flush_interval` seconds into one transaction.
+    The queue is bounded: when it is full, the caller blocks until the writer
+    catches up. Use `.flush()` to wait until all queued writes are committed.
+
+    A failed batch is retried one statement at a time, so that one bad record
+    (e.g., a duplicate) does not take the rest of the batch with it.
+    The statements that still fail are reported by the next `.flush()` call.
+    """
+
+    def __init__(self, engine: Engine, *,
+                 max_queue_size: int = 1000,
+                 flush_interval: float = 1.0):
+        """
+        Create a new writer. The background thread starts on the first write.
+
+        Parameters
+        ----------
+        engine : Engine
+            SQLAlchemy engine to execute the statements.
+        max_queue_size : int
+            Maximum number of the pending statements in the queue.
+        flush_interval : float
+            Time (in seconds) to collect the statements for one transaction.
+        """
+        if max_queue_size <= 0:
+            raise ValueError(f"Invalid max_queue_size: {max_queue_size}")
+        if flush_interval <= 0:
+            raise ValueError(f"Invalid flush_interval: {flush_interval}")
+        self._engine = engine
+        self._flush_interval = flush_interval
+        # None in the queue is a request to commit the current batch immediately.
+        self._queue: Queue[Optional[Tuple[Executable, List[Dict[str, Any]]]]] = Queue(max_queue_size)
+        self._lock = Lock()
+        self._thread: Optional[Thread] = None
+        # Errors of the failed writes since the last `.flush()`.
+        self._errors: List[Exception] = []
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._engine.url.get_backend_name()})"
+
+    def write(self, stmt: Executable, rows: List[Dict[str, Any]]) -> None:
+        """
+        Queue the statement to execute with the given rows of parameters.
+        Block if the queue is full.
+        """
+        if not rows:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = Thread(target=self._run, name=f"{self}", daemon=True)
+                self._thread.start()
+        self._queue.put((stmt, rows))
+
+    def insert(self, table: Table, rows: List[Dict[str, Any]]) -> None:
+        """
+        Queue the rows to insert into the table, skipping the duplicates
+        if the database supports it.
+        """
+        stmt = insert_ignore(self._engine, table)
+        self.write(table.insert() if stmt is None else stmt, rows)
+
+    def flush(self) -> None:
+        """
+        Wait until all queued statements are committed to the database.
+        Raise an exception if any of the writes since the last flush have failed.
+        """
+        _LOG.debug("Flush the storage writer: %d pending", self._queue.qsize())
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._queue.join()
+        with self._lock:
+            (errors, self._errors) = (self._errors, [])
+        if errors:
+            raise RuntimeError(f"{self}: {len(errors)} write(s) failed; first error: {errors[0]}") from errors[0]
+
+    def _run(self) -> None:
+        """
+        Main loop of the background thread.
+        """
+        while True:
+            batch = [self._queue.get()]
+            # Collect more statements for the same transaction.
+            deadline = time.monotonic() + self._flush_interval
+            try:
+                while batch[-1] is not None:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    batch.append(self._queue.get(timeout=timeout))
+            except Empty:
+                pass
+            try:
+                self._execute([item for item in batch if item is not None])
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _execute(self, batch: List[Tuple[Executable, List[Dict[str, Any]]]]) -> None:
+        """
+        Execute the batch of statements in one transaction.
+        If it fails, retry the statements one by one.
+        """
+        if not batch:
+            return
+        _LOG.debug("Write %d statements", len(batch))
+        try:
+            with self._engine.begin() as conn:
+                for (stmt, rows) in batch:
+                    conn.execute(stmt, rows)
+            return
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            _LOG.warning("Batch write failed; retry one by one: %s", ex)
+        for (stmt, rows) in batch:
+            try:
+                with self._engine.begin() as conn:
+                    conn.execute(stmt, rows)
+            except Exception as ex:  # pylint: disable=broad-exception-caught
+                _LOG.exception("Write failed: %s :: %s", stmt, rows)
+                with self._lock:
+                    self._errors.append(ex)
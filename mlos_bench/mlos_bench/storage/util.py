@@ -6,13 +6,18 @@
 Utility functions for the storage subsystem.
 """
 
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 import pandas
 
 from mlos_bench.tunables.tunable import TunableValue, TunableValueTypeTuple
 from mlos_bench.util import try_parse_val
 
+TELEMETRY_ROLLUP_COLUMNS: List[str] = ['ts', 'metric', 'count', 'min', 'max', 'mean', 'last']
+"""
+Columns of the downsampled telemetry dataframe.
+"""
+
 
 def kv_df_to_dict(dataframe: pandas.DataFrame) -> Dict[str, Optional[TunableValue]]:
     """
@@ -38,3 +43,38 @@ def kv_df_to_dict(dataframe: pandas.DataFrame) -> Dict[str, Optional[TunableValu
             raise ValueError(f"Duplicate parameter '{row['parameter']}' in dataframe")
         data[row['parameter']] = try_parse_val(row['value']) if isinstance(row['value'], str) else row['value']
     return data
+
+
+def telemetry_rollup_df(buckets: pandas.DataFrame, resolution: int) -> pandas.DataFrame:
+    """
+    Utility function to aggregate the telemetry buckets into the coarser buckets
+    of `resolution` seconds (aligned to the Unix epoch).
+
+    Parameters
+    ----------
+    buckets : pandas.DataFrame
+        A dataframe with the columns "ts" (start of the bucket), "metric", "count",
+        "min", "max", "sum", "last", and "ts_last" (timestamp of the last value).
+        The raw telemetry is a special case with one value per bucket.
+    resolution : int
+        Size of the output buckets in seconds.
+        Should be a multiple of the size of the input buckets.
+
+    Returns
+    -------
+    telemetry : pandas.DataFrame
+        A dataframe with the `TELEMETRY_ROLLUP_COLUMNS`, sorted by "ts" and "metric".
+    """
+    if buckets.empty:
+        return pandas.DataFrame(columns=TELEMETRY_ROLLUP_COLUMNS)
+    buckets = buckets.sort_values("ts_last")
+    buckets["ts"] = buckets["ts"].dt.floor(f"{resolution}s")
+    rollup_df = buckets.groupby(["ts", "metric"], sort=True).agg(
+        count=("count", "sum"),
+        min=("min", "min"),
+        max=("max", "max"),
+        sum=("sum", "sum"),
+        last=("last", "last"),
+    ).reset_index()
+    rollup_df["mean"] = rollup_df["sum"] / rollup_df["count"]
+    return rollup_df[TELEMETRY_ROLLUP_COLUMNS]
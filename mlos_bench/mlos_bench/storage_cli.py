@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Command line tool to move the experiment data in and out of mlos_bench storage.
+
+Note: this script is also available as a CLI tool via pip under the name "mlos_bench_storage".
+
+Examples
+--------
+Export the experiment from one storage and load it into another:
+
+    mlos_bench_storage --storage storage/sqlite.jsonc export --experiment-id MyExperiment /tmp/MyExperiment
+    mlos_bench_storage --storage storage/postgres.jsonc import /tmp/MyExperiment
+
+See `--help` output for details.
+"""
+
+import argparse
+import logging
+from typing import Dict, List, Optional
+
+from mlos_bench.config.schemas import ConfigSchema
+from mlos_bench.services.config_persistence import ConfigPersistenceService
+from mlos_bench.storage.sql.storage import SqlStorage
+
+_LOG_FORMAT = '%(asctime)s %(filename)s:%(lineno)d %(funcName)s %(levelname)s %(message)s'
+
+_LOG = logging.getLogger(__name__)
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    """
+    Parse the command line arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="mlos_bench storage tool : Bulk export and import of the experiment data.")
+    parser.add_argument(
+        '--storage', required=True,
+        help='Path to the JSON file with the SQL storage configuration.')
+    parser.add_argument(
+        '--config_path', '--config-path', '--config-paths', '--config_paths',
+        nargs="+", action='extend', required=False,
+        help='One or more locations of JSON config files.')
+    parser.add_argument(
+        '--log_level', '--log-level', required=False, type=str, default="INFO",
+        help='Logging level. Default is INFO.')
+
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser(
+        "export", help="Export the experiment data to the partitioned Parquet/Arrow files.")
+    export_parser.add_argument(
+        '--experiment_id', '--experiment-id', required=True,
+        help='ID of the experiment to export.')
+    export_parser.add_argument(
+        '--format', choices=["parquet", "arrow", "csv"], default="parquet",
+        help='Output file format. Default is parquet. ' +
+        'The parquet and arrow formats require the mlos-bench[pyarrow] extra.')
+    export_parser.add_argument(
+        '--chunk_size', '--chunk-size', type=int, default=100_000,
+        help='Maximum number of rows in one output file. Default is 100000.')
+    export_parser.add_argument(
+        'path', help='Output directory.')
+
+    import_parser = subparsers.add_parser(
+        "import", help="Load the exported experiment data into the storage.")
+    import_parser.add_argument(
+        'path', help='Directory with the exported experiment data.')
+
+    return parser.parse_args(argv)
+
+
+def _load_storage(args: argparse.Namespace) -> SqlStorage:
+    """
+    Instantiate the storage from the JSON config in the --storage parameter.
+    """
+    config_loader = ConfigPersistenceService({"config_path": args.config_path or []})
+    class_config = config_loader.load_config(args.storage, ConfigSchema.STORAGE)
+    assert isinstance(class_config, Dict)
+    storage = config_loader.build_storage(service=config_loader, config=class_config)
+    if not isinstance(storage, SqlStorage):
+        raise ValueError(f"Export/import is only supported for SqlStorage: {storage}")
+    return storage
+
+
+def _main(argv: Optional[List[str]] = None) -> None:
+
+    args = _parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper(), format=_LOG_FORMAT)
+    storage = _load_storage(args)
+
+    if args.command == "export":
+        manifest = storage.export_experiment(args.experiment_id, args.path,
+                                             fmt=args.format, chunk_size=args.chunk_size)
+        _LOG.info("Exported experiment %s from %s to: %s :: %s", args.experiment_id, storage, args.path,
+                  {table: sum(part["rows"] for part in parts) for (table, parts) in manifest["tables"].items()})
+    else:
+        experiment_id = storage.import_experiment(args.path)
+        _LOG.info("Imported experiment %s into %s from: %s", experiment_id, storage, args.path)
+
+
+if __name__ == "__main__":
+    _main()
@@ -100,8 +100,12 @@ def test_load_cli_config_examples(config_loader_service: ConfigPersistenceServic
 
 
 @pytest.mark.parametrize("config_path", configs)
-def test_load_cli_config_examples_via_launcher(config_loader_service: ConfigPersistenceService, config_path: str) -> None:
+def test_load_cli_config_examples_via_launcher(config_loader_service: ConfigPersistenceService, config_path: str,
+                                               tmp_path: str, monkeypatch: pytest.MonkeyPatch) -> None:
     """Tests loading a config example via the Launcher."""
+    # Some examples write the log file and the SQLite database to the current directory,
+    # and some look up their configs relative to it (see the extra config paths below).
+    monkeypatch.chdir(tmp_path)
     config = config_loader_service.load_config(config_path, ConfigSchema.CLI)
     assert isinstance(config, dict)
 
@@ -111,6 +115,7 @@ def test_load_cli_config_examples_via_launcher(config_loader_service: ConfigPers
     cli_args = f"--config {config_path}" + \
         f" --config-path {files('mlos_bench.config')} --config-path {files('mlos_bench.tests.config')}" + \
         f" --config-path {path_join(str(files('mlos_bench.tests.config')), 'globals')}" + \
+        f" --config-path {path_join(str(files('mlos_bench.config')), 'experiments')}" + \
         f" --globals {files('mlos_bench.tests.config')}/experiments/experiment_test_config.jsonc"
     launcher = Launcher(description=__name__, long_text=config_path, argv=cli_args.split())
     assert launcher
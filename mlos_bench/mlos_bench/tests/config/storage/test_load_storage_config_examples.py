@@ -15,6 +15,7 @@ from mlos_bench.tests.config import locate_config_examples
 from mlos_bench.config.schemas.config_schemas import ConfigSchema
 from mlos_bench.services.config_persistence import ConfigPersistenceService
 from mlos_bench.storage.base_storage import Storage
+from mlos_bench.storage.sql.storage import SqlStorage
 from mlos_bench.util import get_class_from_name
 
 
@@ -40,10 +41,11 @@ def test_load_storage_config_examples(config_loader_service: ConfigPersistenceSe
     """Tests loading a config example."""
     config = config_loader_service.load_config(config_path, ConfigSchema.STORAGE)
     assert isinstance(config, dict)
-    # Skip schema loading that would require a database connection for this test.
-    config["config"]["lazy_schema_create"] = True
     cls = get_class_from_name(config["class"])
     assert issubclass(cls, Storage)
+    if issubclass(cls, SqlStorage):
+        # Skip schema loading that would require a database connection for this test.
+        config["config"]["lazy_schema_create"] = True
     # Make an instance of the class based on the config.
     storage_inst = config_loader_service.build_storage(
         config=config,
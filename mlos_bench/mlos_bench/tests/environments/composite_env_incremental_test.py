@@ -0,0 +1,108 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Unit tests for the incremental setup of the composite environment.
+"""
+
+from typing import Callable, List, Optional
+
+import pytest
+
+from mlos_bench.environments.base_environment import Environment
+from mlos_bench.environments.composite_env import CompositeEnv
+from mlos_bench.tunables.tunable_groups import TunableGroups
+from mlos_bench.services.config_persistence import ConfigPersistenceService
+
+
+def _create_composite_env(tunable_groups: TunableGroups, incremental_setup: bool) -> CompositeEnv:
+    """
+    Create a composite environment with one child per covariant group.
+    """
+    return CompositeEnv(
+        name="Composite Test Environment",
+        config={
+            "incremental_setup": incremental_setup,
+            "children": [
+                {
+                    "name": f"Mock Env {group}",
+                    "class": "mlos_bench.environments.mock_env.MockEnv",
+                    "config": {
+                        "tunable_params": [group],
+                        "required_args": ["trial_id"],
+                        "range": [60, 120],
+                        "metrics": ["score"],
+                    }
+                }
+                for group in ["provision", "boot", "kernel"]
+            ]
+        },
+        tunables=tunable_groups,
+        service=ConfigPersistenceService({}),
+        global_config={"trial_id": 0},
+    )
+
+
+def _setup(env: CompositeEnv, tunable_groups: TunableGroups, trial_id: int,
+           monkeypatch: pytest.MonkeyPatch) -> List[str]:
+    """
+    Set up the composite environment and return the names of the children
+    that went through the full setup.
+    """
+    setup_envs: List[str] = []
+
+    def _make_setup(child: Environment) -> Callable[[TunableGroups, Optional[dict]], bool]:
+        def _child_setup(tunables: TunableGroups, global_config: Optional[dict] = None) -> bool:
+            setup_envs.append(child.name)
+            return Environment.setup(child, tunables, global_config)
+        return _child_setup
+
+    with monkeypatch.context() as patch:
+        for child in env.children:
+            patch.setattr(child, "setup", _make_setup(child))
+        assert env.setup(tunable_groups, {"trial_id": trial_id})
+
+    # All children get the new parameters, even if their setup was skipped.
+    for child in env.children:
+        assert child.parameters["trial_id"] == trial_id
+    return setup_envs
+
+
+def test_composite_env_incremental_setup(tunable_groups: TunableGroups,
+                                         monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Check that only the children with updated tunables get set up again.
+    """
+    env = _create_composite_env(tunable_groups, incremental_setup=True)
+    all_envs = [child.name for child in env.children]
+    with env as env_context:
+        assert isinstance(env_context, CompositeEnv)
+        assert _setup(env_context, tunable_groups, 1, monkeypatch) == all_envs
+        # Repeat of the same config: nothing to set up.
+        assert not _setup(env_context, tunable_groups, 2, monkeypatch)
+
+        tunable_groups["kernel_sched_latency_ns"] = 1000
+        assert _setup(env_context, tunable_groups, 3, monkeypatch) == ["Mock Env kernel"]
+
+        tunable_groups["vmSize"] = "Standard_B2s"
+        tunable_groups["idle"] = "mwait"
+        assert _setup(env_context, tunable_groups, 4, monkeypatch) == [
+            "Mock Env provision", "Mock Env boot"]
+
+        # The environments have to be set up again after the teardown.
+        env_context.teardown()
+        assert _setup(env_context, tunable_groups, 5, monkeypatch) == all_envs
+
+
+def test_composite_env_full_setup(tunable_groups: TunableGroups,
+                                  monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Check that all children get set up on every trial by default.
+    """
+    env = _create_composite_env(tunable_groups, incremental_setup=False)
+    all_envs = [child.name for child in env.children]
+    with env as env_context:
+        assert isinstance(env_context, CompositeEnv)
+        assert _setup(env_context, tunable_groups, 1, monkeypatch) == all_envs
+        assert _setup(env_context, tunable_groups, 2, monkeypatch) == all_envs
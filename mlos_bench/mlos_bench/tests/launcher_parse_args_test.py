@@ -98,6 +98,7 @@ def test_launcher_args_parse_1(config_paths: List[str]) -> None:
         == path_join(os.getcwd(), "foo", abs_path=True)
     assert launcher.global_config["varWithEnvVarRef"] == f'user:{getuser()}'
     assert launcher.teardown
+    assert not launcher.worker
     # Check that the environment that got loaded looks to be of the right type.
     env_config = launcher.config_loader.load_config(env_conf_path, ConfigSchema.ENVIRONMENT)
     assert check_class_name(launcher.environment, env_config['class'])
@@ -135,6 +136,7 @@ def test_launcher_args_parse_2(config_paths: List[str]) -> None:
         f' --globals {globals_file}' + \
         ' --experiment_id MockeryExperiment' + \
         ' --no-teardown' + \
+        ' --worker' + \
         ' --random-init' + \
         ' --random-seed 1234' + \
         ' --trial-config-repeat-count 5' + \
@@ -157,6 +159,7 @@ def test_launcher_args_parse_2(config_paths: List[str]) -> None:
         == path_join(os.getcwd(), "foo", abs_path=True)
     assert launcher.global_config["varWithEnvVarRef"] == f'user:{getuser()}'
     assert not launcher.teardown
+    assert launcher.worker
 
     config = launcher.config_loader.load_config(config_file, ConfigSchema.CLI)
     assert launcher.config_loader.config_paths == [path_join(path, abs_path=True) for path in config_paths + config['config_path']]
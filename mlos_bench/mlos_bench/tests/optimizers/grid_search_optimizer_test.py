@@ -275,3 +275,49 @@ def test_grid_search_register(grid_search_opt: GridSearchOptimizer,
         "score": float("inf"),
         "other_score": float("inf"),
     }
+
+
+def test_grid_search_suggest_batch(grid_search_opt: GridSearchOptimizer,
+                                   grid_search_tunables: TunableGroups,
+                                   grid_search_tunables_grid: List[Dict[str, TunableValue]]) -> None:
+    """
+    Make sure that the batches of suggestions are consecutive slices of the grid.
+    """
+    default_config = grid_search_tunables.restore_defaults().get_param_values()
+    pending_configs = list(grid_search_opt.pending_configs)
+    pending_configs.remove(default_config)
+
+    # The first batch starts with the defaults.
+    batch = grid_search_opt.suggest_batch(3)
+    assert [suggestion.get_param_values() for suggestion in batch] == [default_config] + pending_configs[:2]
+    assert grid_search_opt.current_iteration == 3
+
+    batch = grid_search_opt.suggest_batch(4)
+    assert [suggestion.get_param_values() for suggestion in batch] == pending_configs[2:6]
+    assert grid_search_opt.current_iteration == 7
+    assert len(list(grid_search_opt.suggested_configs)) == 7
+    assert len(list(grid_search_opt.pending_configs)) == len(grid_search_tunables_grid) - 7
+
+    # The batch stops at the end of the grid.
+    batch = grid_search_opt.suggest_batch(len(grid_search_tunables_grid))
+    assert [suggestion.get_param_values() for suggestion in batch] == pending_configs[6:]
+    assert not grid_search_opt.not_converged()
+
+    with pytest.raises(ValueError):
+        grid_search_opt.suggest_batch(0)
+
+
+def test_grid_search_unregister_pending(grid_search_opt: GridSearchOptimizer,
+                                        grid_search_tunables_grid: List[Dict[str, TunableValue]]) -> None:
+    """
+    Make sure that the dropped suggestions return to the grid.
+    """
+    batch = grid_search_opt.suggest_batch(3)
+    grid_search_opt.unregister_pending(batch[1])
+    assert batch[1].get_param_values() not in grid_search_opt.suggested_configs
+    assert len(list(grid_search_opt.suggested_configs)) == 2
+    assert list(grid_search_opt.pending_configs)[-1] == batch[1].get_param_values()
+    assert len(list(grid_search_opt.pending_configs)) == len(grid_search_tunables_grid) - 2
+    # Unregistering the same config again is a no-op.
+    grid_search_opt.unregister_pending(batch[1])
+    assert len(list(grid_search_opt.pending_configs)) == len(grid_search_tunables_grid) - 2
@@ -145,3 +145,25 @@ def test_init_mlos_core_smac_temp_output_directory(tunable_groups: TunableGroups
     # pylint: disable=protected-access
     assert isinstance(opt._opt, SmacOptimizer)
     assert opt._opt.base_optimizer.scenario.output_directory is not None
+
+
+def test_mlos_core_smac_suggest_batch(tunable_groups: TunableGroups) -> None:
+    """
+    Test suggesting a batch of distinct configurations from mlos_core SMAC optimizer.
+    """
+    test_opt_config = {
+        'optimizer_type': 'SMAC',
+        'max_suggestions': 10,
+        'seed': SEED,
+    }
+    opt = MlosCoreOptimizer(tunable_groups, test_opt_config)
+    batch = opt.suggest_batch(4)
+    assert len(batch) == 4
+    # The defaults go first.
+    assert batch[0].is_defaults()
+    assert len({str(tunables) for tunables in batch}) == 4
+    assert opt.current_iteration == 4
+    # Never go past the max. number of suggestions.
+    assert len(opt.suggest_batch(100)) == 6
+    assert opt.current_iteration == 10
+    assert not opt.not_converged()
@@ -0,0 +1,7 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Tests for the rules that stop unpromising trials early.
+"""
@@ -0,0 +1,136 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Unit tests for the trial pruners on synthetic telemetry.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Callable, List, Tuple
+
+import pytest
+from pytz import UTC
+
+from mlos_bench.pruners import (
+    CurveExtrapolationPruner,
+    MedianStoppingPruner,
+    PercentilePruner,
+    TrialPruner,
+)
+
+Telemetry = List[Tuple[datetime, str, Any]]
+
+_START = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def _telemetry(values: List[float], metric: str = "latency") -> Telemetry:
+    """
+    Generate the telemetry with one sample of the metric per second.
+    """
+    return [(_START + timedelta(seconds=i), metric, value) for (i, value) in enumerate(values)]
+
+
+def _add_history(pruner: TrialPruner, curve: Callable[[int], float],
+                 num_trials: int = 5, length: int = 10) -> None:
+    """
+    Add several completed trials with (slightly shifted) copies of the same curve.
+    """
+    for trial_id in range(num_trials):
+        pruner.add_trial(trial_id, _telemetry([curve(t) + trial_id for t in range(length)]))
+
+
+def test_pruner_bad_config() -> None:
+    """
+    Check the validation of the pruner parameters.
+    """
+    with pytest.raises(KeyError):
+        MedianStoppingPruner({})
+    with pytest.raises(ValueError):
+        MedianStoppingPruner({"metric": "latency", "direction": "lowest"})
+    with pytest.raises(ValueError):
+        PercentilePruner({"metric": "latency", "percentile": 101})
+    with pytest.raises(ValueError):
+        CurveExtrapolationPruner({"metric": "latency", "min_samples": 1})
+
+
+def test_pruner_not_enough_history() -> None:
+    """
+    Never prune without enough completed trials to compare with.
+    """
+    pruner = MedianStoppingPruner({"metric": "latency", "min_trials": 3})
+    _add_history(pruner, lambda t: 10.0, num_trials=2)
+    assert pruner.num_trials == 2
+    assert not pruner.should_prune(_telemetry([1000.0] * 5))
+
+
+def test_pruner_grace_period() -> None:
+    """
+    Never prune the trials that have not been running for `grace_period` seconds.
+    """
+    pruner = MedianStoppingPruner({"metric": "latency", "grace_period": 5})
+    _add_history(pruner, lambda t: 10.0)
+    assert not pruner.should_prune(_telemetry([1000.0] * 5))
+    assert pruner.should_prune(_telemetry([1000.0] * 6))
+
+
+def test_pruner_skip_other_metrics() -> None:
+    """
+    Ignore other metrics and non-numeric values in the telemetry.
+    """
+    pruner = MedianStoppingPruner({"metric": "latency"})
+    _add_history(pruner, lambda t: 10.0)
+    pruner.add_trial(100, _telemetry([1.0, 2.0], metric="other"))
+    assert pruner.num_trials == 5
+    assert not pruner.should_prune(_telemetry([1000.0] * 5, metric="other"))
+    assert not pruner.should_prune(_telemetry(["n/a", "nan"]))  # type: ignore[list-item]
+    assert pruner.should_prune(_telemetry(["1000", "2000"]))  # type: ignore[list-item]
+
+
+def test_median_stopping_pruner() -> None:
+    """
+    Prune the trials that are worse than the median of the completed ones.
+    """
+    pruner = MedianStoppingPruner({"metric": "latency"})
+    _add_history(pruner, lambda t: 100.0 - t)
+    assert not pruner.should_prune(_telemetry([100.0, 99.0, 98.0]))
+    assert not pruner.should_prune(_telemetry([100.0, 90.0, 200.0]))
+    assert pruner.should_prune(_telemetry([110.0, 109.0, 108.0]))
+
+
+def test_median_stopping_pruner_maximize() -> None:
+    """
+    Prune the trials with lower throughput than the median of the completed ones.
+    """
+    pruner = MedianStoppingPruner({"metric": "throughput", "direction": "max"})
+    for trial_id in range(5):
+        pruner.add_trial(trial_id, _telemetry([100.0 + trial_id] * 10, metric="throughput"))
+    assert not pruner.should_prune(_telemetry([105.0] * 3, metric="throughput"))
+    assert pruner.should_prune(_telemetry([90.0] * 3, metric="throughput"))
+
+
+def test_percentile_pruner() -> None:
+    """
+    Prune the trials that are worse than the given percentile of the completed ones.
+    """
+    pruner = PercentilePruner({"metric": "latency", "percentile": 25})
+    _add_history(pruner, lambda t: 100.0 - t)   # Best values at t=2: 98..102
+    assert not pruner.should_prune(_telemetry([100.0, 99.0, 98.0]))
+    # Better than the median, but worse than the 25th percentile.
+    assert pruner.should_prune(_telemetry([100.0, 100.0, 100.0]))
+    assert not PercentilePruner({"metric": "latency", "percentile": 75}).should_prune(
+        _telemetry([100.0, 100.0, 100.0]))
+
+
+def test_curve_extrapolation_pruner() -> None:
+    """
+    Prune the trials whose learning curve is not going to catch up with the best one.
+    """
+    pruner = CurveExtrapolationPruner({"metric": "latency", "min_samples": 3, "tolerance": 0.1})
+    _add_history(pruner, lambda t: 100.0 - 5 * t, length=20)    # Best final value: 5.0
+    # Too few samples to extrapolate.
+    assert not pruner.should_prune(_telemetry([200.0, 190.0]))
+    # Worse than the others now but improving fast.
+    assert not pruner.should_prune(_telemetry([200.0, 100.0, 50.0, 20.0]))
+    # Flat curve far from the best final value.
+    assert pruner.should_prune(_telemetry([200.0, 199.0, 198.0, 197.0]))
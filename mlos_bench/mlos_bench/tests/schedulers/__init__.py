@@ -0,0 +1,29 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Tests for mlos_bench schedulers.
+"""
+
+from typing import Any, Dict, Optional, Protocol, Type, TypeVar
+
+from mlos_bench.environments.base_environment import Environment
+from mlos_bench.schedulers.base_scheduler import Scheduler
+
+SchedulerT = TypeVar("SchedulerT", bound=Scheduler)
+
+
+class SchedulerFactory(Protocol):
+    """
+    Type of the `make_scheduler` fixture.
+    """
+
+    def __call__(self, scheduler_class: Type[SchedulerT], config: Dict[str, Any], *,
+                 experiment_id: str,
+                 environment: Optional[Environment] = None,
+                 optimizer_config: Optional[Dict[str, Any]] = None,
+                 global_config: Optional[Dict[str, Any]] = None) -> SchedulerT:
+        """
+        Create a new scheduler of the given class with the MockOptimizer.
+        """
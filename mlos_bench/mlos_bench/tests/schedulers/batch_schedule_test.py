@@ -0,0 +1,60 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Unit tests for scheduling batches of optimizer suggestions at once.
+"""
+
+import pytest
+
+from mlos_bench.schedulers.sync_scheduler import SyncScheduler
+from mlos_bench.storage.sql.storage import SqlStorage
+
+from mlos_bench.tests.schedulers import SchedulerFactory
+
+
+@pytest.mark.parametrize(("suggestion_batch_size", "suggestion_lookahead"), [
+    (1, 0),
+    (2, 0),
+    (4, 0),
+    (4, 2),
+])
+def test_suggestion_batch(storage: SqlStorage, make_scheduler: SchedulerFactory,
+                          suggestion_batch_size: int, suggestion_lookahead: int) -> None:
+    """
+    Batches of suggestions should not change the number of trials or lose any results.
+    """
+    max_suggestions = 7
+    repeat_count = 2
+    scheduler = make_scheduler(
+        SyncScheduler,
+        {
+            "trial_config_repeat_count": repeat_count,
+            "suggestion_batch_size": suggestion_batch_size,
+            "suggestion_lookahead": suggestion_lookahead,
+        },
+        experiment_id="Test-Batch-001",
+        optimizer_config={"max_suggestions": max_suggestions},
+    )
+    with scheduler:
+        scheduler.start()
+        (best_score, _best_config) = scheduler.get_best_observation()
+
+    trials = storage.experiments["Test-Batch-001"].trials
+    assert len(trials) == max_suggestions * repeat_count
+    assert all(trial.status.is_succeeded() for trial in trials.values())
+    # All repeats of the same configuration are scheduled together.
+    config_ids = [trials[trial_id].tunable_config_id for trial_id in sorted(trials)]
+    assert config_ids[::repeat_count] == config_ids[1::repeat_count]
+    assert best_score is not None
+    assert best_score["score"] == pytest.approx(
+        min(float(trial.results_dict["score"]) for trial in trials.values()))  # type: ignore[arg-type]
+
+
+def test_suggestion_batch_bad_size(make_scheduler: SchedulerFactory) -> None:
+    """
+    Batch size must be positive.
+    """
+    with pytest.raises(ValueError):
+        make_scheduler(SyncScheduler, {"suggestion_batch_size": 0}, experiment_id="Test-Batch-002")
@@ -0,0 +1,139 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Unit tests for the time and cost budgets of the experiment in the scheduler.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+import pytest
+from pytz import UTC
+
+from mlos_bench.environments.mock_env import MockEnv
+from mlos_bench.environments.status import Status
+from mlos_bench.schedulers.sync_scheduler import SyncScheduler
+from mlos_bench.storage.base_storage import Storage
+from mlos_bench.storage.experiment_progress import ExperimentProgress
+from mlos_bench.storage.sql.storage import SqlStorage
+
+from mlos_bench.tests.schedulers import SchedulerFactory
+
+
+def _progress(num_trials: int, trial_minutes: int) -> ExperimentProgress:
+    """
+    Progress of the experiment with `num_trials` sequential trials of the given duration.
+    """
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    duration = timedelta(minutes=trial_minutes)
+    return ExperimentProgress(
+        [(start + i * duration, start + (i + 1) * duration, Status.SUCCEEDED) for i in range(num_trials)],
+        timestamp=start + num_trials * duration,
+    )
+
+
+@pytest.mark.parametrize(("config", "num_trials", "is_within_budget"), [
+    ({}, 100, True),
+    ({"max_time": 3600}, 5, True),
+    ({"max_time": 3600}, 6, False),
+    # Cost of 6 trials, 10 minutes each: 0.5 * 1 hour
+    ({"max_cost": 1, "cost_per_hour": 0.5}, 6, True),
+    ({"max_cost": 0.5, "cost_per_hour": 0.5}, 6, False),
+])
+def test_scheduler_budget(make_scheduler: SchedulerFactory,
+                          monkeypatch: pytest.MonkeyPatch, config: Dict[str, Any],
+                          num_trials: int, is_within_budget: bool) -> None:
+    """
+    Check the time and cost stopping conditions of the scheduler.
+    """
+    scheduler = make_scheduler(SyncScheduler, config, experiment_id="Test-Budget-001")
+    with scheduler:
+        assert scheduler.experiment is not None
+        monkeypatch.setattr(scheduler.experiment, "progress", lambda: _progress(num_trials, 10))
+        assert scheduler.not_done() == is_within_budget
+
+
+def test_scheduler_eta(make_scheduler: SchedulerFactory) -> None:
+    """
+    Check the ETA of the experiment for different limits.
+    """
+    # 6 trials per hour, half of the budget spent after 6 trials.
+    progress = _progress(6, 10)
+    scheduler = make_scheduler(SyncScheduler, {
+        "max_trials": 12, "max_time": 3 * 3600, "max_cost": 2, "cost_per_hour": 1,
+    }, experiment_id="Test-Budget-001")
+    # pylint: disable=protected-access
+    assert scheduler._estimate_time_left(progress, cost=1.0) == timedelta(hours=1)
+    scheduler = make_scheduler(SyncScheduler, {"max_time": 3 * 3600}, experiment_id="Test-Budget-001")
+    assert scheduler._estimate_time_left(progress, cost=1.0) == timedelta(hours=2)
+    scheduler = make_scheduler(SyncScheduler, {}, experiment_id="Test-Budget-001")
+    assert scheduler._estimate_time_left(progress, cost=1.0) is None
+
+
+def test_scheduler_racing_budget(storage: SqlStorage, make_scheduler: SchedulerFactory,
+                                 monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Stop adding the racing repeats once the time budget is exhausted.
+    """
+    scheduler = make_scheduler(SyncScheduler, {
+        "racing": True, "trial_config_repeat_count": 4, "max_time": 3600,
+    }, experiment_id="Test-Budget-001")
+    with scheduler:
+        exp = scheduler.experiment
+        assert exp is not None
+
+        def num_completed() -> int:
+            return sum(status.is_completed() for status in exp.load()[3])
+
+        # Each completed trial takes 10 minutes: the budget is over after 6 trials.
+        monkeypatch.setattr(exp, "progress", lambda: _progress(num_completed(), 10))
+        # Number of the completed trials each time the new trials are added.
+        new_trials_at: List[int] = []
+        new_trials = exp.new_trials
+
+        def _new_trials(*args: Any, **kwargs: Any) -> List[Storage.Trial]:
+            new_trials_at.append(num_completed())
+            return new_trials(*args, **kwargs)
+
+        monkeypatch.setattr(exp, "new_trials", _new_trials)
+        scheduler.start()
+
+    # Both new suggestions and repeats were added while within budget.
+    assert len(new_trials_at) > 6
+    assert max(new_trials_at) < 6
+    trials = storage.experiments["Test-Budget-001"].trials
+    assert all(trial.status.is_succeeded() for trial in trials.values())
+
+
+def test_scheduler_merge_budget(storage: SqlStorage, mock_env_no_noise: MockEnv,
+                                make_scheduler: SchedulerFactory) -> None:
+    """
+    The trials merged from an old experiment should not eat the budget of the new one.
+    """
+    with storage.experiment(
+        experiment_id="Test-Budget-Old",
+        trial_id=1,
+        root_env_config="environment.jsonc",
+        description="pytest old experiment",
+        tunables=mock_env_no_noise.tunable_params,
+        opt_targets={"score": "min"},
+    ) as old_exp:
+        # 6 trials, 10 minutes each, long ago: more than the budget of the new experiment.
+        start = datetime(2024, 1, 1, tzinfo=UTC)
+        for i in range(6):
+            trial = old_exp.new_trial(mock_env_no_noise.tunable_params, ts_start=start + i * timedelta(minutes=10))
+            trial.update(Status.SUCCEEDED, start + (i + 1) * timedelta(minutes=10), {"score": 1.0})
+
+    scheduler = make_scheduler(SyncScheduler, {
+        "max_trials": 3, "max_time": 3600, "max_cost": 0.5, "cost_per_hour": 0.5,
+        "merge": ["Test-Budget-Old"],
+    }, experiment_id="Test-Budget-001")
+    with scheduler:
+        assert scheduler.not_done()
+        scheduler.start()
+
+    trials = storage.experiments["Test-Budget-001"].trials
+    assert len(trials) == 6 + 3
+    assert sum("merged_from" not in trial.metadata_dict for trial in trials.values()) == 3
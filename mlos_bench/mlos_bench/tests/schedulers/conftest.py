@@ -0,0 +1,61 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Export test fixtures for mlos_bench schedulers.
+"""
+
+from typing import Any, Dict, Optional, Type
+
+import pytest
+
+from mlos_bench.environments.base_environment import Environment
+from mlos_bench.environments.mock_env import MockEnv
+from mlos_bench.optimizers.mock_optimizer import MockOptimizer
+from mlos_bench.storage.sql.storage import SqlStorage
+
+from mlos_bench.tests import SEED
+from mlos_bench.tests.schedulers import SchedulerFactory, SchedulerT
+import mlos_bench.tests.storage.sql.fixtures as sql_storage_fixtures
+
+# pylint: disable=redefined-outer-name
+
+# Expose some of those as local names so they can be picked up as fixtures by pytest.
+storage = sql_storage_fixtures.storage
+
+
+@pytest.fixture
+def make_scheduler(storage: SqlStorage, mock_env_no_noise: MockEnv) -> SchedulerFactory:
+    """
+    Test fixture for the factory of the schedulers that run the (seeded) MockOptimizer
+    on the noise-free MockEnv (or the given environment) and save the results in `storage`.
+    """
+    def _make_scheduler(scheduler_class: Type[SchedulerT], config: Dict[str, Any], *,
+                        experiment_id: str,
+                        environment: Optional[Environment] = None,
+                        optimizer_config: Optional[Dict[str, Any]] = None,
+                        global_config: Optional[Dict[str, Any]] = None) -> SchedulerT:
+        env = environment or mock_env_no_noise
+        return scheduler_class(
+            config=config,
+            global_config={
+                "experiment_id": experiment_id,
+                "trial_id": 1,
+                **(global_config or {}),
+            },
+            environment=env,
+            optimizer=MockOptimizer(
+                tunables=env.tunable_params,
+                service=None,
+                config={
+                    "optimization_targets": {"score": "min"},
+                    "seed": SEED,
+                    **(optimizer_config or {}),
+                },
+            ),
+            storage=storage,
+            root_env_config="environment.jsonc",
+        )
+
+    return _make_scheduler
@@ -0,0 +1,154 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Unit tests for the Hyperband (multi-fidelity) scheduler.
+"""
+
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from mlos_core.optimizers.bayesian_optimizers import SmacOptimizer
+
+from mlos_bench.environments.mock_env import MockEnv
+from mlos_bench.optimizers.mlos_core_optimizer import MlosCoreOptimizer
+from mlos_bench.schedulers.hyperband_scheduler import HyperbandScheduler
+from mlos_bench.storage.sql.storage import SqlStorage
+from mlos_bench.tunables.tunable_groups import TunableGroups
+
+from mlos_bench.tests import SEED
+from mlos_bench.tests.schedulers import SchedulerFactory
+
+
+def _make_hyperband_scheduler(make_scheduler: SchedulerFactory, tunable_groups: TunableGroups,
+                              max_suggestions: int) -> HyperbandScheduler:
+    """
+    Create a HyperbandScheduler for a noise-free MockEnv with the `duration` budget parameter.
+    """
+    env = MockEnv(
+        name="Test Env No Noise",
+        config={
+            "tunable_params": ["provision", "boot", "kernel"],
+            "const_args": {"duration": 1},
+            "range": [60, 120],
+            "metrics": ["score"],
+        },
+        tunables=tunable_groups,
+    )
+    return make_scheduler(
+        HyperbandScheduler,
+        {
+            "trial_config_repeat_count": 3,
+            "min_budget": 1,
+            "max_budget": 9,
+            "eta": 3,
+            "budget_param": "duration",
+        },
+        experiment_id="Test-Hyperband-001",
+        environment=env,
+        optimizer_config={"max_suggestions": max_suggestions},
+        global_config={"duration": 100},
+    )
+
+
+def test_hyperband_bad_config(storage: SqlStorage, make_scheduler: SchedulerFactory,
+                              tunable_groups: TunableGroups) -> None:
+    """
+    Check the validation of the budget parameters.
+    """
+    scheduler = _make_hyperband_scheduler(make_scheduler, tunable_groups, max_suggestions=1)
+    for (key, val) in [("min_budget", 0), ("max_budget", 0.5), ("eta", 1), ("racing", True),
+                       ("suggestion_lookahead", 2), ("suggestion_batch_size", 4)]:
+        with pytest.raises(ValueError):
+            HyperbandScheduler(
+                config={"min_budget": 1, "max_budget": 9, key: val},
+                global_config=scheduler.global_config,
+                environment=scheduler.environment,
+                optimizer=scheduler.optimizer,
+                storage=storage,
+                root_env_config="environment.jsonc",
+            )
+
+
+def test_hyperband_scheduler(storage: SqlStorage, make_scheduler: SchedulerFactory,
+                             tunable_groups: TunableGroups, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Run one full cycle of the Hyperband brackets and check the budgets of the trials.
+    """
+    # Brackets for budgets 1..9 and eta=3 (num. configs x budget):
+    # [9 x 1, 3 x 3, 1 x 9], [5 x 3, 1 x 9], [3 x 9] -- 17 configs in total.
+    scheduler = _make_hyperband_scheduler(make_scheduler, tunable_groups, max_suggestions=17)
+
+    # Record the budgets the environment actually gets.
+    env_budgets: List[int] = []
+    env_setup = scheduler.environment.setup
+
+    def _setup(tunables: TunableGroups, global_config: Optional[Dict[str, Any]] = None) -> bool:
+        is_success = env_setup(tunables, global_config)
+        env_budgets.append(scheduler.environment.parameters["duration"])
+        return is_success
+
+    monkeypatch.setattr(scheduler.environment, "setup", _setup)
+
+    with scheduler:
+        scheduler.start()
+        scheduler.teardown()
+        (best_score, best_config) = scheduler.get_best_observation()
+
+    # Lower budgets run fewer repeats (1, 1, and 3 for budgets 1, 3, and 9).
+    expected_budgets = {1: 9 * 1, 3: (3 + 5) * 1, 9: (1 + 1 + 3) * 3}
+    assert Counter(env_budgets) == expected_budgets
+
+    exp_data = storage.experiments["Test-Hyperband-001"]
+    trials = exp_data.trials
+    assert len(trials) == sum(expected_budgets.values())
+    assert Counter(int(trial.metadata_dict["duration"]) for trial in trials.values()) == expected_budgets
+    assert all(trial.status.is_succeeded() for trial in trials.values())
+
+    # The best observation only accounts for the full-budget results.
+    assert best_score is not None and best_config is not None
+    full_budget_scores = [
+        trial.results_dict["score"] for trial in trials.values()
+        if int(trial.metadata_dict["duration"]) == 9
+    ]
+    assert best_score["score"] == pytest.approx(min(full_budget_scores))
+
+
+def test_hyperband_smac_pending(storage: SqlStorage, make_scheduler: SchedulerFactory,
+                                tunable_groups: TunableGroups) -> None:
+    """
+    Run one bracket with SMAC and make sure it does not keep the eliminated configurations as pending.
+    """
+    # One bracket only: [9 x 1, 3 x 3, 1 x 9].
+    scheduler = _make_hyperband_scheduler(make_scheduler, tunable_groups, max_suggestions=9)
+    scheduler.optimizer = opt = MlosCoreOptimizer(
+        tunables=scheduler.environment.tunable_params,
+        service=None,
+        config={
+            "optimization_targets": {"score": "min"},
+            "max_suggestions": 9,
+            "optimizer_type": "SMAC",
+            "seed": SEED,
+        },
+    )
+    assert isinstance(opt._opt, SmacOptimizer)  # pylint: disable=protected-access
+    runhistory = opt._opt.base_optimizer.runhistory  # pylint: disable=protected-access
+
+    with scheduler:
+        scheduler.start()
+        scheduler.teardown()
+
+    trials = storage.experiments["Test-Hyperband-001"].trials
+    assert len(trials) == 9 + 3 + 1 * 3
+    # Only the full-budget result stays in SMAC's runhistory.
+    assert runhistory.running == 0
+    assert runhistory.finished == len(runhistory) == 1
+    (best_score, _best_config) = scheduler.get_best_observation()
+    assert best_score is not None
+    assert best_score["score"] == pytest.approx(min(
+        float(trial.results_dict["score"]) for trial in trials.values()  # type: ignore[arg-type]
+        if int(trial.metadata_dict["duration"]) == 9
+    ))
@@ -0,0 +1,123 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Unit tests for computing the optimizer suggestions ahead of time.
+"""
+
+import time
+from threading import Event
+from typing import Any, List
+from unittest.mock import patch
+
+import pytest
+
+from mlos_core.optimizers.bayesian_optimizers import SmacOptimizer
+
+from mlos_bench.environments.status import Status
+from mlos_bench.optimizers.mlos_core_optimizer import MlosCoreOptimizer
+from mlos_bench.schedulers.sync_scheduler import SyncScheduler
+from mlos_bench.storage.sql.storage import SqlStorage
+from mlos_bench.tunables.tunable_groups import TunableGroups
+
+from mlos_bench.tests import SEED
+from mlos_bench.tests.schedulers import SchedulerFactory
+
+
+@pytest.mark.parametrize("suggestion_lookahead", [0, 1, 3])
+def test_suggestion_lookahead(storage: SqlStorage, make_scheduler: SchedulerFactory,
+                              suggestion_lookahead: int) -> None:
+    """
+    Precomputed suggestions should not change the number of trials or lose any results.
+    """
+    max_suggestions = 6
+    scheduler = make_scheduler(SyncScheduler, {"suggestion_lookahead": suggestion_lookahead},
+                               experiment_id="Test-Lookahead-001", optimizer_config={"max_suggestions": max_suggestions})
+    with scheduler:
+        scheduler.start()
+        # pylint: disable=protected-access
+        assert scheduler._suggestions_future is None
+        assert not scheduler._suggestions
+        (best_score, _best_config) = scheduler.get_best_observation()
+
+    trials = storage.experiments["Test-Lookahead-001"].trials
+    assert len(trials) == max_suggestions
+    assert all(trial.status.is_succeeded() for trial in trials.values())
+    assert best_score is not None
+    assert best_score["score"] == pytest.approx(
+        min(float(trial.results_dict["score"]) for trial in trials.values()))  # type: ignore[arg-type]
+
+
+def test_suggestion_lookahead_during_setup(storage: SqlStorage, make_scheduler: SchedulerFactory) -> None:
+    """
+    The background suggestions must not read the tunables shared by the optimizer
+    and the root environment while `.setup()` assigns them.
+    """
+    scheduler = make_scheduler(SyncScheduler, {"suggestion_lookahead": 2},
+                               experiment_id="Test-Lookahead-001", optimizer_config={"max_suggestions": 6})
+    (env_setup, suggest_batch) = (scheduler.environment.setup, scheduler.optimizer.suggest_batch)
+    (is_setup, is_suggesting) = (Event(), Event())
+    overlaps: List[bool] = []
+
+    def _setup(*args: Any) -> bool:
+        is_setup.set()
+        time.sleep(0.05)
+        overlaps.append(is_suggesting.is_set())
+        is_setup.clear()
+        return env_setup(*args)
+
+    def _suggest_batch(n: int) -> List[TunableGroups]:
+        is_suggesting.set()
+        time.sleep(0.05)
+        overlaps.append(is_setup.is_set())
+        is_suggesting.clear()
+        return suggest_batch(n)
+
+    with patch.object(scheduler.environment, "setup", _setup), \
+            patch.object(scheduler.optimizer, "suggest_batch", _suggest_batch):
+        with scheduler:
+            scheduler.start()
+
+    assert overlaps and not any(overlaps)
+    assert len(storage.experiments["Test-Lookahead-001"].trials) == 6
+
+
+def test_drop_stale_suggestions(make_scheduler: SchedulerFactory) -> None:
+    """
+    The optimizer should forget the stale lookahead suggestions that the scheduler drops.
+    """
+    scheduler = make_scheduler(SyncScheduler, {"suggestion_lookahead": 2},
+                               experiment_id="Test-Lookahead-001")
+    scheduler.optimizer = opt = MlosCoreOptimizer(
+        tunables=scheduler.environment.tunable_params,
+        service=None,
+        config={
+            "optimization_targets": {"score": "min"},
+            "max_suggestions": 10,
+            "optimizer_type": "SMAC",
+            "seed": SEED,
+        },
+    )
+    assert isinstance(opt._opt, SmacOptimizer)  # pylint: disable=protected-access
+    runhistory = opt._opt.base_optimizer.runhistory  # pylint: disable=protected-access
+    for tunables in opt.suggest_batch(2):
+        opt.register(tunables, Status.SUCCEEDED, {"score": 1.0})
+    assert runhistory.finished == 2 and runhistory.running == 0
+
+    # pylint: disable=protected-access
+    scheduler._suggest_ahead_sync()
+    assert len(scheduler._suggestions) == 2
+    # The pending suggestions have the "lie" registered for them in SMAC.
+    assert runhistory.finished == 4
+
+    scheduler._num_registered += 10
+    scheduler._drop_stale_suggestions()
+    assert not scheduler._suggestions
+    assert runhistory.finished == 2 and runhistory.running == 0
+    assert len(runhistory) == 2
+    assert opt._opt.trial_info_df["TrialValue"].notna().all()
+    # SMAC can go on after that.
+    for tunables in opt.suggest_batch(2):
+        opt.register(tunables, Status.SUCCEEDED, {"score": 2.0})
+    assert runhistory.finished == 4 and runhistory.running == 0
@@ -0,0 +1,91 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Unit tests for the parallel scheduler.
+"""
+
+import itertools
+from typing import Any, Dict
+from unittest.mock import patch
+
+import pytest
+
+from mlos_bench.environments.base_environment import Environment
+from mlos_bench.environments.status import Status
+from mlos_bench.schedulers.base_scheduler import TrialResult
+from mlos_bench.schedulers.parallel_scheduler import ParallelScheduler
+from mlos_bench.storage.sql.storage import SqlStorage
+from mlos_bench.tunables.tunable_groups import TunableGroups
+
+from mlos_bench.tests.schedulers import SchedulerFactory
+
+
+@pytest.mark.parametrize("num_trial_runners", [1, 3])
+def test_parallel_scheduler(storage: SqlStorage, make_scheduler: SchedulerFactory,
+                            num_trial_runners: int) -> None:
+    """
+    Run the optimization loop with several trial runners and check the results.
+    """
+    max_suggestions = 5
+    scheduler = make_scheduler(
+        ParallelScheduler, {"trial_config_repeat_count": 2, "num_trial_runners": num_trial_runners},
+        experiment_id="Test-Parallel-001", optimizer_config={"max_suggestions": max_suggestions})
+    with scheduler:
+        # pylint: disable=protected-access
+        assert len(scheduler._trial_runners) == num_trial_runners
+        assert len({id(env) for env in scheduler._trial_runners}) == num_trial_runners
+        scheduler.start()
+        scheduler.teardown()
+        assert not scheduler._running_trials
+        (best_score, best_config) = scheduler.get_best_observation()
+
+    exp_data = storage.experiments["Test-Parallel-001"]
+    trials = exp_data.trials
+    assert len(trials) == max_suggestions * 2
+    assert all(trial.status.is_succeeded() for trial in trials.values())
+
+    # All results should be registered with the optimizer.
+    assert best_score is not None
+    assert best_config is not None
+    scores = [trial.results_dict["score"] for trial in trials.values()]
+    assert best_score["score"] == pytest.approx(min(float(score) for score in scores))
+
+
+def test_parallel_scheduler_bad_num_runners(make_scheduler: SchedulerFactory) -> None:
+    """
+    Check that the number of trial runners must be positive.
+    """
+    with pytest.raises(ValueError):
+        make_scheduler(ParallelScheduler, {"num_trial_runners": 0}, experiment_id="Test-Parallel-001")
+
+
+def test_parallel_scheduler_runner_error(storage: SqlStorage, make_scheduler: SchedulerFactory) -> None:
+    """
+    Mark the trial as FAILED when its trial runner raises an exception,
+    and keep saving the results of the other trials.
+    """
+    scheduler = make_scheduler(
+        ParallelScheduler, {"trial_config_repeat_count": 2, "num_trial_runners": 3},
+        experiment_id="Test-Parallel-001", optimizer_config={"max_suggestions": 3})
+    run_trial_sync = scheduler._run_trial_sync  # pylint: disable=protected-access
+    num_calls = itertools.count()
+
+    def _run_trial_sync(env: Environment, tunables: TunableGroups, global_config: Dict[str, Any]) -> TrialResult:
+        if next(num_calls) == 0:
+            raise RuntimeError("Trial runner failure")
+        return run_trial_sync(env, tunables, global_config)
+
+    with patch.object(scheduler, "_run_trial_sync", _run_trial_sync):
+        with scheduler:
+            # pylint: disable=protected-access
+            assert all(env.tunable_params is not scheduler.optimizer.tunable_params
+                       for env in scheduler._trial_runners)
+            scheduler.start()
+            assert not scheduler._running_trials
+
+    statuses = [trial.status for trial in storage.experiments["Test-Parallel-001"].trials.values()]
+    assert len(statuses) == 6
+    assert statuses.count(Status.FAILED) == 1
+    assert statuses.count(Status.SUCCEEDED) == 5
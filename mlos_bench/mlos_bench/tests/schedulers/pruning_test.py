@@ -0,0 +1,126 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Unit tests for early termination of the unpromising trials by the scheduler.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytest
+from pytz import UTC
+
+from mlos_bench.environments.mock_env import MockEnv
+from mlos_bench.environments.status import Status
+from mlos_bench.schedulers.sync_scheduler import SyncScheduler
+from mlos_bench.storage.sql.storage import SqlStorage
+from mlos_bench.tunables.tunable import TunableValue
+from mlos_bench.tunables.tunable_groups import TunableGroups
+
+from mlos_bench.tests.schedulers import SchedulerFactory
+
+
+class _StreamingBenchmark:
+    """
+    Mock benchmark that emits the latency telemetry every few milliseconds
+    for a while and can be canceled in the middle of the run.
+    Replaces the `.run()`, `.status()`, and `.cancel()` methods of the MockEnv.
+    """
+
+    def __init__(self, latency: float, num_samples: int):
+        self.latency = latency
+        self._num_samples = num_samples
+        self._telemetry: List[Tuple[datetime, str, Any]] = []
+        self._canceled = threading.Event()
+
+    def run(self) -> Tuple[Status, datetime, Optional[Dict[str, TunableValue]]]:
+        """
+        Produce one telemetry sample every 10 ms until done or canceled.
+        """
+        self._telemetry = []
+        self._canceled.clear()
+        start = datetime.now(UTC)
+        for i in range(self._num_samples):
+            if self._canceled.wait(0.01):
+                return (Status.CANCELED, datetime.now(UTC), None)
+            self._telemetry.append((start + timedelta(seconds=i), "latency", self.latency))
+        return (Status.SUCCEEDED, datetime.now(UTC), {"latency": self.latency})
+
+    def status(self) -> Tuple[Status, datetime, List[Tuple[datetime, str, Any]]]:
+        """
+        Return the telemetry produced so far.
+        """
+        return (Status.RUNNING, datetime.now(UTC), list(self._telemetry))
+
+    def cancel(self) -> bool:
+        """
+        Stop the benchmark.
+        """
+        self._canceled.set()
+        return True
+
+
+def test_scheduler_prune_trials(storage: SqlStorage, make_scheduler: SchedulerFactory,
+                                tunable_groups: TunableGroups,
+                                monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Stop the trials that run worse than the completed ones and store them as PRUNED.
+    """
+    env = MockEnv(
+        name="Test Streaming Env",
+        config={"tunable_params": ["provision", "boot", "kernel"]},
+        tunables=tunable_groups,
+    )
+    benchmark = _StreamingBenchmark(latency=10.0, num_samples=20)
+    monkeypatch.setattr(env, "run", benchmark.run)
+    monkeypatch.setattr(env, "status", benchmark.status)
+    monkeypatch.setattr(env, "cancel", benchmark.cancel)
+    scheduler = make_scheduler(
+        SyncScheduler,
+        {
+            "pruner": {
+                "class": "mlos_bench.pruners.MedianStoppingPruner",
+                "config": {"metric": "latency", "grace_period": 5, "min_trials": 3},
+            },
+            "pruning_interval": 0.02,
+        },
+        experiment_id="Test-Pruning-001",
+        environment=env,
+        optimizer_config={"optimization_targets": {"latency": "min"}, "max_suggestions": 5},
+    )
+    with scheduler:
+        assert scheduler.experiment is not None
+        (_, _, results, telemetry) = scheduler._run_environment(env)  # pylint: disable=protected-access
+        assert results == {"latency": 10.0}
+        assert len(telemetry) == 20
+        for trial_id in range(3):
+            scheduler._pruner.add_trial(trial_id, telemetry)  # type: ignore[union-attr]  # pylint: disable=protected-access
+
+        # Bad trial: pruned after the grace period.
+        benchmark.latency = 100.0
+        trial = scheduler.experiment.new_trial(tunable_groups)
+        start = time.monotonic()
+        (status, timestamp, results, telemetry) = scheduler._run_environment(env)  # pylint: disable=protected-access
+        # Stopped long before the end of the benchmark.
+        assert time.monotonic() - start < 1.0
+        assert status == Status.PRUNED
+        assert status.is_completed() and status.is_pruned() and not status.is_succeeded()
+        assert results == {"latency": 100.0}
+        assert 5 <= len(telemetry) < 20
+        trial.update_telemetry(status, timestamp, telemetry)
+        trial.update(status, timestamp, results)
+
+        # Good trial: not pruned.
+        benchmark.latency = 5.0
+        (status, _, results, telemetry) = scheduler._run_environment(env)  # pylint: disable=protected-access
+        assert status == Status.SUCCEEDED
+        assert len(telemetry) == 20
+
+    exp_data = storage.experiments["Test-Pruning-001"]
+    trial_data = exp_data.trials[trial.trial_id]
+    assert trial_data.status == Status.PRUNED
+    assert trial_data.results_dict == {"latency": 100.0}
@@ -0,0 +1,111 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Unit tests for the adaptive repetition of the trials (racing mode) in the scheduler.
+"""
+
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import pytest
+
+from mlos_bench.environments.mock_env import MockEnv
+from mlos_bench.schedulers.sync_scheduler import SyncScheduler
+from mlos_bench.storage.sql.storage import SqlStorage
+from mlos_bench.tunables.tunable_groups import TunableGroups
+
+from mlos_bench.tests import SEED
+from mlos_bench.tests.schedulers import SchedulerFactory
+
+
+def _run_racing(storage: SqlStorage, make_scheduler: SchedulerFactory, tunable_groups: TunableGroups,
+                env_seed: Optional[int]) -> Dict[int, List[float]]:
+    """
+    Run the optimization loop in racing mode and return the scores of each config.
+    No noise in the benchmark results if `env_seed` is None.
+    """
+    env = MockEnv(
+        name="Test Env",
+        config={
+            "tunable_params": ["provision", "boot", "kernel"],
+            "range": [60, 120],
+            "metrics": ["score"],
+            **({} if env_seed is None else {"seed": env_seed}),
+        },
+        tunables=tunable_groups,
+    )
+    scheduler = make_scheduler(
+        SyncScheduler,
+        {
+            "trial_config_repeat_count": 4,
+            "racing": True,
+        },
+        experiment_id="Test-Racing-001",
+        environment=env,
+        optimizer_config={"max_suggestions": 8},
+    )
+    with scheduler:
+        scheduler.start()
+        scheduler.teardown()
+
+    config_scores: Dict[int, List[float]] = defaultdict(list)
+    for trial in storage.experiments["Test-Racing-001"].trials.values():
+        assert trial.status.is_succeeded()
+        config_scores[trial.tunable_config_id].append(float(trial.results_dict["score"]))  # type: ignore[arg-type]
+    return config_scores
+
+
+def test_racing_no_noise(storage: SqlStorage, make_scheduler: SchedulerFactory,
+                         tunable_groups: TunableGroups) -> None:
+    """
+    Without the noise, the best config gets all repeats, while the configs that
+    have never been the incumbent are dominated right after the first run.
+    """
+    config_scores = _run_racing(storage, make_scheduler, tunable_groups, env_seed=None)
+    assert len(config_scores) == 8
+    best_config_id = min(config_scores, key=lambda config_id: config_scores[config_id][0])
+    assert len(config_scores[best_config_id]) == 4
+    assert all(len(set(scores)) == 1 for scores in config_scores.values())
+    # Configs in the order of suggestion; only the ones that improve on all previous ones get repeated.
+    incumbent_score = float("inf")
+    for (_config_id, scores) in sorted(config_scores.items()):
+        if scores[0] < incumbent_score:
+            incumbent_score = scores[0]
+            assert len(scores) > 1
+        else:
+            assert len(scores) == 1
+    assert sum(len(scores) for scores in config_scores.values()) < 8 * 4
+
+
+def test_racing_noise(storage: SqlStorage, make_scheduler: SchedulerFactory,
+                      tunable_groups: TunableGroups) -> None:
+    """
+    With the noisy benchmark, the number of repeats stays within the limits.
+    """
+    config_scores = _run_racing(storage, make_scheduler, tunable_groups, env_seed=SEED)
+    assert len(config_scores) == 8
+    assert all(1 <= len(scores) <= 4 for scores in config_scores.values())
+    best_config_id = min(config_scores, key=lambda config_id: sum(config_scores[config_id]) / len(config_scores[config_id]))
+    assert len(config_scores[best_config_id]) > 1
+
+
+def test_racing_confidence_interval(make_scheduler: SchedulerFactory) -> None:
+    """
+    Check the confidence interval computation with and without the pooled variance.
+    """
+    # pylint: disable=protected-access
+    scheduler = make_scheduler(SyncScheduler, {"racing": True, "racing_confidence": 0.95},
+                               experiment_id="Test-Racing-002")
+    assert scheduler._pooled_std([[1.0], [2.0]]) is None
+    (std, dof) = scheduler._pooled_std([[1.0, 3.0], [5.0, 7.0, 9.0], [4.0]])  # type: ignore[misc]
+    assert dof == 3
+    assert std == pytest.approx((((1 + 1) + (4 + 0 + 4)) / 3) ** 0.5)
+    assert scheduler._confidence_interval([5.0], None) == (5.0, float("inf"))
+    (mean, half_width) = scheduler._confidence_interval([1.0, 3.0], None)
+    assert mean == 2.0
+    assert half_width == pytest.approx(12.706 * (2 ** 0.5) / (2 ** 0.5), rel=1e-3)
+    (mean, half_width) = scheduler._confidence_interval([5.0], (2.0, 3))
+    assert mean == 5.0
+    assert half_width == pytest.approx(3.182 * 2.0, rel=1e-3)
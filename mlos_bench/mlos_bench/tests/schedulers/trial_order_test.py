@@ -0,0 +1,88 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Unit tests for the reconfiguration-cost-aware ordering of the pending trials.
+"""
+
+from typing import Dict, List
+
+import pytest
+
+from mlos_bench.environments.mock_env import MockEnv
+from mlos_bench.schedulers.sync_scheduler import SyncScheduler
+from mlos_bench.storage.base_storage import Storage
+from mlos_bench.tunables.tunable import TunableValue
+from mlos_bench.tunables.tunable_groups import TunableGroups
+
+from mlos_bench.tests.schedulers import SchedulerFactory
+
+
+# Groups costs: provision (vmSize) = 1000, boot (idle) = 300, kernel = 1.
+_CONFIGS: List[Dict[str, TunableValue]] = [
+    {"vmSize": "Standard_B2s", "idle": "halt", "kernel_sched_latency_ns": 1000},
+    {"vmSize": "Standard_B4ms", "idle": "mwait", "kernel_sched_latency_ns": 1000},
+    {"vmSize": "Standard_B2s", "idle": "mwait", "kernel_sched_latency_ns": 2000},
+    {"vmSize": "Standard_B4ms", "idle": "halt", "kernel_sched_latency_ns": 2000},
+    {"vmSize": "Standard_B2s", "idle": "halt", "kernel_sched_latency_ns": 1000},
+]
+
+
+def _total_cost(tunables: TunableGroups, configs: List[TunableGroups]) -> int:
+    """
+    Total cost of running the configs in the given order, starting from `tunables`.
+    """
+    total = 0
+    for config in configs:
+        total += tunables.get_reconfiguration_cost(config)
+        tunables = config
+    return total
+
+
+@pytest.mark.parametrize(("trial_queue_order", "expected_order"), [
+    ("fifo", [0, 1, 2, 3, 4]),
+    # Start from the default vmSize = Standard_B4ms and idle = halt;
+    # the repeat of config 0 (i.e., config 4) runs right after it.
+    ("min_reconfig_cost", [3, 1, 2, 0, 4]),
+])
+def test_trial_queue_order(make_scheduler: SchedulerFactory, mock_env_no_noise: MockEnv,
+                           monkeypatch: pytest.MonkeyPatch,
+                           trial_queue_order: str, expected_order: List[int]) -> None:
+    """
+    Check the order of the pending trials under different policies.
+    """
+    scheduler = make_scheduler(SyncScheduler, {"trial_queue_order": trial_queue_order},
+                               experiment_id="Test-Order-001")
+    with scheduler:
+        assert scheduler.experiment is not None
+        batch = [mock_env_no_noise.tunable_params.copy().assign(config) for config in _CONFIGS]
+        trials = scheduler.schedule_trials(batch)
+        trial_ids = [trial.trial_id for trial in trials]
+        ordered = list(scheduler._pending_trials(running=False))  # pylint: disable=protected-access
+        assert [trial_ids.index(trial.trial_id) for trial in ordered] == expected_order
+
+        if trial_queue_order == "min_reconfig_cost":
+            start = mock_env_no_noise.tunable_params
+            assert _total_cost(start, [trial.tunables for trial in ordered]) < _total_cost(start, batch)
+
+        # The scheduler claims and runs the trials in the same order.
+        run_order: List[int] = []
+        orig_run_trial = scheduler.run_trial
+
+        def _run_trial(trial: Storage.Trial) -> None:
+            run_order.append(trial.trial_id)
+            orig_run_trial(trial)
+
+        with monkeypatch.context() as patch:
+            patch.setattr(scheduler, "run_trial", _run_trial)
+            scheduler._run_schedule()  # pylint: disable=protected-access
+        assert run_order == [trial.trial_id for trial in ordered]
+
+
+def test_bad_trial_queue_order(make_scheduler: SchedulerFactory) -> None:
+    """
+    Check the validation of the trial order policy.
+    """
+    with pytest.raises(ValueError):
+        make_scheduler(SyncScheduler, {"trial_queue_order": "random"}, experiment_id="Test-Order-001")
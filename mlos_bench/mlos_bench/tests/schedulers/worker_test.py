@@ -0,0 +1,55 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Unit tests for running the schedulers in worker mode.
+"""
+
+from datetime import datetime, timedelta
+from typing import Type
+
+import pytest
+from pytz import UTC
+
+from mlos_bench.schedulers.base_scheduler import Scheduler
+from mlos_bench.schedulers.parallel_scheduler import ParallelScheduler
+from mlos_bench.schedulers.sync_scheduler import SyncScheduler
+from mlos_bench.storage.sql.storage import SqlStorage
+
+from mlos_bench.tests.schedulers import SchedulerFactory
+
+
+@pytest.mark.parametrize("scheduler_class", [SyncScheduler, ParallelScheduler])
+def test_worker(storage: SqlStorage, make_scheduler: SchedulerFactory,
+                scheduler_class: Type[Scheduler]) -> None:
+    """
+    Run the trials scheduled by some other process, skipping the ones claimed by other workers.
+    """
+    worker: Scheduler = make_scheduler(
+        scheduler_class,
+        {
+            "worker_id": "worker-1",
+            "worker_idle_timeout": 0,
+            **({"num_trial_runners": 2} if scheduler_class is ParallelScheduler else {}),
+        },
+        experiment_id="Test-Worker-001",
+    )
+    with worker:
+        assert worker.experiment is not None
+        # Coordinator side: schedule a few trials.
+        for _ in range(4):
+            worker.experiment.new_trial(worker.optimizer.suggest())
+        # Some other worker has already claimed one of the trials.
+        other_trial = next(worker.experiment.pending_trials(datetime.now(UTC), running=False))
+        assert worker.experiment.claim_trial(other_trial, worker_id="worker-2",
+                                             timestamp=datetime.now(UTC),
+                                             lease_timeout=timedelta(minutes=10))
+        worker.run_worker()
+        # Only the trial claimed by the other worker is left.
+        assert [t.trial_id for t in worker.experiment.pending_trials(datetime.now(UTC), running=True)] \
+            == [other_trial.trial_id]
+
+    trials = storage.experiments["Test-Worker-001"].trials
+    assert len(trials) == 4
+    assert sorted(trial.status.name for trial in trials.values()) == ["RUNNING"] + ["SUCCEEDED"] * 3
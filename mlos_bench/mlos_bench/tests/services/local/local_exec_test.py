@@ -7,6 +7,8 @@ Unit tests for the service to run the scripts locally.
 """
 import sys
 import tempfile
+import threading
+import time
 
 import pytest
 import pandas
@@ -224,3 +226,21 @@ def test_temp_dir_path_expansion() -> None:
         # pylint: disable=protected-access
         assert isinstance(local_exec_service._temp_dir, str)
         assert path_join(local_exec_service._temp_dir, abs_path=True) == path_join(temp_dir, "temp", abs_path=True)
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason="sleep and sh are not available on Windows")
+def test_run_script_cancel(local_exec_service: LocalExecService) -> None:
+    """
+    Cancel a long-running script from another thread.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        assert not local_exec_service.local_exec_cancel(temp_dir)
+        timer = threading.Timer(
+            0.5, lambda: local_exec_service.local_exec_cancel(temp_dir))
+        timer.start()
+        start = time.monotonic()
+        (return_code, _stdout, _stderr) = local_exec_service.local_exec(
+            ["sleep 30 && echo done"], cwd=temp_dir)
+        timer.join()
+        assert return_code != 0
+        assert time.monotonic() - start < 10
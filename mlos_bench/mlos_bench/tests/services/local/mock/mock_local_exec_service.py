@@ -32,10 +32,13 @@ class MockLocalExecService(TempDirContextService, SupportsLocalExec):
                  methods: Union[Dict[str, Callable], List[Callable], None] = None):
         super().__init__(
             config, global_config, parent,
-            self.merge_methods(methods, [self.local_exec])
+            self.merge_methods(methods, [self.local_exec, self.local_exec_cancel])
         )
 
     def local_exec(self, script_lines: Iterable[str],
                    env: Optional[Mapping[str, "TunableValue"]] = None,
                    cwd: Optional[str] = None) -> Tuple[int, str, str]:
         return (0, "", "")
+
+    def local_exec_cancel(self, cwd: str) -> bool:
+        return False
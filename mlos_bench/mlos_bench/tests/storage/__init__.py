@@ -6,5 +6,15 @@
 Tests for mlos_bench storage.
 """
 
+from typing import Callable, ContextManager, List
+
+from mlos_bench.storage.sql.storage import SqlStorage
+
 CONFIG_COUNT = 10
 CONFIG_TRIAL_REPEAT_COUNT = 3
+
+StatementRecorder = Callable[[SqlStorage], ContextManager[List[str]]]
+"""
+Type of the `record_statements` fixture: collects the SQL statements
+the storage executes within the context.
+"""
@@ -0,0 +1,109 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Benchmark the storage with one writer (the scheduler) and several readers
+(e.g., notebooks loading the results) working on the same database.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from threading import Event
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+import pytest
+from pytz import UTC
+from sqlalchemy import text
+
+from mlos_bench.environments.status import Status
+from mlos_bench.storage.sql.storage import SqlStorage
+from mlos_bench.tunables.tunable_groups import TunableGroups
+
+_LOG = logging.getLogger(__name__)
+
+_NUM_TRIALS = 30
+_NUM_READERS = 3
+
+
+@pytest.mark.parametrize(("drivername", "engine_profile"), [
+    ("sqlite", {}),
+    # The SQLAlchemy defaults (rollback journal), for comparison.
+    ("sqlite", False),
+    ("duckdb", {}),
+])
+def test_concurrent_writer_readers(make_storage: Callable[..., SqlStorage], tunable_groups: TunableGroups,
+                                   drivername: str, engine_profile: Union[bool, Dict[str, Any]]) -> None:
+    """
+    Run the trials in one storage session while the others read the results,
+    and report the write time and the read throughput. With the engine profile,
+    neither the writer nor the readers should fail on the database locks,
+    and SQLite should use the WAL journal instead of the rollback one.
+    """
+    writer = make_storage(drivername, engine_profile=engine_profile)
+    readers = [make_storage(drivername, engine_profile=engine_profile) for _ in range(_NUM_READERS)]
+    with writer.experiment(
+        experiment_id="Test-Concurrency",
+        trial_id=1,
+        root_env_config="environment.jsonc",
+        description="pytest concurrency benchmark",
+        tunables=tunable_groups,
+        opt_targets={"score": "min"},
+    ) as exp:
+        (write_time, reads) = _run_writer_readers(exp, readers, tunable_groups)
+    num_reads = sum(num_reads for (num_reads, _errors) in reads)
+    errors = [err for (_num_reads, reader_errors) in reads for err in reader_errors]
+    _LOG.info("%s profile=%s :: write %d trials: %.3f sec; %d readers: %d reads, %.1f reads/sec, %d errors",
+              drivername, engine_profile, _NUM_TRIALS, write_time, _NUM_READERS,
+              num_reads, num_reads / write_time, len(errors))
+    assert len(readers[0].experiments[exp.experiment_id].results_df) == _NUM_TRIALS
+    if engine_profile is not False:
+        assert not errors, f"Reader errors: {errors[:3]}"
+    if drivername == "sqlite":
+        # The readers do not block the writer in the WAL mode only.
+        with readers[0]._engine.connect() as conn:  # pylint: disable=protected-access
+            journal_mode = conn.execute(text("PRAGMA journal_mode")).scalar()
+        assert journal_mode == ("delete" if engine_profile is False else "wal")
+
+
+def _run_writer_readers(exp: SqlStorage.Experiment, readers: List[SqlStorage],
+                        tunable_groups: TunableGroups) -> Tuple[float, List[Tuple[int, List[Exception]]]]:
+    """
+    Run the trials in the experiment while the readers load its results.
+    Return the write time and the (number of reads, errors) of each reader.
+    """
+    is_done = Event()
+    timestamp = datetime.now(UTC)
+
+    def _write() -> float:
+        start = time.perf_counter()
+        for i in range(_NUM_TRIALS):
+            trial = exp.new_trial(tunable_groups.copy().assign({"kernel_sched_latency_ns": 1000 * (i + 1)}))
+            trial.update(Status.RUNNING, timestamp)
+            trial.update_telemetry(Status.RUNNING, timestamp + timedelta(seconds=5), [
+                (timestamp + timedelta(seconds=sec), "cpu_load", float(sec)) for sec in range(10)
+            ])
+            trial.update(Status.SUCCEEDED, timestamp + timedelta(seconds=10), {"score": float(i)})
+        return time.perf_counter() - start
+
+    def _read(storage: SqlStorage) -> Tuple[int, List[Exception]]:
+        errors: List[Exception] = []
+        num_reads = 0
+        while not is_done.is_set():
+            try:
+                num_reads += 1
+                storage.experiments[exp.experiment_id].results_df  # pylint: disable=expression-not-assigned
+            except Exception as ex:  # pylint: disable=broad-except
+                errors.append(ex)
+        return (num_reads, errors)
+
+    with ThreadPoolExecutor(max_workers=_NUM_READERS + 1) as executor:
+        reader_futures = [executor.submit(_read, storage) for storage in readers]
+        writer_future = executor.submit(_write)
+        try:
+            write_time = writer_future.result()
+        finally:
+            is_done.set()
+        return (write_time, [future.result() for future in reader_futures])
@@ -14,6 +14,8 @@ import mlos_bench.tests.storage.sql.fixtures as sql_storage_fixtures
 
 # Expose some of those as local names so they can be picked up as fixtures by pytest.
 storage = sql_storage_fixtures.storage
+make_storage = sql_storage_fixtures.make_storage
+record_statements = sql_storage_fixtures.record_statements
 exp_storage = sql_storage_fixtures.exp_storage
 exp_no_tunables_storage = sql_storage_fixtures.exp_no_tunables_storage
 mixed_numerics_exp_storage = sql_storage_fixtures.mixed_numerics_exp_storage
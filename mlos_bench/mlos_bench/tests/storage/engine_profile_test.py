@@ -0,0 +1,70 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Unit tests for the dialect-specific engine profiles of the SQL storage.
+"""
+from typing import Any, Callable, Dict, Union
+
+import pytest
+from sqlalchemy import URL, text
+
+from mlos_bench.storage.sql.engine_profile import DEFAULT_PROFILES, get_engine_profile
+from mlos_bench.storage.sql.storage import SqlStorage
+
+# pylint: disable=protected-access
+
+
+@pytest.mark.parametrize(("engine_profile", "expected"), [
+    (None, {"journal_mode": "wal", "synchronous": 1, "busy_timeout": 30000, "mmap_size": 256 * 1024 * 1024}),
+    ({"synchronous": "FULL", "busy_timeout": 1.5}, {"journal_mode": "wal", "synchronous": 2, "busy_timeout": 1500}),
+    (False, {"journal_mode": "delete", "synchronous": 2, "mmap_size": 0}),
+])
+def test_sqlite_engine_profile(make_storage: Callable[..., SqlStorage],
+                               engine_profile: Union[bool, Dict[str, Any], None],
+                               expected: Dict[str, Any]) -> None:
+    """
+    Apply the SQLite profile settings to every connection of the storage.
+    """
+    storage = make_storage(**({} if engine_profile is None else {"engine_profile": engine_profile}))
+    with storage._engine.connect() as conn:
+        for (pragma, value) in expected.items():
+            assert conn.execute(text(f"PRAGMA {pragma}")).scalar() == value
+    if engine_profile is not False:
+        assert storage._engine.pool.size() == DEFAULT_PROFILES["sqlite"]["pool_size"]
+
+
+def test_duckdb_engine_profile(make_storage: Callable[..., SqlStorage]) -> None:
+    """
+    Pass the DuckDB settings to the database instance.
+    """
+    storage = make_storage("duckdb", engine_profile={"threads": 2, "checkpoint_threshold": "1MB"})
+    with storage._engine.connect() as conn:
+        assert conn.execute(text("SELECT current_setting('threads')")).scalar() == 2
+        assert storage.experiments is not None
+
+
+def test_engine_profile_unsupported() -> None:
+    """
+    Reject the settings that the SQL dialect does not support.
+    """
+    url = URL.create(drivername="duckdb", database=":memory:")
+    with pytest.raises(ValueError):
+        get_engine_profile(url, {"journal_mode": "WAL"})
+    assert get_engine_profile(url, {"threads": 2})["threads"] == 2
+    assert not get_engine_profile(url, False)
+    assert get_engine_profile(URL.create(drivername="oracle", database="mlos"), None) == {}
+
+
+@pytest.mark.parametrize("settings", [
+    {"journal_mode": "WAL; DROP TABLE trial"},
+    {"synchronous": "normal"},
+    {"mmap_size": "0; DROP TABLE trial"},
+])
+def test_engine_profile_bad_pragma(settings: Dict[str, Any]) -> None:
+    """
+    Reject the SQLite PRAGMA values that are not in the allowed set.
+    """
+    with pytest.raises(ValueError):
+        get_engine_profile(URL.create(drivername="sqlite", database="mlos_bench.sqlite"), settings)
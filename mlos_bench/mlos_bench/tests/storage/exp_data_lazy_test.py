@@ -0,0 +1,99 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Unit tests for the lazy (paginated) access to the experiment data.
+"""
+import pytest
+
+from mlos_bench.storage.base_experiment_data import ExperimentData
+from mlos_bench.storage.sql.lazy_mapping import LazySqlMapping
+from mlos_bench.storage.sql.storage import SqlStorage
+
+from mlos_bench.tests.storage import CONFIG_COUNT, CONFIG_TRIAL_REPEAT_COUNT, StatementRecorder
+
+# pylint: disable=protected-access
+
+
+def test_lazy_trials_lookup(storage: SqlStorage, exp_data: ExperimentData,
+                            record_statements: StatementRecorder) -> None:
+    """
+    Make sure a single trial lookup fetches one record instead of the whole experiment.
+    """
+    trials = exp_data.trials
+    assert isinstance(trials, LazySqlMapping)
+    with record_statements(storage) as statements:
+        trial = trials[2]
+    assert trial.trial_id == 2
+    assert len(statements) == 1
+    assert 2 in trials
+    assert -1 not in trials
+    with pytest.raises(KeyError):
+        _ = trials[-1]
+
+
+def test_lazy_trials_len_iter(exp_data: ExperimentData) -> None:
+    """
+    Check the size, the order, and the contents of the lazy mapping.
+    """
+    trial_count = CONFIG_COUNT * CONFIG_TRIAL_REPEAT_COUNT
+    trials = exp_data.trials
+    assert len(trials) == trial_count
+    assert list(trials) == list(range(1, trial_count + 1))
+    assert all(key == trial.trial_id for (key, trial) in trials.items())
+    assert [trial.trial_id for trial in trials.values()] == list(trials)
+    assert dict(trials).keys() == set(trials.keys())
+
+
+def test_lazy_trials_pages(storage: SqlStorage, exp_data: ExperimentData,
+                           record_statements: StatementRecorder) -> None:
+    """
+    Iterate over the trials in small pages.
+    """
+    trial_count = CONFIG_COUNT * CONFIG_TRIAL_REPEAT_COUNT
+    trials = exp_data.trials
+    assert isinstance(trials, LazySqlMapping)
+    paged = LazySqlMapping(engine=storage._engine, stmt=trials._stmt, key=trials._key,
+                           factory=trials._factory, page_size=7)
+    with record_statements(storage) as statements:
+        assert [trial.trial_id for trial in paged.values()] == list(range(1, trial_count + 1))
+    # 30 trials in 7-record pages: 5 queries (the last one is partial).
+    assert len(statements) == (trial_count // 7) + 1
+
+
+def test_lazy_trials_slice(exp_data: ExperimentData) -> None:
+    """
+    Get a range of trials by their IDs.
+    """
+    trials = exp_data.trials
+    assert isinstance(trials, LazySqlMapping)
+    assert list(trials[5:8]) == [5, 6, 7]
+    assert len(trials[:4]) == 3
+    assert 10 not in trials[:10]
+    with pytest.raises(ValueError):
+        _ = trials[1:10:2]
+
+
+def test_lazy_tunable_configs(exp_data: ExperimentData) -> None:
+    """
+    Check the lazy access to the tunable configs and their trial groups.
+    """
+    configs = exp_data.tunable_configs
+    assert len(configs) == CONFIG_COUNT
+    config_id = next(iter(configs))
+    assert configs[config_id].tunable_config_id == config_id
+    groups = exp_data.tunable_config_trial_groups
+    assert len(groups) == CONFIG_COUNT
+    assert groups[config_id].tunable_config_id == config_id
+    assert len(groups[config_id].trials) == CONFIG_TRIAL_REPEAT_COUNT
+
+
+def test_lazy_experiments(storage: SqlStorage, exp_data: ExperimentData) -> None:
+    """
+    Look up the experiment without loading the rest.
+    """
+    assert exp_data.experiment_id in storage.experiments
+    assert "no-such-experiment" not in storage.experiments
+    assert list(storage.experiments) == [exp_data.experiment_id]
+    assert storage.experiments[exp_data.experiment_id].description == exp_data.description
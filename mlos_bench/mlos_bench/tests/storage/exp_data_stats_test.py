@@ -0,0 +1,124 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Unit tests for the aggregated statistics of the experiment data.
+"""
+from datetime import datetime
+from typing import Any, List
+
+import pandas
+import pytest
+from pytz import UTC
+from sqlalchemy import event
+
+from mlos_bench.environments.status import Status
+from mlos_bench.storage.base_experiment_data import ExperimentData
+from mlos_bench.storage.sql import common
+from mlos_bench.storage.sql.storage import SqlStorage
+from mlos_bench.tunables.tunable_groups import TunableGroups
+
+from mlos_bench.tests.storage import CONFIG_COUNT, CONFIG_TRIAL_REPEAT_COUNT
+
+# pylint: disable=protected-access
+
+
+def test_config_trial_group_stats(exp_data: ExperimentData) -> None:
+    """
+    Compare the statistics computed by the database with the ones computed in pandas.
+    """
+    stats_df = exp_data.config_trial_group_stats("score")
+    assert len(stats_df) == CONFIG_COUNT
+    assert (stats_df["count"] == CONFIG_TRIAL_REPEAT_COUNT).all()
+    assert list(stats_df.columns) == [
+        "tunable_config_id", "tunable_config_trial_group_id", "count", "mean", "stddev",
+        "var", "var_zscore", "p50", "p75", "p90", "p95", "p99",
+    ]
+    # Call the generic pandas-based implementation of the base class.
+    expected_df = ExperimentData.config_trial_group_stats(exp_data, "result.score")
+    pandas.testing.assert_frame_equal(stats_df, expected_df, check_dtype=False)
+
+
+def test_config_trial_group_stats_succeeded(storage: SqlStorage,
+                                            exp_storage_with_trials: SqlStorage.Experiment,
+                                            tunable_groups: TunableGroups) -> None:
+    """
+    Only the successful trials should be counted, even if the failed ones have results.
+    """
+    exp_data = storage.experiments[exp_storage_with_trials.experiment_id]
+    stats_df = exp_data.config_trial_group_stats("score")
+    # Failed trial of the default config.
+    trial = exp_storage_with_trials.new_trial(tunable_groups)
+    trial.update(Status.FAILED, datetime.now(UTC), {"score": 1e9})
+    new_stats_df = exp_data.config_trial_group_stats("score")
+    pandas.testing.assert_frame_equal(new_stats_df, stats_df)
+    expected_df = ExperimentData.config_trial_group_stats(exp_data, "score")
+    pandas.testing.assert_frame_equal(new_stats_df, expected_df, check_dtype=False)
+
+
+def test_config_trial_group_stats_percentiles_iter(storage: SqlStorage, exp_data: ExperimentData) -> None:
+    """
+    The percentiles can be passed as a one-shot iterator.
+    """
+    stats_df = common.get_config_trial_group_stats(
+        storage._engine, storage._schema, exp_data.experiment_id, "score", iter([50, 90]))
+    assert stats_df["p50"].notna().all()
+    assert stats_df["p90"].notna().all()
+
+
+def test_config_trial_group_stats_unknown_metric(exp_data: ExperimentData) -> None:
+    """
+    No stats for the metric that does not exist.
+    """
+    stats_df = exp_data.config_trial_group_stats("no-such-metric")
+    assert stats_df.empty
+    assert "var_zscore" in stats_df.columns
+
+
+def test_config_trial_group_stats_query(storage: SqlStorage, exp_data: ExperimentData) -> None:
+    """
+    Make sure the stats are computed in one query that returns the aggregated rows only.
+    """
+    row_counts: List[int] = []
+
+    def _count_rows(_conn: Any, _clauseelement: Any, _multiparams: Any,
+                    _params: Any, _execution_options: Any, result: Any) -> None:
+        row_counts.append(len(result.fetchall()) if result.returns_rows else 0)
+
+    event.listen(storage._engine, "after_execute", _count_rows)
+    try:
+        exp_data.config_trial_group_stats("score")
+    finally:
+        event.remove(storage._engine, "after_execute", _count_rows)
+    assert row_counts == [CONFIG_COUNT]
+
+
+def test_top_n_configs(exp_data: ExperimentData) -> None:
+    """
+    Get the best configs and the default baseline.
+    """
+    assert exp_data.objectives == {"score": "min"}
+    top_df = exp_data.top_n_configs(3)
+    assert len(top_df) == 4
+    assert top_df["is_default"].tolist() == [True, False, False, False]
+    assert top_df["tunable_config_id"][0] == exp_data.default_tunable_config_id
+    # The rest is sorted by the mean score, ascending (minimization).
+    stats_df = exp_data.config_trial_group_stats("score")
+    best_df = stats_df[stats_df["tunable_config_id"] != exp_data.default_tunable_config_id] \
+        .sort_values("mean").head(3)
+    assert top_df["tunable_config_id"][1:].tolist() == best_df["tunable_config_id"].tolist()
+
+    top_p90_df = exp_data.top_n_configs(CONFIG_COUNT, method="p90")
+    assert len(top_p90_df) == CONFIG_COUNT
+    assert top_p90_df["p90"][1:].is_monotonic_increasing
+
+
+def test_top_n_configs_invalid(exp_data: ExperimentData) -> None:
+    """
+    Check the input validation.
+    """
+    with pytest.raises(ValueError):
+        exp_data.top_n_configs(3, objective="no-such-objective")
+    with pytest.raises(ValueError):
+        exp_data.top_n_configs(3, method="median")  # type: ignore[arg-type]
@@ -0,0 +1,61 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Benchmark loading (resuming) the experiment data with a growing number of trials.
+"""
+
+import logging
+import time
+from datetime import datetime
+
+import pytest
+from pytz import UTC
+
+from mlos_bench.environments.status import Status
+from mlos_bench.storage.sql.storage import SqlStorage
+from mlos_bench.tunables.tunable_groups import TunableGroups
+
+from mlos_bench.tests.storage import StatementRecorder
+
+_LOG = logging.getLogger(__name__)
+
+
+@pytest.mark.parametrize("num_trials", [10, 100, 1000])
+def test_exp_load_scale(storage: SqlStorage, exp_storage: SqlStorage.Experiment,
+                        tunable_groups: TunableGroups, num_trials: int,
+                        record_statements: StatementRecorder) -> None:
+    """
+    Make sure that the number of queries to load the experiment data does not
+    depend on the number of trials, and report the time it takes to load them.
+    """
+    configs = [
+        tunable_groups.copy().assign({"kernel_sched_latency_ns": 1000 * (i + 1)})
+        for i in range(num_trials)
+    ]
+    timestamp = datetime.now(UTC)
+    for (i, trial) in enumerate(exp_storage.new_trials(configs)):
+        trial.update(Status.RUNNING, timestamp)
+        if i % 10 == 0:
+            trial.update(Status.FAILED, timestamp)
+        else:
+            trial.update(Status.SUCCEEDED, timestamp, {"score": float(i)})
+
+    with record_statements(storage) as statements:
+        start = time.perf_counter()
+        (trial_ids, configs_loaded, scores, status) = exp_storage.load()
+        elapsed = time.perf_counter() - start
+
+    _LOG.info("Load %d trials: %.3f sec, %d queries", num_trials, elapsed, len(statements))
+    assert len(statements) <= 3
+    assert len(trial_ids) == len(configs_loaded) == len(scores) == len(status) == num_trials
+    for (i, trial_id) in enumerate(trial_ids):
+        assert configs_loaded[i]["kernel_sched_latency_ns"] == str(1000 * (i + 1))
+        if i % 10 == 0:
+            assert status[i] == Status.FAILED
+            assert scores[i] is None
+        else:
+            assert status[i] == Status.SUCCEEDED
+            assert scores[i] == {"score": str(float(i))}
+    assert trial_ids == sorted(trial_ids)
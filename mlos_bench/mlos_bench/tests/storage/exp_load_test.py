@@ -160,3 +160,32 @@ def test_exp_trial_pending_3(exp_storage: Storage.Experiment,
     assert status == [Status.FAILED, Status.SUCCEEDED]
     assert tunable_groups.copy().assign(configs[0]).reset() == trial_fail.tunables
     assert tunable_groups.copy().assign(configs[1]).reset() == trial_succ.tunables
+
+
+def test_exp_load_config_trials(exp_storage: Storage.Experiment,
+                                tunable_groups: TunableGroups) -> None:
+    """
+    Load the status and the results of all trials grouped by the tunable config.
+    """
+    trial_succ = exp_storage.new_trial(tunable_groups)
+    trial_fail = exp_storage.new_trial(tunable_groups)
+    tunables = tunable_groups.copy().assign({"idle": "mwait"})
+    trial_other = exp_storage.new_trial(tunables)
+    trial_pend = exp_storage.new_trial(tunables)
+
+    trial_succ.update(Status.SUCCEEDED, datetime.now(UTC), {"score": 99.9, "benchmark": "test"})
+    trial_fail.update(Status.FAILED, datetime.now(UTC))
+    trial_other.update(Status.SUCCEEDED, datetime.now(UTC), {"score": 88.8})
+
+    assert trial_succ.tunable_config_id == trial_fail.tunable_config_id
+    assert trial_other.tunable_config_id == trial_pend.tunable_config_id
+    assert exp_storage.load_config_trials("score") == {
+        trial_succ.tunable_config_id: {
+            trial_succ.trial_id: (Status.SUCCEEDED, "99.9"),
+            trial_fail.trial_id: (Status.FAILED, None),
+        },
+        trial_other.tunable_config_id: {
+            trial_other.trial_id: (Status.SUCCEEDED, "88.8"),
+            trial_pend.trial_id: (Status.PENDING, None),
+        },
+    }
@@ -0,0 +1,113 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Unit tests for merging the trials of other experiments into the current one.
+"""
+from datetime import datetime
+
+import json5
+import pytest
+from pytz import UTC
+
+from mlos_bench.environments.status import Status
+from mlos_bench.storage.sql.storage import SqlStorage
+from mlos_bench.tunables.tunable_groups import TunableGroups
+
+from mlos_bench.tests.storage import CONFIG_COUNT, CONFIG_TRIAL_REPEAT_COUNT
+from mlos_bench.tests.tunable_groups_fixtures import TUNABLE_GROUPS_JSON
+
+
+def _new_experiment(storage: SqlStorage, tunables: TunableGroups,
+                    experiment_id: str = "Test-Merge") -> SqlStorage.Experiment:
+    """
+    Create a new experiment (already in context) to merge the data into.
+    """
+    return storage.experiment(
+        experiment_id=experiment_id,
+        trial_id=1,
+        root_env_config="environment.jsonc",
+        description="pytest merge experiment",
+        tunables=tunables,
+        opt_targets={"score": "min"},
+    ).__enter__()
+
+
+def test_exp_merge(storage: SqlStorage,
+                   exp_storage_with_trials: SqlStorage.Experiment,
+                   tunable_groups: TunableGroups) -> None:
+    """
+    Merge all trials of a compatible experiment and load them back in one pass.
+    """
+    trial_count = CONFIG_COUNT * CONFIG_TRIAL_REPEAT_COUNT
+    # The pending trial of the source experiment should not be merged.
+    exp_storage_with_trials.new_trial(tunable_groups)
+    exp = _new_experiment(storage, tunable_groups)
+    # Keep a trial of the new experiment to make sure the merged trial IDs follow it.
+    trial = exp.new_trial(tunable_groups)
+    trial.update(Status.SUCCEEDED, datetime.now(UTC), {"score": 1.0})
+
+    exp.merge([exp_storage_with_trials.experiment_id])
+    (trial_ids, configs, scores, status) = exp.load()
+    (src_trial_ids, src_configs, src_scores, src_status) = exp_storage_with_trials.load()
+    assert len(src_trial_ids) == trial_count
+    assert trial_ids == list(range(1, trial_count + 2))
+    assert configs[1:] == src_configs
+    assert scores[1:] == src_scores
+    assert status[1:] == src_status
+    # The merged trials do not count towards the progress of the experiment.
+    assert exp.progress().num_completed == 1
+
+    # The new trials get the IDs after the merged ones.
+    new_trial = exp.new_trial(tunable_groups)
+    assert new_trial.trial_id == trial_count + 2
+    assert new_trial.tunable_config_id == trial.tunable_config_id
+
+    # Provenance of the merged trials.
+    trial_data = storage.experiments[exp.experiment_id].trials[2]
+    assert trial_data.metadata_dict["merged_from"] == f"{exp_storage_with_trials.experiment_id}:1"
+    assert trial_data.metadata_dict["trial_number"] == 1
+
+    # Merging the same experiment again is a no-op.
+    exp.merge([exp_storage_with_trials.experiment_id, exp.experiment_id])
+    assert len(exp.load()[0]) == trial_count + 1
+
+
+def test_exp_merge_incompatible(storage: SqlStorage,
+                                exp_storage_with_trials: SqlStorage.Experiment,
+                                mixed_numerics_tunable_groups: TunableGroups) -> None:
+    """
+    Do not merge the trials with different tunables.
+    """
+    exp = _new_experiment(storage, mixed_numerics_tunable_groups)
+    exp.merge([exp_storage_with_trials.experiment_id])
+    assert exp.load() == ([], [], [], [])
+
+
+def test_exp_merge_out_of_range(storage: SqlStorage,
+                                exp_storage_with_trials: SqlStorage.Experiment) -> None:
+    """
+    Merge only the configs with values that are valid for the current tunables.
+    """
+    tunables_json = json5.loads(TUNABLE_GROUPS_JSON)
+    tunables_json["kernel"]["params"]["kernel_sched_latency_ns"]["range"] = [0, 500000000]
+    narrow_tunables = TunableGroups(tunables_json)
+    (_trial_ids, src_configs, _scores, _status) = exp_storage_with_trials.load()
+    valid_configs = [config for config in src_configs
+                     if int(config["kernel_sched_latency_ns"]) <= 500000000]
+    assert 0 < len(valid_configs) < len(src_configs)
+
+    exp = _new_experiment(storage, narrow_tunables)
+    exp.merge([exp_storage_with_trials.experiment_id])
+    (_trial_ids, configs, _scores, _status) = exp.load()
+    assert configs == valid_configs
+
+
+def test_exp_merge_missing(storage: SqlStorage, tunable_groups: TunableGroups) -> None:
+    """
+    Merging an unknown experiment is an error.
+    """
+    exp = _new_experiment(storage, tunable_groups)
+    with pytest.raises(ValueError):
+        exp.merge(["no-such-experiment"])
@@ -0,0 +1,78 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Unit tests for the experiment progress (time spent, throughput, ETA).
+"""
+from datetime import datetime, timedelta
+
+from pytz import UTC
+
+from mlos_bench.environments.status import Status
+from mlos_bench.storage.base_storage import Storage
+from mlos_bench.storage.experiment_progress import ExperimentProgress
+from mlos_bench.tunables.tunable_groups import TunableGroups
+
+
+def test_progress_empty() -> None:
+    """
+    Check the progress of the experiment without trials.
+    """
+    progress = ExperimentProgress([])
+    assert progress.num_completed == progress.num_running == progress.num_pending == 0
+    assert progress.wall_time == progress.benchmark_time == progress.overhead_time == timedelta(0)
+    assert progress.mean_trial_time is None
+    assert progress.trials_per_hour == 0
+    assert progress.time_to_complete(10) is None
+    assert progress.time_to_complete(0) == timedelta(0)
+
+
+def test_progress_parallel_trials() -> None:
+    """
+    Check the progress of the overlapping and running trials.
+    """
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    minute = timedelta(minutes=1)
+    progress = ExperimentProgress([
+        (start, start + 10 * minute, Status.SUCCEEDED),
+        (start + 5 * minute, start + 20 * minute, Status.FAILED),
+        # Nothing runs between 20 and 30 minutes.
+        (start + 30 * minute, None, Status.RUNNING),
+        (start + 35 * minute, None, Status.PENDING),
+    ], timestamp=start + 40 * minute)
+    assert progress.num_completed == 2
+    assert progress.num_running == 1
+    assert progress.num_pending == 1
+    assert progress.wall_time == 40 * minute
+    assert progress.benchmark_time == 35 * minute
+    assert progress.overhead_time == 10 * minute
+    assert progress.mean_trial_time == 12.5 * minute
+    assert progress.trials_per_hour == 3.0
+    assert progress.time_to_complete(6) == timedelta(hours=2)
+
+
+def test_exp_progress(storage: Storage, exp_storage: Storage.Experiment,
+                      tunable_groups: TunableGroups) -> None:
+    """
+    Compute the progress of the experiment from the trials in the storage.
+    """
+    start = datetime.now(UTC) - timedelta(hours=1)
+    minute = timedelta(minutes=1)
+    for i in range(3):
+        trial = exp_storage.new_trial(tunable_groups, start + 20 * i * minute)
+        trial.update(Status.RUNNING, start + 20 * i * minute)
+        trial.update(Status.SUCCEEDED, start + (20 * i + 15) * minute, {"score": 99.9})
+    exp_storage.new_trial(tunable_groups)
+
+    progress = exp_storage.progress()
+    assert progress.num_completed == 3
+    assert progress.num_running == 0
+    assert progress.num_pending == 1
+    assert progress.wall_time == 55 * minute
+    assert progress.benchmark_time == 45 * minute
+    assert progress.overhead_time == 10 * minute
+
+    exp_data_progress = storage.experiments[exp_storage.experiment_id].progress
+    assert exp_data_progress.wall_time == progress.wall_time
+    assert exp_data_progress.benchmark_time == progress.benchmark_time
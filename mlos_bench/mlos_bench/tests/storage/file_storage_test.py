@@ -0,0 +1,301 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Unit tests for the append-only file-based storage.
+"""
+import os
+from datetime import datetime, timedelta
+from typing import Any, Callable, List
+
+import pandas
+import pytest
+from pytz import UTC
+
+from mlos_bench.environments.status import Status
+from mlos_bench.storage.base_storage import Storage
+from mlos_bench.storage.file.storage import FileStorage
+from mlos_bench.storage.sql.storage import SqlStorage
+from mlos_bench.tunables.tunable_groups import TunableGroups
+
+# pylint: disable=protected-access,redefined-outer-name
+
+_TS_START = datetime(2024, 1, 1, 12, 0, 0, tzinfo=UTC)
+
+
+@pytest.fixture
+def make_file_storage(tmp_path: str) -> Callable[..., FileStorage]:
+    """
+    Test fixture to create (or reopen) the file storage in the temp directory.
+    Takes the storage config parameters.
+    """
+    def _make_file_storage(**kwargs: Any) -> FileStorage:
+        return FileStorage(service=None, config={"path": os.path.join(tmp_path, "storage"), **kwargs})
+
+    return _make_file_storage
+
+
+def _make_experiment(storage: Storage, tunable_groups: TunableGroups,
+                     experiment_id: str = "Test-File") -> Storage.Experiment:
+    """
+    Create a new experiment (already in context).
+    """
+    return storage.experiment(
+        experiment_id=experiment_id,
+        trial_id=1,
+        root_env_config="environment.jsonc",
+        description="pytest file storage experiment",
+        tunables=tunable_groups,
+        opt_targets={"score": "min"},
+    ).__enter__()
+
+
+def _segments(tmp_path: str, experiment_id: str = "Test-File") -> List[str]:
+    """
+    List the segment files of the experiment log.
+    """
+    return sorted(name for name in os.listdir(os.path.join(tmp_path, "storage", experiment_id))
+                  if name.startswith("segment-"))
+
+
+def _crash(exp: Storage.Experiment) -> None:
+    """
+    Simulate a crash of the writer: close its files without sealing the log.
+    """
+    log = exp._index.log  # type: ignore[attr-defined]
+    log._file.close()
+    log._file = None
+    log._lock_file.close()
+    log._lock_file = None
+
+
+def _run_trials(exp: Storage.Experiment, tunable_groups: TunableGroups) -> None:
+    """
+    Run the same sequence of trials in any storage.
+    """
+    tunables = []
+    for i in range(3):
+        tunables.append(tunable_groups.copy())
+        tunables[-1]["kernel_sched_migration_cost_ns"] = 10000 * (i + 1)
+    trials = exp.new_trials(tunables + [tunables[0]], ts_start=_TS_START)
+    for (i, trial) in enumerate(trials[:3]):
+        assert exp.claim_trial(trial, worker_id="worker-1", timestamp=_TS_START + timedelta(seconds=i),
+                               lease_timeout=timedelta(minutes=1))
+        status = Status.FAILED if i == 1 else Status.SUCCEEDED
+        trial.update(status, _TS_START + timedelta(minutes=i + 1),
+                     {"score": 10.0 * i, "note": f"run-{i}"} if status.is_succeeded() else None)
+
+
+def test_file_storage_trials(make_file_storage: Callable[..., FileStorage], tunable_groups: TunableGroups) -> None:
+    """
+    Schedule, claim, and complete the trials, and load them back.
+    """
+    storage = make_file_storage()
+    exp = _make_experiment(storage, tunable_groups)
+    _run_trials(exp, tunable_groups)
+
+    (pending,) = exp.pending_trials(_TS_START, running=True)
+    assert pending.trial_id == 4
+    assert pending.tunable_config_id == 1
+    assert not list(exp.pending_trials(_TS_START - timedelta(seconds=1), running=True))
+
+    (trial_ids, configs, scores, status) = exp.load()
+    assert trial_ids == [1, 2, 3]
+    assert [config["kernel_sched_migration_cost_ns"] for config in configs] == [10000, 20000, 30000]
+    assert scores == [{"score": 0.0, "note": "run-0"}, None, {"score": 20.0, "note": "run-2"}]
+    assert status == [Status.SUCCEEDED, Status.FAILED, Status.SUCCEEDED]
+    assert exp.load(last_trial_id=2)[0] == [3]
+    assert exp.load_config_trials("score")[1] == {1: (Status.SUCCEEDED, 0.0), 4: (Status.PENDING, None)}
+
+    # A completed trial cannot be completed again, nor claimed by another worker.
+    (trial,) = exp.new_trials([tunable_groups], ts_start=_TS_START)
+    (other_trial,) = [pending for pending in exp.pending_trials(_TS_START, running=True)
+                      if pending.trial_id == trial.trial_id]
+    assert exp.claim_trial(trial, worker_id="worker-1", timestamp=_TS_START, lease_timeout=timedelta(minutes=1))
+    assert not exp.claim_trial(other_trial, worker_id="worker-2", timestamp=_TS_START,
+                               lease_timeout=timedelta(minutes=1))
+    assert trial.heartbeat(_TS_START + timedelta(minutes=5))
+    # The lease of worker-1 expires.
+    assert exp.claim_trial(other_trial, worker_id="worker-2", timestamp=_TS_START + timedelta(minutes=10),
+                           lease_timeout=timedelta(minutes=1))
+    assert not trial.heartbeat(_TS_START + timedelta(minutes=11))
+    other_trial.update(Status.CANCELED, _TS_START + timedelta(minutes=12))
+    # The results of the worker that has lost the lease are dropped.
+    assert trial.update(Status.SUCCEEDED, _TS_START + timedelta(minutes=13), {"score": 1.0}) is None
+    assert storage.experiments[exp.experiment_id].trials[trial.trial_id].status == Status.CANCELED
+
+    exp_data = storage.experiments[exp.experiment_id]
+    assert list(storage.experiments) == [exp.experiment_id]
+    assert exp_data.objectives == {"score": "min"}
+    assert exp_data.trials[3].results_dict == {"note": "run-2", "score": 20.0}
+    assert exp_data.tunable_config_trial_groups[1].tunable_config_trial_group_id == 1
+    assert exp_data.progress.num_completed == 4
+    assert exp.progress().num_pending == 1
+
+
+def test_file_storage_claim_no_lease(make_file_storage: Callable[..., FileStorage],
+                                     tunable_groups: TunableGroups) -> None:
+    """
+    A trial running without a heartbeat can be claimed once the lease timeout passes.
+    """
+    exp = _make_experiment(make_file_storage(), tunable_groups)
+    (trial,) = exp.new_trials([tunable_groups], ts_start=_TS_START)
+    trial.update(Status.RUNNING, _TS_START)
+    assert not exp.claim_trial(trial, worker_id="worker-1", timestamp=_TS_START + timedelta(seconds=30),
+                               lease_timeout=timedelta(minutes=1))
+    assert exp.claim_trial(trial, worker_id="worker-1", timestamp=_TS_START + timedelta(minutes=2),
+                           lease_timeout=timedelta(minutes=1))
+    assert trial.heartbeat(_TS_START + timedelta(minutes=3))
+
+
+def test_file_storage_results_df(make_file_storage: Callable[..., FileStorage], storage: SqlStorage,
+                                 tunable_groups: TunableGroups) -> None:
+    """
+    Produce the same results DataFrame as the SQL storage.
+    """
+    exp_sql = _make_experiment(storage, tunable_groups)
+    _run_trials(exp_sql, tunable_groups)
+    file_storage = make_file_storage()
+    exp_file = _make_experiment(file_storage, tunable_groups)
+    _run_trials(exp_file, tunable_groups)
+
+    results_df = file_storage.experiments[exp_file.experiment_id].results_df
+    assert len(results_df) == 4
+    pandas.testing.assert_frame_equal(
+        results_df, storage.experiments[exp_sql.experiment_id].results_df, check_dtype=False)
+
+
+def test_file_storage_telemetry(make_file_storage: Callable[..., FileStorage], tunable_groups: TunableGroups) -> None:
+    """
+    Store the telemetry and skip the duplicate records when reading it.
+    """
+    storage = make_file_storage()
+    exp = _make_experiment(storage, tunable_groups)
+    trial = exp.new_trial(tunable_groups, ts_start=_TS_START)
+    telemetry = [(_TS_START + timedelta(seconds=sec), metric, float(sec))
+                 for sec in range(0, 60, 10) for metric in ("cpu_load", "mem_usage")]
+    trial.update_telemetry(Status.RUNNING, _TS_START, telemetry[:8])
+    trial.update_telemetry(Status.RUNNING, _TS_START, telemetry)
+    # Another session re-sends the same records.
+    (trial,) = exp.pending_trials(_TS_START + timedelta(minutes=1), running=True)
+    trial.update_telemetry(Status.RUNNING, _TS_START, telemetry)
+    assert exp.load_telemetry(trial.trial_id) == telemetry
+    telemetry_df = storage.experiments[exp.experiment_id].trials[trial.trial_id].telemetry_df
+    assert telemetry_df["ts"].tolist() == [ts for (ts, _metric, _val) in telemetry]
+
+
+def test_file_storage_reopen(tmp_path: str, make_file_storage: Callable[..., FileStorage],
+                             tunable_groups: TunableGroups) -> None:
+    """
+    Rebuild the experiment state from the sealed log segments in a new session.
+    """
+    storage = make_file_storage(segment_size=256)
+    exp = _make_experiment(storage, tunable_groups)
+    _run_trials(exp, tunable_groups)
+    results_df = storage.experiments[exp.experiment_id].results_df
+    exp.__exit__(None, None, None)
+    segments = _segments(tmp_path)
+    assert len(segments) > 3
+    assert not any(name.endswith(".open") for name in segments)
+
+    storage = make_file_storage(segment_size=256)
+    exp = _make_experiment(storage, tunable_groups)
+    pandas.testing.assert_frame_equal(storage.experiments[exp.experiment_id].results_df, results_df)
+    assert exp.new_trial(tunable_groups).trial_id == 5
+    assert [trial.trial_id for trial in exp.pending_trials(_TS_START, running=False)] == [4]
+
+
+def test_file_storage_torn_tail(tmp_path: str, make_file_storage: Callable[..., FileStorage],
+                                tunable_groups: TunableGroups) -> None:
+    """
+    Recover from the partially written record at the end of the log after a crash.
+    """
+    storage = make_file_storage()
+    exp = _make_experiment(storage, tunable_groups)
+    trial = exp.new_trial(tunable_groups, ts_start=_TS_START)
+    log_dir = os.path.join(tmp_path, "storage", "Test-File")
+    (segment,) = _segments(tmp_path)
+    segment_size = os.path.getsize(os.path.join(log_dir, segment))
+    with open(os.path.join(log_dir, segment), "ab") as fh_segment:
+        fh_segment.write(b'{"type":"status","trial_id":1,"ts":"2024-')
+
+    # Readers skip the partial record.
+    assert storage.experiments[exp.experiment_id].trials[trial.trial_id].status == Status.PENDING
+
+    # The writer truncates it on restart and continues the log.
+    _crash(exp)
+    storage = make_file_storage()
+    exp = _make_experiment(storage, tunable_groups)
+    assert os.path.getsize(os.path.join(log_dir, segment)) == segment_size
+    (trial,) = exp.pending_trials(_TS_START, running=False)
+    trial.update(Status.SUCCEEDED, _TS_START + timedelta(minutes=1), {"score": 1.0})
+    assert make_file_storage().experiments[exp.experiment_id].trials[trial.trial_id].status == Status.SUCCEEDED
+
+
+def test_file_storage_close(tmp_path: str, make_file_storage: Callable[..., FileStorage],
+                            tunable_groups: TunableGroups) -> None:
+    """
+    Seal the active segment on close, and the leftover active segments on restart.
+    """
+    storage = make_file_storage()
+    exp = _make_experiment(storage, tunable_groups)
+    exp.new_trial(tunable_groups, ts_start=_TS_START)
+    exp.__exit__(None, None, None)
+    assert _segments(tmp_path) == ["segment-000001.jsonl"]
+
+    # The older versions did not seal the active segment on close,
+    # and a crash could leave several active segments behind.
+    exp = _make_experiment(make_file_storage(), tunable_groups)
+    exp.new_trial(tunable_groups, ts_start=_TS_START)
+    exp._index.log._file.close()  # type: ignore[attr-defined]
+    exp._index.log._file = None  # type: ignore[attr-defined]
+    exp.new_trial(tunable_groups, ts_start=_TS_START)
+    _crash(exp)
+    assert _segments(tmp_path) == ["segment-000001.jsonl", "segment-000002.jsonl.open", "segment-000003.jsonl.open"]
+
+    exp = _make_experiment(make_file_storage(), tunable_groups)
+    assert _segments(tmp_path) == ["segment-000001.jsonl", "segment-000002.jsonl", "segment-000003.jsonl.open"]
+    assert exp.new_trial(tunable_groups).trial_id == 4
+    exp.__exit__(None, None, None)
+    assert _segments(tmp_path) == ["segment-000001.jsonl", "segment-000002.jsonl", "segment-000003.jsonl"]
+
+
+def test_file_storage_one_writer(make_file_storage: Callable[..., FileStorage], tunable_groups: TunableGroups) -> None:
+    """
+    Only one writer can open the experiment at a time; the readers are not blocked.
+    """
+    storage = make_file_storage()
+    exp = _make_experiment(storage, tunable_groups)
+    trial = exp.new_trial(tunable_groups, ts_start=_TS_START)
+    with pytest.raises(RuntimeError):
+        _make_experiment(make_file_storage(), tunable_groups)
+    assert make_file_storage().experiments[exp.experiment_id].trials[trial.trial_id].status == Status.PENDING
+    exp.__exit__(None, None, None)
+    # The lock is released on close.
+    exp = _make_experiment(make_file_storage(), tunable_groups)
+    assert exp.new_trial(tunable_groups).trial_id == 2
+    exp.__exit__(None, None, None)
+
+
+def test_file_storage_merge(make_file_storage: Callable[..., FileStorage], tunable_groups: TunableGroups) -> None:
+    """
+    Merge the completed trials of another experiment.
+    """
+    storage = make_file_storage()
+    src_exp = _make_experiment(storage, tunable_groups, "Test-Source")
+    _run_trials(src_exp, tunable_groups)
+    exp = _make_experiment(storage, tunable_groups)
+    exp.new_trial(tunable_groups)
+    exp.merge([src_exp.experiment_id])
+    (trial_ids, configs, scores, status) = exp.load()
+    assert trial_ids == [2, 3, 4]
+    assert (configs, scores, status) == src_exp.load()[1:]
+    assert storage.experiments[exp.experiment_id].trials[2].metadata_dict == {"merged_from": "Test-Source:1"}
+    # The merged trials do not count towards the progress of the experiment.
+    assert exp.progress().num_completed == 0
+    # Merging again is a no-op.
+    exp.merge([src_exp.experiment_id])
+    assert exp.load()[0] == [2, 3, 4]
+    with pytest.raises(ValueError):
+        exp.merge(["Test-Missing"])
@@ -0,0 +1,93 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Check the query plans of the most frequent storage queries to catch full table scans.
+"""
+
+from datetime import datetime
+from typing import Any, Callable, List, Tuple
+
+from pytz import UTC
+from sqlalchemy import event
+
+from mlos_bench.environments.status import Status
+from mlos_bench.storage.sql.storage import SqlStorage
+from mlos_bench.tunables.tunable_groups import TunableGroups
+
+# Tables that grow with the number of trials.
+_TRIAL_TABLES = {"trial", "config_param", "trial_param", "trial_result", "trial_telemetry"}
+
+
+def _query_plans(storage: SqlStorage, func: Callable[[], Any]) -> List[str]:
+    """
+    Run the function and return the SQLite query plans of all its statements.
+    """
+    statements: List[Tuple[str, Any]] = []
+
+    def _save_statement(_conn: Any, _cursor: Any, statement: str, parameters: Any, *_args: Any) -> None:
+        statements.append((statement, parameters))
+
+    engine = storage._engine  # pylint: disable=protected-access
+    event.listen(engine, "before_cursor_execute", _save_statement)
+    try:
+        func()
+    finally:
+        event.remove(engine, "before_cursor_execute", _save_statement)
+
+    plans: List[str] = []
+    with engine.connect() as conn:
+        for (statement, parameters) in statements:
+            if not statement.lstrip().upper().startswith("SELECT"):
+                continue
+            plans.extend(
+                row[-1] for row in
+                conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+            )
+    assert plans
+    return plans
+
+
+def _full_scans(plans: List[str]) -> List[str]:
+    """
+    Get the steps of the query plans that scan the whole trial tables.
+    """
+    return [step for step in plans
+            if step.startswith("SCAN ") and step.split()[1] in _TRIAL_TABLES]
+
+
+def _add_trials(exp_storage: SqlStorage.Experiment, tunable_groups: TunableGroups) -> None:
+    """
+    Add some completed and pending trials to the experiment.
+    """
+    timestamp = datetime.now(UTC)
+    for i in range(10):
+        trial = exp_storage.new_trial(
+            tunable_groups.copy().assign({"kernel_sched_latency_ns": 1000 * (i + 1)}))
+        if i % 2 == 0:
+            trial.update(Status.RUNNING, timestamp)
+            trial.update(Status.SUCCEEDED, timestamp, {"score": float(i)})
+
+
+def test_pending_trials_plan(storage: SqlStorage, exp_storage: SqlStorage.Experiment,
+                             tunable_groups: TunableGroups) -> None:
+    """
+    Make sure `pending_trials()` uses the indexes on the trial status.
+    """
+    _add_trials(exp_storage, tunable_groups)
+    plans = _query_plans(
+        storage, lambda: list(exp_storage.pending_trials(datetime.now(UTC), running=True)))
+    assert not _full_scans(plans)
+    assert any("trial_status_idx" in step for step in plans)
+
+
+def test_results_df_plan(storage: SqlStorage, exp_storage: SqlStorage.Experiment,
+                         tunable_groups: TunableGroups) -> None:
+    """
+    Make sure loading the results of the experiment does not scan the whole tables.
+    """
+    _add_trials(exp_storage, tunable_groups)
+    plans = _query_plans(storage, lambda: storage.experiments[exp_storage.experiment_id].results_df)
+    assert not _full_scans(plans)
+    assert any("trial_config_idx" in step for step in plans)
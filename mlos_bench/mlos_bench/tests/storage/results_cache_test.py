@@ -0,0 +1,135 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Unit tests for the incremental cache of the experiment results.
+"""
+import os
+from datetime import datetime, timedelta
+from typing import Any, List
+
+import pandas
+import pytest
+from pytz import UTC
+
+from mlos_bench.environments.status import Status
+from mlos_bench.storage.sql import common
+from mlos_bench.storage.sql.results_cache import ResultsCache
+from mlos_bench.storage.sql.storage import SqlStorage
+from mlos_bench.tunables.tunable_groups import TunableGroups
+
+try:
+    import pyarrow  # pylint: disable=unused-import
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# pylint: disable=protected-access
+
+
+def _new_trial(exp_storage: SqlStorage.Experiment, tunable_groups: TunableGroups,
+               i: int, status: Status) -> SqlStorage.Trial:
+    """
+    Add a new trial with a distinct config and (if succeeded) a score.
+    """
+    timestamp = datetime.now(UTC) + timedelta(seconds=i)
+    trial = exp_storage.new_trial(
+        tunable_groups.copy().assign({"kernel_sched_latency_ns": 1000 * (i + 1)}))
+    if status != Status.PENDING:
+        trial.update(Status.RUNNING, timestamp)
+    if status.is_completed():
+        trial.update(status, timestamp, {"score": float(i)} if status.is_succeeded() else None)
+    return trial
+
+
+def _full_results_df(storage: SqlStorage, exp_storage: SqlStorage.Experiment) -> pandas.DataFrame:
+    """
+    Load the results of the experiment bypassing the cache.
+    """
+    return common.get_results_df(storage._engine, storage._schema, exp_storage.experiment_id)
+
+
+def test_results_cache_incremental(storage: SqlStorage,
+                                   exp_storage: SqlStorage.Experiment,
+                                   tunable_groups: TunableGroups,
+                                   monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Make sure the cache fetches only the new and the incomplete trials,
+    and still matches the full query.
+    """
+    fetched: List[int] = []
+    get_results_df = common.get_results_df
+
+    def _get_results_df(*args: Any, **kwargs: Any) -> pandas.DataFrame:
+        results_df = get_results_df(*args, **kwargs)
+        fetched.append(len(results_df))
+        return results_df
+
+    monkeypatch.setattr(common, "get_results_df", _get_results_df)
+
+    exp_data = storage.experiments[exp_storage.experiment_id]
+    assert exp_data.results_df.empty
+
+    for i in range(5):
+        _new_trial(exp_storage, tunable_groups, i, Status.SUCCEEDED)
+    running = _new_trial(exp_storage, tunable_groups, 5, Status.RUNNING)
+    pending = _new_trial(exp_storage, tunable_groups, 6, Status.PENDING)
+
+    fetched.clear()
+    # Another lookup of the same experiment shares the cache.
+    results_df = storage.experiments[exp_storage.experiment_id].results_df
+    assert fetched == [7]
+    pandas.testing.assert_frame_equal(results_df, _full_results_df(storage, exp_storage))
+
+    # Nothing new: re-check the two incomplete trials only.
+    fetched.clear()
+    results_df = exp_data.results_df
+    assert fetched == [2]
+    assert len(results_df) == 7
+
+    # Complete the running trial and add one more.
+    running.update(Status.SUCCEEDED, datetime.now(UTC), {"score": 42.0})
+    _new_trial(exp_storage, tunable_groups, 7, Status.FAILED)
+    fetched.clear()
+    results_df = exp_data.results_df
+    assert fetched == [3]
+    pandas.testing.assert_frame_equal(results_df, _full_results_df(storage, exp_storage))
+    assert results_df.loc[results_df["trial_id"] == running.trial_id, "status"].item() == "SUCCEEDED"
+    assert results_df.loc[results_df["trial_id"] == pending.trial_id, "status"].item() == "PENDING"
+
+
+def test_results_cache_copy(storage: SqlStorage,
+                            exp_storage: SqlStorage.Experiment,
+                            tunable_groups: TunableGroups) -> None:
+    """
+    Changes to the returned DataFrame must not affect the cache.
+    """
+    _new_trial(exp_storage, tunable_groups, 0, Status.SUCCEEDED)
+    exp_data = storage.experiments[exp_storage.experiment_id]
+    results_df = exp_data.results_df
+    results_df.drop(columns=["status"], inplace=True)
+    assert "status" in exp_data.results_df.columns
+
+
+@pytest.mark.skipif(not HAS_PYARROW, reason="pyarrow is required to save the results as Parquet")
+def test_results_cache_persist(storage: SqlStorage,
+                               exp_storage: SqlStorage.Experiment,
+                               tunable_groups: TunableGroups,
+                               tmp_path: str) -> None:
+    """
+    Save the cached results to Parquet and load them in the next session.
+    """
+    for i in range(3):
+        _new_trial(exp_storage, tunable_groups, i, Status.SUCCEEDED)
+    cache = ResultsCache(engine=storage._engine, schema=storage._schema,
+                         experiment_id=exp_storage.experiment_id, cache_dir=tmp_path)
+    cache.get()
+    assert os.path.exists(cache._cache_path or "")
+
+    _new_trial(exp_storage, tunable_groups, 3, Status.SUCCEEDED)
+    new_cache = ResultsCache(engine=storage._engine, schema=storage._schema,
+                             experiment_id=exp_storage.experiment_id, cache_dir=tmp_path)
+    results_df = new_cache.get()
+    assert new_cache.watermark == 4
+    assert list(results_df["trial_id"]) == [1, 2, 3, 4]
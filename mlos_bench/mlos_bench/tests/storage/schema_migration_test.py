@@ -0,0 +1,228 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Unit tests for the DB schema versions and migrations.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from threading import Barrier
+from typing import Callable
+
+from pytz import UTC
+from sqlalchemy import inspect, select, text
+
+import pandas
+import pytest
+
+from mlos_bench.environments.status import Status
+from mlos_bench.storage.base_experiment_data import ExperimentData
+from mlos_bench.storage.sql import migrations
+from mlos_bench.storage.sql.storage import SqlStorage
+from mlos_bench.tunables.tunable_groups import TunableGroups
+
+
+def _save_trial(storage: SqlStorage, tunable_groups: TunableGroups) -> None:
+    """
+    Store one successful trial with a numeric and a string metric.
+    """
+    with storage.experiment(
+        experiment_id="Test-Migration",
+        trial_id=1,
+        root_env_config="environment.jsonc",
+        description="pytest experiment",
+        tunables=tunable_groups,
+        opt_targets={"score": "min"},
+    ) as exp:
+        timestamp = datetime.now(UTC)
+        trial = exp.new_trial(tunable_groups)
+        trial.update_telemetry(Status.RUNNING, timestamp, [(timestamp, "cpu_load", 10.5)])
+        trial.update(Status.SUCCEEDED, timestamp, {"score": 42.5, "setup": "prod"})
+
+
+def _check_results(storage: SqlStorage, tunable_groups: TunableGroups) -> None:
+    """
+    Make sure the results are read back as numbers, without coercion.
+    """
+    exp_data = storage.experiments["Test-Migration"]
+    results_df = exp_data.results_df
+    score_col = ExperimentData.RESULT_COLUMN_PREFIX + "score"
+    assert pandas.api.types.is_float_dtype(results_df[score_col])
+    assert results_df[score_col].iloc[0] == 42.5
+    assert results_df[ExperimentData.RESULT_COLUMN_PREFIX + "setup"].iloc[0] == "prod"
+    latency_col = ExperimentData.CONFIG_COLUMN_PREFIX + "kernel_sched_latency_ns"
+    assert pandas.api.types.is_integer_dtype(results_df[latency_col])
+    assert results_df[latency_col].iloc[0] == tunable_groups["kernel_sched_latency_ns"]
+    telemetry_df = exp_data.trials[1].telemetry_df
+    assert telemetry_df["value"].tolist() == [10.5]
+
+
+def test_numeric_columns(storage: SqlStorage, tunable_groups: TunableGroups) -> None:
+    """
+    Check that the numeric values are stored in the typed columns on write.
+    """
+    _save_trial(storage, tunable_groups)
+    # pylint: disable=protected-access
+    schema = storage._schema
+    with storage._engine.connect() as conn:
+        metrics = dict(conn.execute(select(
+            schema.trial_result.c.metric_id,
+            schema.trial_result.c.metric_value_num,
+        )).fetchall())
+    assert metrics == {"score": 42.5, "setup": None}
+    _check_results(storage, tunable_groups)
+
+
+def test_numeric_dtypes(storage: SqlStorage, tunable_groups: TunableGroups) -> None:
+    """
+    Check that the float metrics with integral values are not read back as ints.
+    """
+    with storage.experiment(
+        experiment_id="Test-Dtypes",
+        trial_id=1,
+        root_env_config="environment.jsonc",
+        description="pytest experiment",
+        tunables=tunable_groups,
+        opt_targets={"score": "min"},
+    ) as exp:
+        timestamp = datetime.now(UTC)
+        for score in [1.0, 2.0]:
+            trial = exp.new_trial(tunable_groups)
+            trial.update(Status.SUCCEEDED, timestamp, {"score": score, "count": 3})
+
+    exp_data = storage.experiments["Test-Dtypes"]
+    results_df = exp_data.results_df
+    score_col = ExperimentData.RESULT_COLUMN_PREFIX + "score"
+    assert pandas.api.types.is_float_dtype(results_df[score_col])
+    assert results_df[score_col].tolist() == [1.0, 2.0]
+    assert pandas.api.types.is_integer_dtype(results_df[ExperimentData.RESULT_COLUMN_PREFIX + "count"])
+    assert isinstance(exp_data.trials[1].results_dict["score"], float)
+    assert isinstance(exp_data.trials[1].results_dict["count"], int)
+
+
+def _make_legacy_db(make_storage: Callable[..., SqlStorage], tunable_groups: TunableGroups) -> None:
+    """
+    Create a database with one trial and roll it back
+    to the schema before the versioned migrations.
+    """
+    storage = make_storage()
+    _save_trial(storage, tunable_groups)
+    # pylint: disable=protected-access
+    with storage._engine.begin() as conn:
+        for (table, col) in [("config_param", "param_value_num"),
+                             ("trial_param", "param_value_num"),
+                             ("trial_result", "metric_value_num"),
+                             ("trial_telemetry", "metric_value_num"),
+                             ("trial", "worker_id"),
+                             ("trial", "ts_heartbeat")]:
+            conn.execute(text(f"ALTER TABLE {table} DROP COLUMN {col}"))
+        for index in storage._schema.trial.indexes:
+            conn.execute(text(f"DROP INDEX {index.name}"))
+        conn.execute(text("DROP TABLE trial_telemetry_rollup"))
+        conn.execute(text("DROP TABLE schema_version"))
+    storage._engine.dispose()
+
+
+def test_schema_migration(make_storage: Callable[..., SqlStorage], tunable_groups: TunableGroups) -> None:
+    """
+    Check that the existing database gets upgraded to the current schema version.
+    """
+    _make_legacy_db(make_storage, tunable_groups)
+
+    storage = make_storage()
+    # pylint: disable=protected-access
+    inspector = inspect(storage._engine)
+    assert "metric_value_num" in {col["name"] for col in inspector.get_columns("trial_result")}
+    assert {idx["name"] for idx in inspector.get_indexes("trial")} == \
+        {"trial_status_idx", "trial_config_idx"}
+    assert inspector.has_table("trial_telemetry_rollup")
+    assert {"worker_id", "ts_heartbeat"} <= {col["name"] for col in inspector.get_columns("trial")}
+    with storage._engine.connect() as conn:
+        versions = conn.execute(select(storage._schema.schema_version.c.version)).scalars().all()
+        assert migrations.get_version(storage._schema, conn) == migrations.SCHEMA_VERSION
+    assert sorted(versions) == list(range(2, migrations.SCHEMA_VERSION + 1))
+    _check_results(storage, tunable_groups)
+
+    # Nothing to upgrade the second time.
+    storage._engine.dispose()
+    storage = make_storage()
+    with storage._engine.connect() as conn:
+        assert len(conn.execute(select(storage._schema.schema_version)).fetchall()) == len(versions)
+
+
+def test_schema_migration_trial_lease(make_storage: Callable[..., SqlStorage], tunable_groups: TunableGroups) -> None:
+    """
+    Check that the trials can be claimed in the upgraded database.
+    """
+    _make_legacy_db(make_storage, tunable_groups)
+    storage = make_storage()
+    with storage.experiment(
+        experiment_id="Test-Migration",
+        trial_id=2,
+        root_env_config="environment.jsonc",
+        description="pytest experiment",
+        tunables=tunable_groups,
+        opt_targets={"score": "min"},
+    ) as exp:
+        timestamp = datetime.now(UTC)
+        trial = exp.new_trial(tunable_groups, ts_start=timestamp)
+        (pending,) = exp.pending_trials(timestamp, running=True)
+        assert pending.trial_id == trial.trial_id
+        assert exp.claim_trial(pending, worker_id="w1", timestamp=timestamp, lease_timeout=timedelta(minutes=1))
+        assert pending.heartbeat(timestamp)
+        pending.update(Status.SUCCEEDED, timestamp, {"score": 1.0})
+        assert exp.load()[0] == [1, 2]
+
+
+def test_schema_version_new(storage: SqlStorage) -> None:
+    """
+    Check that the new database gets the current schema version.
+    """
+    # pylint: disable=protected-access
+    with storage._engine.connect() as conn:
+        assert migrations.get_version(storage._schema, conn) == migrations.SCHEMA_VERSION
+
+
+def test_schema_version_unsupported(make_storage: Callable[..., SqlStorage]) -> None:
+    """
+    Check that we do not touch the databases created by the newer versions of mlos_bench.
+    """
+    storage = make_storage()
+    # pylint: disable=protected-access
+    with storage._engine.begin() as conn:
+        conn.execute(storage._schema.schema_version.insert().values(
+            version=migrations.SCHEMA_VERSION + 1,
+            description="Future schema",
+            ts_applied=datetime.now(UTC),
+        ))
+    storage._engine.dispose()
+    with pytest.raises(RuntimeError):
+        make_storage()
+
+
+@pytest.mark.parametrize("is_legacy", [False, True])
+def test_schema_create_concurrent(make_storage: Callable[..., SqlStorage], tunable_groups: TunableGroups,
+                                  is_legacy: bool) -> None:
+    """
+    Check that several workers can create (or upgrade) the schema of the same database at once.
+    """
+    if is_legacy:
+        _make_legacy_db(make_storage, tunable_groups)
+    num_workers = 4
+    storages = [make_storage(lazy_schema_create=True) for _ in range(num_workers)]
+    barrier = Barrier(num_workers)
+
+    def _create_schema(storage: SqlStorage) -> None:
+        barrier.wait()
+        assert storage._schema  # pylint: disable=protected-access
+
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        list(executor.map(_create_schema, storages))
+
+    # pylint: disable=protected-access
+    with storages[0]._engine.connect() as conn:
+        versions = conn.execute(select(storages[0]._schema.schema_version.c.version)).scalars().all()
+        assert migrations.get_version(storages[0]._schema, conn) == migrations.SCHEMA_VERSION
+    assert sorted(versions) == list(range(2 if is_legacy else migrations.SCHEMA_VERSION,
+                                          migrations.SCHEMA_VERSION + 1))
@@ -6,11 +6,14 @@
 Test fixtures for mlos_bench storage.
 """
 
+import os
+from contextlib import contextmanager
 from datetime import datetime
 from random import random, seed as rand_seed
-from typing import Generator, Optional
+from typing import Any, Callable, Generator, Iterator, List, Optional
 
 from pytz import UTC
+from sqlalchemy import event
 
 import pytest
 
@@ -21,7 +24,7 @@ from mlos_bench.optimizers.mock_optimizer import MockOptimizer
 from mlos_bench.tunables.tunable_groups import TunableGroups
 
 from mlos_bench.tests import SEED
-from mlos_bench.tests.storage import CONFIG_COUNT, CONFIG_TRIAL_REPEAT_COUNT
+from mlos_bench.tests.storage import CONFIG_COUNT, CONFIG_TRIAL_REPEAT_COUNT, StatementRecorder
 
 # pylint: disable=redefined-outer-name
 
@@ -41,6 +44,56 @@ def storage() -> SqlStorage:
     )
 
 
+@pytest.fixture
+def make_storage(tmp_path: str) -> Generator[Callable[..., SqlStorage], None, None]:
+    """
+    Test fixture to create (or reopen) the SQL storage in a file in the temp directory.
+    Takes the `drivername` (SQLite by default) and other storage config parameters.
+    Disposes the engines of all storages it created at teardown.
+    """
+    storages: List[SqlStorage] = []
+
+    def _make_storage(drivername: str = "sqlite", **kwargs: Any) -> SqlStorage:
+        sql_storage = SqlStorage(service=None, config={
+            "drivername": drivername,
+            "database": os.path.join(tmp_path, f"mlos_bench.{drivername}"),
+            **kwargs,
+        })
+        storages.append(sql_storage)
+        return sql_storage
+
+    yield _make_storage
+    for sql_storage in storages:
+        sql_storage._engine.dispose()  # pylint: disable=protected-access
+
+
+@contextmanager
+def _record_statements(sql_storage: SqlStorage) -> Iterator[List[str]]:
+    """
+    Collect the SQL statements executed by the storage within the context.
+    """
+    statements: List[str] = []
+
+    def _save_statement(_conn: Any, _cursor: Any, statement: str, *_args: Any) -> None:
+        statements.append(statement)
+
+    engine = sql_storage._engine  # pylint: disable=protected-access
+    event.listen(engine, "before_cursor_execute", _save_statement)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _save_statement)
+
+
+@pytest.fixture
+def record_statements() -> StatementRecorder:
+    """
+    Test fixture to collect the SQL statements the storage executes
+    within the context, e.g., to count the queries of an operation.
+    """
+    return _record_statements
+
+
 @pytest.fixture
 def exp_storage(
     storage: SqlStorage,
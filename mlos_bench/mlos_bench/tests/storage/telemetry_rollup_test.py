@@ -0,0 +1,161 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Unit tests for the time-bucketed rollups of the trial telemetry.
+"""
+from datetime import datetime, timedelta
+from typing import Any, Callable, List, Tuple
+
+import pandas
+import pytest
+from pytz import UTC
+from sqlalchemy import func, select
+
+from mlos_bench.environments.status import Status
+from mlos_bench.storage.base_trial_data import TrialData
+from mlos_bench.storage.sql.storage import SqlStorage
+from mlos_bench.tunables.tunable_groups import TunableGroups
+
+# pylint: disable=protected-access
+
+_TS_START = datetime(2024, 1, 1, 12, 0, 0, tzinfo=UTC)
+
+
+def _make_experiment(storage: SqlStorage, tunable_groups: TunableGroups) -> SqlStorage.Experiment:
+    """
+    Create a new experiment (already in context) to store the telemetry in.
+    """
+    return storage.experiment(
+        experiment_id="Test-Rollup",
+        trial_id=1,
+        root_env_config="environment.jsonc",
+        description="pytest telemetry rollup experiment",
+        tunables=tunable_groups,
+        opt_targets={"score": "min"},
+    ).__enter__()
+
+
+def _telemetry(start: int, stop: int) -> List[Tuple[datetime, str, Any]]:
+    """
+    Mock telemetry: one numeric and one string metric every 10 seconds.
+    """
+    return [
+        record
+        for sec in range(start, stop, 10)
+        for record in [
+            (_TS_START + timedelta(seconds=sec), "cpu_load", float(sec % 70)),
+            (_TS_START + timedelta(seconds=sec), "setup", "prod"),
+        ]
+    ]
+
+
+def _count_rows(storage: SqlStorage, table_name: str) -> int:
+    """
+    Count the records in the DB table.
+    """
+    with storage._engine.connect() as conn:
+        return int(conn.execute(select(func.count()).select_from(
+            storage._schema._meta.tables[table_name])).scalar_one())
+
+
+@pytest.mark.parametrize("write_behind", [False, True])
+def test_telemetry_rollup(make_storage: Callable[..., SqlStorage], tunable_groups: TunableGroups,
+                          write_behind: bool) -> None:
+    """
+    Maintain the rollups at ingest time and serve the downsampled telemetry from them.
+    """
+    storage = make_storage(telemetry_rollups=[60, 600], write_behind=write_behind)
+    exp = _make_experiment(storage, tunable_groups)
+    trial = exp.new_trial(tunable_groups)
+    # 20 minutes of telemetry in overlapping batches (the overlaps are skipped).
+    for (start, stop) in [(0, 300), (290, 700), (700, 1200), (1100, 1200)]:
+        trial.update_telemetry(Status.RUNNING, _TS_START + timedelta(seconds=stop), _telemetry(start, stop))
+
+    trial_data = storage.experiments[exp.experiment_id].trials[trial.trial_id]
+    # Only the numeric metric is rolled up: 20 + 2 buckets.
+    assert _count_rows(storage, "trial_telemetry_rollup") == 22
+    for resolution in (60, 120, 600, 90):
+        rollup_df = trial_data.telemetry_rollup_df(resolution)
+        # Compare with the aggregation of the raw telemetry.
+        pandas.testing.assert_frame_equal(
+            rollup_df, TrialData.telemetry_rollup_df(trial_data, resolution), check_dtype=False)
+    rollup_df = trial_data.telemetry_rollup_df(600)
+    assert rollup_df["ts"].tolist() == [_TS_START, _TS_START + timedelta(minutes=10)]
+    assert rollup_df["count"].tolist() == [60, 60]
+    assert rollup_df["metric"].unique().tolist() == ["cpu_load"]
+    assert rollup_df["last"].tolist() == [590 % 70, 1190 % 70]
+
+    with pytest.raises(ValueError):
+        trial_data.telemetry_rollup_df(0)
+
+
+def test_telemetry_rollup_resume(make_storage: Callable[..., SqlStorage], tunable_groups: TunableGroups) -> None:
+    """
+    Continue the open buckets of the trial in another storage session.
+    """
+    storage = make_storage(telemetry_rollups=[60])
+    exp = _make_experiment(storage, tunable_groups)
+    trial = exp.new_trial(tunable_groups)
+    trial.update_telemetry(Status.RUNNING, _TS_START, _telemetry(0, 90))
+    storage._engine.dispose()
+
+    storage = make_storage(telemetry_rollups=[60])
+    exp = _make_experiment(storage, tunable_groups)
+    (trial,) = exp.pending_trials(datetime.now(UTC), running=True)
+    # Re-send the last record, then more.
+    trial.update_telemetry(Status.RUNNING, _TS_START, _telemetry(80, 180))
+    trial_data = storage.experiments[exp.experiment_id].trials[trial.trial_id]
+    rollup_df = trial_data.telemetry_rollup_df(60)
+    assert rollup_df["count"].tolist() == [6, 6, 6]
+    pandas.testing.assert_frame_equal(
+        rollup_df, TrialData.telemetry_rollup_df(trial_data, 60), check_dtype=False)
+
+
+def test_telemetry_retention(make_storage: Callable[..., SqlStorage], tunable_groups: TunableGroups) -> None:
+    """
+    Prune the raw telemetry of the completed trials after the retention period.
+    """
+    storage = make_storage(telemetry_rollups=[60], telemetry_retention=300)
+    exp = _make_experiment(storage, tunable_groups)
+    (trial_done, trial_running) = exp.new_trials([tunable_groups, tunable_groups])
+    trial_done.update_telemetry(Status.RUNNING, _TS_START, _telemetry(0, 600))
+    trial_running.update_telemetry(Status.RUNNING, _TS_START, _telemetry(0, 600))
+    exp_data = storage.experiments[exp.experiment_id]
+    expected_df = exp_data.trials[trial_done.trial_id].telemetry_rollup_df(60)
+
+    trial_done.update(Status.SUCCEEDED, _TS_START + timedelta(seconds=600), {"score": 1.0})
+    trial_data = storage.experiments[exp.experiment_id].trials[trial_done.trial_id]
+    # Only the last 5 minutes of the raw telemetry are kept.
+    telemetry_df = trial_data.telemetry_df
+    cpu_load_df = telemetry_df[telemetry_df["metric"] == "cpu_load"]
+    assert cpu_load_df["ts"].min() == _TS_START + timedelta(seconds=300)
+    # The string metric has no rollups, so all of its records are kept.
+    assert (telemetry_df["metric"] == "setup").sum() == 60
+    pandas.testing.assert_frame_equal(trial_data.telemetry_rollup_df(60), expected_df)
+    # The running trial is not affected.
+    assert len(exp_data.trials[trial_running.trial_id].telemetry_df) == 120
+
+
+
+def test_telemetry_retention_no_rollups(make_storage: Callable[..., SqlStorage],
+                                        tunable_groups: TunableGroups) -> None:
+    """
+    Do not prune the numeric metrics of the trial that have not been rolled up.
+    """
+    exp = _make_experiment(make_storage(), tunable_groups)
+    trial = exp.new_trial(tunable_groups, ts_start=_TS_START)
+    # Telemetry saved before the rollups were enabled.
+    trial.update_telemetry(Status.RUNNING, _TS_START, [
+        (_TS_START + timedelta(seconds=sec), "mem_load", float(sec)) for sec in range(0, 600, 10)
+    ])
+
+    storage = make_storage(telemetry_rollups=[60], telemetry_retention=300)
+    exp = _make_experiment(storage, tunable_groups)
+    (trial,) = exp.pending_trials(_TS_START + timedelta(seconds=600), running=True)
+    trial.update_telemetry(Status.RUNNING, _TS_START, _telemetry(0, 600))
+    trial.update(Status.SUCCEEDED, _TS_START + timedelta(seconds=600), {"score": 1.0})
+
+    telemetry_df = storage.experiments[exp.experiment_id].trials[trial.trial_id].telemetry_df
+    assert telemetry_df.groupby("metric")["ts"].count().to_dict() == {"cpu_load": 30, "mem_load": 60, "setup": 60}
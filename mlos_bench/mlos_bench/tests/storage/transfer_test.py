@@ -0,0 +1,190 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Unit tests for the bulk export and import of the experiment data.
+"""
+import json
+import os
+import sys
+from typing import Dict
+
+import pandas
+import pytest
+
+from mlos_bench.storage.sql.storage import SqlStorage
+from mlos_bench.tunables.tunable_groups import TunableGroups
+from mlos_bench.storage_cli import _main as storage_cli_main
+
+from mlos_bench.tests.storage import CONFIG_COUNT, CONFIG_TRIAL_REPEAT_COUNT
+
+try:
+    import pyarrow  # pylint: disable=unused-import
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# pylint: disable=protected-access
+
+
+def _sqlite_config(tmp_path: str, name: str) -> Dict[str, str]:
+    """
+    Config of the file-based SQLite storage in the temp directory.
+    """
+    return {
+        "drivername": "sqlite",
+        "database": os.path.join(tmp_path, name),
+    }
+
+
+def _check_same_experiment(src: SqlStorage, dst: SqlStorage, experiment_id: str) -> None:
+    """
+    Make sure the experiment data is the same in both storages.
+    """
+    src_exp = src.experiments[experiment_id]
+    dst_exp = dst.experiments[experiment_id]
+    assert dst_exp.description == src_exp.description
+    assert dst_exp.objectives == src_exp.objectives
+    pandas.testing.assert_frame_equal(dst_exp.results_df, src_exp.results_df)
+    for (trial_id, src_trial) in src_exp.trials.items():
+        dst_trial = dst_exp.trials[trial_id]
+        assert dst_trial.metadata_dict == src_trial.metadata_dict
+        assert dst_trial.tunable_config.config_dict == src_trial.tunable_config.config_dict
+        pandas.testing.assert_frame_equal(dst_trial.telemetry_df, src_trial.telemetry_df)
+
+
+@pytest.mark.parametrize("fmt", [
+    "csv",
+    pytest.param("parquet", marks=pytest.mark.skipif(not HAS_PYARROW, reason="requires pyarrow")),
+    pytest.param("arrow", marks=pytest.mark.skipif(not HAS_PYARROW, reason="requires pyarrow")),
+])
+def test_export_import(storage: SqlStorage,
+                       exp_storage_with_trials: SqlStorage.Experiment,
+                       tmp_path: str, fmt: str) -> None:
+    """
+    Export the experiment and load it into another storage.
+    """
+    experiment_id = exp_storage_with_trials.experiment_id
+    trial_count = CONFIG_COUNT * CONFIG_TRIAL_REPEAT_COUNT
+    export_path = os.path.join(tmp_path, "export")
+    manifest = storage.export_experiment(experiment_id, export_path, fmt=fmt, chunk_size=7)  # type: ignore[arg-type]
+    assert manifest["experiment_id"] == experiment_id
+    # Partitioned files: 30 trials in 7-row chunks.
+    assert [part["rows"] for part in manifest["tables"]["trial"]] == [7, 7, 7, 7, 2]
+    assert sum(part["rows"] for part in manifest["tables"]["trial_telemetry"]) == trial_count
+    assert os.path.exists(os.path.join(export_path, manifest["tables"]["trial_telemetry"][0]["file"]))
+
+    dst_storage = SqlStorage(service=None, config=_sqlite_config(tmp_path, "dst.sqlite"))
+    assert dst_storage.import_experiment(export_path) == experiment_id
+    _check_same_experiment(storage, dst_storage, experiment_id)
+
+    # Cannot import the same experiment twice.
+    with pytest.raises(ValueError):
+        dst_storage.import_experiment(export_path)
+
+
+def test_import_reuse_configs(storage: SqlStorage,
+                              exp_storage_with_trials: SqlStorage.Experiment,
+                              tmp_path: str) -> None:
+    """
+    Importing into a storage with the same configs should reuse them.
+    """
+    experiment_id = exp_storage_with_trials.experiment_id
+    export_path = os.path.join(tmp_path, "export")
+    storage.export_experiment(experiment_id, export_path, fmt="csv")
+
+    # Rename the experiment in the exported files and load it back into the same storage.
+    manifest_path = os.path.join(export_path, "manifest.json")
+    with open(manifest_path, encoding="utf-8") as fh_manifest:
+        manifest = json.load(fh_manifest)
+    manifest["experiment_id"] = "Test-Imported"
+    with open(manifest_path, "w", encoding="utf-8") as fh_manifest:
+        json.dump(manifest, fh_manifest)
+    for table_name in ("experiment", "objectives", "trial", "trial_param",
+                       "trial_status", "trial_result", "trial_telemetry"):
+        for part in manifest["tables"][table_name]:
+            file_path = os.path.join(export_path, part["file"])
+            df = pandas.read_csv(file_path, dtype=str, keep_default_na=False)
+            df["exp_id"] = "Test-Imported"
+            df.to_csv(file_path, index=False)
+
+    with storage._engine.connect() as conn:
+        config_count = len(conn.execute(storage._schema.config.select()).fetchall())
+    assert storage.import_experiment(export_path) == "Test-Imported"
+    with storage._engine.connect() as conn:
+        assert len(conn.execute(storage._schema.config.select()).fetchall()) == config_count
+
+    src_df = storage.experiments[experiment_id].results_df
+    dst_df = storage.experiments["Test-Imported"].results_df
+    pandas.testing.assert_frame_equal(dst_df, src_df)
+
+
+def test_export_import_csv_empty_strings(storage: SqlStorage,
+                                         exp_storage_with_trials: SqlStorage.Experiment,
+                                         tunable_groups: TunableGroups,
+                                         tmp_path: str) -> None:
+    """
+    Empty strings and NULLs should survive the round trip through the CSV files.
+    """
+    experiment_id = exp_storage_with_trials.experiment_id
+    # A pending trial has NULL `ts_end`, and an empty string in its config.
+    trial = exp_storage_with_trials.new_trial(tunable_groups, config={"user": ""})
+    export_path = os.path.join(tmp_path, "export")
+    storage.export_experiment(experiment_id, export_path, fmt="csv")
+
+    dst_storage = SqlStorage(service=None, config=_sqlite_config(tmp_path, "dst.sqlite"))
+    dst_storage.import_experiment(export_path)
+    _check_same_experiment(storage, dst_storage, experiment_id)
+    dst_trial = dst_storage.experiments[experiment_id].trials[trial.trial_id]
+    assert dst_trial.metadata_dict["user"] == ""
+    assert dst_trial.ts_end is None
+
+
+def test_export_no_pyarrow(storage: SqlStorage,
+                           exp_storage_with_trials: SqlStorage.Experiment,
+                           tmp_path: str,
+                           monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Exporting to Parquet without pyarrow should fail with a clear error.
+    """
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    with pytest.raises(ImportError, match=r"mlos-bench\[pyarrow\]"):
+        storage.export_experiment(exp_storage_with_trials.experiment_id, str(tmp_path), fmt="parquet")
+
+
+def test_export_missing_experiment(storage: SqlStorage, tmp_path: str) -> None:
+    """
+    Exporting an unknown experiment is an error.
+    """
+    with pytest.raises(ValueError):
+        storage.export_experiment("no-such-experiment", str(tmp_path), fmt="csv")
+
+
+def test_storage_cli(storage: SqlStorage,
+                     exp_storage_with_trials: SqlStorage.Experiment,
+                     tmp_path: str) -> None:
+    """
+    Move the experiment from SQLite to DuckDB with the command line tool.
+    """
+    pytest.importorskip("duckdb_engine")
+    experiment_id = exp_storage_with_trials.experiment_id
+    storage_configs: Dict[str, str] = {}
+    for (name, config) in {
+        "sqlite": _sqlite_config(tmp_path, "src.sqlite"),
+        "duckdb": {"drivername": "duckdb", "database": os.path.join(tmp_path, "dst.duckdb")},
+    }.items():
+        storage_configs[name] = os.path.join(tmp_path, f"{name}.jsonc")
+        with open(storage_configs[name], "w", encoding="utf-8") as fh_config:
+            json.dump({"class": "mlos_bench.storage.sql.storage.SqlStorage", "config": config}, fh_config)
+
+    # The in-memory storage of the fixture is not visible to the CLI, so start from the files.
+    storage.export_experiment(experiment_id, os.path.join(tmp_path, "export-1"), fmt="csv")
+    storage_cli_main(["--storage", storage_configs["sqlite"], "import", os.path.join(tmp_path, "export-1")])
+    storage_cli_main(["--storage", storage_configs["sqlite"], "export", "--experiment-id", experiment_id,
+                      "--format", "csv", os.path.join(tmp_path, "export-2")])
+    storage_cli_main(["--storage", storage_configs["duckdb"], "import", os.path.join(tmp_path, "export-2")])
+
+    dst_storage = SqlStorage(service=None, config={
+        "drivername": "duckdb", "database": os.path.join(tmp_path, "dst.duckdb")})
+    _check_same_experiment(storage, dst_storage, experiment_id)
@@ -0,0 +1,117 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Unit tests for claiming the trials by several workers sharing the same storage.
+"""
+from datetime import datetime, timedelta
+
+from pytz import UTC
+
+from mlos_bench.environments.status import Status
+from mlos_bench.storage.base_storage import Storage
+from mlos_bench.tunables.tunable_groups import TunableGroups
+
+LEASE = timedelta(minutes=10)
+
+
+def test_claim_trial_once(exp_storage: Storage.Experiment,
+                          tunable_groups: TunableGroups) -> None:
+    """
+    Only one worker can claim a pending trial.
+    """
+    trial = exp_storage.new_trial(tunable_groups)
+    timestamp = datetime.now(UTC)
+    (trial_w1, trial_w2) = [
+        t for _ in range(2)
+        for t in exp_storage.pending_trials(timestamp, running=False)
+    ]
+    assert exp_storage.claim_trial(trial_w1, worker_id="w1", timestamp=timestamp, lease_timeout=LEASE)
+    assert trial_w1.worker_id == "w1"
+    assert not exp_storage.claim_trial(trial_w2, worker_id="w2", timestamp=timestamp, lease_timeout=LEASE)
+    assert trial_w2.worker_id is None
+
+    # The claimed trial is no longer pending but is still running.
+    assert not list(exp_storage.pending_trials(timestamp, running=False))
+    assert [t.trial_id for t in exp_storage.pending_trials(timestamp, running=True)] == [trial.trial_id]
+
+    # Completed trials cannot be claimed.
+    trial_w1.update(Status.SUCCEEDED, timestamp + timedelta(minutes=1), {"score": 42.0})
+    assert not exp_storage.claim_trial(trial_w2, worker_id="w2",
+                                       timestamp=timestamp + LEASE * 2, lease_timeout=LEASE)
+    assert not trial_w1.heartbeat(timestamp + timedelta(minutes=2))
+
+
+def test_claim_trial_lease_expired(exp_storage: Storage.Experiment,
+                                   tunable_groups: TunableGroups) -> None:
+    """
+    A running trial can be claimed by another worker after its lease expires.
+    """
+    exp_storage.new_trial(tunable_groups)
+    timestamp = datetime.now(UTC)
+    (trial_w1, trial_w2) = [
+        t for _ in range(2)
+        for t in exp_storage.pending_trials(timestamp, running=False)
+    ]
+    assert exp_storage.claim_trial(trial_w1, worker_id="w1", timestamp=timestamp, lease_timeout=LEASE)
+
+    # Heartbeat keeps the lease alive.
+    assert trial_w1.heartbeat(timestamp + LEASE / 2)
+    assert not exp_storage.claim_trial(trial_w2, worker_id="w2",
+                                       timestamp=timestamp + LEASE, lease_timeout=LEASE)
+
+    # No heartbeat for too long: another worker takes over.
+    assert exp_storage.claim_trial(trial_w2, worker_id="w2",
+                                   timestamp=timestamp + LEASE * 2, lease_timeout=LEASE)
+    assert not trial_w1.heartbeat(timestamp + LEASE * 2)
+    assert trial_w2.heartbeat(timestamp + LEASE * 2)
+
+
+def test_claim_trial_stale_results(exp_storage: Storage.Experiment,
+                                   tunable_groups: TunableGroups) -> None:
+    """
+    A worker that has lost the lease cannot complete the trial:
+    its results are dropped instead.
+    """
+    exp_storage.new_trial(tunable_groups)
+    timestamp = datetime.now(UTC)
+    (trial_w1, trial_w2) = [
+        t for _ in range(2)
+        for t in exp_storage.pending_trials(timestamp, running=False)
+    ]
+    assert exp_storage.claim_trial(trial_w1, worker_id="w1", timestamp=timestamp, lease_timeout=LEASE)
+    assert exp_storage.claim_trial(trial_w2, worker_id="w2",
+                                   timestamp=timestamp + LEASE * 2, lease_timeout=LEASE)
+
+    # Both workers finish the trial; only the results of the lease holder are saved.
+    assert trial_w1.update(Status.SUCCEEDED, timestamp + LEASE * 3, {"score": 1.0}) is None
+    assert [t.trial_id for t in exp_storage.pending_trials(timestamp + LEASE * 3, running=True)] == [trial_w2.trial_id]
+    trial_w2.update(Status.SUCCEEDED, timestamp + LEASE * 4, {"score": 2.0})
+    assert trial_w1.update(Status.SUCCEEDED, timestamp + LEASE * 5, {"score": 3.0}) is None
+    (_trial_ids, _configs, scores, status) = exp_storage.load()
+    assert scores == [{"score": "2.0"}]
+    assert status == [Status.SUCCEEDED]
+
+
+def test_claim_trial_no_lease(exp_storage: Storage.Experiment,
+                              tunable_groups: TunableGroups) -> None:
+    """
+    A trial started without a lease (e.g., by a scheduler that does not claim
+    its trials) can be claimed once it runs for longer than the lease timeout,
+    and a duplicate status record does not undo the claim of a pending trial.
+    """
+    timestamp = datetime.now(UTC)
+    trial = exp_storage.new_trial(tunable_groups, ts_start=timestamp)
+    trial.update(Status.RUNNING, timestamp)
+    assert not exp_storage.claim_trial(trial, worker_id="w1",
+                                       timestamp=timestamp + LEASE / 2, lease_timeout=LEASE)
+    assert exp_storage.claim_trial(trial, worker_id="w1",
+                                   timestamp=timestamp + LEASE * 2, lease_timeout=LEASE)
+    assert trial.worker_id == "w1"
+    assert trial.heartbeat(timestamp + LEASE * 3)
+
+    trial = exp_storage.new_trial(tunable_groups, ts_start=timestamp)
+    trial.update(Status.PENDING, timestamp)
+    assert exp_storage.claim_trial(trial, worker_id="w1", timestamp=timestamp, lease_timeout=LEASE)
+    assert trial.heartbeat(timestamp + LEASE / 2)
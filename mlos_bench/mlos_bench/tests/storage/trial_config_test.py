@@ -5,13 +5,18 @@
 """
 Unit tests for saving and retrieving additional parameters of pending trials.
 """
+import hashlib
+import re
 from datetime import datetime
 
 from pytz import UTC
 
 from mlos_bench.storage.base_storage import Storage
+from mlos_bench.storage.sql.storage import SqlStorage
 from mlos_bench.tunables.tunable_groups import TunableGroups
 
+from mlos_bench.tests.storage import StatementRecorder
+
 
 def test_exp_trial_pending(exp_storage: Storage.Experiment,
                            tunable_groups: TunableGroups) -> None:
@@ -66,6 +71,44 @@ def test_exp_trial_configs(exp_storage: Storage.Experiment,
     assert set(pending_ids) == {trials1[0].tunable_config_id, trials2[0].tunable_config_id}
 
 
+def test_exp_trial_config_cache(storage: SqlStorage,
+                                exp_storage: SqlStorage.Experiment,
+                                tunable_groups: TunableGroups,
+                                record_statements: StatementRecorder) -> None:
+    """
+    Make sure the repeated configs do not query the DB for their config IDs.
+    """
+    config1 = tunable_groups.copy().assign({'idle': 'mwait'})
+    config2 = tunable_groups.copy().assign({'idle': 'halt'})
+    trial1 = exp_storage.new_trial(config1)
+    trial2 = exp_storage.new_trial(config2)
+
+    with record_statements(storage) as statements:
+        trials = exp_storage.new_trials([config1.copy(), config2.copy(), config1])
+
+    assert [trial.tunable_config_id for trial in trials] == [
+        trial1.tunable_config_id, trial2.tunable_config_id, trial1.tunable_config_id,
+    ]
+    # Only the new trials are inserted; no lookups or inserts in the `config` table.
+    assert statements
+    assert not [stmt for stmt in statements if re.search(r"\bconfig\b", stmt)]
+
+
+def test_exp_trial_config_legacy_hash(storage: SqlStorage,
+                                      exp_storage: SqlStorage.Experiment,
+                                      tunable_groups: TunableGroups) -> None:
+    """
+    Make sure we find the configs saved with the hashes of the earlier mlos_bench versions.
+    """
+    # pylint: disable=protected-access
+    legacy_hash = hashlib.sha256(str(tunable_groups).encode('utf-8')).hexdigest()
+    with storage._engine.begin() as conn:
+        config_id = conn.execute(storage._schema.config.insert().values(
+            config_hash=legacy_hash)).inserted_primary_key[0]
+    trial = exp_storage.new_trial(tunable_groups)
+    assert trial.tunable_config_id == config_id
+
+
 def test_exp_trial_no_config(exp_no_tunables_storage: Storage.Experiment) -> None:
     """
     Schedule a trial that has an empty tunable groups config.
@@ -13,8 +13,11 @@ from pytz import UTC
 
 from mlos_bench.environments.status import Status
 from mlos_bench.storage.base_storage import Storage
+from mlos_bench.storage.sql.storage import SqlStorage
 from mlos_bench.tunables.tunable_groups import TunableGroups
 
+from mlos_bench.tests.storage import StatementRecorder
+
 
 def _trial_ids(trials: Iterator[Storage.Trial]) -> Set[int]:
     """
@@ -119,3 +122,50 @@ def test_schedule_trial(exp_storage: Storage.Experiment,
     assert trial_ids == [trial_1h.trial_id]
     assert len(trial_configs) == len(trial_scores) == 1
     assert trial_status == [Status.SUCCEEDED]
+
+
+def test_schedule_trials_batch(exp_storage: Storage.Experiment,
+                               tunable_groups: TunableGroups) -> None:
+    """
+    Schedule a batch of trials at once and make sure they all get consecutive IDs.
+    """
+    timestamp = datetime.now(UTC)
+    tunables_other = tunable_groups.copy().assign({"kernel_sched_migration_cost_ns": 40000})
+    trials = exp_storage.new_trials(
+        [tunable_groups, tunable_groups, tunables_other],
+        configs=[{"repeat_i": 1}, {"repeat_i": 2}, None])
+    assert [trial.trial_id for trial in trials] == list(range(trials[0].trial_id, trials[0].trial_id + 3))
+    # Same tunables share the same config ID.
+    assert trials[0].tunable_config_id == trials[1].tunable_config_id != trials[2].tunable_config_id
+    assert trials[1].config()["repeat_i"] == 2
+    assert _trial_ids(exp_storage.pending_trials(timestamp + timedelta(minutes=1), running=False)) == \
+        {trial.trial_id for trial in trials}
+    # The next trial continues the sequence.
+    assert exp_storage.new_trial(tunable_groups).trial_id == trials[-1].trial_id + 1
+
+
+def test_pending_trials_limit(storage: SqlStorage, exp_storage: Storage.Experiment,
+                              tunable_groups: TunableGroups, record_statements: StatementRecorder) -> None:
+    """
+    Retrieve the pending trials in small batches, and make sure they are
+    loaded in bulk before the caller starts iterating over them.
+    """
+    timestamp = datetime.now(UTC)
+    tunables_other = tunable_groups.copy().assign({"kernel_sched_migration_cost_ns": 40000})
+    trials = exp_storage.new_trials(
+        [tunable_groups, tunables_other, tunable_groups, tunables_other],
+        configs=[{"repeat_i": i} for i in range(4)])
+
+    with record_statements(storage) as statements:
+        for limit in (None, 2):
+            statements.clear()
+            pending = exp_storage.pending_trials(timestamp + timedelta(minutes=1), running=False, limit=limit)
+            num_statements = len(statements)
+            assert num_statements <= 3
+            pending_trials = list(pending)
+            # No more queries while iterating.
+            assert len(statements) == num_statements
+            assert [trial.trial_id for trial in pending_trials] == [trial.trial_id for trial in trials[:limit]]
+            for (i, trial) in enumerate(pending_trials):
+                assert trial.config()["repeat_i"] == str(i)
+                assert trial.tunables.get_param_values() == trials[i].tunables.get_param_values()
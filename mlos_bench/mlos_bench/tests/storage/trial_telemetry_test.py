@@ -15,9 +15,12 @@ import pytest
 from mlos_bench.environments.status import Status
 from mlos_bench.tunables.tunable_groups import TunableGroups
 from mlos_bench.storage.base_storage import Storage
+from mlos_bench.storage.sql import trial as sql_trial
+from mlos_bench.storage.sql.storage import SqlStorage
 from mlos_bench.util import nullable
 
 from mlos_bench.tests import ZONE_INFO
+from mlos_bench.tests.storage import StatementRecorder
 
 # pylint: disable=redefined-outer-name
 
@@ -88,3 +91,46 @@ def test_update_telemetry_twice(exp_storage: Storage.Experiment,
     trial.update_telemetry(Status.RUNNING, timestamp, telemetry_data)
     trial.update_telemetry(Status.RUNNING, timestamp, telemetry_data)
     assert exp_storage.load_telemetry(trial.trial_id) == _telemetry_str(telemetry_data)
+
+
+def test_update_telemetry_incremental(storage: SqlStorage,
+                                      exp_storage: Storage.Experiment,
+                                      tunable_groups: TunableGroups,
+                                      record_statements: StatementRecorder) -> None:
+    """
+    Save the cumulative telemetry in bulk, skipping the records already stored.
+    """
+    telemetry_data = zoned_telemetry_data(UTC)
+    trial = exp_storage.new_trial(tunable_groups)
+    timestamp = datetime.now(UTC)
+
+    with record_statements(storage) as statements:
+        trial.update_telemetry(Status.RUNNING, timestamp, telemetry_data[:2])
+        trial.update_telemetry(Status.RUNNING, timestamp, telemetry_data)
+        trial.update_telemetry(Status.RUNNING, timestamp, telemetry_data)
+    # One (bulk) insert per call: only the records at or after the high-water mark.
+    inserts = [stmt for stmt in statements if "INSERT" in stmt and "trial_telemetry" in stmt]
+    assert len(inserts) == 3
+    assert exp_storage.load_telemetry(trial.trial_id) == _telemetry_str(telemetry_data)
+
+    # A new object for the same trial does not know what has been stored already.
+    (pending,) = exp_storage.pending_trials(datetime.now(UTC), running=True)
+    pending.update_telemetry(Status.RUNNING, timestamp, telemetry_data)
+    assert exp_storage.load_telemetry(trial.trial_id) == _telemetry_str(telemetry_data)
+
+
+def test_update_telemetry_no_upsert(exp_storage: Storage.Experiment,
+                                    tunable_groups: TunableGroups,
+                                    monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Make sure update_telemetry() is idempotent even if the database
+    does not support the insert-or-ignore statements.
+    """
+    monkeypatch.setattr(sql_trial, "insert_ignore", lambda _engine, _table: None)
+    telemetry_data = zoned_telemetry_data(UTC)
+    trial = exp_storage.new_trial(tunable_groups)
+    timestamp = datetime.now(UTC)
+    trial.update_telemetry(Status.RUNNING, timestamp, telemetry_data)
+    (pending,) = exp_storage.pending_trials(datetime.now(UTC), running=True)
+    pending.update_telemetry(Status.RUNNING, timestamp, telemetry_data)
+    assert exp_storage.load_telemetry(trial.trial_id) == _telemetry_str(telemetry_data)
@@ -0,0 +1,164 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+"""
+Unit tests for the write-behind mode of the SQL storage.
+"""
+import os
+from datetime import datetime, timedelta
+from typing import Any, List
+
+import pytest
+from pytz import UTC
+from sqlalchemy import event, func, select
+
+from mlos_bench.environments.status import Status
+from mlos_bench.storage.sql.storage import SqlStorage
+from mlos_bench.storage.sql.writer import StorageWriter
+from mlos_bench.tunables.tunable_groups import TunableGroups
+
+# pylint: disable=redefined-outer-name,protected-access
+
+
+@pytest.fixture
+def wb_storage(tmp_path: str) -> SqlStorage:
+    """
+    SQLite storage with the write-behind enabled and a long batching interval.
+    """
+    return SqlStorage(service=None, config={
+        "drivername": "sqlite",
+        "database": os.path.join(tmp_path, "mlos_bench.sqlite"),
+        "write_behind": True,
+        "write_behind_interval": 60,
+    })
+
+
+def _count_rows(storage: SqlStorage, table_name: str) -> int:
+    """
+    Count the records in the table, bypassing the write-behind queue.
+    """
+    table = storage._schema._meta.tables[table_name]
+    with storage._engine.connect() as conn:
+        return int(conn.execute(select(func.count()).select_from(table)).scalar_one())
+
+
+def test_write_behind_flush_on_exit(wb_storage: SqlStorage, tunable_groups: TunableGroups) -> None:
+    """
+    Make sure the queued writes are saved when the experiment context is closed.
+    """
+    timestamp = datetime.now(UTC)
+    with wb_storage.experiment(
+        experiment_id="Test-WriteBehind",
+        trial_id=1,
+        root_env_config="environment.jsonc",
+        description="pytest experiment",
+        tunables=tunable_groups,
+        opt_targets={"score": "min"},
+    ) as exp:
+        trial = exp.new_trial(tunable_groups, config={"trial_number": 1})
+        trial.update(Status.RUNNING, timestamp)
+        trial.update_telemetry(Status.RUNNING, timestamp + timedelta(seconds=1),
+                               [(timestamp, "cpu_load", 10.5)])
+        trial.update(Status.SUCCEEDED, timestamp + timedelta(seconds=2), {"score": 42.5})
+        # The results and the trial configs are saved synchronously; the rest is still in the queue.
+        assert _count_rows(wb_storage, "trial_result") == 1
+        assert _count_rows(wb_storage, "trial_param") == 1
+        assert _count_rows(wb_storage, "trial_status") == 0
+        assert _count_rows(wb_storage, "trial_telemetry") == 0
+
+    assert _count_rows(wb_storage, "trial_status") == 3
+    assert _count_rows(wb_storage, "trial_telemetry") == 1
+
+
+def test_write_behind_read_own_writes(wb_storage: SqlStorage, tunable_groups: TunableGroups) -> None:
+    """
+    Make sure the storage reads see the writes that are still in the queue.
+    """
+    timestamp = datetime.now(UTC)
+    with wb_storage.experiment(
+        experiment_id="Test-WriteBehind",
+        trial_id=1,
+        root_env_config="environment.jsonc",
+        description="pytest experiment",
+        tunables=tunable_groups,
+        opt_targets={"score": "min"},
+    ) as exp:
+        trial = exp.new_trial(tunable_groups, config={"trial_number": 1})
+        (pending,) = exp.pending_trials(datetime.now(UTC), running=False)
+        assert pending.config()["trial_number"] == "1"
+
+        trial.update_telemetry(Status.RUNNING, timestamp, [(timestamp, "cpu_load", 10.5)])
+        assert exp.load_telemetry(trial.trial_id) == [(timestamp, "cpu_load", "10.5")]
+
+        trial_data = wb_storage.experiments[exp.experiment_id].trials[trial.trial_id]
+        assert trial_data.metadata_dict["trial_number"] == 1
+
+
+def test_write_behind_batch(wb_storage: SqlStorage) -> None:
+    """
+    Make sure the queued writes are committed in one transaction, and a bad
+    statement does not prevent the rest of the batch from being saved.
+    """
+    # Use the writer directly to control the batch.
+    writer = StorageWriter(wb_storage._engine, flush_interval=60)
+    schema = wb_storage._schema
+    commits: List[Any] = []
+
+    def _count_commit(conn: Any) -> None:
+        commits.append(conn)
+
+    event.listen(wb_storage._engine, "commit", _count_commit)
+    try:
+        for i in range(5):
+            writer.write(schema.config.insert(), [{"config_hash": f"hash-{i}"}])
+        writer.flush()
+        assert len(commits) == 1
+        assert _count_rows(wb_storage, "config") == 5
+
+        # A duplicate hash fails the batch; the rest is retried one by one,
+        # and the failure is reported on flush (only once).
+        writer.write(schema.config.insert(), [{"config_hash": "hash-0"}])
+        writer.write(schema.config.insert(), [{"config_hash": "hash-5"}])
+        with pytest.raises(RuntimeError, match="1 write"):
+            writer.flush()
+        assert _count_rows(wb_storage, "config") == 6
+        writer.flush()
+    finally:
+        event.remove(wb_storage._engine, "commit", _count_commit)
+
+
+def test_write_behind_in_memory() -> None:
+    """
+    The background thread cannot see the in-memory SQLite database of the main thread.
+    """
+    with pytest.raises(ValueError):
+        SqlStorage(service=None, config={
+            "drivername": "sqlite",
+            "database": ":memory:",
+            "write_behind": True,
+        })
+
+
+def test_write_behind_failure_on_exit(wb_storage: SqlStorage, tunable_groups: TunableGroups) -> None:
+    """
+    A failed background write is not lost silently: the experiment teardown raises.
+    """
+    with pytest.raises(RuntimeError):
+        with wb_storage.experiment(
+            experiment_id="Test-WB-Failure",
+            trial_id=1,
+            root_env_config="environment.jsonc",
+            description="pytest write-behind experiment",
+            tunables=tunable_groups,
+            opt_targets={"score": "min"},
+        ) as exp:
+            trial = exp.new_trial(tunable_groups)
+            assert wb_storage._writer is not None
+            # A telemetry record for a missing metric ID violates the NOT NULL constraint.
+            wb_storage._writer.write(wb_storage._schema.trial_telemetry.insert(), [{
+                "exp_id": exp.experiment_id,
+                "trial_id": trial.trial_id,
+                "ts": datetime.now(UTC),
+                "metric_id": None,
+            }])
@@ -59,3 +59,23 @@ def test_tunable_group_update_boot(tunable_groups: TunableGroups) -> None:
     assert tunable_groups.is_updated()
     assert tunable_groups.is_updated(["boot"])
     assert not tunable_groups.is_updated(["kernel"])
+
+
+def test_tunable_group_reconfiguration_cost(tunable_groups: TunableGroups) -> None:
+    """
+    Test that the reconfiguration cost accounts only for the groups with different values.
+    """
+    other = tunable_groups.copy()
+    assert tunable_groups.get_reconfiguration_cost(other) == 0
+    other.assign(_TUNABLE_VALUES)
+    assert tunable_groups.get_reconfiguration_cost(other) == 1
+    other["idle"] = "mwait"
+    assert tunable_groups.get_reconfiguration_cost(other) == 1 + 300
+    other["vmSize"] = "Standard_B2s"
+    assert tunable_groups.get_reconfiguration_cost(other) == 1 + 300 + 1000
+    assert other.get_reconfiguration_cost(tunable_groups) == 1 + 300 + 1000
+    # The update flags do not matter.
+    tunable_groups.assign(_TUNABLE_VALUES)
+    assert tunable_groups.is_updated()
+    assert tunable_groups.get_reconfiguration_cost(other) == 300 + 1000
+    assert tunable_groups.get_reconfiguration_cost(tunable_groups.subgroup(["kernel"])) == 0
@@ -276,6 +276,29 @@ class TunableGroups:
         return any(self._tunable_groups[name].is_updated()
                    for name in (group_names or self.get_covariant_group_names()))
 
+    def get_reconfiguration_cost(self, other: "TunableGroups") -> int:
+        """
+        Get the cost of switching from the current values of the tunables to the
+        values in the `other` collection, i.e., the total cost of all covariant
+        groups where the values differ. Groups missing in `other` are ignored.
+
+        Parameters
+        ----------
+        other : TunableGroups
+            Tunable values to switch to.
+
+        Returns
+        -------
+        cost : int
+            Total cost of the covariant groups that need to be reconfigured.
+        """
+        # pylint: disable=protected-access
+        return sum(
+            group.cost for (name, group) in self._tunable_groups.items()
+            if name in other._tunable_groups and
+            group.get_tunable_values_dict() != other._tunable_groups[name].get_tunable_values_dict()
+        )
+
     def is_defaults(self) -> bool:
         """
         Checks whether the currently assigned values of all tunables are at their defaults.
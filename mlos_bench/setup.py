@@ -65,6 +65,7 @@ extra_requires: Dict[str, List[str]] = {    # pylint: disable=consider-using-nam
     'storage-sql-mysql': ['sqlalchemy', 'mysql-connector-python'],
     'storage-sql-postgres': ['sqlalchemy', 'psycopg2'],
     'storage-sql-sqlite': ['sqlalchemy'],   # sqlite3 comes with python, so we don't need to install it.
+    'pyarrow': ['pyarrow'],     # Parquet and Arrow formats for the experiment export and the results cache.
     # Transitive extra_requires from mlos-core.
     'flaml': ['flaml[blendsearch]'],
     'smac': ['smac'],
@@ -106,6 +107,7 @@ setup(
     entry_points={
         'console_scripts': [
             'mlos_bench = mlos_bench.run:_main',
+            'mlos_bench_storage = mlos_bench.storage_cli:_main',
         ],
     },
     install_requires=[
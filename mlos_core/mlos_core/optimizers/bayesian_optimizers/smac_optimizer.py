@@ -26,7 +26,7 @@ from smac.initial_design import AbstractInitialDesign, SobolInitialDesign
 from smac.intensifier.abstract_intensifier import AbstractIntensifier
 from smac.main.config_selector import ConfigSelector
 from smac.random_design.probability_design import ProbabilityRandomDesign
-from smac.runhistory import StatusType, TrialInfo, TrialValue
+from smac.runhistory import InstanceSeedKey, StatusType, TrialInfo, TrialKey, TrialValue
 
 from mlos_core.optimizers.bayesian_optimizers.bayesian_optimizer import BaseBayesianOptimizer
 from mlos_core.spaces.adapters.adapter import BaseSpaceAdapter
@@ -38,11 +38,12 @@ class SmacOptimizer(BaseBayesianOptimizer):
     Wrapper class for SMAC based Bayesian optimization.
     """
 
-<<<<<<< HEAD
     def __init__(
-        self,  # pylint: disable=too-many-locals
-        *,  # pylint: disable=too-many-locals
+        self,  # pylint: disable=too-many-locals,too-many-arguments
+        *,
         parameter_space: ConfigSpace.ConfigurationSpace,
+        optimization_targets: List[str],
+        objective_weights: Optional[List[float]] = None,
         space_adapter: Optional[BaseSpaceAdapter] = None,
         seed: Optional[int] = 0,
         run_name: Optional[str] = None,
@@ -57,21 +58,6 @@ class SmacOptimizer(BaseBayesianOptimizer):
         initial_design_class: Type[AbstractInitialDesign] = SobolInitialDesign,
         **kwargs: Any,
     ):
-=======
-    def __init__(self, *,  # pylint: disable=too-many-locals,too-many-arguments
-                 parameter_space: ConfigSpace.ConfigurationSpace,
-                 optimization_targets: List[str],
-                 objective_weights: Optional[List[float]] = None,
-                 space_adapter: Optional[BaseSpaceAdapter] = None,
-                 seed: Optional[int] = 0,
-                 run_name: Optional[str] = None,
-                 output_directory: Optional[str] = None,
-                 max_trials: int = 100,
-                 n_random_init: Optional[int] = None,
-                 max_ratio: Optional[float] = None,
-                 use_default_config: bool = False,
-                 n_random_probability: float = 0.1):
->>>>>>> c7a4823b22855ccc9b9083495b48e95a48b779ec
         """
         Instantiate a new SMAC optimizer wrapper.
 
@@ -354,17 +340,12 @@ class SmacOptimizer(BaseBayesianOptimizer):
         # -- this planned to be fixed in some future release: https://github.com/automl/SMAC3/issues/946
         raise RuntimeError("This function should never be called.")
 
-<<<<<<< HEAD
     def _register(
         self,
         configurations: pd.DataFrame,
-        scores: pd.Series,
+        scores: pd.DataFrame,
         context: Optional[pd.DataFrame] = None,
     ) -> None:
-=======
-    def _register(self, configurations: pd.DataFrame,
-                  scores: pd.DataFrame, context: Optional[pd.DataFrame] = None) -> None:
->>>>>>> c7a4823b22855ccc9b9083495b48e95a48b779ec
         """Registers the given configurations and scores.
 
         Parameters
@@ -381,15 +362,15 @@ class SmacOptimizer(BaseBayesianOptimizer):
         with self.lock:
             # Register each trial (one-by-one)
             contexts: Union[List[pd.Series], List[None]] = _to_context(context) or [
-                None for _ in scores    # type: ignore[misc]
+                None for _ in range(len(scores))    # type: ignore[misc]
             ]
-            for config, score, ctx in zip(
+            for config, (_, score), ctx in zip(
                 self._to_configspace_configs(configurations),
-                scores.tolist(),
+                scores.iterrows(),
                 contexts,
             ):
                 value: TrialValue = TrialValue(
-                    cost=score, time=0.0, status=StatusType.SUCCESS
+                    cost=list(score.astype(float)), time=0.0, status=StatusType.SUCCESS
                 )
 
                 # Retrieve previously generated TrialInfo (returned by .ask()) or create new TrialInfo instance
@@ -403,7 +384,6 @@ class SmacOptimizer(BaseBayesianOptimizer):
                         [df_ctx.equals(ctx) for df_ctx in self.trial_info_df["Context"]]
                     )
 
-<<<<<<< HEAD
                 # make a new entry
                 if sum(matching) > 0:
                     info = self.trial_info_df[matching]["TrialInfo"].iloc[-1]
@@ -435,15 +415,6 @@ class SmacOptimizer(BaseBayesianOptimizer):
                             value,
                         ]
                 self.base_optimizer.tell(info, value, save=False)
-=======
-        # Register each trial (one-by-one)
-        for (config, (_i, score)) in zip(self._to_configspace_configs(configurations), scores.iterrows()):
-            # Retrieve previously generated TrialInfo (returned by .ask()) or create new TrialInfo instance
-            info: TrialInfo = self.trial_info_map.get(
-                config, TrialInfo(config=config, seed=self.base_optimizer.scenario.seed))
-            value = TrialValue(cost=list(score.astype(float)), time=0.0, status=StatusType.SUCCESS)
-            self.base_optimizer.tell(info, value, save=False)
->>>>>>> c7a4823b22855ccc9b9083495b48e95a48b779ec
 
             # Save optimizer once we register all configs
             self.base_optimizer.optimizer.save()
@@ -468,17 +439,12 @@ class SmacOptimizer(BaseBayesianOptimizer):
             Pandas dataframe with a single row containing the context.
             Column names are the budget, seed, and instance of the evaluation, if valid.
         """
-<<<<<<< HEAD
         with self.lock:
             if context is not None:
                 warn(
                     f"Not Implemented: Ignoring context {list(context.columns)}",
                     UserWarning,
                 )
-=======
-        if TYPE_CHECKING:
-            from smac.runhistory import TrialInfo  # pylint: disable=import-outside-toplevel,unused-import
->>>>>>> c7a4823b22855ccc9b9083495b48e95a48b779ec
 
             trial: TrialInfo = self.base_optimizer.ask()
             trial.config.is_valid_configuration()
@@ -497,10 +463,166 @@ class SmacOptimizer(BaseBayesianOptimizer):
 
             return config_df, context_df
 
+    def _suggest_batch(
+        self, n: int, context: Optional[pd.DataFrame] = None
+    ) -> Tuple[pd.DataFrame, Optional[pd.DataFrame]]:
+        """Suggests a batch of new configurations.
+
+        Uses the constant liar strategy: each configuration in the batch is
+        registered as pending before asking SMAC for the next one.
+
+        Parameters
+        ----------
+        n : int
+            Number of configurations to suggest.
+        context : pd.DataFrame
+            Not Yet Implemented.
+
+        Returns
+        -------
+        configurations : pd.DataFrame
+            Pandas dataframe with `n` rows. Column names are the parameter names.
+
+        context : pd.DataFrame
+            Pandas dataframe with `n` rows containing the context.
+            Column names are the budget, seed, and instance of the evaluation, if valid.
+        """
+        batch = []
+        for _ in range(n):
+            (config_df, context_df) = self._suggest(context)
+            self._register_pending(config_df)
+            batch.append((config_df, context_df))
+        return (pd.concat([config for (config, _) in batch]).reset_index(drop=True),
+                pd.concat([ctx for (_, ctx) in batch]).reset_index(drop=True))
+
     def register_pending(
         self, configurations: pd.DataFrame, context: Optional[pd.DataFrame] = None
     ) -> None:
-        raise NotImplementedError()
+        """Registers the given configurations as "pending".
+
+        Uses the constant liar strategy: until the actual results are registered,
+        SMAC sees the pending configurations with the worst cost observed so far.
+        That keeps the surrogate model from suggesting the same region again.
+
+        Parameters
+        ----------
+        configurations : pd.DataFrame
+            Dataframe of configurations / parameters. The columns are parameter names and the rows are the configurations.
+        context : pd.DataFrame
+            Not Yet Implemented.
+        """
+        if context is not None:
+            warn(
+                f"Not Implemented: Ignoring context {list(context.columns)}",
+                UserWarning,
+            )
+        if self._space_adapter:
+            configurations = self._space_adapter.inverse_transform(configurations)
+        self._register_pending(configurations)
+
+    def _register_pending(self, configurations: pd.DataFrame) -> None:
+        """Tell SMAC the "lie" for the given pending configurations.
+
+        Parameters
+        ----------
+        configurations : pd.DataFrame
+            Dataframe of configurations in the optimizer's parameter space.
+        """
+        if len(self._observations) == 0:
+            # Nothing to lie about yet. SMAC still tracks the configs returned by .ask()
+            # as running, so the initial design does not suggest them twice.
+            return
+        lie = pd.concat([scores for (_, scores, _) in self._observations]) \
+            .max()[self._optimization_targets].astype(float)
+        value = TrialValue(cost=list(lie), time=0.0, status=StatusType.SUCCESS)
+        with self.lock:
+            for config in self._to_configspace_configs(configurations):
+                matching = (self.trial_info_df["Configuration"] == config) \
+                    & self.trial_info_df["TrialValue"].isna()
+                if sum(matching) > 0:
+                    info = self.trial_info_df[matching]["TrialInfo"].iloc[-1]
+                else:
+                    info = TrialInfo(config=config, seed=self.base_optimizer.scenario.seed)
+                    self.trial_info_df.loc[len(self.trial_info_df.index)] = [
+                        config,
+                        None,
+                        info,
+                        None,
+                    ]
+                # The actual result overwrites the lie in SMAC's runhistory later.
+                self.base_optimizer.tell(info, value, save=False)
+
+    def unregister_pending(
+        self, configurations: pd.DataFrame, context: Optional[pd.DataFrame] = None
+    ) -> None:
+        """Forget the given "pending" configurations without registering any results.
+
+        Removes the pending trials (and the "lies" told about them) from SMAC's
+        runhistory, so the discarded suggestions no longer affect the surrogate model.
+
+        Parameters
+        ----------
+        configurations : pd.DataFrame
+            Dataframe of configurations / parameters. The columns are parameter names and the rows are the configurations.
+        context : pd.DataFrame
+            Not Yet Implemented.
+        """
+        if context is not None:
+            warn(
+                f"Not Implemented: Ignoring context {list(context.columns)}",
+                UserWarning,
+            )
+        if self._space_adapter:
+            configurations = self._space_adapter.inverse_transform(configurations)
+        with self.lock:
+            for config in self._to_configspace_configs(configurations):
+                matching = (self.trial_info_df["Configuration"] == config) \
+                    & self.trial_info_df["TrialValue"].isna()
+                for info in self.trial_info_df[matching]["TrialInfo"]:
+                    self._forget_trial(info)
+                self.trial_info_df = self.trial_info_df[~matching].reset_index(drop=True)
+
+    def _forget_trial(self, info: TrialInfo) -> None:
+        """Remove the trial from SMAC's runhistory, whether it is still running or
+        has a "lie" registered for it.
+
+        SMAC has no public API to remove the trials, so we have to update
+        the internal data structures of its runhistory directly.
+        """
+        # pylint: disable=protected-access
+        runhistory = self.base_optimizer.runhistory
+        config_id = runhistory._config_ids.get(info.config)
+        if config_id is None:
+            return
+        key = TrialKey(
+            config_id=config_id,
+            instance=info.instance,
+            seed=info.seed,
+            budget=None if info.budget is None else float(info.budget),
+        )
+        value = runhistory._data.pop(key, None)
+        if value is None:
+            return
+        runhistory._submitted -= 1
+        if value.status == StatusType.RUNNING:
+            runhistory._running -= 1
+            if info in runhistory._running_trials:
+                runhistory._running_trials.remove(info)
+        else:
+            runhistory._finished -= 1
+            isk_to_budget = runhistory._config_id_to_isk_to_budget.get(config_id, {})
+            isk = InstanceSeedKey(info.instance, info.seed)
+            if key.budget in isk_to_budget.get(isk, []):
+                isk_to_budget[isk].remove(key.budget)
+                if not isk_to_budget[isk]:
+                    del isk_to_budget[isk]
+            runhistory.update_cost(info.config)
+            runhistory._update_objective_bounds()
+            if not isk_to_budget:
+                # The lie could have made it an incumbent (e.g., when all scores are equal).
+                intensifier = self.base_optimizer.intensifier
+                if info.config in intensifier._incumbents:
+                    intensifier._incumbents.remove(info.config)
 
     def surrogate_predict(
         self, configurations: pd.DataFrame, context: Optional[pd.DataFrame] = None
@@ -581,21 +703,6 @@ class SmacOptimizer(BaseBayesianOptimizer):
             [trial.config], columns=list(self.optimizer_parameter_space.keys())
         )
 
-    def get_observations(self) -> pd.DataFrame:
-        """Returns the observations as a dataframe.
-
-        Returns
-        -------
-        observations : pd.DataFrame
-            Dataframe of observations. The columns are parameter names and "score" for the score, each row is an observation.
-        """
-        if len(self._observations) == 0:
-            raise ValueError("No observations registered yet.")
-        configs = pd.concat([config for config, _, _ in self._observations])
-        configs["score"] = pd.concat([score for _, score, _ in self._observations])
-
-        return configs
-
     def get_observations_full(self) -> pd.DataFrame:
         """Returns the observations as a dataframe with additional info.
 
@@ -609,40 +716,35 @@ class SmacOptimizer(BaseBayesianOptimizer):
 
         return self.trial_info_df
 
-    def get_best_observation(self) -> pd.DataFrame:
-        """Returns the best observation so far as a dataframe.
+    def get_best_observations(self, n_max: int = 1) -> Tuple[pd.DataFrame, pd.DataFrame, Optional[pd.DataFrame]]:
+        """
+        Get the N best observations so far as a triplet of DataFrames (config, score, context).
+        Only the observations made at the highest budget seen so far (if any) are considered.
+
+        Parameters
+        ----------
+        n_max : int
+            Maximum number of best observations to return. Default is 1.
 
         Returns
         -------
-        best_observation : pd.DataFrame
-            Dataframe with a single row containing the best observation. The columns are parameter names and "score" for the score.
+        observations : Tuple[pd.DataFrame, pd.DataFrame, Optional[pd.DataFrame]]
+            A triplet of best (config, score, context) DataFrames of best observations.
         """
         if len(self._observations) == 0:
             raise ValueError("No observations registered yet.")
 
-        observations = self._observations
-
-        max_budget = np.nan
-        budgets = [
-            context["budget"].max()
-            for _, _, context in self._observations
-            if context is not None
-        ]
-        if len(budgets) > 0:
-            max_budget = max(budgets)
-
-        if max_budget is not np.nan:
-            observations = [
-                (config, score, context)
-                for config, score, context in self._observations
-                if context is not None and context["budget"].max() == max_budget
-            ]
-
-        configs = pd.concat([config for config, _, _ in observations])
-        scores = pd.concat([score for _, score, _ in observations])
-        configs["score"] = scores
+        (configs, scores, contexts) = self.get_observations()
+        if contexts is not None and "budget" in contexts.columns:
+            max_budget = contexts["budget"].max()
+            if not np.isnan(max_budget):
+                is_max_budget = contexts["budget"] == max_budget
+                (configs, scores, contexts) = (
+                    configs[is_max_budget], scores[is_max_budget], contexts[is_max_budget])
 
-        return configs.nsmallest(1, columns="score")
+        idx = scores.nsmallest(n_max, columns=self._optimization_targets, keep="first").index
+        return (configs.loc[idx], scores.loc[idx],
+                None if contexts is None else contexts.loc[idx])
 
     def cleanup(self) -> None:
         if self._temp_output_directory is not None:
@@ -665,8 +767,9 @@ class SmacOptimizer(BaseBayesianOptimizer):
             List of ConfigSpace configurations.
         """
         return [
+            # Inactive (conditional) parameters are missing from the configuration.
             ConfigSpace.Configuration(
-                self.optimizer_parameter_space, values=config.to_dict()
+                self.optimizer_parameter_space, values=config.dropna().to_dict()
             )
             for (_, config) in configurations.astype("O").iterrows()
         ]
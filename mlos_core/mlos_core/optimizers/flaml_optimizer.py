@@ -6,11 +6,7 @@
 Contains the FlamlOptimizer class.
 """
 
-<<<<<<< HEAD
-from typing import Dict, NamedTuple, Optional, Tuple, Union
-=======
-from typing import Dict, List, NamedTuple, Optional, Union
->>>>>>> c7a4823b22855ccc9b9083495b48e95a48b779ec
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
 from warnings import warn
 
 import ConfigSpace
@@ -33,16 +29,6 @@ class FlamlOptimizer(BaseOptimizer):
     Wrapper class for FLAML Optimizer: A fast library for AutoML and tuning.
     """
 
-<<<<<<< HEAD
-    def __init__(
-        self,
-        *,
-        parameter_space: ConfigSpace.ConfigurationSpace,
-        space_adapter: Optional[BaseSpaceAdapter] = None,
-        low_cost_partial_config: Optional[dict] = None,
-        seed: Optional[int] = None,
-    ):
-=======
     # The name of an internal objective attribute that is calculated as a weighted average of the user provided objective metrics.
     _METRIC_NAME = "FLAML_score"
 
@@ -53,7 +39,6 @@ class FlamlOptimizer(BaseOptimizer):
                  space_adapter: Optional[BaseSpaceAdapter] = None,
                  low_cost_partial_config: Optional[dict] = None,
                  seed: Optional[int] = None):
->>>>>>> c7a4823b22855ccc9b9083495b48e95a48b779ec
         """
         Create an MLOS wrapper for FLAML.
 
@@ -104,17 +89,8 @@ class FlamlOptimizer(BaseOptimizer):
         self.evaluated_samples: Dict[ConfigSpace.Configuration, EvaluatedSample] = {}
         self._suggested_config: Optional[dict]
 
-<<<<<<< HEAD
-    def _register(
-        self,
-        configurations: pd.DataFrame,
-        scores: pd.Series,
-        context: Optional[pd.DataFrame] = None,
-    ) -> None:
-=======
     def _register(self, configurations: pd.DataFrame, scores: pd.DataFrame,
                   context: Optional[pd.DataFrame] = None) -> None:
->>>>>>> c7a4823b22855ccc9b9083495b48e95a48b779ec
         """Registers the given configurations and scores.
 
         Parameters
@@ -129,33 +105,16 @@ class FlamlOptimizer(BaseOptimizer):
             Not Yet Implemented.
         """
         if context is not None:
-<<<<<<< HEAD
-            for (_, config), score in zip(
-                configurations.astype("O").iterrows(), scores
-            ):
-                warn(
-                    f"Not Implemented: Ignoring context {list(context.columns)}",
-                    UserWarning,
-                )
-        for (_, config), score in zip(configurations.astype("O").iterrows(), scores):
-=======
             warn(f"Not Implemented: Ignoring context {list(context.columns)}", UserWarning)
         for (_, config), (_, score) in zip(configurations.astype('O').iterrows(), scores.iterrows()):
->>>>>>> c7a4823b22855ccc9b9083495b48e95a48b779ec
             cs_config: ConfigSpace.Configuration = ConfigSpace.Configuration(
                 self.optimizer_parameter_space, values=config.to_dict()
             )
             if cs_config in self.evaluated_samples:
                 warn(f"Configuration {config} was already registered", UserWarning)
-<<<<<<< HEAD
-
-            self.evaluated_samples[cs_config] = EvaluatedSample(
-                config=config.to_dict(), score=score
-=======
             self.evaluated_samples[cs_config] = EvaluatedSample(
                 config=config.to_dict(),
                 score=float(np.average(score.astype(float), weights=self._objective_weights)),
->>>>>>> c7a4823b22855ccc9b9083495b48e95a48b779ec
             )
 
     def _suggest(
@@ -207,11 +166,7 @@ class FlamlOptimizer(BaseOptimizer):
         """
         cs_config = normalize_config(self.optimizer_parameter_space, config)
         if cs_config in self.evaluated_samples:
-<<<<<<< HEAD
-            return {"score": self.evaluated_samples[cs_config].score}
-=======
             return {self._METRIC_NAME: self.evaluated_samples[cs_config].score}
->>>>>>> c7a4823b22855ccc9b9083495b48e95a48b779ec
 
         self._suggested_config = dict(cs_config)  # Cleaned-up version of the config
         return None  # Returning None stops the process
@@ -251,13 +206,8 @@ class FlamlOptimizer(BaseOptimizer):
         tune.run(
             self._target_function,
             config=self.flaml_parameter_space,
-<<<<<<< HEAD
-            mode="min",
-            metric="score",
-=======
             mode='min',
             metric=self._METRIC_NAME,
->>>>>>> c7a4823b22855ccc9b9083495b48e95a48b779ec
             points_to_evaluate=points_to_evaluate,
             evaluated_rewards=evaluated_rewards,
             num_samples=len(points_to_evaluate) + 1,
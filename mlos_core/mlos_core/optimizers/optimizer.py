@@ -24,21 +24,11 @@ class BaseOptimizer(metaclass=ABCMeta):
     Optimizer abstract base class defining the basic interface.
     """
 
-<<<<<<< HEAD
-    # pylint: disable=too-many-instance-attributes
-    def __init__(
-        self,
-        *,
-        parameter_space: ConfigSpace.ConfigurationSpace,
-        space_adapter: Optional[BaseSpaceAdapter] = None,
-    ):
-=======
     def __init__(self, *,
                  parameter_space: ConfigSpace.ConfigurationSpace,
                  optimization_targets: List[str],
                  objective_weights: Optional[List[float]] = None,
                  space_adapter: Optional[BaseSpaceAdapter] = None):
->>>>>>> c7a4823b22855ccc9b9083495b48e95a48b779ec
         """
         Create a new instance of the base optimizer.
 
@@ -74,13 +64,7 @@ class BaseOptimizer(metaclass=ABCMeta):
             raise ValueError("Number of weights must match the number of optimization targets")
 
         self._space_adapter: Optional[BaseSpaceAdapter] = space_adapter
-<<<<<<< HEAD
-        self._observations: List[
-            Tuple[pd.DataFrame, pd.Series, Optional[pd.DataFrame]]
-        ] = []
-=======
         self._observations: List[Tuple[pd.DataFrame, pd.DataFrame, Optional[pd.DataFrame]]] = []
->>>>>>> c7a4823b22855ccc9b9083495b48e95a48b779ec
         self._has_context: Optional[bool] = None
         self._pending_observations: List[
             Tuple[pd.DataFrame, Optional[pd.DataFrame]]
@@ -97,17 +81,8 @@ class BaseOptimizer(metaclass=ABCMeta):
         """Get the space adapter instance (if any)."""
         return self._space_adapter
 
-<<<<<<< HEAD
-    def register(
-        self,
-        configurations: pd.DataFrame,
-        scores: pd.Series,
-        context: Optional[pd.DataFrame] = None,
-    ) -> None:
-=======
     def register(self, configurations: pd.DataFrame, scores: pd.DataFrame,
                  context: Optional[pd.DataFrame] = None) -> None:
->>>>>>> c7a4823b22855ccc9b9083495b48e95a48b779ec
         """Wrapper method, which employs the space adapter (if any), before registering the configurations and scores.
 
         Parameters
@@ -121,21 +96,12 @@ class BaseOptimizer(metaclass=ABCMeta):
             Not Yet Implemented.
         """
         # Do some input validation.
-<<<<<<< HEAD
-        assert self._has_context is None or self._has_context ^ (
-            context is None
-        ), "Context must always be added or never be added."
-        assert len(configurations) == len(
-            scores
-        ), "Mismatched number of configurations and scores."
-=======
         assert set(scores.columns) == set(self._optimization_targets), \
             "Mismatched optimization targets."
         assert self._has_context is None or self._has_context ^ (context is None), \
             "Context must always be added or never be added."
         assert len(configurations) == len(scores), \
             "Mismatched number of configurations and scores."
->>>>>>> c7a4823b22855ccc9b9083495b48e95a48b779ec
         if context is not None:
             assert len(configurations) == len(
                 context
@@ -155,17 +121,8 @@ class BaseOptimizer(metaclass=ABCMeta):
         return self._register(configurations, scores, context)
 
     @abstractmethod
-<<<<<<< HEAD
-    def _register(
-        self,
-        configurations: pd.DataFrame,
-        scores: pd.Series,
-        context: Optional[pd.DataFrame] = None,
-    ) -> None:
-=======
     def _register(self, configurations: pd.DataFrame, scores: pd.DataFrame,
                   context: Optional[pd.DataFrame] = None) -> None:
->>>>>>> c7a4823b22855ccc9b9083495b48e95a48b779ec
         """Registers the given configurations and scores.
 
         Parameters
@@ -228,6 +185,55 @@ class BaseOptimizer(metaclass=ABCMeta):
             ), "Space adapter produced a configuration that does not match the expected parameter space."
         return configuration, context
 
+    def suggest_batch(
+        self, n: int, context: Optional[pd.DataFrame] = None, defaults: bool = False
+    ) -> Tuple[pd.DataFrame, Optional[pd.DataFrame]]:
+        """Wrapper method, which employs the space adapter (if any), after suggesting a batch of new configurations.
+        Optimizers that support pending configurations account for the earlier
+        suggestions in the batch when making the later ones, and keep the whole
+        batch as pending until the results are registered.
+
+        Parameters
+        ----------
+        n : int
+            Number of configurations to suggest. Must be positive.
+        context : pd.DataFrame
+            Not Yet Implemented.
+        defaults : bool
+            Whether or not to return the default config as the first suggestion in the batch.
+            By default, use the ones from the optimizer.
+
+        Returns
+        -------
+        configurations : pd.DataFrame
+            Pandas dataframe with `n` rows. Column names are the parameter names.
+        context : pd.DataFrame
+            Pandas dataframe with `n` rows containing the context (if any).
+        """
+        if n <= 0:
+            raise ValueError(f"Invalid batch size: {n}")
+        batch: List[Tuple[pd.DataFrame, Optional[pd.DataFrame]]] = []
+        # Reuse the single suggestion logic for the defaults and the delayed config (if any).
+        while len(batch) < n and (defaults or self.delayed_config is not None):
+            batch.append(self.suggest(context, defaults=defaults))
+            defaults = False
+        if len(batch) < n:
+            (configurations, batch_context) = self._suggest_batch(n - len(batch), context)
+            assert len(configurations) == n - len(batch), \
+                "Suggest batch must return the requested number of configurations."
+            assert set(configurations.columns).issubset(
+                set(self.optimizer_parameter_space)
+            ), "Optimizer suggested a configuration that does not match the expected parameter space."
+            if self._space_adapter:
+                configurations = self._space_adapter.transform(configurations)
+                assert set(configurations.columns).issubset(
+                    set(self.parameter_space)
+                ), "Space adapter produced a configuration that does not match the expected parameter space."
+            batch.append((configurations, batch_context))
+        configurations = pd.concat([config for (config, _) in batch]).reset_index(drop=True)
+        contexts = [ctx for (_, ctx) in batch if ctx is not None]
+        return (configurations, pd.concat(contexts).reset_index(drop=True) if contexts else None)
+
     @abstractmethod
     def _suggest(
         self, context: Optional[pd.DataFrame] = None
@@ -246,6 +252,32 @@ class BaseOptimizer(metaclass=ABCMeta):
         """
         pass  # pylint: disable=unnecessary-pass # pragma: no cover
 
+    def _suggest_batch(
+        self, n: int, context: Optional[pd.DataFrame] = None
+    ) -> Tuple[pd.DataFrame, Optional[pd.DataFrame]]:
+        """Suggests a batch of new configurations.
+        Default implementation calls `._suggest()` `n` times in a row.
+        Redefine this method in optimizers that can do better than that.
+
+        Parameters
+        ----------
+        n : int
+            Number of configurations to suggest.
+        context : pd.DataFrame
+            Not Yet Implemented.
+
+        Returns
+        -------
+        configurations : pd.DataFrame
+            Pandas dataframe with `n` rows. Column names are the parameter names.
+        context : pd.DataFrame
+            Pandas dataframe with `n` rows containing the context (if any).
+        """
+        batch = [self._suggest(context) for _ in range(n)]
+        configurations = pd.concat([config for (config, _) in batch]).reset_index(drop=True)
+        contexts = [ctx for (_, ctx) in batch if ctx is not None]
+        return (configurations, pd.concat(contexts).reset_index(drop=True) if contexts else None)
+
     @abstractmethod
     def register_pending(
         self, configurations: pd.DataFrame, context: Optional[pd.DataFrame] = None
@@ -263,6 +295,22 @@ class BaseOptimizer(metaclass=ABCMeta):
         """
         pass  # pylint: disable=unnecessary-pass # pragma: no cover
 
+    def unregister_pending(
+        self, configurations: pd.DataFrame, context: Optional[pd.DataFrame] = None
+    ) -> None:
+        """Forget the given "pending" configurations without registering any results.
+        That is to say, the suggestions were discarded and will never be evaluated.
+        Default implementation does nothing: redefine this method in optimizers
+        that keep track of the pending configurations.
+
+        Parameters
+        ----------
+        configurations : pd.DataFrame
+            Dataframe of configurations / parameters. The columns are parameter names and the rows are the configurations.
+        context : pd.DataFrame
+            Not Yet Implemented.
+        """
+
     def get_observations(self) -> Tuple[pd.DataFrame, pd.DataFrame, Optional[pd.DataFrame]]:
         """
         Returns the observations as a triplet of DataFrames (config, score, context).
@@ -274,29 +322,11 @@ class BaseOptimizer(metaclass=ABCMeta):
         """
         if len(self._observations) == 0:
             raise ValueError("No observations registered yet.")
-<<<<<<< HEAD
-        configs = pd.concat([config for config, _, _ in self._observations])
-        scores = pd.concat([score for _, score, _ in self._observations])
-        try:
-            contexts = pd.concat(
-                [context for _, _, context in self._observations if context is not None]
-            )
-        except ValueError:
-            contexts = None
-        configs["score"] = scores
-
-        if contexts is not None:
-            # configs = pd.concat([configs, contexts], axis=1)
-            # Not reachable for now
-            raise NotImplementedError()
-        return configs
-=======
         configs = pd.concat([config for config, _, _ in self._observations]).reset_index(drop=True)
         scores = pd.concat([score for _, score, _ in self._observations]).reset_index(drop=True)
         contexts = pd.concat([pd.DataFrame() if context is None else context
                               for _, _, context in self._observations]).reset_index(drop=True)
         return (configs, scores, contexts if len(contexts.columns) > 0 else None)
->>>>>>> c7a4823b22855ccc9b9083495b48e95a48b779ec
 
     def get_best_observations(self, n_max: int = 1) -> Tuple[pd.DataFrame, pd.DataFrame, Optional[pd.DataFrame]]:
         """
@@ -316,15 +346,10 @@ class BaseOptimizer(metaclass=ABCMeta):
         """
         if len(self._observations) == 0:
             raise ValueError("No observations registered yet.")
-<<<<<<< HEAD
-        observations = self.get_observations()
-        return observations.nsmallest(1, columns="score")
-=======
         (configs, scores, contexts) = self.get_observations()
         idx = scores.nsmallest(n_max, columns=self._optimization_targets, keep="first").index
         return (configs.loc[idx], scores.loc[idx],
                 None if contexts is None else contexts.loc[idx])
->>>>>>> c7a4823b22855ccc9b9083495b48e95a48b779ec
 
     def cleanup(self) -> None:
         """
@@ -23,17 +23,8 @@ class RandomOptimizer(BaseOptimizer):
         The parameter space to optimize.
     """
 
-<<<<<<< HEAD
-    def _register(
-        self,
-        configurations: pd.DataFrame,
-        scores: pd.Series,
-        context: Optional[pd.DataFrame] = None,
-    ) -> None:
-=======
     def _register(self, configurations: pd.DataFrame, scores: pd.DataFrame,
                   context: Optional[pd.DataFrame] = None) -> None:
->>>>>>> c7a4823b22855ccc9b9083495b48e95a48b779ec
         """Registers the given configurations and scores.
 
         Doesn't do anything on the RandomOptimizer except storing configurations for logging.
@@ -86,6 +77,38 @@ class RandomOptimizer(BaseOptimizer):
             None,
         )
 
+    def _suggest_batch(
+        self, n: int, context: Optional[pd.DataFrame] = None
+    ) -> Tuple[pd.DataFrame, Optional[pd.DataFrame]]:
+        """Suggests a batch of new configurations.
+
+        Sampled at random using ConfigSpace, all at once.
+
+        Parameters
+        ----------
+        n : int
+            Number of configurations to suggest.
+        context : None
+            Not Yet Implemented.
+
+        Returns
+        -------
+        configurations : pd.DataFrame
+            Pandas dataframe with `n` rows. Column names are the parameter names.
+        """
+        if context is not None:
+            warn(
+                f"Not Implemented: Ignoring context {list(context.columns)}",
+                UserWarning,
+            )
+        # ConfigSpace returns a single Configuration (not a list) for size=1.
+        configs = self.optimizer_parameter_space.sample_configuration(n) if n > 1 else \
+            [self.optimizer_parameter_space.sample_configuration()]
+        return (
+            pd.DataFrame([dict(config) for config in configs]),
+            None,
+        )
+
     def register_pending(
         self, configurations: pd.DataFrame, context: Optional[pd.DataFrame] = None
     ) -> None:
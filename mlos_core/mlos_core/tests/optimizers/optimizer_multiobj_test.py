@@ -84,7 +84,7 @@ def test_multi_target_opt(objective_weights: Optional[List[float]],
         optimizer.get_observations()
 
     for _ in range(max_iterations):
-        suggestion = optimizer.suggest()
+        suggestion, _ = optimizer.suggest()
         assert isinstance(suggestion, pd.DataFrame)
         assert set(suggestion.columns) == {'x', 'y'}
         # Check suggestion values are the expected dtype
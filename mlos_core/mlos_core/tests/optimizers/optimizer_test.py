@@ -12,14 +12,8 @@ from typing import List, Optional, Type
 
 import ConfigSpace as CS
 import numpy as np
-<<<<<<< HEAD
-import numpy.typing as npt
 import pandas as pd
 import pytest
-=======
-import ConfigSpace as CS
-
->>>>>>> c7a4823b22855ccc9b9083495b48e95a48b779ec
 from mlos_core.optimizers import (
     BaseOptimizer,
     ConcreteOptimizer,
@@ -68,9 +62,12 @@ def test_create_optimizer_and_suggest(
     myrepr = repr(optimizer)
     assert myrepr.startswith(optimizer_class.__name__)
 
-    # pending not implemented
-    with pytest.raises(NotImplementedError):
+    if optimizer_class == OptimizerType.SMAC.value:
         optimizer.register_pending(suggestion, context)
+    else:
+        # pending not implemented
+        with pytest.raises(NotImplementedError):
+            optimizer.register_pending(suggestion, context)
 
 
 @pytest.mark.parametrize(
@@ -96,14 +93,8 @@ def test_basic_interface_toy_problem(
         # To avoid having to train more than 25 model iterations, we set a lower number of max iterations.
         kwargs["max_trials"] = max_iterations * 2
 
-<<<<<<< HEAD
-    def objective(x: pd.Series) -> npt.ArrayLike:  # pylint: disable=invalid-name
-        ret: npt.ArrayLike = (6 * x - 2) ** 2 * np.sin(12 * x - 4)
-        return ret
-=======
     def objective(x: pd.Series) -> pd.DataFrame:
         return pd.DataFrame({"score": (6 * x - 2)**2 * np.sin(12 * x - 4)})
->>>>>>> c7a4823b22855ccc9b9083495b48e95a48b779ec
 
     # Emukit doesn't allow specifying a random state, so we set the global seed.
     np.random.seed(SEED)
@@ -122,38 +113,13 @@ def test_basic_interface_toy_problem(
     for _ in range(max_iterations):
         suggestion, context = optimizer.suggest()
         assert isinstance(suggestion, pd.DataFrame)
-<<<<<<< HEAD
-        assert (suggestion.columns == ["x", "y", "z"]).all()
-=======
         assert set(suggestion.columns) == {'x', 'y', 'z'}
->>>>>>> c7a4823b22855ccc9b9083495b48e95a48b779ec
         # check that suggestion is in the space
         configuration = CS.Configuration(
             optimizer.parameter_space, suggestion.iloc[0].to_dict()
         )
         # Raises an error if outside of configuration space
         configuration.is_valid_configuration()
-<<<<<<< HEAD
-        observation = objective(suggestion["x"])
-        assert isinstance(observation, pd.Series)
-        optimizer.register(suggestion, observation, context)
-
-    best_observation = optimizer.get_best_observation()
-    assert isinstance(best_observation, pd.DataFrame)
-    assert (best_observation.columns == ["x", "y", "z", "score"]).all()
-
-    all_observations = optimizer.get_observations()
-    assert isinstance(all_observations, pd.DataFrame)
-    assert all_observations.shape == (20, 4)
-    assert (all_observations.columns == ["x", "y", "z", "score"]).all()
-
-    # It would be better to put this into bayesian_optimizer_test but then we'd have to refit the model
-    if isinstance(optimizer, BaseBayesianOptimizer):
-        pred_best = optimizer.surrogate_predict(best_observation[["x", "y", "z"]])
-        assert pred_best.shape == (1,)
-
-        pred_all = optimizer.surrogate_predict(all_observations[["x", "y", "z"]])
-=======
         observation = objective(suggestion['x'])
         assert isinstance(observation, pd.DataFrame)
         optimizer.register(suggestion, observation)
@@ -183,10 +149,93 @@ def test_basic_interface_toy_problem(
         assert pred_best.shape == (1,)
 
         pred_all = optimizer.surrogate_predict(all_configs)
->>>>>>> c7a4823b22855ccc9b9083495b48e95a48b779ec
         assert pred_all.shape == (20,)
 
 
+@pytest.mark.parametrize(
+    ("optimizer_class", "kwargs"),
+    [
+        *[(member.value, {}) for member in OptimizerType],
+    ],
+)
+def test_suggest_batch(
+    configuration_space: CS.ConfigurationSpace,
+    optimizer_class: Type[BaseOptimizer],
+    kwargs: Optional[dict],
+) -> None:
+    """
+    Test that the optimizers can suggest batches of configurations.
+    """
+    batch_size = 4
+    if kwargs is None:
+        kwargs = {}
+    if optimizer_class == OptimizerType.SMAC.value:
+        kwargs["max_trials"] = 40
+        kwargs["n_random_init"] = batch_size
+
+    def objective(x: pd.Series) -> pd.DataFrame:
+        return pd.DataFrame({"score": (6 * x - 2)**2 * np.sin(12 * x - 4)})
+
+    optimizer = optimizer_class(
+        parameter_space=configuration_space,
+        optimization_targets=['score'],
+        **kwargs
+    )
+    with pytest.raises(ValueError):
+        optimizer.suggest_batch(0)
+
+    # The first configuration of the batch is the default one, if requested.
+    (suggestions, context) = optimizer.suggest_batch(batch_size, defaults=True)
+    default_config = CS.Configuration(
+        optimizer.parameter_space, suggestions.iloc[0].to_dict())
+    assert default_config == configuration_space.get_default_configuration()
+
+    for _ in range(3):
+        assert isinstance(suggestions, pd.DataFrame)
+        assert suggestions.shape == (batch_size, 3)
+        assert set(suggestions.columns) == {'x', 'y', 'z'}
+        assert context is None or len(context) == batch_size
+        for (_, suggestion) in suggestions.iterrows():
+            # Raises an error if outside of configuration space
+            CS.Configuration(optimizer.parameter_space, suggestion.to_dict()).is_valid_configuration()
+        if optimizer_class != OptimizerType.FLAML.value:
+            # FLAML does not support pending configurations and can repeat its suggestions.
+            assert len(suggestions.drop_duplicates()) == batch_size
+        optimizer.register(suggestions, objective(suggestions['x']), context)
+        (suggestions, context) = optimizer.suggest_batch(batch_size)
+
+    (all_configs, all_scores, _) = optimizer.get_observations()
+    assert all_configs.shape == (3 * batch_size, 3)
+    assert all_scores.shape == (3 * batch_size, 1)
+
+
+def test_smac_unregister_pending(configuration_space: CS.ConfigurationSpace) -> None:
+    """
+    Test that SMAC forgets the pending configurations that will never be evaluated.
+    """
+    optimizer = SmacOptimizer(
+        parameter_space=configuration_space,
+        optimization_targets=['score'],
+        max_trials=20,
+        n_random_init=2,
+        seed=SEED,
+    )
+    runhistory = optimizer.base_optimizer.runhistory
+    (suggestions, context) = optimizer.suggest_batch(2)
+    optimizer.register(suggestions, pd.DataFrame({"score": [1.0, 2.0]}), context)
+
+    (suggestions, _) = optimizer.suggest_batch(3)
+    # SMAC sees the "lie" for each pending configuration.
+    assert len(runhistory) == 5
+    optimizer.unregister_pending(suggestions.iloc[1:])
+    assert len(runhistory) == 3
+    assert runhistory.finished == 3 and runhistory.running == 0
+    assert len(optimizer.get_observations_full()) == 3
+    # Forgetting the configuration again is a no-op.
+    optimizer.unregister_pending(suggestions.iloc[1:])
+    assert len(runhistory) == 3
+
+
 @pytest.mark.parametrize(
     ("optimizer_type"),
     [
@@ -276,13 +325,8 @@ def test_optimizer_with_llamatune(
 
     def objective(point: pd.DataFrame) -> pd.DataFrame:
         # Best value can be reached by tuning an 1-dimensional search space
-<<<<<<< HEAD
-        ret: pd.Series = np.sin(point["x"] * point["y"])
-        assert ret.hasnans is False
-=======
         ret = pd.DataFrame({"score": np.sin(point.x * point.y)})
         assert ret.score.hasnans is False
->>>>>>> c7a4823b22855ccc9b9083495b48e95a48b779ec
         return ret
 
     input_space = CS.ConfigurationSpace(seed=1234)
@@ -351,44 +395,23 @@ def test_optimizer_with_llamatune(
             _LOG.debug("Optimizer is done with random init.")
 
         # loop for optimizer
-        suggestion, context = optimizer.suggest()
+        suggestion, _context = optimizer.suggest()
         observation = objective(suggestion)
-        optimizer.register(suggestion, observation, context)
+        optimizer.register(suggestion, observation)
 
         # loop for llamatune-optimizer
-        suggestion, context = llamatune_optimizer.suggest()
+        suggestion, _context = llamatune_optimizer.suggest()
         _x, _y = suggestion["x"].iloc[0], suggestion["y"].iloc[0]
         assert _x == pytest.approx(_y, rel=1e-3) or _x + _y == pytest.approx(
             3.0, rel=1e-3
         )  # optimizer explores 1-dimensional space
         observation = objective(suggestion)
-        llamatune_optimizer.register(suggestion, observation, context)
+        llamatune_optimizer.register(suggestion, observation)
 
     # Retrieve best observations
     best_observation = optimizer.get_best_observations()
     llamatune_best_observation = llamatune_optimizer.get_best_observations()
 
-<<<<<<< HEAD
-    for best_obv in (best_observation, llamatune_best_observation):
-        assert isinstance(best_obv, pd.DataFrame)
-        assert (best_obv.columns == ["x", "y", "score"]).all()
-
-    # LlamaTune's optimizer score should better (i.e., lower) than plain optimizer's one, or close to that
-    assert (
-        best_observation["score"].iloc[0] > llamatune_best_observation["score"].iloc[0]
-        or best_observation["score"].iloc[0] + 1
-        > llamatune_best_observation["score"].iloc[0]
-    )
-
-    # Retrieve and check all observations
-    for all_obvs in (
-        optimizer.get_observations(),
-        llamatune_optimizer.get_observations(),
-    ):
-        assert isinstance(all_obvs, pd.DataFrame)
-        assert all_obvs.shape == (num_iters, 3)
-        assert (all_obvs.columns == ["x", "y", "score"]).all()
-=======
     for (best_config, best_score, best_context) in (best_observation, llamatune_best_observation):
         assert isinstance(best_config, pd.DataFrame)
         assert isinstance(best_score, pd.DataFrame)
@@ -413,18 +436,11 @@ def test_optimizer_with_llamatune(
         assert set(all_scores.columns) == {'score'}
         assert len(all_configs) == num_iters
         assert len(all_scores) == num_iters
->>>>>>> c7a4823b22855ccc9b9083495b48e95a48b779ec
 
     # .surrogate_predict method not currently implemented if space adapter is employed
     if isinstance(llamatune_optimizer, BaseBayesianOptimizer):
         with pytest.raises(NotImplementedError):
-<<<<<<< HEAD
-            llamatune_optimizer.surrogate_predict(
-                llamatune_best_observation[["x", "y"]]
-            )
-=======
             llamatune_optimizer.surrogate_predict(llamatune_best_config)
->>>>>>> c7a4823b22855ccc9b9083495b48e95a48b779ec
 
 
 # Dynamically determine all of the optimizers we have implemented.
@@ -512,13 +528,8 @@ def test_mixed_numerics_type_input_space_types(
         test_configuration.is_valid_configuration()
         # Test registering the suggested configuration with a score.
         observation = objective(suggestion)
-<<<<<<< HEAD
-        assert isinstance(observation, pd.Series)
-        optimizer.register(suggestion, observation, context)
-=======
         assert isinstance(observation, pd.DataFrame)
         optimizer.register(suggestion, observation)
->>>>>>> c7a4823b22855ccc9b9083495b48e95a48b779ec
 
     (best_config, best_score, best_context) = optimizer.get_best_observations()
     assert isinstance(best_config, pd.DataFrame)